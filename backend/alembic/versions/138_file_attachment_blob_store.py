@@ -0,0 +1,119 @@
+"""Move file-attachment bytes out of Postgres into the blob store.
+
+``file_attachments.data`` was a non-deferred ``bytea``, so every entity
+select — the card's Resources listing included — dragged each file's bytes
+over the wire just to render names and sizes. The bytes now live in the
+content-addressed blob store (``app.services.blob_store``) and the row keeps
+only ``content_hash``, the SHA-256 they are stored under.
+
+Rows are moved in small batches: each batch reads at most ``_BATCH_ROWS``
+payloads, writes them to the store (identical files land in one blob) and
+stamps their hash, so memory stays bounded by the batch rather than the
+table. The column is only dropped once every row is hashed, in the same
+transaction, so an upgrade that fails half-way rolls back with the bytes
+still in place; re-running it finds the blobs already written and only
+refreshes them.
+
+Downgrade reads each blob back into ``data``. The blobs themselves are left
+in place — the hourly GC of the new release is what removes unreferenced
+ones, and it doesn't run on the old one.
+
+Revision ID: 138
+Revises: 137
+"""
+
+import hashlib
+import os
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "138"
+down_revision: Union[str, None] = "137"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 50 rows × the 10 MB upload cap bounds one batch at ~500 MB in the worst
+# case; typical attachments are far smaller.
+_BATCH_ROWS = 50
+
+
+# Frozen copy of the local blob store (app/services/blob_store/local.py) —
+# migrations never import app code, so a later change to the store does not
+# break upgrading or downgrading through here.
+def _blob_path(digest: str) -> Path:
+    backend = os.getenv("BLOB_STORE_BACKEND", "local").lower()
+    if backend != "local":
+        raise RuntimeError(f"Unknown BLOB_STORE_BACKEND {backend!r}")
+    root = Path(os.getenv("BLOB_STORE_PATH", "data/blobs"))
+    return root / digest[:2] / digest[2:4] / digest
+
+
+def _put_blob(data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    path = _blob_path(digest)
+    if path.exists():
+        os.utime(path)
+        return digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return digest
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.add_column("file_attachments", sa.Column("content_hash", sa.String(64), nullable=True))
+    select_batch = sa.text(
+        "SELECT id, data FROM file_attachments WHERE content_hash IS NULL ORDER BY id LIMIT :n"
+    )
+    stamp = sa.text("UPDATE file_attachments SET content_hash = :digest WHERE id = :id")
+    while True:
+        rows = conn.execute(select_batch, {"n": _BATCH_ROWS}).all()
+        if not rows:
+            break
+        conn.execute(
+            stamp,
+            [{"id": row.id, "digest": _put_blob(bytes(row.data))} for row in rows],
+        )
+
+    op.alter_column("file_attachments", "content_hash", nullable=False)
+    op.create_index(
+        "ix_file_attachments_content_hash", "file_attachments", ["content_hash"], unique=False
+    )
+    op.drop_column("file_attachments", "data")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    op.add_column("file_attachments", sa.Column("data", sa.LargeBinary(), nullable=True))
+    select_batch = sa.text(
+        "SELECT id, content_hash FROM file_attachments WHERE data IS NULL ORDER BY id LIMIT :n"
+    )
+    restore = sa.text("UPDATE file_attachments SET data = :data WHERE id = :id")
+    while True:
+        rows = conn.execute(select_batch, {"n": _BATCH_ROWS}).all()
+        if not rows:
+            break
+        conn.execute(
+            restore,
+            [{"id": row.id, "data": _blob_path(row.content_hash).read_bytes()} for row in rows],
+        )
+
+    op.alter_column("file_attachments", "data", nullable=False)
+    op.drop_index("ix_file_attachments_content_hash", table_name="file_attachments")
+    op.drop_column("file_attachments", "content_hash")
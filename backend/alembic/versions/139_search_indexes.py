@@ -0,0 +1,103 @@
+"""Trigram and full-text search indexes for cards, risks and ADRs.
+
+Every search box filters with ``ILIKE '%term%'`` (``search_rank.search_filter``)
+and no migration ever gave those columns an index that can serve a leading
+wildcard, so each keystroke was a sequential scan of ``cards`` (and of
+``risks`` / ``architecture_decisions`` on their registers).
+
+1. ``search_vector`` — a stored generated ``tsvector`` over the searched text
+   columns, GIN-indexed. Postgres maintains it on every write; multi-word
+   queries match it word-prefix by word-prefix in any order. Adding a stored
+   generated column rewrites the table once.
+2. ``pg_trgm`` GIN indexes on each column searched with ``ILIKE``. The
+   extension is contrib: when the server doesn't offer it, or the role may not
+   create it, the indexes are skipped with a warning and search keeps working
+   unindexed. ``app.services.search_index.ensure_trigram_indexes`` re-checks on
+   every startup, so enabling the extension later needs only a restart.
+
+The ranking tiers (exact / starts-with / starts a word / contains) are
+untouched — they order the matches and are mirrored by the frontend.
+
+Revision ID: 139
+Revises: 138
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from alembic import op
+
+revision: str = "139"
+down_revision: Union[str, None] = "138"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+_VECTORS = {
+    "cards": (
+        "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(alias, '') || ' ' "
+        "|| coalesce(reference, '') || ' ' || coalesce(description, ''))"
+    ),
+    "risks": (
+        "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(reference, '') "
+        "|| ' ' || coalesce(description, ''))"
+    ),
+    "architecture_decisions": (
+        "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(reference_number, ''))"
+    ),
+}
+
+_TRIGRAM_COLUMNS = {
+    "cards": ("name", "alias", "reference", "description"),
+    "risks": ("title", "reference", "description"),
+    "architecture_decisions": ("title", "reference_number"),
+}
+
+
+def _enable_pg_trgm(bind) -> bool:
+    if bind.scalar(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")):
+        return True
+    if not bind.scalar(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")):
+        return False
+    try:
+        with bind.begin_nested():
+            bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except sa.exc.DBAPIError:
+        return False
+    return True
+
+
+def upgrade() -> None:
+    for table, expression in _VECTORS.items():
+        op.add_column(
+            table,
+            sa.Column("search_vector", TSVECTOR(), sa.Computed(expression, persisted=True)),
+        )
+        op.create_index(
+            f"ix_{table}_search_vector", table, ["search_vector"], postgresql_using="gin"
+        )
+
+    bind = op.get_bind()
+    if not _enable_pg_trgm(bind):
+        logger.warning("pg_trgm unavailable — skipping trigram search indexes")
+        return
+    for table, columns in _TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    for table, columns in _TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
+    for table in _VECTORS:
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
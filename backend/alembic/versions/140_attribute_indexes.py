@@ -0,0 +1,41 @@
+"""GIN indexes on card and relation attributes.
+
+Attribute filters (the inventory's ``attr=`` filter, the matrix report's
+relation-attribute filters) are JSONB containment, ``attributes @> {...}``,
+which no index served: every filter read every row of the type. A
+``jsonb_path_ops`` GIN index answers containment for any key, and is a
+fraction of the size of the default ``jsonb_ops``.
+
+Per-field B-tree indexes for sorting and grouping are not created here: they
+follow the metamodel (fields declared ``indexed``) and are reconciled at
+startup by ``app.services.attribute_index.sync_attribute_indexes``.
+
+Revision ID: 140
+Revises: 139
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+revision: str = "140"
+down_revision: Union[str, None] = "139"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("cards", "relations"):
+        op.create_index(
+            f"ix_{table}_attributes",
+            table,
+            ["attributes"],
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    for table in ("cards", "relations"):
+        op.drop_index(f"ix_{table}_attributes", table_name=table)
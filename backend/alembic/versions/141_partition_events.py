@@ -0,0 +1,138 @@
+"""Partition events by month on created_at.
+
+The events table (card history, audit log, activity feeds) only ever grew:
+retention could at best null ``batch_id``. Range partitioning by month lets
+the retention policy drop or detach a whole month at once, and lets readers
+that page by time touch only the months they need.
+
+The table is rebuilt: the old one is renamed aside, a partitioned ``events``
+is created with one partition per month from the oldest event to two months
+ahead plus ``events_default``, the rows are copied across and the old table
+dropped. Postgres requires the partition key in the primary key, so it
+becomes ``(created_at, id)``; nothing references ``events.id``.
+
+``ix_events_card_id`` is replaced by ``(card_id, created_at, id)``, which
+serves the History tab's newest-first keyset pagination; the primary key
+serves the same for the global readers.
+
+Revision ID: 141
+Revises: 140
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "141"
+down_revision: Union[str, None] = "140"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = "card_id, user_id, event_type, data, batch_id, created_at, id"
+_MONTHS_AHEAD = 2
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("card_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("event_type", sa.String(100), nullable=False),
+        sa.Column("data", postgresql.JSONB(), nullable=True),
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+    ]
+
+
+def _foreign_keys() -> list[sa.ForeignKeyConstraint]:
+    return [
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["batch_id"], ["mutation_batches.id"], ondelete="SET NULL"),
+    ]
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def _months(oldest: datetime | None) -> list[datetime]:
+    now = datetime.now(timezone.utc)
+    month = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+    last = month
+    for _ in range(_MONTHS_AHEAD):
+        last = _next_month(last)
+    if oldest is not None:
+        oldest = oldest.astimezone(timezone.utc)
+        month = min(month, datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc))
+    months = [month]
+    while months[-1] < last:
+        months.append(_next_month(months[-1]))
+    return months
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.rename_table("events", "events_legacy")
+    op.execute("ALTER TABLE events_legacy RENAME CONSTRAINT events_pkey TO events_legacy_pkey")
+    op.drop_index("ix_events_card_id", table_name="events_legacy")
+    op.drop_index("ix_events_batch_id", table_name="events_legacy")
+    for column in ("card_id", "user_id", "batch_id"):
+        op.drop_constraint(f"events_{column}_fkey", "events_legacy", type_="foreignkey")
+
+    op.create_table(
+        "events",
+        *_columns(),
+        *_foreign_keys(),
+        sa.PrimaryKeyConstraint("created_at", "id", name="events_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM events_legacy")).scalar()
+    for month in _months(oldest):
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE events_y{month.year:04d}m{month.month:02d} PARTITION OF events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+
+    op.execute(f"INSERT INTO events ({_COLUMNS}) SELECT {_COLUMNS} FROM events_legacy")
+    op.drop_table("events_legacy")
+
+    op.create_index("ix_events_batch_id", "events", ["batch_id"])
+    op.create_index("ix_events_card_id_created_at", "events", ["card_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    # Detached partitions (``events_y…_detached``) and archive files are left
+    # as they are: their rows had already left the table.
+    op.create_table(
+        "events_plain",
+        *_columns(),
+        *_foreign_keys(),
+        sa.PrimaryKeyConstraint("id", name="events_plain_pkey"),
+    )
+    op.execute(f"INSERT INTO events_plain ({_COLUMNS}) SELECT {_COLUMNS} FROM events")
+    op.drop_table("events")  # takes every attached partition with it
+    op.rename_table("events_plain", "events")
+    op.execute("ALTER TABLE events RENAME CONSTRAINT events_plain_pkey TO events_pkey")
+    for column in ("card_id", "user_id", "batch_id"):
+        op.execute(
+            f"ALTER TABLE events RENAME CONSTRAINT events_plain_{column}_fkey "
+            f"TO events_{column}_fkey"
+        )
+    op.create_index("ix_events_card_id", "events", ["card_id"])
+    op.create_index("ix_events_batch_id", "events", ["batch_id"])
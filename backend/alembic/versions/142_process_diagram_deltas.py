@@ -0,0 +1,84 @@
+"""Delta-compressed process diagram versions.
+
+Every save of the process modeller added a ``process_diagrams`` row holding
+the complete BPMN XML, so a heavily edited process accumulated hundreds of
+near-identical copies. A version can now be stored as a compressed line delta
+against an earlier snapshot: ``bpmn_xml`` becomes nullable and
+``bpmn_delta`` / ``delta_base_id`` carry the delta. Existing rows stay
+snapshots; the leader's hourly compaction converts them
+(``app.services.diagram_versions.compact_process_diagrams``).
+
+Revision ID: 142
+Revises: 141
+"""
+
+import json
+import zlib
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "142"
+down_revision: Union[str, None] = "141"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of app.services.diagram_versions.apply_delta — migrations never
+# import app code, so a later change to the codec does not break downgrading
+# through here.
+def _apply_delta(base: str, delta: bytes) -> str:
+    if delta[:1] != b"\x01":
+        raise ValueError(f"Unknown diagram delta format {delta[:1]!r}")
+    ops = json.loads(zlib.decompress(delta[1:]).decode("utf-8"))
+    base_lines = base.splitlines(keepends=True)
+    out: list[str] = []
+    for item in ops:
+        if isinstance(item, list):
+            out.extend(base_lines[item[0] : item[1]])
+        else:
+            out.append(item)
+    return "".join(out)
+
+
+def upgrade() -> None:
+    op.add_column("process_diagrams", sa.Column("bpmn_delta", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "process_diagrams",
+        sa.Column(
+            "delta_base_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("process_diagrams.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_process_diagrams_delta_base_id", "process_diagrams", ["delta_base_id"])
+    op.alter_column("process_diagrams", "bpmn_xml", nullable=True)
+
+
+def downgrade() -> None:
+    # Deltas are expanded back into full XML first, oldest first: a delta's
+    # base is always an older version.
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, bpmn_delta, delta_base_id FROM process_diagrams "
+            "WHERE bpmn_xml IS NULL ORDER BY version"
+        )
+    ).all()
+    for row_id, delta, base_id in rows:
+        base_xml = conn.execute(
+            sa.text("SELECT bpmn_xml FROM process_diagrams WHERE id = :id"), {"id": base_id}
+        ).scalar()
+        conn.execute(
+            sa.text("UPDATE process_diagrams SET bpmn_xml = :xml WHERE id = :id"),
+            {"xml": _apply_delta(base_xml, delta), "id": row_id},
+        )
+    op.alter_column("process_diagrams", "bpmn_xml", nullable=False)
+    op.drop_index("ix_process_diagrams_delta_base_id", table_name="process_diagrams")
+    op.drop_column("process_diagrams", "delta_base_id")
+    op.drop_column("process_diagrams", "bpmn_delta")
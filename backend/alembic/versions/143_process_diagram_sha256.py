@@ -0,0 +1,31 @@
+"""Digest of each process diagram version's XML.
+
+Saving a diagram re-parses the BPMN and rewrites the process elements. When
+the XML is byte-for-byte the previous version's (an autosave, a repeated
+import) that work can be skipped; ``bpmn_sha256`` lets the save tell without
+rebuilding the previous version's XML. Existing versions keep NULL, which
+just means their next save extracts as before.
+
+Revision ID: 143
+Revises: 142
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "143"
+down_revision: Union[str, None] = "142"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("process_diagrams", sa.Column("bpmn_sha256", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("process_diagrams", "bpmn_sha256")
@@ -0,0 +1,66 @@
+"""Persistent background jobs.
+
+Long operations (bulk recalculation, data-quality rescoring, compliance
+scans) used to run inside the HTTP request or as an in-process task that a
+restart silently dropped. ``background_jobs`` queues them for the job
+workers, with progress, cancellation and retry state on the row.
+
+Revision ID: 144
+Revises: 143
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from alembic import op
+
+revision: str = "144"
+down_revision: Union[str, None] = "143"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("params", JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("result", JSONB, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("progress", JSONB, nullable=True),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer, nullable=False, server_default="1"),
+        sa.Column("cancel_requested", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column(
+            "run_after", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        sa.Column("locked_by", sa.String(64), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_by",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_background_jobs_kind", "background_jobs", ["kind"])
+    op.create_index(
+        "ix_background_jobs_status_run_after", "background_jobs", ["status", "run_after"]
+    )
+    op.create_index(
+        "ix_background_jobs_created_by_created_at",
+        "background_jobs",
+        ["created_by", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("background_jobs")
@@ -0,0 +1,38 @@
+"""Per-extension cursors for durable event subscriptions.
+
+Extension event handlers received ``card.*`` / ``relation.*`` events from
+the in-memory bus at most once, so connectors paired them with periodic
+full reconciles. Durable subscriptions (SDK 1.6) read the persisted
+``events`` table instead, and ``extension_event_cursors`` records how far
+each extension has consumed it.
+
+Revision ID: 145
+Revises: 144
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "145"
+down_revision: Union[str, None] = "144"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extension_event_cursors",
+        sa.Column("extension_key", sa.String(64), primary_key=True),
+        sa.Column("event_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("extension_event_cursors")
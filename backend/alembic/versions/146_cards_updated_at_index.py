@@ -0,0 +1,27 @@
+"""Index cards on (updated_at, id).
+
+The extension bridge's ``iter_cards`` (SDK 1.7) streams cards ordered by
+``(updated_at, id)`` from a ``since`` timestamp so connectors can sync
+incrementally; without an index every run sorted the whole table.
+
+Revision ID: 146
+Revises: 145
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+revision: str = "146"
+down_revision: Union[str, None] = "145"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_cards_updated_at_id", "cards", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cards_updated_at_id", table_name="cards")
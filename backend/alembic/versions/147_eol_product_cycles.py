@@ -0,0 +1,41 @@
+"""Local copy of endoflife.date release cycles.
+
+The EOL report fetched ``{product}.json`` from endoflife.date for every
+linked product on every run, and ``GET /eol/products/{product}`` proxied
+the same call. ``eol_product_cycles`` keeps the last known cycles per
+product with the validators needed to revalidate them (``ETag``,
+``Last-Modified``); the ``eol.refresh_cycles`` background job keeps it
+current and the readers never wait on the network.
+
+Revision ID: 147
+Revises: 146
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision: str = "147"
+down_revision: Union[str, None] = "146"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "eol_product_cycles",
+        sa.Column("product", sa.String(100), primary_key=True),
+        sa.Column("cycles", JSONB, nullable=True),
+        sa.Column("etag", sa.String(255), nullable=True),
+        sa.Column("last_modified", sa.String(64), nullable=True),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("eol_product_cycles")
@@ -0,0 +1,116 @@
+"""Commit-safe delivery order for durable extension event subscriptions.
+
+Durable subscriptions read ``events`` past a per-extension cursor on
+``(created_at, id)``, holding back events younger than a settle window. But
+``created_at`` is the writing transaction's start time: a transaction open
+longer than the window committed its events behind the cursor, and they were
+never delivered. Events of one transaction also shared ``created_at`` and
+were ordered by their random ids.
+
+Each event now records the id of the transaction that wrote it
+(``xact_id``) and its place in a global sequence (``seq``). The reader only
+takes events below the oldest transaction still in progress, where nothing
+can commit any more.
+
+Events still past some extension's cursor are numbered ``(0, 1..n)`` in
+their old ``(created_at, id)`` order — below every real transaction id — and
+each cursor moves to the number of the last event it had delivered, so
+nothing pending at upgrade time is lost. Older events, delivered everywhere
+already, keep NULL.
+
+Revision ID: 148
+Revises: 147
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "148"
+down_revision: Union[str, None] = "147"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Added without a default and given one afterwards: existing rows stay
+    # NULL instead of the whole partitioned table being rewritten.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS events_seq")
+    op.add_column("events", sa.Column("xact_id", sa.BigInteger(), nullable=True))
+    op.add_column("events", sa.Column("seq", sa.BigInteger(), nullable=True))
+    op.execute(
+        "ALTER TABLE events ALTER COLUMN xact_id "
+        "SET DEFAULT CAST(CAST(pg_current_xact_id() AS text) AS bigint)"
+    )
+    op.execute("ALTER TABLE events ALTER COLUMN seq SET DEFAULT nextval('events_seq')")
+    op.create_index("ix_events_xact_id_seq", "events", ["xact_id", "seq"])
+
+    op.add_column("extension_event_cursors", sa.Column("event_xact_id", sa.BigInteger()))
+    op.add_column("extension_event_cursors", sa.Column("event_seq", sa.BigInteger()))
+    op.execute(
+        """
+        UPDATE events e SET xact_id = 0, seq = pending.n
+        FROM (
+            SELECT created_at, id, row_number() OVER (ORDER BY created_at, id) AS n
+            FROM events
+            WHERE (created_at, id) > (
+                SELECT event_created_at, event_id FROM extension_event_cursors
+                ORDER BY event_created_at, event_id LIMIT 1
+            )
+        ) pending
+        WHERE e.created_at = pending.created_at AND e.id = pending.id
+        """
+    )
+    op.execute("SELECT setval('events_seq', max(seq)) FROM events HAVING max(seq) IS NOT NULL")
+    op.execute(
+        """
+        UPDATE extension_event_cursors c SET event_xact_id = 0, event_seq = COALESCE(
+            (SELECT max(e.seq) FROM events e
+             WHERE e.xact_id = 0 AND (e.created_at, e.id) <= (c.event_created_at, c.event_id)),
+            0
+        )
+        """
+    )
+    op.alter_column("extension_event_cursors", "event_xact_id", nullable=False)
+    op.alter_column("extension_event_cursors", "event_seq", nullable=False)
+    op.drop_column("extension_event_cursors", "event_created_at")
+    op.drop_column("extension_event_cursors", "event_id")
+
+
+def downgrade() -> None:
+    # Each cursor goes back to the key of the last event at or before it; one
+    # before every event restarts at the newest.
+    op.add_column(
+        "extension_event_cursors",
+        sa.Column("event_created_at", sa.DateTime(timezone=True)),
+    )
+    op.add_column("extension_event_cursors", sa.Column("event_id", UUID(as_uuid=True)))
+    op.execute(
+        """
+        UPDATE extension_event_cursors c SET (event_created_at, event_id) = (
+            SELECT e.created_at, e.id FROM events e
+            WHERE (e.xact_id, e.seq) <= (c.event_xact_id, c.event_seq)
+            ORDER BY e.xact_id DESC, e.seq DESC LIMIT 1
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE extension_event_cursors
+        SET event_created_at = now(), event_id = '00000000-0000-0000-0000-000000000000'
+        WHERE event_id IS NULL
+        """
+    )
+    op.alter_column("extension_event_cursors", "event_created_at", nullable=False)
+    op.alter_column("extension_event_cursors", "event_id", nullable=False)
+    op.drop_column("extension_event_cursors", "event_seq")
+    op.drop_column("extension_event_cursors", "event_xact_id")
+
+    op.drop_index("ix_events_xact_id_seq", table_name="events")
+    op.drop_column("events", "seq")
+    op.drop_column("events", "xact_id")
+    op.execute("DROP SEQUENCE IF EXISTS events_seq")
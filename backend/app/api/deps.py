@@ -1,31 +1,23 @@
 from __future__ import annotations
 
-import uuid
-
 from fastapi import Depends, HTTPException, Request
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_access_token
+from app.core.request_context import request_principal
 from app.database import get_db
 from app.models.user import User
+from app.services.principal_cache import PrincipalCache
 
 
 async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
-    auth = request.headers.get("Authorization", "")
-    if auth.startswith("Bearer "):
-        token = auth[7:]
-    else:
-        # Fall back to httpOnly cookie set by /auth/login
-        token = request.cookies.get("access_token", "")
-    if not token:
+    # The token was decoded once by RequestContextMiddleware; the user row
+    # comes from the short-TTL principal cache when fresh.
+    principal = request_principal(request)
+    if not principal.token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    payload = decode_access_token(token)
-    if payload is None:
+    if principal.claims is None or principal.user_id is None:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    user_id = payload.get("sub")
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+    user = await PrincipalCache.load(db, principal.user_id)
     if user is None or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     if user.access_expires_at is not None:
@@ -37,8 +29,7 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
 
 
 async def get_optional_user(request: Request, db: AsyncSession = Depends(get_db)) -> User | None:
-    auth = request.headers.get("Authorization", "")
-    if not auth.startswith("Bearer ") and not request.cookies.get("access_token"):
+    if not request_principal(request).token:
         return None
     try:
         return await get_current_user(request, db)
@@ -71,3 +62,12 @@ def require_permission(app_perm: str):
         return user
 
     return _check
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """``If-None-Match`` evaluation (weak comparison, RFC 9110 §13.1.2)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
@@ -26,7 +26,7 @@ from app.schemas.adr import (
 from app.services import notification_service
 from app.services.event_bus import event_bus
 from app.services.permission_service import PermissionService
-from app.services.search_rank import search_filter, search_rank
+from app.services.search_rank import search_match, search_rank
 
 router = APIRouter(prefix="/adr", tags=["adr"])
 
@@ -211,8 +211,12 @@ async def list_adrs(
         stmt = stmt.where(ArchitectureDecision.status == status)
     if search:
         stmt = stmt.where(
-            search_filter(ArchitectureDecision.title, search)
-            | search_filter(ArchitectureDecision.reference_number, search)
+            search_match(
+                search,
+                ArchitectureDecision.title,
+                ArchitectureDecision.reference_number,
+                vector=ArchitectureDecision.search_vector,
+            )
         )
         # Typing a query means "best match first" — the recency order below is
         # what you want when browsing, not when searching (#918).
@@ -12,7 +12,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.config import settings
 from app.core.rate_limit import limiter
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.request_context import request_principal
+from app.core.security import (
+    create_access_token,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 from app.database import get_db
 from app.models.sso_invitation import SsoInvitation
 from app.models.user import User
@@ -144,7 +150,7 @@ async def register(
     user = User(
         email=body.email,
         display_name=body.display_name,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
         role=role,
         auth_provider="local",
     )
@@ -181,7 +187,7 @@ async def login(
     if user.locked_until and user.locked_until > datetime.now(timezone.utc):
         raise HTTPException(423, "Account temporarily locked. Try again later.")
 
-    if not verify_password(body.password, user.password_hash):
+    if not await verify_password_async(body.password, user.password_hash):
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
         if user.failed_login_attempts >= 5:
             user.locked_until = datetime.now(timezone.utc) + timedelta(minutes=15)
@@ -192,6 +198,11 @@ async def login(
     if not user.is_active:
         raise HTTPException(403, "Account disabled")
 
+    # The configured bcrypt cost changed since this hash was made: re-hash
+    # while we hold the plaintext, so costs converge without a forced reset.
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(body.password)
+
     # Reset failed attempts on successful login
     user.failed_login_attempts = 0
     user.locked_until = None
@@ -218,21 +229,9 @@ async def me(
     from app.models.user import DEFAULT_UI_PREFERENCES
     from app.services.permission_service import PermissionService
 
-    # Detect an active role-impersonation session from the JWT. We could
-    # read the contextvar, but the middleware already set it from the same
-    # token we'd decode here — the explicit decode keeps this endpoint
-    # self-contained and easy to test.
-    impersonated_role_key: str | None = None
-    raw_auth = request.headers.get("Authorization", "")
-    raw_token = (
-        raw_auth[7:] if raw_auth.startswith("Bearer ") else request.cookies.get("access_token", "")
-    )
-    if raw_token:
-        from app.core.security import decode_access_token
-
-        payload = decode_access_token(raw_token)
-        if payload:
-            impersonated_role_key = payload.get("impersonated_role")
+    # Detect an active role-impersonation session from the JWT, as decoded
+    # once for this request by RequestContextMiddleware.
+    impersonated_role_key = request_principal(request).impersonated_role
 
     # Effective role drives label / color / permissions so the entire
     # frontend behaves as that role after the impersonator hits "View as".
@@ -314,14 +313,7 @@ async def stop_impersonating(
     JWT without the claim so all subsequent checks revert to the user's
     real role.
     """
-    from app.core.security import decode_access_token
-
-    raw_auth = request.headers.get("Authorization", "")
-    raw_token = (
-        raw_auth[7:] if raw_auth.startswith("Bearer ") else request.cookies.get("access_token", "")
-    )
-    payload = decode_access_token(raw_token) if raw_token else None
-    if not payload or not payload.get("impersonated_role"):
+    if not request_principal(request).impersonated_role:
         raise HTTPException(400, "No active impersonation session")
     token = create_access_token(user.id, user.role)
     _set_auth_cookie(response, token, secure=_is_secure_request(request))
@@ -576,7 +568,7 @@ async def set_password(
     if not user:
         raise HTTPException(404, "Invalid or expired setup token")
 
-    user.password_hash = hash_password(body.password)
+    user.password_hash = await hash_password_async(body.password)
     user.password_setup_token = None
     if user.auth_provider != "sso":
         user.auth_provider = "local"
@@ -842,7 +834,7 @@ async def reset_password(
     if user.password_reset_expires_at < datetime.now(timezone.utc):
         raise HTTPException(404, "Invalid or expired reset token")
 
-    user.password_hash = hash_password(body.password)
+    user.password_hash = await hash_password_async(body.password)
     user.password_reset_token = None
     user.password_reset_expires_at = None
     # A successful reset clears any account lockout — the user proved
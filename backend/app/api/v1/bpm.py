@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from sqlalchemy import delete, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -14,12 +14,15 @@ from app.database import get_db
 from app.models.card import Card
 from app.models.process_diagram import ProcessDiagram
 from app.models.process_element import ProcessElement, ProcessElementOrganization
+from app.models.process_flow_version import ProcessFlowVersion
 from app.models.user import User
 from app.schemas.bpm import DiagramSave, ElementUpdate
-from app.services.bpmn_parser import parse_bpmn_xml
+from app.services.bpmn_parser import bpmn_digest, extract_bpmn_elements
+from app.services.diagram_versions import diagram_xml, version_storage
 from app.services.element_relation_sync import sync_element_relations
 from app.services.event_bus import event_bus
 from app.services.permission_service import PermissionService
+from app.services.process_elements import upsert_extracted_elements
 
 router = APIRouter(prefix="/bpm", tags=["bpm"])
 
@@ -82,6 +85,29 @@ async def _get_process_or_404(db: AsyncSession, process_id: uuid.UUID) -> Card:
 # ── Diagram endpoints ────────────────────────────────────────────────────
 
 
+async def _diagram_out(db: AsyncSession, diagram: ProcessDiagram) -> dict:
+    return {
+        "id": str(diagram.id),
+        "process_id": str(diagram.process_id),
+        "bpmn_xml": await diagram_xml(db, diagram),
+        "svg_thumbnail": diagram.svg_thumbnail,
+        "version": diagram.version,
+        "created_by": str(diagram.created_by) if diagram.created_by else None,
+        "created_at": diagram.created_at.isoformat() if diagram.created_at else None,
+    }
+
+
+async def _diagram_version(
+    db: AsyncSession, pid: uuid.UUID, version: int | None
+) -> ProcessDiagram | None:
+    """The given version of a process's diagram, or its latest when None."""
+    q = select(ProcessDiagram).where(ProcessDiagram.process_id == pid)
+    if version is not None:
+        q = q.where(ProcessDiagram.version == version)
+    result = await db.execute(q.order_by(ProcessDiagram.version.desc()).limit(1))
+    return result.scalar_one_or_none()
+
+
 @router.get("/processes/{process_id}/diagram")
 async def get_diagram(
     process_id: str,
@@ -100,15 +126,24 @@ async def get_diagram(
     diagram = result.scalar_one_or_none()
     if not diagram:
         return None
-    return {
-        "id": str(diagram.id),
-        "process_id": str(diagram.process_id),
-        "bpmn_xml": diagram.bpmn_xml,
-        "svg_thumbnail": diagram.svg_thumbnail,
-        "version": diagram.version,
-        "created_by": str(diagram.created_by) if diagram.created_by else None,
-        "created_at": diagram.created_at.isoformat() if diagram.created_at else None,
-    }
+    return await _diagram_out(db, diagram)
+
+
+async def _elements_current(
+    db: AsyncSession, pid: uuid.UUID, current: ProcessDiagram | None, digest: str
+) -> bool:
+    """Whether the process elements were extracted from XML with ``digest``."""
+    if current is None or current.bpmn_sha256 != digest:
+        return False
+    republished = await db.execute(
+        select(
+            exists().where(
+                ProcessFlowVersion.process_id == pid,
+                ProcessFlowVersion.approved_at > current.created_at,
+            )
+        )
+    )
+    return not republished.scalar()
 
 
 @router.put("/processes/{process_id}/diagram")
@@ -135,52 +170,28 @@ async def save_diagram(
     current = existing.scalar_one_or_none()
     new_version = (current.version + 1) if current else 1
 
+    digest = bpmn_digest(body.bpmn_xml)
     diagram = ProcessDiagram(
         process_id=pid,
-        bpmn_xml=body.bpmn_xml,
         svg_thumbnail=body.svg_thumbnail,
         version=new_version,
         created_by=current_user.id,
+        bpmn_sha256=digest,
+        **await version_storage(db, current, body.bpmn_xml, new_version),
     )
     db.add(diagram)
 
-    # Parse XML and extract elements
-    extracted = parse_bpmn_xml(body.bpmn_xml)
-
-    # Load existing elements to preserve EA links
-    existing_elements = await db.execute(
-        select(ProcessElement).where(ProcessElement.process_id == pid)
-    )
-    old_by_bpmn_id = {e.bpmn_element_id: e for e in existing_elements.scalars().all()}
-
-    # Upsert: keep EA links for elements that still exist, remove deleted ones
-    new_bpmn_ids = {e.bpmn_element_id for e in extracted}
-    for old_id, old_elem in old_by_bpmn_id.items():
-        if old_id not in new_bpmn_ids:
-            await db.delete(old_elem)
-
-    for ext in extracted:
-        if ext.bpmn_element_id in old_by_bpmn_id:
-            old = old_by_bpmn_id[ext.bpmn_element_id]
-            old.element_type = ext.element_type
-            old.name = ext.name
-            old.documentation = ext.documentation
-            old.lane_name = ext.lane_name
-            old.is_automated = ext.is_automated
-            old.sequence_order = ext.sequence_order
-        else:
-            db.add(
-                ProcessElement(
-                    process_id=pid,
-                    bpmn_element_id=ext.bpmn_element_id,
-                    element_type=ext.element_type,
-                    name=ext.name,
-                    documentation=ext.documentation,
-                    lane_name=ext.lane_name,
-                    is_automated=ext.is_automated,
-                    sequence_order=ext.sequence_order,
-                )
-            )
+    # Re-extract elements unless they already came from this exact XML: the
+    # previous version had the same digest and no published flow revision has
+    # rewritten the elements since.
+    if await _elements_current(db, pid, current, digest):
+        element_count = (
+            await db.execute(select(func.count()).where(ProcessElement.process_id == pid))
+        ).scalar_one()
+    else:
+        extracted = await extract_bpmn_elements(body.bpmn_xml)
+        await upsert_extracted_elements(db, pid, extracted)
+        element_count = len(extracted)
 
     # Publish event — skipped in dry-run mode since nothing is persisted.
     if not body.dry_run:
@@ -189,7 +200,7 @@ async def save_diagram(
             {
                 "process_name": process.name,
                 "version": new_version,
-                "element_count": len(extracted),
+                "element_count": element_count,
             },
             db=db,
             card_id=pid,
@@ -202,7 +213,7 @@ async def save_diagram(
     # from version/element_count.
     diagram_id = str(diagram.id)
     bpmn_xml_bytes = len(body.bpmn_xml)
-    flow_nodes_extracted = len(extracted)
+    flow_nodes_extracted = element_count
     if body.dry_run:
         assert dry_run_savepoint is not None
         await dry_run_savepoint.rollback()
@@ -243,10 +254,9 @@ async def delete_diagram(
     for elem in elements.scalars().all():
         await db.delete(elem)
 
-    # Delete all diagram versions
-    diagrams = await db.execute(select(ProcessDiagram).where(ProcessDiagram.process_id == pid))
-    for diag in diagrams.scalars().all():
-        await db.delete(diag)
+    # Delete all diagram versions in one statement: deltas reference their
+    # snapshot, so deleting row by row would depend on the order.
+    await db.execute(delete(ProcessDiagram).where(ProcessDiagram.process_id == pid))
 
     await event_bus.publish(
         "process_diagram.deleted",
@@ -269,8 +279,15 @@ async def list_diagram_versions(
     await PermissionService.require_permission(db, user, "bpm.view")
     pid = uuid.UUID(process_id)
     await _get_process_or_404(db, pid)
+    # Metadata only — the XML of every version is not needed for the list.
     result = await db.execute(
-        select(ProcessDiagram)
+        select(
+            ProcessDiagram.id,
+            ProcessDiagram.version,
+            ProcessDiagram.created_by,
+            ProcessDiagram.created_at,
+            ProcessDiagram.bpmn_xml.is_(None).label("is_delta"),
+        )
         .where(ProcessDiagram.process_id == pid)
         .order_by(ProcessDiagram.version.desc())
     )
@@ -280,33 +297,45 @@ async def list_diagram_versions(
             "version": d.version,
             "created_by": str(d.created_by) if d.created_by else None,
             "created_at": d.created_at.isoformat() if d.created_at else None,
+            "stored_as": "delta" if d.is_delta else "snapshot",
         }
-        for d in result.scalars().all()
+        for d in result.all()
     ]
 
 
+@router.get("/processes/{process_id}/diagram/versions/{version}")
+async def get_diagram_version(
+    process_id: str,
+    version: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    await PermissionService.require_permission(db, user, "bpm.view")
+    pid = uuid.UUID(process_id)
+    await _get_process_or_404(db, pid)
+    diagram = await _diagram_version(db, pid, version)
+    if not diagram:
+        raise HTTPException(404, "Diagram version not found")
+    return await _diagram_out(db, diagram)
+
+
 @router.get("/processes/{process_id}/diagram/export/bpmn")
 async def export_bpmn(
     process_id: str,
+    version: int | None = Query(None, description="Diagram version; latest when omitted"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     await PermissionService.require_permission(db, user, "bpm.view")
     pid = uuid.UUID(process_id)
     await _get_process_or_404(db, pid)
-    result = await db.execute(
-        select(ProcessDiagram)
-        .where(ProcessDiagram.process_id == pid)
-        .order_by(ProcessDiagram.version.desc())
-        .limit(1)
-    )
-    diagram = result.scalar_one_or_none()
+    diagram = await _diagram_version(db, pid, version)
     if not diagram:
         raise HTTPException(404, "No diagram found")
     from fastapi.responses import Response
 
     return Response(
-        content=diagram.bpmn_xml,
+        content=await diagram_xml(db, diagram),
         media_type="application/xml",
         headers={"Content-Disposition": f'attachment; filename="process-{process_id}.bpmn"'},
     )
@@ -353,7 +382,7 @@ async def import_bpmn(
     bpmn_xml = content.decode("utf-8")
     # Validate it's parseable BPMN
     try:
-        parse_bpmn_xml(bpmn_xml)
+        await extract_bpmn_elements(bpmn_xml)
     except Exception:
         raise HTTPException(400, "Invalid BPMN 2.0 XML file")
     # Save via the same logic as PUT
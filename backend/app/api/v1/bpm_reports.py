@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
@@ -15,7 +15,9 @@ from app.models.process_element import ProcessElement, ProcessElementOrganizatio
 from app.models.process_flow_version import ProcessFlowVersion
 from app.models.relation import Relation
 from app.models.user import User
+from app.services.attribute_index import attribute_text
 from app.services.permission_service import PermissionService
+from app.services.report_queries import active_card_ids, id_in, touching
 
 router = APIRouter(prefix="/reports/bpm", tags=["reports"])
 
@@ -27,47 +29,41 @@ async def bpm_dashboard(
 ):
     """BPM KPIs: counts, maturity distribution, automation levels, risk."""
     await PermissionService.require_permission(db, user, "reports.bpm_dashboard")
-    # All active BusinessProcess cards
-    result = await db.execute(
-        select(Card).where(
-            Card.type == "BusinessProcess",
-            Card.status == "ACTIVE",
-        )
+    active = (Card.type == "BusinessProcess", Card.status == "ACTIVE")
+    total = (await db.execute(select(func.count(Card.id)).where(*active))).scalar() or 0
+
+    async def _distribution(field_key: str) -> dict[str, int]:
+        # Grouped in SQL on the attribute expression, so a field declared
+        # ``indexed`` on BusinessProcess is counted from its index.
+        value = attribute_text(field_key)
+        rows = await db.execute(select(value, func.count(Card.id)).where(*active).group_by(value))
+        counts: dict[str, int] = {}
+        for key, count in rows.all():
+            key = "unknown" if key is None else key
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    by_process_type = await _distribution("processType")
+    by_maturity = await _distribution("maturity")
+    by_automation = await _distribution("automationLevel")
+    by_risk = await _distribution("riskLevel")
+
+    risk = attribute_text("riskLevel")
+    top_result = await db.execute(
+        select(Card.id, Card.name, risk, attribute_text("maturity"))
+        .where(*active, risk.in_(("high", "critical")))
+        .order_by(case((risk == "critical", 0), else_=1), Card.name)
+        .limit(10)
     )
-    processes = result.scalars().all()
-    total = len(processes)
-
-    by_process_type: dict[str, int] = {}
-    by_maturity: dict[str, int] = {}
-    by_automation: dict[str, int] = {}
-    by_risk: dict[str, int] = {}
-    top_risk: list[dict] = []
-
-    for p in processes:
-        attrs = p.attributes or {}
-        pt = attrs.get("processType", "unknown")
-        by_process_type[pt] = by_process_type.get(pt, 0) + 1
-        mat = attrs.get("maturity", "unknown")
-        by_maturity[mat] = by_maturity.get(mat, 0) + 1
-        auto = attrs.get("automationLevel", "unknown")
-        by_automation[auto] = by_automation.get(auto, 0) + 1
-        risk = attrs.get("riskLevel", "unknown")
-        by_risk[risk] = by_risk.get(risk, 0) + 1
-        if risk in ("high", "critical"):
-            top_risk.append(
-                {
-                    "id": str(p.id),
-                    "name": p.name,
-                    "risk": risk,
-                    "maturity": mat,
-                }
-            )
-
-    def _risk_order(x: dict) -> int:
-        order = {"critical": 0, "high": 1}
-        return order.get(x["risk"], 99)
-
-    top_risk.sort(key=_risk_order)
+    top_risk = [
+        {
+            "id": str(pid),
+            "name": name,
+            "risk": level,
+            "maturity": "unknown" if maturity is None else maturity,
+        }
+        for pid, name, level, maturity in top_result.all()
+    ]
 
     # Diagram coverage (count processes with a published flow version)
     diag_result = await db.execute(
@@ -83,7 +79,7 @@ async def bpm_dashboard(
         "by_maturity": by_maturity,
         "by_automation": by_automation,
         "by_risk": by_risk,
-        "top_risk_processes": top_risk[:10],
+        "top_risk_processes": top_risk,
         "diagram_coverage": {
             "with_diagram": processes_with_diagrams,
             "total": total,
@@ -111,7 +107,7 @@ async def capability_process_matrix(
     if not all_ids:
         return {"rows": [], "columns": [], "cells": []}
 
-    card_result = await db.execute(select(Card).where(Card.id.in_(all_ids)))
+    card_result = await db.execute(select(Card).where(id_in(Card.id, all_ids)))
     card_map = {card.id: card for card in card_result.scalars().all()}
 
     rows = [{"id": str(pid), "name": card_map[pid].name} for pid in process_ids if pid in card_map]
@@ -179,7 +175,7 @@ async def process_application_matrix(
     if not all_ids:
         return {"rows": [], "columns": [], "cells": []}
 
-    card_result = await db.execute(select(Card).where(Card.id.in_(all_ids)))
+    card_result = await db.execute(select(Card).where(id_in(Card.id, all_ids)))
     card_map = {card.id: card for card in card_result.scalars().all()}
 
     rows = [{"id": str(pid), "name": card_map[pid].name} for pid in process_ids if pid in card_map]
@@ -214,7 +210,7 @@ async def process_dependencies(
     if not node_ids:
         return {"nodes": [], "edges": []}
 
-    card_result = await db.execute(select(Card).where(Card.id.in_(node_ids)))
+    card_result = await db.execute(select(Card).where(id_in(Card.id, node_ids)))
     nodes = [
         {
             "id": str(card.id),
@@ -331,7 +327,7 @@ async def process_organization_matrix(
         return {"rows": [], "columns": [], "cells": []}
 
     card_result = await db.execute(
-        select(Card).where(Card.id.in_(all_ids), Card.status == "ACTIVE")
+        select(Card).where(id_in(Card.id, all_ids), Card.status == "ACTIVE")
     )
     card_map = {card.id: card for card in card_result.scalars().all()}
 
@@ -393,7 +389,7 @@ async def element_application_map(
     if not all_ids:
         return []
 
-    card_result = await db.execute(select(Card).where(Card.id.in_(all_ids)))
+    card_result = await db.execute(select(Card).where(id_in(Card.id, all_ids)))
     card_map = {str(card.id): card.name for card in card_result.scalars().all()}
 
     result_list = []
@@ -457,7 +453,6 @@ async def process_map(
         .order_by(Card.name)
     )
     orgs = org_result.scalars().all()
-    org_map = {o.id: o for o in orgs}
 
     # All BusinessContexts (for filtering)
     ctx_result = await db.execute(
@@ -469,13 +464,11 @@ async def process_map(
         .order_by(Card.name)
     )
     contexts = ctx_result.scalars().all()
-    ctx_map = {c.id: c for c in contexts}
 
-    # Fetch all relations touching process ids, org ids, or context ids
-    all_entity_ids = proc_ids + list(org_map.keys()) + list(ctx_map.keys())
+    # Fetch all relations touching processes, organizations, or contexts
     rels_result = await db.execute(
         select(Relation).where(
-            (Relation.source_id.in_(all_entity_ids)) | (Relation.target_id.in_(all_entity_ids))
+            touching(active_card_ids("BusinessProcess", "Organization", "BusinessContext"))
         )
     )
     rels = rels_result.scalars().all()
@@ -685,7 +678,7 @@ async def value_stream_matrix(
                     "relProcessToApp",
                 ]
             ),
-            (Relation.source_id.in_(proc_ids)) | (Relation.target_id.in_(proc_ids)),
+            touching(active_card_ids("BusinessProcess")),
         )
     )
     rels = rels_result.scalars().all()
@@ -7,11 +7,12 @@ from datetime import datetime
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy import func, or_, select
+from sqlalchemy import case, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_current_user
+from app.api.v1.events import older_than
 from app.database import get_db
 from app.models.card import Card
 from app.models.card_type import CardType
@@ -69,8 +70,14 @@ from app.schemas.card import (
     TagRef,
 )
 from app.services import card_lifecycle, card_reference, card_write_service, notification_service
+from app.services.attribute_index import (
+    attribute_filter_clause,
+    attribute_sort_expression,
+    schema_field_types,
+)
 from app.services.calculation_engine import run_calculations_for_card
 from app.services.card_completeness import missing_mandatory
+from app.services.card_counts import CardCountCache, CountStrategy, count_rows
 from app.services.card_flags import orphaned_condition, stale_condition
 from app.services.card_resolver import CardResolver
 from app.services.card_uniqueness import check_sibling_name_unique
@@ -93,9 +100,15 @@ from app.services.card_write_service import (
 from app.services.cost_field_filter import cost_field_keys_from_card_schema
 from app.services.data_quality import calc_data_quality
 from app.services.event_bus import event_bus
-from app.services.lifecycle import lifecycle_rank
+from app.services.lifecycle import lifecycle_rank_sql
 from app.services.permission_service import PermissionService
-from app.services.search_rank import search_filter, search_rank
+from app.services.relation_rollup import (
+    RelationSummaryCache,
+    descendant_peer_counts,
+    descendant_peers,
+)
+from app.services.report_queries import id_in
+from app.services.search_rank import search_match, search_rank
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
@@ -201,6 +214,36 @@ _ALLOWED_SORT_COLUMNS = {
     "subtype",
 }
 
+#: ``sort_by`` prefix selecting an attribute of the requested type.
+_ATTRIBUTE_SORT_PREFIX = "attributes."
+
+
+def _parse_attr_filters(
+    raw: list[str], field_types: dict[str, str]
+) -> dict[str, tuple[str, set[str]]]:
+    """Parse ``attr=<fieldKey>:<value>`` filters into ``{field: (type, {values})}``.
+
+    Values sharing a field OR together; different fields AND together. The
+    field must be declared on the requested type(s) — a typo that quietly
+    matches nothing is worse than a 400.
+    """
+    parsed: dict[str, tuple[str, set[str]]] = {}
+    for item in raw:
+        field_key, sep, value = item.partition(":")
+        if not sep or not field_key:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid attribute filter {item!r}; expected field:value",
+            )
+        field_type = field_types.get(field_key)
+        if field_type is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Attribute filter {item!r} names a field not declared on this type",
+            )
+        parsed.setdefault(field_key, (field_type, set()))[1].add(value)
+    return parsed
+
 
 @router.get("", response_model=CardListResponse)
 async def list_cards(
@@ -241,6 +284,15 @@ async def list_cards(
             "Keep only cards not updated in the last 90 days (`card_flags.STALE_AFTER_DAYS`)."
         ),
     ),
+    attr: list[str] = Query(
+        default_factory=list,
+        description=(
+            "Attribute filter, `fieldKey:value`. Repeatable: values of one field "
+            "OR together, different fields AND together; `fieldKey:__empty__` "
+            "matches cards with no value. Requires `type`, whose metamodel must "
+            "declare the field."
+        ),
+    ),
     page: int = Query(1, ge=1),
     page_size: int = Query(10000, ge=1, le=10000),
     sort_by: str | None = Query(
@@ -249,10 +301,22 @@ async def list_cards(
             "Sort column. Defaults to `name` ascending. When omitted together "
             "with `sort_dir` and a `search` term is given, results are ordered "
             "by search relevance first (exact, then starts-with, then "
-            "starts-a-word, then contains) and alphabetically within each tier."
+            "starts-a-word, then contains) and alphabetically within each tier. "
+            "`attributes.<fieldKey>` sorts by a field of the requested `type` "
+            "(numerically for number and cost fields, cards without a value last)."
         ),
     ),
     sort_dir: str | None = Query(None, description="`asc` (default) or `desc`."),
+    count: CountStrategy = Query(
+        "exact",
+        description=(
+            "How `total` is produced. `exact` counts every matching card; "
+            "`cached` reuses the exact count of the same filters until a card, "
+            "relation or stakeholder changes; `estimated` returns the planner's "
+            "estimate (`total_exact` is false) once it exceeds "
+            "`CARD_COUNT_EXACT_BELOW`, and counts exactly below that."
+        ),
+    ),
 ):
     await PermissionService.require_permission(db, user, "inventory.view")
     q = select(Card)
@@ -279,12 +343,12 @@ async def list_cards(
         q = q.where(Card.id.in_(id_list))
         count_q = count_q.where(Card.id.in_(id_list))
 
-    if type:
-        types_list = [t.strip() for t in type.split(",") if t.strip()]
+    types_list = [t.strip() for t in type.split(",") if t.strip()] if type else []
+    if types_list:
         if len(types_list) == 1:
             q = q.where(Card.type == types_list[0])
             count_q = count_q.where(Card.type == types_list[0])
-        elif types_list:
+        else:
             q = q.where(Card.type.in_(types_list))
             count_q = count_q.where(Card.type.in_(types_list))
     if status:
@@ -302,7 +366,14 @@ async def list_cards(
         q = q.where(Card.status == "ACTIVE")
         count_q = count_q.where(Card.status == "ACTIVE")
     if search:
-        match = or_(search_filter(Card.name, search), search_filter(Card.description, search))
+        match = search_match(
+            search,
+            Card.name,
+            Card.alias,
+            Card.reference,
+            Card.description,
+            vector=Card.search_vector,
+        )
         q = q.where(match)
         count_q = count_q.where(match)
     if parent_id:
@@ -323,10 +394,52 @@ async def list_cards(
         q = q.where(stale_condition())
         count_q = count_q.where(stale_condition())
 
+    # Attribute filters and sorts resolve their fields through the requested
+    # types' metamodel, so nothing here knows any attribute by name. Both run
+    # in SQL: filters as JSONB containment (GIN-indexed), sorts on the
+    # expression a field declared ``indexed`` has a B-tree for.
+    attr_sort_key = (
+        sort_by[len(_ATTRIBUTE_SORT_PREFIX) :]
+        if sort_by and sort_by.startswith(_ATTRIBUTE_SORT_PREFIX)
+        else None
+    )
+    field_types: dict[str, str] = {}
+    cost_keys: frozenset[str] = frozenset()
+    if types_list and (attr or attr_sort_key):
+        schemas = (
+            await db.execute(select(CardType.fields_schema).where(CardType.key.in_(types_list)))
+        ).scalars()
+        for schema in schemas:
+            for field_key, field_type in schema_field_types(schema).items():
+                field_types.setdefault(field_key, field_type)
+            cost_keys |= cost_field_keys_from_card_schema(schema)
+    if attr and not types_list:
+        raise HTTPException(400, "Attribute filters require a card type")
+    attr_filters = _parse_attr_filters(attr, field_types)
+    if attr_sort_key not in field_types:
+        attr_sort_key = None
+    # Filtering or ordering by a cost field would reveal it to a caller who
+    # may not read it — same rule as the portfolio report's axes.
+    if cost_keys & (set(attr_filters) | {attr_sort_key}):
+        await PermissionService.require_permission(db, user, "costs.view")
+    for field_key, (field_type, values) in attr_filters.items():
+        clause = or_(
+            *(
+                attribute_filter_clause(Card.attributes, field_key, field_type, v)
+                for v in sorted(values)
+            )
+        )
+        q = q.where(clause)
+        count_q = count_q.where(clause)
+
     # Sorting — H9: whitelist sort columns
-    effective_sort = sort_by if sort_by in _ALLOWED_SORT_COLUMNS else "name"
-    sort_col = getattr(Card, effective_sort, Card.name)
-    order = [sort_col.desc() if sort_dir == "desc" else sort_col.asc()]
+    if attr_sort_key:
+        sort_col = attribute_sort_expression(attr_sort_key, field_types[attr_sort_key])
+        order = [sort_col.desc().nulls_last() if sort_dir == "desc" else sort_col.asc()]
+    else:
+        effective_sort = sort_by if sort_by in _ALLOWED_SORT_COLUMNS else "name"
+        sort_col = getattr(Card, effective_sort, Card.name)
+        order = [sort_col.desc() if sort_dir == "desc" else sort_col.asc()]
     # Relevance first, but only when the caller expressed no sort preference of
     # their own — an explicit `sort_by`/`sort_dir` always wins (#918).
     if search and sort_by is None and sort_dir is None:
@@ -337,8 +450,7 @@ async def list_cards(
     q = q.order_by(*order)
     q = q.offset((page - 1) * page_size).limit(page_size)
 
-    total_result = await db.execute(count_q)
-    total = total_result.scalar() or 0
+    total, total_exact = await count_rows(db, count_q, strategy=count)
 
     q = q.options(
         selectinload(Card.tags).selectinload(Tag.group),
@@ -351,7 +463,9 @@ async def list_cards(
         _card_to_response(card, strip_cost_keys=redact.get(card.id, frozenset())) for card in cards
     ]
 
-    return CardListResponse(items=items, total=total, page=page, page_size=page_size)
+    return CardListResponse(
+        items=items, total=total, total_exact=total_exact, page=page, page_size=page_size
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -944,6 +1058,9 @@ async def resolve_card_refs(
     return CardRefResolveResponse(results=results)
 
 
+_COUNTS_BY_TYPE_KEY = "cards.counts.by_type"
+
+
 @router.get("/counts", response_model=CardCountsResponse)
 async def cards_counts(
     db: AsyncSession = Depends(get_db),
@@ -951,19 +1068,25 @@ async def cards_counts(
 ):
     """Per-card-type counts of ACTIVE cards. Powers the type chips with
     counts in the diagram editor's Insert Cards dialog (LeanIX-style).
-    Hidden types are excluded so the dialog never offers them.
+    Hidden types are excluded so the dialog never offers them. Served from
+    ``CardCountCache``, which card writes clear.
 
     Declared above /{card_id} so the literal `counts` segment isn't shadowed
     by the UUID-typed catch-all and parsed as a (broken) UUID.
     """
     await PermissionService.require_permission(db, user, "inventory.view")
-    hidden_types_sq = select(CardType.key).where(CardType.is_hidden == True)  # noqa: E712
-    rows = await db.execute(
-        select(Card.type, func.count(Card.id))
-        .where(Card.status == "ACTIVE", Card.type.not_in(hidden_types_sq))
-        .group_by(Card.type)
-    )
-    by_type = [CardTypeCount(type=tp, count=int(cnt)) for tp, cnt in rows.all()]
+    counts = CardCountCache.get(_COUNTS_BY_TYPE_KEY)
+    if counts is None:
+        generation = CardCountCache.generation()
+        hidden_types_sq = select(CardType.key).where(CardType.is_hidden == True)  # noqa: E712
+        rows = await db.execute(
+            select(Card.type, func.count(Card.id))
+            .where(Card.status == "ACTIVE", Card.type.not_in(hidden_types_sq))
+            .group_by(Card.type)
+        )
+        counts = [(tp, int(cnt)) for tp, cnt in rows.all()]
+        CardCountCache.put(_COUNTS_BY_TYPE_KEY, counts, generation)
+    by_type = [CardTypeCount(type=tp, count=cnt) for tp, cnt in counts]
     total = sum(entry.count for entry in by_type)
     return CardCountsResponse(by_type=by_type, total=total)
 
@@ -1052,6 +1175,10 @@ async def relation_summary(
     await PermissionService.require_permission(
         db, user, "inventory.view", card_id=uid, card_permission="card.view"
     )
+    cached = RelationSummaryCache.get("relations", uid)
+    if cached is not None:
+        return await _with_current_parent_name(db, cached)
+    generation = RelationSummaryCache.generation()
     card = await db.get(Card, uid)
     if not card:
         raise HTTPException(404, "Card not found")
@@ -1143,7 +1270,25 @@ async def relation_summary(
         parent_name=parent_name,
         parent_type=parent_type,
     )
-    return CardRelationSummaryResponse(by_type=entries, hierarchy=hierarchy)
+    response = CardRelationSummaryResponse(by_type=entries, hierarchy=hierarchy)
+    RelationSummaryCache.put("relations", uid, response, generation)
+    return response
+
+
+async def _with_current_parent_name(
+    db: AsyncSession, response: CardRelationSummaryResponse
+) -> CardRelationSummaryResponse:
+    """A cached summary with its parent's name as it is now.
+
+    Renaming a card leaves the cache alone, so the name is read per request;
+    the cached entry itself is not modified.
+    """
+    parent_id = response.hierarchy.parent_id
+    if parent_id is None:
+        return response
+    name = await db.scalar(select(Card.name).where(Card.id == uuid.UUID(parent_id)))
+    hierarchy = response.hierarchy.model_copy(update={"parent_name": name})
+    return response.model_copy(update={"hierarchy": hierarchy})
 
 
 # ── Descendant relation roll-up (discussion #863) ─────────────────────
@@ -1155,107 +1300,6 @@ async def relation_summary(
 # not leak into the inventory grid, the matrix report or exports, where they
 # would double counts.
 
-# Belt-and-braces cap on the relation fan-out. `collect_descendants` already
-# caps the subtree at 10k nodes; this bounds the edge count on a subtree that
-# is small but densely connected.
-_MAX_DESCENDANT_RELATIONS = 20_000
-
-
-async def _descendant_relation_map(
-    db: AsyncSession,
-    root: Card,
-    *,
-    relation_type: str | None = None,
-) -> dict[str, dict[uuid.UUID, list[Card]]]:
-    """Map ``relation_type_key -> {peer_card_id: [descendants linking it]}``.
-
-    Rules (all three agreed on discussion #863):
-
-    - **Full descendant subtree**, not just direct children — an L1 capability
-      rolling up only L2 would miss the applications, which sit at L3+.
-    - **Peers already directly linked to the root are excluded**, per relation
-      type, so the "+N" chip only ever advertises rows the user cannot already
-      see in the list above it.
-    - **Peers inside the subtree are excluded** — a relation between two
-      descendants is internal to the tree, not an additional related card.
-
-    Archived cards and cards of hidden types are filtered on both ends, so the
-    roll-up matches what ``GET /relations`` would show the same user.
-    """
-    try:
-        descendant_ids = await card_lifecycle.collect_descendants(db, root.id)
-    except HTTPException:
-        # subtree_too_large — degrade to "no roll-up" rather than breaking the
-        # whole Relations section on a pathological tree.
-        return {}
-    if not descendant_ids:
-        return {}
-
-    # ACTIVE descendants only, mirroring the hierarchy section + relation-summary.
-    desc_rows = await db.execute(
-        select(Card).where(Card.id.in_(descendant_ids), Card.status == "ACTIVE")
-    )
-    descendants = {c.id: c for c in desc_rows.scalars().all()}
-    if not descendants:
-        return {}
-
-    # Same hidden-type / archived exclusion as relation_summary, so a peer the
-    # user could not open never shows up in the count.
-    hidden_types_sq = select(CardType.key).where(CardType.is_hidden == True)  # noqa: E712
-    excluded_card_sq = select(Card.id).where(
-        or_(Card.type.in_(hidden_types_sq), Card.status == "ARCHIVED")
-    )
-
-    desc_id_list = list(descendants.keys())
-    rel_q = select(Relation).where(
-        or_(Relation.source_id.in_(desc_id_list), Relation.target_id.in_(desc_id_list)),
-        Relation.source_id.not_in(excluded_card_sq),
-        Relation.target_id.not_in(excluded_card_sq),
-    )
-    if relation_type:
-        rel_q = rel_q.where(Relation.type == relation_type)
-    rel_rows = await db.execute(rel_q.limit(_MAX_DESCENDANT_RELATIONS))
-    relations = list(rel_rows.scalars().all())
-    if not relations:
-        return {}
-
-    # Edges the root already owns — (relation_type, peer_id) pairs to suppress.
-    direct_q = select(Relation).where(
-        or_(Relation.source_id == root.id, Relation.target_id == root.id)
-    )
-    if relation_type:
-        direct_q = direct_q.where(Relation.type == relation_type)
-    direct_rows = await db.execute(direct_q)
-    already_linked: set[tuple[str, uuid.UUID]] = set()
-    for r in direct_rows.scalars().all():
-        peer_id = r.target_id if r.source_id == root.id else r.source_id
-        already_linked.add((r.type, peer_id))
-
-    inside_tree = set(descendants.keys()) | {root.id}
-    out: dict[str, dict[uuid.UUID, list[Card]]] = {}
-    for r in relations:
-        # Resolve which end is the descendant and which is the peer. A relation
-        # with both ends inside the subtree is skipped by the `inside_tree`
-        # check below regardless of which end we pick here.
-        if r.source_id in descendants:
-            owner_id, peer_id = r.source_id, r.target_id
-        else:
-            owner_id, peer_id = r.target_id, r.source_id
-        if peer_id in inside_tree:
-            continue
-        if (r.type, peer_id) in already_linked:
-            continue
-        owner = descendants.get(owner_id)
-        if owner is None:
-            continue
-        by_peer = out.setdefault(r.type, {})
-        vias = by_peer.setdefault(peer_id, [])
-        # Dedup provenance: one descendant may link the same peer more than
-        # once if the metamodel ever allows parallel edges.
-        if not any(v.id == owner.id for v in vias):
-            vias.append(owner)
-    return out
-
 
 @router.get("/{card_id}/descendant-relations/summary")
 async def descendant_relation_summary(
@@ -1266,23 +1310,27 @@ async def descendant_relation_summary(
     """Per-relation-type count of cards reachable only through descendants.
 
     Powers the "+N in sub-items" chip on the Relations section. Returns an
-    empty list for leaf cards and for non-hierarchical types.
+    empty list for leaf cards and for non-hierarchical types. See
+    ``app/services/relation_rollup.py`` for the rules.
     """
     uid = uuid.UUID(card_id)
     await PermissionService.require_permission(
         db, user, "inventory.view", card_id=uid, card_permission="card.view"
     )
+    cached = RelationSummaryCache.get("descendants", uid)
+    if cached is not None:
+        return cached
+    generation = RelationSummaryCache.generation()
     card = await db.get(Card, uid)
     if not card:
         raise HTTPException(404, "Card not found")
 
-    by_type = await _descendant_relation_map(db, card)
+    counts = await descendant_peer_counts(db, uid)
     entries = [
-        DescendantRelationSummaryEntry(relation_type_key=rt_key, count=len(peers))
-        for rt_key, peers in by_type.items()
-        if peers
+        DescendantRelationSummaryEntry(relation_type_key=rt_key, count=count)
+        for rt_key, count in counts.items()
     ]
-    entries.sort(key=lambda e: e.relation_type_key)
+    RelationSummaryCache.put("descendants", uid, entries, generation)
     return entries
 
 
@@ -1290,8 +1338,9 @@ async def descendant_relation_summary(
 async def descendant_relations(
     card_id: str,
     relation_type: str = Query(..., description="Relation type key to roll up"),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="Deprecated: page with after_id."),
     page_size: int = Query(50, ge=1, le=200),
+    after_id: uuid.UUID | None = Query(None),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -1299,7 +1348,8 @@ async def descendant_relations(
 
     Each row is a distinct peer card plus the descendants that link it, so a
     card reachable through two sub-capabilities appears once with two `via`
-    entries. Read-only by design — there is no matching write route.
+    entries. Read-only by design — there is no matching write route. Pass the
+    ``id`` of the last row received as ``after_id`` for the next page.
     """
     uid = uuid.UUID(card_id)
     await PermissionService.require_permission(
@@ -1309,42 +1359,45 @@ async def descendant_relations(
     if not card:
         raise HTTPException(404, "Card not found")
 
-    by_type = await _descendant_relation_map(db, card, relation_type=relation_type)
-    peers = by_type.get(relation_type, {})
+    peers = await descendant_peers(db, uid, relation_type)
     if not peers:
         return DescendantRelationsResponse(rows=[], total=0, via_total=0)
 
-    peer_rows = await db.execute(select(Card).where(Card.id.in_(list(peers.keys()))))
-    peer_cards = list(peer_rows.scalars().all())
-
     # Order: subtype (metamodel order) → lifecycle urgency → name. Sorting
     # server-side keeps subtype buckets contiguous across pages — grouping only
     # the current page would split a bucket in half at the page boundary.
+    peer_type_key = await db.scalar(select(Card.type).where(id_in(Card.id, peers)).limit(1))
+    peer_type = await db.scalar(select(CardType).where(CardType.key == peer_type_key).limit(1))
     subtype_order: dict[str, int] = {}
-    if peer_cards:
-        peer_type = await db.scalar(
-            select(CardType).where(CardType.key == peer_cards[0].type).limit(1)
-        )
-        for idx, sub in enumerate(peer_type.subtypes or [] if peer_type else []):
-            if isinstance(sub, dict) and sub.get("key"):
-                subtype_order[sub["key"]] = idx
-
-    def _sort_key(c: Card) -> tuple[int, int, str]:
-        # Unknown / missing subtype sorts last, mirroring the trailing
-        # "No subtype" bucket in the relations list.
-        sub_idx = (
-            subtype_order.get(c.subtype, len(subtype_order)) if c.subtype else len(subtype_order)
-        )
-        return (sub_idx, lifecycle_rank(c.lifecycle), c.name.lower())
-
-    peer_cards.sort(key=_sort_key)
+    for idx, sub in enumerate(peer_type.subtypes or [] if peer_type else []):
+        if isinstance(sub, dict) and sub.get("key"):
+            subtype_order[sub["key"]] = idx
+    # Unknown / missing subtype sorts last, mirroring the trailing
+    # "No subtype" bucket in the relations list.
+    order = [lifecycle_rank_sql(Card.lifecycle), func.lower(Card.name).collate("C"), Card.id]
+    if subtype_order:
+        order.insert(0, case(subtype_order, value=Card.subtype, else_=len(subtype_order)))
+    q = select(Card).where(id_in(Card.id, peers)).order_by(*order).limit(page_size)
+    if after_id is not None:
+        if after_id not in peers:
+            raise HTTPException(400, "after_id is not a row of this roll-up")
+        # Keyset: the sort key of the last row received, recomputed here.
+        anchor = (await db.execute(select(*order).where(Card.id == after_id))).one()
+        q = q.where(tuple_(*order) > tuple_(*anchor))
+    else:
+        q = q.offset((page - 1) * page_size)
+    window = list((await db.execute(q)).scalars().all())
 
-    total = len(peer_cards)
+    total = len(peers)
     # Counted across every peer, not just the current page — the header states
     # how concentrated the roll-up is over the whole result set.
-    via_total = len({d.id for owners in peers.values() for d in owners})
-    start = (page - 1) * page_size
-    window = peer_cards[start : start + page_size]
+    via_total = len({owner_id for owners in peers.values() for owner_id in owners})
+    via_rows = await db.execute(
+        select(Card.id, Card.name, Card.type).where(
+            id_in(Card.id, {owner_id for p in window for owner_id in peers[p.id]})
+        )
+    )
+    vias = {row.id: row for row in via_rows.all()}
 
     rows = [
         DescendantRelationRow(
@@ -1355,7 +1408,9 @@ async def descendant_relations(
             lifecycle=p.lifecycle or {},
             via=[
                 DescendantRelationVia(id=str(d.id), name=d.name, type=d.type)
-                for d in sorted(peers.get(p.id, []), key=lambda d: d.name.lower())
+                for d in sorted(
+                    (vias[owner_id] for owner_id in peers[p.id]), key=lambda d: d.name.lower()
+                )
             ],
         )
         for p in window
@@ -2548,9 +2603,13 @@ async def get_history(
     card_id: str,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="Deprecated: page with before/before_id."),
     page_size: int = Query(50, ge=1, le=200),
+    before: datetime | None = Query(None),
+    before_id: uuid.UUID | None = Query(None),
 ):
+    """The card's events, newest first. Pass the ``created_at`` and ``id`` of
+    the last event received as ``before`` / ``before_id`` for the next page."""
     await PermissionService.require_permission(
         db, user, "inventory.view", card_id=uuid.UUID(card_id), card_permission="card.view"
     )
@@ -2558,10 +2617,13 @@ async def get_history(
         select(Event)
         .where(Event.card_id == uuid.UUID(card_id))
         .options(selectinload(Event.user))
-        .order_by(Event.created_at.desc())
-        .offset((page - 1) * page_size)
+        .order_by(Event.created_at.desc(), Event.id.desc())
         .limit(page_size)
     )
+    if before is not None:
+        q = q.where(older_than(before, before_id))
+    else:
+        q = q.offset((page - 1) * page_size)
     result = await db.execute(q)
     events = result.scalars().all()
     return [
@@ -0,0 +1,55 @@
+"""Runtime diagnostics for administrators.
+
+- ``GET /diagnostics/queries`` — the sampled per-request SQL query report
+  collected by ``app.core.query_profiler``: a per-route summary (average and
+  worst statement counts, how many samples tripped the N+1 detector) plus the
+  most recent sampled requests with their repeated statement shapes.
+- ``DELETE /diagnostics/queries`` — reset the report, e.g. before reproducing
+  a slow page.
+
+Permission: ``admin.settings``. The report lives in process memory, so it is
+per backend process and empty after a restart.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.config import settings
+from app.core import query_profiler
+from app.database import get_db
+from app.models.user import User
+from app.services.permission_service import PermissionService
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/queries")
+async def query_report(
+    n_plus_one_only: bool = Query(False),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    await PermissionService.require_permission(db, user, "admin.settings")
+    recent = query_profiler.recent_reports()
+    if n_plus_one_only:
+        recent = [r for r in recent if r["n_plus_one"]]
+    return {
+        "enabled": settings.QUERY_PROFILER_ENABLED,
+        "sample_rate": settings.QUERY_PROFILER_SAMPLE_RATE,
+        "n_plus_one_threshold": settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD,
+        "routes": query_profiler.route_summary(),
+        "recent": recent[:limit],
+    }
+
+
+@router.delete("/queries", status_code=204)
+async def clear_query_report(
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    await PermissionService.require_permission(db, user, "admin.settings")
+    query_profiler.clear_reports()
@@ -2,6 +2,9 @@
 
 These endpoints allow the frontend to search for products and fetch
 end-of-life / release-cycle data without running into CORS restrictions.
+Release cycles are served from the local copy kept by
+``app/services/eol_cycles.py``; only a product never seen before is fetched
+while the caller waits.
 """
 
 from __future__ import annotations
@@ -14,21 +17,29 @@ import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.api.deps import get_current_user
 from app.database import get_db
 from app.models.card import Card
+from app.models.eol_product_cycles import EolProductCycles
 from app.models.user import User
+from app.services.eol_cycles import (
+    EOL_BASE,
+    PRODUCT_NAME,
+    is_stale,
+    load_fixture,
+    refresh_product_cycles,
+    schedule_refresh,
+)
 from app.services.permission_service import PermissionService
 
 logger = logging.getLogger("turboea.eol")
 
 router = APIRouter(prefix="/eol", tags=["End of Life"])
 
-EOL_BASE = "https://endoflife.date/api"
-
 # ---------------------------------------------------------------------------
 # Response schemas
 # ---------------------------------------------------------------------------
@@ -109,6 +120,10 @@ async def _get_all_products() -> list[str]:
     global _products_cache, _products_cache_time  # noqa: N816
     import time
 
+    fixture = load_fixture()
+    if fixture is not None:
+        return sorted(fixture)
+
     now = time.time()
     if _products_cache is not None and (now - _products_cache_time) < 1800:
         return _products_cache
@@ -249,27 +264,33 @@ async def get_product_cycles(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Return all release cycles for a given product."""
+    """Return all release cycles for a given product.
+
+    Served from the stored copy; a stale one is returned as is and
+    revalidated in the background.
+    """
     await PermissionService.require_permission(db, user, "eol.view")
     # M6: SSRF prevention — only allow alphanumeric, hyphens, and dots
-    if not re.match(r"^[a-zA-Z0-9._-]+$", product):
+    if not PRODUCT_NAME.match(product):
         raise HTTPException(status_code=400, detail="Invalid product name")
-    client = await _get_client()
-    try:
-        resp = await client.get(f"{EOL_BASE}/{product}.json")
-        if resp.status_code == 404:
-            raise HTTPException(status_code=404, detail=f"Product '{product}' not found")
-        resp.raise_for_status()
-    except httpx.HTTPStatusError as exc:
-        if exc.response.status_code == 404:
-            raise HTTPException(status_code=404, detail=f"Product '{product}' not found") from exc
-        logger.warning("endoflife.date API error for product '%s': %s", product, exc)
-        raise HTTPException(status_code=502, detail="endoflife.date API is unavailable") from exc
-    except httpx.HTTPError as exc:
-        logger.warning("endoflife.date API error for product '%s': %s", product, exc)
-        raise HTTPException(status_code=502, detail="endoflife.date API is unavailable") from exc
-
-    return resp.json()
+    row = await db.get(EolProductCycles, product)
+    if row is None:
+        try:
+            counts = await refresh_product_cycles(db, [product], client=await _get_client())
+        except IntegrityError:
+            # A concurrent first request (or the refresh job) stored the
+            # product first: serve its copy.
+            await db.rollback()
+        else:
+            if counts["failed"]:
+                raise HTTPException(status_code=502, detail="endoflife.date API is unavailable")
+        row = await db.get(EolProductCycles, product)
+    elif is_stale(row):
+        await schedule_refresh(db)
+        await db.commit()
+    if row is None or row.cycles is None:
+        raise HTTPException(status_code=404, detail=f"Product '{product}' not found")
+    return row.cycles
 
 
 @router.post("/mass-search", response_model=list[MassEolResult])
@@ -7,7 +7,7 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select, union
+from sqlalchemy import select, tuple_, union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -25,6 +25,20 @@ from app.services.permission_service import PermissionService
 router = APIRouter(prefix="/events", tags=["events"])
 
 
+def older_than(before: datetime, before_id: uuid.UUID | None):
+    """Keyset condition for event readers paging newest first.
+
+    Clients pass the ``created_at`` and ``id`` of the last event they hold;
+    ordered by ``(created_at, id)`` descending, each page is a short index
+    range scan on the primary key (or ``ix_events_card_id_created_at``)
+    however deep the history, where ``OFFSET`` re-reads every skipped row.
+    Without ``before_id``, events sharing that exact timestamp are skipped.
+    """
+    if before_id is None:
+        return Event.created_at < before
+    return tuple_(Event.created_at, Event.id) < tuple_(before, before_id)
+
+
 def _event_visible_to(is_events_admin: bool, message: dict[str, Any], user_id: str) -> bool:
     """Decide whether an event-bus message may be sent to a given subscriber.
 
@@ -114,12 +128,15 @@ async def list_my_card_events(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=50),
+    before: datetime | None = Query(None),
+    before_id: uuid.UUID | None = Query(None),
 ):
     """Recent events on cards the current user is a stakeholder on or has favorited.
 
     Used by the Dashboard → My Workspace tab. The shape mirrors
     ``/reports/dashboard``'s ``recent_events`` so the frontend can reuse
-    the existing ``RecentActivity`` component verbatim.
+    the existing ``RecentActivity`` component verbatim. ``before`` /
+    ``before_id`` page further back (see ``older_than``).
     """
     favorite_cards = select(UserFavorite.card_id).where(UserFavorite.user_id == user.id)
     stakeholder_cards = select(Stakeholder.card_id).where(Stakeholder.user_id == user.id).distinct()
@@ -129,9 +146,11 @@ async def list_my_card_events(
         select(Event)
         .options(selectinload(Event.user))
         .where(Event.card_id.in_(select(relevant_card_ids.c.card_id)))
-        .order_by(Event.created_at.desc())
+        .order_by(Event.created_at.desc(), Event.id.desc())
         .limit(limit)
     )
+    if before is not None:
+        q = q.where(older_than(before, before_id))
     events_list = list((await db.execute(q)).scalars().all())
 
     referenced_card_ids = {e.card_id for e in events_list if e.card_id is not None}
@@ -169,16 +188,27 @@ async def list_events(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
     card_id: str | None = Query(None),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="Deprecated: page with before/before_id."),
     page_size: int = Query(50, ge=1, le=200),
+    before: datetime | None = Query(None),
+    before_id: uuid.UUID | None = Query(None),
 ):
+    """The audit trail, newest first. Page with ``before`` / ``before_id`` set
+    to the last event received (``older_than``); ``page`` still works but
+    reads every skipped row."""
     await PermissionService.require_permission(db, user, "admin.events")
-    q = select(Event).options(selectinload(Event.user)).order_by(Event.created_at.desc())
+    q = (
+        select(Event)
+        .options(selectinload(Event.user))
+        .order_by(Event.created_at.desc(), Event.id.desc())
+    )
     if card_id:
-        import uuid as _uuid
-
-        q = q.where(Event.card_id == _uuid.UUID(card_id))
-    q = q.offset((page - 1) * page_size).limit(page_size)
+        q = q.where(Event.card_id == uuid.UUID(card_id))
+    if before is not None:
+        q = q.where(older_than(before, before_id))
+    else:
+        q = q.offset((page - 1) * page_size)
+    q = q.limit(page_size)
     result = await db.execute(q)
     return [
         {
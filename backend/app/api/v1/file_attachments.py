@@ -1,18 +1,20 @@
 from __future__ import annotations
 
+import re
 import uuid
 from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import etag_matches, get_current_user
 from app.database import get_db
 from app.models.app_settings import AppSettings
 from app.models.file_attachment import FileAttachment
 from app.models.user import User
+from app.services.blob_store import get_blob_store, put_blob
 from app.services.event_bus import event_bus
 from app.services.permission_service import PermissionService
 
@@ -99,19 +101,22 @@ async def upload_file_attachment(
             f"Accepted: PDF, DOCX, XLSX, PPTX, PNG, JPG, SVG, TXT.",
         )
 
-    # Read file content with size limit
-    data = await file.read()
+    # Read file content with size limit (one byte past it is enough to tell)
+    data = await file.read(MAX_FILE_SIZE + 1)
     if len(data) > MAX_FILE_SIZE:
         raise HTTPException(
             400, f"File exceeds maximum size of {MAX_FILE_SIZE // (1024 * 1024)} MB"
         )
 
+    # The blob is written before the row: a failed insert leaves an
+    # unreferenced blob for the GC sweep, never a row without its bytes.
+    content_hash = await put_blob(db, data)
     attachment = FileAttachment(
         card_id=card_uuid,
         name=file.filename or "untitled",
         mime_type=content_type,
         size=len(data),
-        data=data,
+        content_hash=content_hash,
         category=category,
         created_by=user.id,
     )
@@ -146,9 +151,43 @@ async def upload_file_attachment(
     }
 
 
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Resolve a ``Range`` header to ``[start, stop)``, or ``None`` for the whole body.
+
+    Only a single byte range is honoured; multi-range requests and anything
+    malformed get the full content, which RFC 9110 permits. A well-formed
+    range that lies entirely past the end raises 416.
+    """
+    if not header or size == 0:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the final N bytes.
+        suffix = int(last)
+        if suffix == 0:
+            raise HTTPException(416, headers={"Content-Range": f"bytes */{size}"})
+        return max(0, size - suffix), size
+    start = int(first)
+    stop = min(int(last) + 1, size) if last else size
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise HTTPException(416, headers={"Content-Range": f"bytes */{size}"})
+    return start, stop
+
+
 @router.get("/file-attachments/{attachment_id}/download")
 async def download_file_attachment(
     attachment_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -160,6 +199,22 @@ async def download_file_attachment(
     if not attachment:
         raise HTTPException(404, "File attachment not found")
 
+    # The content hash is a strong validator for free: the bytes under it
+    # can never change. ``no-cache`` keeps the browser revalidating (the
+    # permission check must run every time) while a 304 saves the transfer.
+    etag = f'"{attachment.content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    store = get_blob_store()
+    if not await store.exists(attachment.content_hash):
+        raise HTTPException(404, "File content is missing from the blob store")
+
     # RFC 6266 / RFC 5987: HTTP header values must be Latin-1 encodable, so a
     # raw filename with non-Latin-1 characters (Cyrillic, CJK, emoji, ...) would
     # crash the response serializer with UnicodeEncodeError. Emit an ASCII
@@ -167,11 +222,27 @@ async def download_file_attachment(
     ascii_fallback = attachment.name.encode("ascii", "replace").decode("ascii")
     ascii_fallback = ascii_fallback.replace("\\", "_").replace('"', "_")
     encoded_name = quote(attachment.name, safe="")
-    disposition = f"attachment; filename=\"{ascii_fallback}\"; filename*=UTF-8''{encoded_name}"
-    return Response(
-        content=attachment.data,
+    headers["Content-Disposition"] = (
+        f"attachment; filename=\"{ascii_fallback}\"; filename*=UTF-8''{encoded_name}"
+    )
+
+    size = attachment.size
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        byte_range = _parse_range(request.headers.get("range"), size)
+    status_code = 200
+    start, stop = 0, size
+    if byte_range is not None:
+        start, stop = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    headers["Content-Length"] = str(stop - start)
+    return StreamingResponse(
+        store.iter_range(attachment.content_hash, start, stop),
+        status_code=status_code,
         media_type=attachment.mime_type,
-        headers={"Content-Disposition": disposition},
+        headers=headers,
     )
 
 
@@ -0,0 +1,133 @@
+"""Background jobs: submit, follow and cancel long-running work.
+
+Routes:
+
+- ``POST /jobs`` — queue a job of a kind that declares a submit permission
+  (e.g. ``calculations.recalculate``, ``data_quality.rescore``). Returns
+  202 with the queued job; an equal job already queued or running is
+  returned instead for kinds that allow only one.
+- ``GET /jobs`` — the caller's jobs, newest first; with ``admin.events``
+  everyone's. Filters by ``status`` and ``kind``.
+- ``GET /jobs/{id}`` — one job with its progress and, once finished, its
+  result or error. Pollable.
+- ``POST /jobs/{id}/cancel`` — cancel a queued job, or ask a running one
+  to stop at its next progress report.
+
+The queue itself is ``app/services/background_jobs.py``.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.database import get_db
+from app.models.background_job import BackgroundJob
+from app.models.user import User
+from app.schemas.background_job import JobListPage, JobOut, JobSubmit
+from app.services.background_jobs import (
+    FINISHED_STATUSES,
+    enqueue_job,
+    get_job_kind,
+    request_cancel,
+)
+from app.services.permission_service import PermissionService
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+async def _visible_job(db: AsyncSession, user: User, job_id: uuid.UUID) -> BackgroundJob:
+    job = await db.get(BackgroundJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.created_by != user.id:
+        await PermissionService.require_permission(db, user, "admin.events")
+    return job
+
+
+@router.post("", response_model=JobOut, status_code=202)
+async def submit_job(
+    body: JobSubmit,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> JobOut:
+    spec = get_job_kind(body.kind)
+    if spec is None or spec.permission is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {body.kind}")
+    await PermissionService.require_permission(db, user, spec.permission)
+    params = body.params
+    if spec.params_model is not None:
+        try:
+            params = spec.params_model.model_validate(params).model_dump(mode="json")
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False)) from e
+    job = await enqueue_job(db, body.kind, params, user=user)
+    await db.commit()
+    return JobOut.model_validate(job)
+
+
+@router.get("", response_model=JobListPage)
+async def list_jobs(
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+    status: str | None = Query(None),
+    kind: str | None = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+) -> JobListPage:
+    filters = []
+    if not await PermissionService.has_app_permission(db, user, "admin.events"):
+        filters.append(BackgroundJob.created_by == user.id)
+    if status:
+        filters.append(BackgroundJob.status == status)
+    if kind:
+        filters.append(BackgroundJob.kind == kind)
+
+    total = int(
+        (
+            await db.execute(select(func.count()).select_from(BackgroundJob).where(*filters))
+        ).scalar_one()
+    )
+    rows = (
+        await db.execute(
+            select(BackgroundJob)
+            .where(*filters)
+            .order_by(BackgroundJob.created_at.desc(), BackgroundJob.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+    ).scalars()
+    return JobListPage(
+        items=[JobOut.model_validate(j) for j in rows],
+        total=total,
+        page=page,
+        page_size=page_size,
+    )
+
+
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> JobOut:
+    return JobOut.model_validate(await _visible_job(db, user, job_id))
+
+
+@router.post("/{job_id}/cancel", response_model=JobOut)
+async def cancel_job(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> JobOut:
+    job = await _visible_job(db, user, job_id)
+    if job.status in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    await request_cancel(db, job)
+    await db.commit()
+    return JobOut.model_validate(job)
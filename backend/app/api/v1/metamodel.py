@@ -4,13 +4,16 @@ import copy
 import logging
 import re
 import uuid
+from collections.abc import Awaitable, Callable, Hashable
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import delete, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import etag_matches, get_current_user
+from app.config import settings
 from app.database import get_db
 from app.models.card import Card
 from app.models.card_type import CardType
@@ -22,12 +25,21 @@ from app.models.resource_type import ResourceType
 from app.models.stakeholder import Stakeholder
 from app.models.user import User
 from app.services import card_reference
+from app.services.attribute_index import indexed_fields
+from app.services.background_jobs import enqueue_job
+from app.services.data_quality import schedule_type_rescore
 from app.services.extensions.registry import extension_registry
 from app.services.hierarchy import (
     HIERARCHY_LEVEL_KEY,
     backfill_hierarchy_levels_for_type,
     hierarchy_level_field_def,
 )
+from app.services.metamodel_cache import MetamodelCache
+from app.services.metamodel_migration import (
+    plan_attribute_migration,
+    preview_attribute_migration,
+    run_attribute_migration,
+)
 from app.services.permission_service import PermissionService
 from app.services.seed import DEFAULT_TYPE_COLORS
 
@@ -191,6 +203,25 @@ def _serialize_relation_type(r: RelationType) -> dict:
     }
 
 
+async def _cached_listing(
+    request: Request, key: Hashable, build: Callable[[], Awaitable[list[dict]]]
+) -> Response:
+    """Serve a listing from ``MetamodelCache``, honouring ``If-None-Match``.
+
+    ``no-cache`` keeps clients revalidating on every use — a metamodel edit
+    must show up at once — while a matching ETag answers with a bodyless 304.
+    """
+    cached = MetamodelCache.get(key)
+    if cached is None:
+        generation = MetamodelCache.generation()
+        cached = MetamodelCache.put(key, JSONResponse(await build()).body, generation)
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
 # Fields of a built-in attribute *definition* (field or option) that admins may
 # never change. ``hidden`` is intentionally excluded — built-in values are
 # locked-but-hideable.
@@ -315,134 +346,24 @@ def _merge_field_options(base_field: dict, incoming_field: dict, target: dict) -
     return target
 
 
-async def _cleanup_removed_fields_and_options(
-    db: AsyncSession,
-    type_key: str,
-    old_schema: list[dict],
-    new_schema: list[dict],
-) -> None:
-    """Clean up card attribute data when fields or options are removed.
-
-    - Removed fields: strip the key from attributes JSONB on all cards of this type.
-    - Removed options on single_select: set the value to null.
-    - Removed options on multiple_select: filter the value out of the array.
-    """
-    # Build lookup: field_key -> field definition
-    old_fields: dict[str, dict] = {}
-    for section in old_schema:
-        for f in section.get("fields", []):
-            old_fields[f["key"]] = f
-
-    new_fields: dict[str, dict] = {}
-    for section in new_schema:
-        for f in section.get("fields", []):
-            new_fields[f["key"]] = f
-
-    # 1) Removed fields — delete the key from attributes JSONB.
-    #    Extension-contributed fields (stamped ``ext``) are exempt: an
-    #    extension's disable/uninstall path removes them from the schema *while
-    #    preserving the stored values* (see field_contributions.remove_field_
-    #    contributions), and a manual metamodel edit that drops the field must
-    #    honour the same contract rather than hard-deleting the data.
-    removed_field_keys = set(old_fields.keys()) - set(new_fields.keys())
-    for fk in removed_field_keys:
-        if old_fields[fk].get("ext"):
-            logger.info(
-                "Skipping data cleanup for extension-owned field '%s' on type '%s' "
-                "(values preserved for re-enable)",
-                fk,
-                type_key,
-            )
-            continue
-        result = await db.execute(
-            text(
-                "UPDATE cards SET attributes = attributes - :field_key "
-                "WHERE type = :type_key AND attributes ? :field_key"
-            ),
-            {"type_key": type_key, "field_key": fk},
-        )
-        if result.rowcount:
-            logger.info(
-                "Cleaned up removed field '%s' from %d card(s) of type '%s'",
-                fk,
-                result.rowcount,
-                type_key,
-            )
-
-    # 2) Removed options — null out single_select, filter out multiple_select
-    for fk, new_field in new_fields.items():
-        old_field = old_fields.get(fk)
-        if not old_field:
-            continue  # new field, nothing to clean up
-        field_type = old_field.get("type", "text")
-        if field_type not in ("single_select", "multiple_select"):
-            continue
-
-        old_option_keys = {o["key"] for o in old_field.get("options", [])}
-        new_option_keys = {o["key"] for o in new_field.get("options", [])}
-        removed_opts = old_option_keys - new_option_keys
-        if not removed_opts:
-            continue
-
-        for opt_key in removed_opts:
-            if field_type == "single_select":
-                # Set to null where the current value matches
-                result = await db.execute(
-                    text(
-                        "UPDATE cards SET attributes = attributes - :field_key "
-                        "WHERE type = :type_key AND attributes ->> :field_key = :opt_key"
-                    ),
-                    {"type_key": type_key, "field_key": fk, "opt_key": opt_key},
-                )
-            else:
-                # multiple_select: remove the option from the array
-                result = await db.execute(
-                    text(
-                        "UPDATE cards "
-                        "SET attributes = jsonb_set("
-                        "  attributes, ARRAY[:field_key],"
-                        "  COALESCE("
-                        "    (SELECT jsonb_agg(elem) "
-                        "     FROM jsonb_array_elements("
-                        "       attributes->:field_key) elem"
-                        "     WHERE elem #>> '{}' != :opt_key),"
-                        "    '[]'::jsonb"
-                        "  )"
-                        ") WHERE type = :type_key "
-                        "AND attributes->:field_key "
-                        "@> (:opt_json)::jsonb"
-                    ),
-                    {
-                        "type_key": type_key,
-                        "field_key": fk,
-                        "opt_key": opt_key,
-                        "opt_json": f'["{opt_key}"]',
-                    },
-                )
-            if result.rowcount:
-                logger.info(
-                    "Cleaned up removed option '%s' from field '%s' on %d card(s) of type '%s'",
-                    opt_key,
-                    fk,
-                    result.rowcount,
-                    type_key,
-                )
-
-
 # ── Card Types ─────────────────────────────────────────────────────────
 
 
 @router.get("/types")
 async def list_types(
+    request: Request,
     include_hidden: bool = Query(False),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    q = select(CardType).order_by(CardType.sort_order)
-    if not include_hidden:
-        q = q.where(CardType.is_hidden == False)  # noqa: E712
-    result = await db.execute(q)
-    return [_serialize_type(t) for t in result.scalars().all()]
+    async def build() -> list[dict]:
+        q = select(CardType).order_by(CardType.sort_order)
+        if not include_hidden:
+            q = q.where(CardType.is_hidden == False)  # noqa: E712
+        result = await db.execute(q)
+        return [_serialize_type(t) for t in result.scalars().all()]
+
+    return await _cached_listing(request, ("types", include_hidden), build)
 
 
 @router.get("/types/{key}")
@@ -732,9 +653,33 @@ async def create_type(
         await _ensure_successor_relation_type(db, t.key)
     await db.commit()
     await db.refresh(t)
+    if indexed_fields(t.fields_schema):
+        await _sync_attribute_indexes(db)
     return _serialize_type(t)
 
 
+@router.post("/types/{key}/fields-schema/preview")
+async def preview_fields_schema_change(
+    key: str,
+    body: dict,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Cards a save of ``body["fields_schema"]`` would rewrite: removed
+    fields are stripped and removed select options cleared, archived cards
+    included. ``background`` says whether the save would leave the rewrite
+    to a background job."""
+    await PermissionService.require_permission(db, user, "admin.metamodel")
+    result = await db.execute(select(CardType).where(CardType.key == key))
+    t = result.scalar_one_or_none()
+    if not t:
+        raise HTTPException(404, "Card type not found")
+    migration = plan_attribute_migration(t.fields_schema or [], body.get("fields_schema") or [])
+    preview = await preview_attribute_migration(db, key, migration)
+    preview["background"] = preview["cards"] > settings.METAMODEL_MIGRATION_INLINE_MAX_CARDS
+    return preview
+
+
 @router.patch("/types/{key}")
 async def update_type(
     key: str, body: dict, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
@@ -770,13 +715,23 @@ async def update_type(
                 )
 
     # ── Clean up card attributes when fields or options are removed ──
+    # One pass over the affected cards for the whole edit: inside this
+    # transaction when few cards are affected, else as a background job.
+    data_migration = None
     if "fields_schema" in body:
-        await _cleanup_removed_fields_and_options(
-            db,
-            key,
-            t.fields_schema or [],
-            body["fields_schema"] or [],
-        )
+        migration = plan_attribute_migration(t.fields_schema or [], body["fields_schema"] or [])
+        if migration:
+            affected = (await preview_attribute_migration(db, key, migration))["cards"]
+            if affected <= settings.METAMODEL_MIGRATION_INLINE_MAX_CARDS:
+                await run_attribute_migration(db, key, migration, commit=False, total=affected)
+            else:
+                job = await enqueue_job(
+                    db,
+                    "metamodel.migrate_attributes",
+                    {"type_key": key, "migration": migration.to_params()},
+                    user=user,
+                )
+                data_migration = {"job_id": str(job.id), "card_count": affected}
         # Strip extension-gated field attributes (help text, custom types) that
         # aren't unlocked by a licensed extension — grandfathering stored values.
         await extension_registry.refresh_from_db(db)
@@ -790,6 +745,7 @@ async def update_type(
     # cards if (and only if) the admin changed field weights or the built-in
     # contributor weights.
     old_signature = _scoring_signature(t.fields_schema, t.section_config)
+    old_indexed = indexed_fields(t.fields_schema)
     old_has_hierarchy = t.has_hierarchy
     old_reference_config = dict(t.reference_config or {})
 
@@ -874,21 +830,30 @@ async def update_type(
     await db.refresh(t)
 
     # Re-score existing cards when the scoring config actually changed, so
-    # tuned data-quality weights take effect immediately instead of waiting
-    # for each card to be edited.
+    # tuned data-quality weights take effect without waiting for each card to
+    # be edited. Queued and debounced: an admin tuning weights saves often.
     new_signature = _scoring_signature(t.fields_schema, t.section_config)
     if new_signature != old_signature:
-        await _recompute_data_quality_for_type(db, key)
+        await schedule_type_rescore(db, key)
+        await db.commit()
+    if indexed_fields(t.fields_schema) != old_indexed:
+        await _sync_attribute_indexes(db)
 
-    return _serialize_type(t)
+    result = _serialize_type(t)
+    if data_migration is not None:
+        # Too many cards to rewrite in the request: follow GET /jobs/{job_id}.
+        result["data_migration"] = data_migration
+    return result
 
 
-async def _recompute_data_quality_for_type(db: AsyncSession, type_key: str) -> None:
-    """Recompute data_quality for every active card of a type after a config change."""
-    from app.services.data_quality import rescore_card_type
+async def _sync_attribute_indexes(db: AsyncSession) -> None:
+    """Queue the build or drop of the expression indexes of ``indexed`` fields.
 
-    if await rescore_card_type(db, type_key):
-        await db.commit()
+    Runs after the type is committed. The job builds ``CONCURRENTLY``, so the
+    save neither waits for it nor holds card writes on a large inventory.
+    """
+    await enqueue_job(db, "metamodel.sync_attribute_indexes")
+    await db.commit()
 
 
 @router.delete("/types/{key}")
@@ -934,6 +899,7 @@ async def delete_type(
 
     await db.delete(t)
     await db.commit()
+    await _sync_attribute_indexes(db)
     return {"status": "deleted", "key": key}
 
 
@@ -1077,20 +1043,25 @@ async def _ensure_successor_relation_type(db: AsyncSession, card_type_key: str)
 
 @router.get("/relation-types")
 async def list_relation_types(
+    request: Request,
     type_key: str | None = Query(None, description="Filter relations connected to this type"),
     include_hidden: bool = Query(False),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    q = select(RelationType).order_by(RelationType.sort_order)
-    if not include_hidden:
-        q = q.where(RelationType.is_hidden == False)  # noqa: E712
-    if type_key:
-        q = q.where(
-            (RelationType.source_type_key == type_key) | (RelationType.target_type_key == type_key)
-        )
-    result = await db.execute(q)
-    return [_serialize_relation_type(r) for r in result.scalars().all()]
+    async def build() -> list[dict]:
+        q = select(RelationType).order_by(RelationType.sort_order)
+        if not include_hidden:
+            q = q.where(RelationType.is_hidden == False)  # noqa: E712
+        if type_key:
+            q = q.where(
+                (RelationType.source_type_key == type_key)
+                | (RelationType.target_type_key == type_key)
+            )
+        result = await db.execute(q)
+        return [_serialize_relation_type(r) for r in result.scalars().all()]
+
+    return await _cached_listing(request, ("relation-types", type_key, include_hidden), build)
 
 
 @router.get("/relation-types/{key}")
@@ -1,9 +1,15 @@
-"""PPM — Portfolio-level dashboard KPIs, Gantt chart data, and grouping options."""
+"""PPM — Portfolio-level dashboard KPIs, Gantt chart data, and grouping options.
+
+Both portfolio views assemble in a fixed number of queries however many
+initiatives there are: reports, reporters, stakeholders and cost totals are
+loaded for all initiatives at once and joined up in Python.
+"""
 
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import distinct_on
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
@@ -21,30 +27,63 @@ from app.schemas.ppm import (
     PpmStatusReportOut,
     ReporterOut,
 )
+from app.services.attribute_index import attribute_text
 from app.services.permission_service import PermissionService
+from app.services.ppm_gantt_cache import PpmGanttCache
 
 router = APIRouter(prefix="/reports/ppm", tags=["ppm-reports"])
 
 
-async def _latest_reports(db: AsyncSession) -> dict:
+async def _latest_reports(db: AsyncSession, initiative_ids: list) -> dict:
     """Return the most recent PpmStatusReport per initiative."""
-    sub = (
-        select(
+    if not initiative_ids:
+        return {}
+    result = await db.execute(
+        select(PpmStatusReport)
+        .where(PpmStatusReport.initiative_id.in_(initiative_ids))
+        .ext(distinct_on(PpmStatusReport.initiative_id))
+        .order_by(
             PpmStatusReport.initiative_id,
-            func.max(PpmStatusReport.report_date).label("max_date"),
+            PpmStatusReport.report_date.desc(),
+            PpmStatusReport.created_at.desc(),
         )
-        .group_by(PpmStatusReport.initiative_id)
-        .subquery()
     )
+    return {r.initiative_id: r for r in result.scalars().all()}
+
+
+async def _reporter_names(db: AsyncSession, reports) -> dict:
+    """Map reporter user_id → display name for the given status reports."""
+    reporter_ids = {r.reporter_id for r in reports if r.reporter_id}
+    if not reporter_ids:
+        return {}
     result = await db.execute(
-        select(PpmStatusReport).join(
-            sub,
-            (PpmStatusReport.initiative_id == sub.c.initiative_id)
-            & (PpmStatusReport.report_date == sub.c.max_date),
+        select(User.id, User.display_name, User.email).where(User.id.in_(reporter_ids))
+    )
+    return {uid: name or email for uid, name, email in result.all()}
+
+
+async def _stakeholders_by_card(db: AsyncSession, initiative_ids: list) -> dict:
+    """Map initiative_id → its stakeholders, with the users' display names."""
+    if not initiative_ids:
+        return {}
+    result = await db.execute(
+        select(
+            Stakeholder.card_id,
+            Stakeholder.user_id,
+            Stakeholder.role,
+            User.display_name,
+            User.email,
         )
+        .join(User, Stakeholder.user_id == User.id)
+        .where(Stakeholder.card_id.in_(initiative_ids))
+        .order_by(Stakeholder.card_id, Stakeholder.created_at)
     )
-    reports = result.scalars().all()
-    return {r.initiative_id: r for r in reports}
+    by_card: dict = {}
+    for card_id, user_id, role, name, email in result.all():
+        by_card.setdefault(card_id, []).append(
+            PpmGanttStakeholder(user_id=str(user_id), display_name=name or email, role_key=role)
+        )
+    return by_card
 
 
 @router.get("/group-options", response_model=list[PpmGroupOption])
@@ -83,11 +122,15 @@ async def ppm_dashboard(
 ):
     await PermissionService.require_permission(db, user, "ppm.view")
 
-    q = select(Card).where(Card.type == "Initiative", Card.status == "ACTIVE")
-    result = await db.execute(q)
-    initiatives = result.scalars().all()
+    result = await db.execute(
+        select(Card.id, Card.subtype, attribute_text("initiativeStatus")).where(
+            Card.type == "Initiative", Card.status == "ACTIVE"
+        )
+    )
+    initiatives = result.all()
+    init_ids = [row[0] for row in initiatives]
 
-    latest = await _latest_reports(db)
+    latest = await _latest_reports(db, init_ids)
 
     total = len(initiatives)
     by_subtype: dict[str, int] = {}
@@ -96,17 +139,14 @@ async def ppm_dashboard(
     health_cost = {"onTrack": 0, "atRisk": 0, "offTrack": 0, "noReport": 0}
     health_scope = {"onTrack": 0, "atRisk": 0, "offTrack": 0, "noReport": 0}
 
-    init_ids = [c.id for c in initiatives]
-
-    for card in initiatives:
-        sub = card.subtype or "Other"
+    for card_id, subtype, init_status in initiatives:
+        sub = subtype or "Other"
         by_subtype[sub] = by_subtype.get(sub, 0) + 1
 
-        attrs = card.attributes or {}
-        init_status = attrs.get("initiativeStatus", "Unknown")
+        init_status = init_status or "Unknown"
         by_status[init_status] = by_status.get(init_status, 0) + 1
 
-        report = latest.get(card.id)
+        report = latest.get(card_id)
         if report:
             health_schedule[report.schedule_health] += 1
             health_cost[report.cost_health] += 1
@@ -120,19 +160,19 @@ async def ppm_dashboard(
     total_budget = 0.0
     total_actual = 0.0
     if init_ids:
-        budget_sum = await db.execute(
-            select(func.coalesce(func.sum(PpmBudgetLine.amount), 0)).where(
-                PpmBudgetLine.initiative_id.in_(init_ids)
-            )
-        )
-        total_budget = float(budget_sum.scalar() or 0)
-
-        actual_sum = await db.execute(
-            select(func.coalesce(func.sum(PpmCostLine.actual), 0)).where(
-                PpmCostLine.initiative_id.in_(init_ids)
+        sums = await db.execute(
+            select(
+                select(func.coalesce(func.sum(PpmBudgetLine.amount), 0))
+                .where(PpmBudgetLine.initiative_id.in_(init_ids))
+                .scalar_subquery(),
+                select(func.coalesce(func.sum(PpmCostLine.actual), 0))
+                .where(PpmCostLine.initiative_id.in_(init_ids))
+                .scalar_subquery(),
             )
         )
-        total_actual = float(actual_sum.scalar() or 0)
+        budget, actual = sums.one()
+        total_budget = float(budget or 0)
+        total_actual = float(actual or 0)
 
     return {
         "total_initiatives": total,
@@ -216,20 +256,31 @@ async def ppm_gantt(
 ):
     await PermissionService.require_permission(db, user, "ppm.view")
 
+    cached = PpmGanttCache.get(group_by)
+    if cached is not None:
+        return cached
+    generation = PpmGanttCache.generation()
+    items = await _build_gantt(db, group_by)
+    PpmGanttCache.put(group_by, items, generation)
+    return items
+
+
+async def _build_gantt(db: AsyncSession, group_by: str | None) -> list[PpmGanttItem]:
     q = select(Card).where(Card.type == "Initiative", Card.status == "ACTIVE")
     result = await db.execute(q)
     initiatives = result.scalars().all()
+    init_ids = [c.id for c in initiatives]
 
-    latest = await _latest_reports(db)
+    latest = await _latest_reports(db, init_ids)
+    reporter_names = await _reporter_names(db, latest.values())
+    stakeholders_by_card = await _stakeholders_by_card(db, init_ids)
 
     # Build group map if group_by is specified
     group_map: dict = {}
     if group_by and initiatives:
-        init_ids = [c.id for c in initiatives]
         group_map = await _build_group_map(db, init_ids, group_by)
 
     # Batch-load cost line actuals per initiative
-    init_ids = [c.id for c in initiatives]
     cost_agg: dict = {}
     if init_ids:
         cost_result = await db.execute(
@@ -282,11 +333,10 @@ async def ppm_gantt(
         report_out = None
         if report:
             reporter = None
-            if report.reporter_id:
-                u_result = await db.execute(select(User).where(User.id == report.reporter_id))
-                u = u_result.scalar_one_or_none()
-                if u:
-                    reporter = ReporterOut(id=str(u.id), display_name=u.display_name or u.email)
+            if report.reporter_id in reporter_names:
+                reporter = ReporterOut(
+                    id=str(report.reporter_id), display_name=reporter_names[report.reporter_id]
+                )
             report_out = PpmStatusReportOut(
                 id=str(report.id),
                 initiative_id=str(report.initiative_id),
@@ -303,21 +353,6 @@ async def ppm_gantt(
                 updated_at=report.updated_at,
             )
 
-        # Stakeholders
-        sh_result = await db.execute(
-            select(Stakeholder, User)
-            .join(User, Stakeholder.user_id == User.id)
-            .where(Stakeholder.card_id == card.id)
-        )
-        stakeholders = [
-            PpmGanttStakeholder(
-                user_id=str(sh.user_id),
-                display_name=u.display_name or u.email,
-                role_key=sh.role,
-            )
-            for sh, u in sh_result.all()
-        ]
-
         # Grouping
         group_info = group_map.get(card.id)
         group_id = str(group_info[0]) if group_info else None
@@ -345,7 +380,7 @@ async def ppm_gantt(
                 group_name=group_name,
                 latest_report=report_out,
                 latest_report_id=str(report.id) if report else None,
-                stakeholders=stakeholders,
+                stakeholders=stakeholders_by_card.get(card.id, []),
             )
         )
 
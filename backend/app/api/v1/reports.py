@@ -1,15 +1,12 @@
 from __future__ import annotations
 
-import asyncio
 import json
-import logging
 import re
 import uuid
 from datetime import datetime, timedelta, timezone
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import and_, case, func, not_, or_, select
+from sqlalchemy import and_, case, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, selectinload
 
@@ -24,33 +21,36 @@ from app.models.sso_invitation import SsoInvitation
 from app.models.stakeholder import Stakeholder
 from app.models.stakeholder_role_definition import StakeholderRoleDefinition
 from app.models.survey import SurveyResponse
-from app.models.tag import CardTag, Tag, TagGroup
+from app.models.tag import CardTag
 from app.models.todo import Todo
 from app.models.user import User
 from app.models.user_favorite import UserFavorite
+from app.services.attribute_index import attribute_filter_clause
+from app.services.card_counts import cached_scalar
 from app.services.card_flags import orphaned_condition, stale_condition, stale_cutoff
 from app.services.cost_field_filter import cost_field_keys_from_card_schema
+from app.services.eol_cycles import read_product_cycles
 from app.services.kpi_snapshot_service import (
     compute_trend_block,
     get_comparison_snapshot,
 )
-from app.services.lifecycle import current_lifecycle_phase
+from app.services.lifecycle import (
+    EOL_APPROACHING_DAYS,
+    lifecycle_phase_sql,
+    manual_eol_status_sql,
+)
 from app.services.permission_service import PermissionService
+from app.services.report_cache import cached_report
+from app.services.report_queries import (
+    active_card_ids,
+    between,
+    id_in,
+    tag_groups_for_type,
+    touching,
+)
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
-log = logging.getLogger(__name__)
-
-
-def _current_lifecycle_phase(lifecycle: dict | None) -> str | None:
-    """Determine which lifecycle phase a card is currently in based on dates.
-
-    Thin alias kept for the call sites in this module — the implementation
-    moved to `services/lifecycle.py` when the descendant relation roll-up
-    needed the same phase precedence to sort by.
-    """
-    return current_lifecycle_phase(lifecycle)
-
 
 @router.get("/dashboard")
 async def dashboard(db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
@@ -95,8 +95,11 @@ async def dashboard(db: AsyncSession = Depends(get_db), user: User = Depends(get
         "75-100": dq_row.dq_75_100 or 0,
     }
 
-    # Lifecycle phase distribution
-    lifecycle_result = await db.execute(select(Card.lifecycle).where(Card.status == "ACTIVE"))
+    # Lifecycle phase distribution – computed in SQL
+    phase = lifecycle_phase_sql(Card.lifecycle)
+    lifecycle_result = await db.execute(
+        select(phase, func.count(Card.id)).where(Card.status == "ACTIVE").group_by(phase)
+    )
     lifecycle_dist: dict[str, int] = {
         "plan": 0,
         "phaseIn": 0,
@@ -105,19 +108,18 @@ async def dashboard(db: AsyncSession = Depends(get_db), user: User = Depends(get
         "endOfLife": 0,
         "none": 0,
     }
-    for (lc,) in lifecycle_result.all():
-        phase = _current_lifecycle_phase(lc)
-        if phase and phase in lifecycle_dist:
-            lifecycle_dist[phase] += 1
-        else:
-            lifecycle_dist["none"] += 1
+    for current_phase, count in lifecycle_result.all():
+        lifecycle_dist[current_phase or "none"] += count
 
     # Recent events. Many event payloads (`card.updated`, approval changes)
     # don't include the card name in `data`, so we resolve names server-side
     # in a single batch lookup keyed on `card_id` to keep the dashboard's
     # Recent Activity panel readable without extra round-trips.
     events_result = await db.execute(
-        select(Event).options(selectinload(Event.user)).order_by(Event.created_at.desc()).limit(20)
+        select(Event)
+        .options(selectinload(Event.user))
+        .order_by(Event.created_at.desc(), Event.id.desc())
+        .limit(20)
     )
     events_list = list(events_result.scalars().all())
     referenced_card_ids = {e.card_id for e in events_list if e.card_id is not None}
@@ -316,15 +318,16 @@ async def admin_dashboard_summary(
 
     # Cards lacking *any* stakeholder assignment.
     has_stakeholder_sq = select(Stakeholder.card_id).distinct()
-    cards_without_stakeholders = (
-        await db.execute(
-            select(func.count(Card.id)).where(
-                Card.status == "ACTIVE",
-                Card.type.not_in(hidden_types_sq),
-                Card.id.not_in(has_stakeholder_sq),
-            )
-        )
-    ).scalar() or 0
+    # Card counts come from the write-invalidated count cache; the user and
+    # todo counts below are cheap and stay exact.
+    cards_without_stakeholders = await cached_scalar(
+        db,
+        select(func.count(Card.id)).where(
+            Card.status == "ACTIVE",
+            Card.type.not_in(hidden_types_sq),
+            Card.id.not_in(has_stakeholder_sq),
+        ),
+    )
 
     overdue_todos_total = (
         await db.execute(
@@ -336,26 +339,28 @@ async def admin_dashboard_summary(
         )
     ).scalar() or 0
 
-    stuck_approvals = (
-        await db.execute(
-            select(func.count(Card.id)).where(
-                Card.status == "ACTIVE",
-                Card.type.not_in(hidden_types_sq),
-                Card.approval_status == "DRAFT",
-                Card.updated_at < thirty_days_ago,
-            )
-        )
-    ).scalar() or 0
+    # Keyed on the day, not the exact cut-off instant, so the count can be
+    # reused; a draft crossing the 30-day mark shows up at the next card write
+    # or once CARD_COUNT_CACHE_TTL lapses.
+    stuck_approvals = await cached_scalar(
+        db,
+        select(func.count(Card.id)).where(
+            Card.status == "ACTIVE",
+            Card.type.not_in(hidden_types_sq),
+            Card.approval_status == "DRAFT",
+            Card.updated_at < thirty_days_ago,
+        ),
+        key=f"admin-dashboard.stuck-approvals.{today.isoformat()}",
+    )
 
-    broken_total = (
-        await db.execute(
-            select(func.count(Card.id)).where(
-                Card.status == "ACTIVE",
-                Card.type.not_in(hidden_types_sq),
-                Card.approval_status == "BROKEN",
-            )
-        )
-    ).scalar() or 0
+    broken_total = await cached_scalar(
+        db,
+        select(func.count(Card.id)).where(
+            Card.status == "ACTIVE",
+            Card.type.not_in(hidden_types_sq),
+            Card.approval_status == "BROKEN",
+        ),
+    )
 
     # ---- Top contributors (last 30d) -------------------------------------
     contrib_rows = (
@@ -499,7 +504,10 @@ async def admin_dashboard_summary(
 
     # ---- Recent system activity (50 events) ------------------------------
     sys_events_result = await db.execute(
-        select(Event).options(selectinload(Event.user)).order_by(Event.created_at.desc()).limit(50)
+        select(Event)
+        .options(selectinload(Event.user))
+        .order_by(Event.created_at.desc(), Event.id.desc())
+        .limit(50)
     )
     sys_events_list = list(sys_events_result.scalars().all())
     sys_card_ids = {e.card_id for e in sys_events_list if e.card_id is not None}
@@ -745,6 +753,7 @@ async def stakeholder_directory(
 
 
 @router.get("/landscape")
+@cached_report("landscape", permissions=("reports.ea_dashboard", "costs.view"))
 async def landscape(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -778,14 +787,9 @@ async def landscape(
     )
     groups = group_result.scalars().all()
 
-    # Get relations connecting only the two relevant sets of IDs
-    sheet_ids = [card.id for card in sheets]
-    group_ids = [g.id for g in groups]
+    # Get relations connecting only the two relevant sets of cards
     rels_result = await db.execute(
-        select(Relation).where(
-            ((Relation.source_id.in_(sheet_ids)) & (Relation.target_id.in_(group_ids)))
-            | ((Relation.source_id.in_(group_ids)) & (Relation.target_id.in_(sheet_ids)))
-        )
+        select(Relation).where(between(active_card_ids(type), active_card_ids(group_by)))
     )
     rels = rels_result.scalars().all()
 
@@ -892,26 +896,36 @@ async def portfolio(
     if cost_keys & {x_axis, y_axis, size_field, color_field}:
         await PermissionService.require_permission(db, user, "costs.view")
 
-    result = await db.execute(select(Card).where(Card.type == type, Card.status == "ACTIVE"))
-    sheets = result.scalars().all()
-    items = []
-    for card in sheets:
-        attrs = card.attributes or {}
-        items.append(
-            {
-                "id": str(card.id),
-                "name": card.name,
-                "x": attrs.get(x_axis),
-                "y": attrs.get(y_axis),
-                "size": attrs.get(size_field, 0),
-                "color": attrs.get(color_field),
-                "lifecycle": card.lifecycle,
-            }
-        )
+    # Only the four plotted attributes leave the database, not every card's
+    # whole attribute document.
+    result = await db.execute(
+        select(
+            Card.id,
+            Card.name,
+            Card.lifecycle,
+            Card.attributes[x_axis].label("x"),
+            Card.attributes[y_axis].label("y"),
+            Card.attributes[size_field].label("size"),
+            Card.attributes[color_field].label("color"),
+        ).where(Card.type == type, Card.status == "ACTIVE")
+    )
+    items = [
+        {
+            "id": str(row.id),
+            "name": row.name,
+            "x": row.x,
+            "y": row.y,
+            "size": 0 if row.size is None else row.size,
+            "color": row.color,
+            "lifecycle": row.lifecycle,
+        }
+        for row in result.all()
+    ]
     return {"items": items, "x_axis": x_axis, "y_axis": y_axis}
 
 
 @router.get("/app-portfolio")
+@cached_report("app-portfolio", permissions=("reports.portfolio", "costs.view"))
 async def app_portfolio(
     type: str = Query("Application"),
     db: AsyncSession = Depends(get_db),
@@ -940,11 +954,7 @@ async def app_portfolio(
     app_id_set = {str(a.id) for a in apps}
 
     # 2. Get all relations touching those cards
-    rels_result = await db.execute(
-        select(Relation).where(
-            (Relation.source_id.in_(app_ids)) | (Relation.target_id.in_(app_ids))
-        )
-    )
+    rels_result = await db.execute(select(Relation).where(touching(active_card_ids(type))))
     rels = rels_result.scalars().all()
 
     # Collect all related card IDs
@@ -961,10 +971,7 @@ async def app_portfolio(
     related_map: dict[str, dict] = {}
     if related_ids:
         rel_result = await db.execute(
-            select(Card).where(
-                Card.id.in_(list(related_ids)),
-                Card.status == "ACTIVE",
-            )
+            select(Card).where(id_in(Card.id, related_ids), Card.status == "ACTIVE")
         )
         for card in rel_result.scalars().all():
             related_map[str(card.id)] = {
@@ -1015,7 +1022,7 @@ async def app_portfolio(
         if not pending:
             break
         anc_result = await db.execute(
-            select(Card).where(Card.id.in_(list(pending)), Card.status == "ACTIVE")
+            select(Card).where(id_in(Card.id, pending), Card.status == "ACTIVE")
         )
         pending = set()
         for card in anc_result.scalars().all():
@@ -1082,27 +1089,13 @@ async def app_portfolio(
     # Tag assignments + tag groups applicable to the requested card type
     app_tag_ids: dict[str, list[str]] = {}
     if app_ids:
-        ct_rows = await db.execute(select(CardTag).where(CardTag.card_id.in_(app_ids)))
+        ct_rows = await db.execute(
+            select(CardTag).where(CardTag.card_id.in_(active_card_ids(type)))
+        )
         for ct in ct_rows.scalars().all():
             app_tag_ids.setdefault(str(ct.card_id), []).append(str(ct.tag_id))
 
-    tg_rows = await db.execute(select(TagGroup).order_by(TagGroup.name))
-    tag_groups_payload = []
-    for tg in tg_rows.scalars().all():
-        if tg.restrict_to_types and type not in tg.restrict_to_types:
-            continue
-        t_rows = await db.execute(select(Tag).where(Tag.tag_group_id == tg.id).order_by(Tag.name))
-        tag_groups_payload.append(
-            {
-                "id": str(tg.id),
-                "name": tg.name,
-                "mode": tg.mode,
-                "tags": [
-                    {"id": str(t.id), "name": t.name, "color": t.color}
-                    for t in t_rows.scalars().all()
-                ],
-            }
-        )
+    tag_groups_payload = await tag_groups_for_type(db, type)
 
     # 8. Build response items
     items = []
@@ -1151,10 +1144,6 @@ async def app_portfolio(
 #: UI can tell the user to narrow the filter rather than quietly lying.
 MATRIX_MAX_EDGES = 200_000
 
-#: Sentinel meaning "this attribute has no value", mirroring EMPTY_FILTER_KEY in
-#: ``frontend/src/components/FilterSelect.tsx``.
-MATRIX_EMPTY_FILTER = "__empty__"
-
 
 def _parse_matrix_attr_filters(
     raw: list[str], pair_schemas: dict[str, list[dict]]
@@ -1197,25 +1186,8 @@ def _parse_matrix_attr_filters(
     return parsed
 
 
-def _matrix_attr_clause(field_key: str, field_type: str, value: str):
-    """One JSONB predicate for a single attribute filter value."""
-    if value == MATRIX_EMPTY_FILTER:
-        return or_(
-            Relation.attributes.is_(None),
-            not_(Relation.attributes.has_key(field_key)),  # noqa: W601 — JSONB ? operator
-            Relation.attributes[field_key].astext.is_(None),
-        )
-    if field_type == "boolean":
-        return Relation.attributes.contains({field_key: value == "true"})
-    if field_type == "number":
-        try:
-            return Relation.attributes.contains({field_key: float(value)})
-        except ValueError:
-            return Relation.attributes[field_key].astext == value
-    return Relation.attributes.contains({field_key: value})
-
-
 @router.get("/matrix")
+@cached_report("matrix", permissions=("reports.ea_dashboard", "costs.view"))
 async def matrix(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1330,7 +1302,10 @@ async def matrix(
         if requested_types is not None:
             stmt = stmt.where(Relation.type.in_(sorted(requested_types)))
         for (rt_key, field_key), (field_type, values) in attr_filters.items():
-            clauses = [_matrix_attr_clause(field_key, field_type, v) for v in sorted(values)]
+            clauses = [
+                attribute_filter_clause(Relation.attributes, field_key, field_type, v)
+                for v in sorted(values)
+            ]
             # Scoped to its own relation type so a filter on one type never
             # silently discards relations of the other type on these axes.
             stmt = stmt.where(or_(Relation.type != rt_key, or_(*clauses)))
@@ -1412,6 +1387,7 @@ async def matrix(
 
 
 @router.get("/roadmap")
+@cached_report("roadmap", permissions=("reports.ea_dashboard", "costs.view"))
 async def roadmap(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1419,26 +1395,30 @@ async def roadmap(
 ):
     """Roadmap: lifecycle timeline data."""
     await PermissionService.require_permission(db, user, "reports.ea_dashboard")
-    q = select(Card).where(Card.status == "ACTIVE")
+    # Only cards with something to place on the timeline: a lifecycle phase
+    # (any date set) or a start / end date attribute.
+    q = select(Card).where(
+        Card.status == "ACTIVE",
+        or_(
+            lifecycle_phase_sql(Card.lifecycle).is_not(None),
+            func.coalesce(Card.attributes["startDate"].astext, "") != "",
+            func.coalesce(Card.attributes["endDate"].astext, "") != "",
+        ),
+    )
     if type:
         q = q.where(Card.type == type)
     result = await db.execute(q)
-    sheets = result.scalars().all()
-    items = []
-    for card in sheets:
-        lc = card.lifecycle or {}
-        attrs = card.attributes or {}
-        if any(lc.values()) or attrs.get("startDate") or attrs.get("endDate"):
-            items.append(
-                {
-                    "id": str(card.id),
-                    "name": card.name,
-                    "type": card.type,
-                    "subtype": card.subtype,
-                    "lifecycle": lc,
-                    "attributes": attrs,
-                }
-            )
+    items = [
+        {
+            "id": str(card.id),
+            "name": card.name,
+            "type": card.type,
+            "subtype": card.subtype,
+            "lifecycle": card.lifecycle or {},
+            "attributes": card.attributes or {},
+        }
+        for card in result.scalars().all()
+    ]
     return {"items": items}
 
 
@@ -1478,6 +1458,7 @@ async def cost_report(
 
 
 @router.get("/cost-treemap")
+@cached_report("cost-treemap", permissions=("reports.ea_dashboard", "costs.view"))
 async def cost_treemap(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1518,8 +1499,14 @@ async def cost_treemap(
         if sheet_ids:
             edges_result = await db.execute(
                 select(Relation).where(
-                    ((Relation.source_id == parent_card_id) & (Relation.target_id.in_(sheet_ids)))
-                    | ((Relation.target_id == parent_card_id) & (Relation.source_id.in_(sheet_ids)))
+                    (
+                        (Relation.source_id == parent_card_id)
+                        & Relation.target_id.in_(active_card_ids(type))
+                    )
+                    | (
+                        (Relation.target_id == parent_card_id)
+                        & Relation.source_id.in_(active_card_ids(type))
+                    )
                 )
             )
             linked_ids: set[uuid.UUID] = set()
@@ -1585,16 +1572,10 @@ async def cost_treemap(
             related_ids = [c.id for c in related_cards]
 
             if primary_ids and related_ids:
+                # Primary cards dropped by the parent filter are skipped below.
                 edges_result = await db.execute(
                     select(Relation).where(
-                        (
-                            (Relation.source_id.in_(primary_ids))
-                            & (Relation.target_id.in_(related_ids))
-                        )
-                        | (
-                            (Relation.source_id.in_(related_ids))
-                            & (Relation.target_id.in_(primary_ids))
-                        )
+                        between(active_card_ids(type), active_card_ids(type_key))
                     )
                 )
                 edges = edges_result.scalars().all()
@@ -1656,13 +1637,8 @@ async def cost_treemap(
         grp_map = {str(g.id): g.name for g in grp_sheets}
 
         # Get relations
-        sheet_ids = [card.id for card in sheets]
-        grp_ids = [g.id for g in grp_sheets]
         rels_result = await db.execute(
-            select(Relation).where(
-                ((Relation.source_id.in_(sheet_ids)) & (Relation.target_id.in_(grp_ids)))
-                | ((Relation.source_id.in_(grp_ids)) & (Relation.target_id.in_(sheet_ids)))
-            )
+            select(Relation).where(between(active_card_ids(type), active_card_ids(group_by)))
         )
         rels = rels_result.scalars().all()
 
@@ -1691,6 +1667,7 @@ async def cost_treemap(
 
 
 @router.get("/capability-heatmap")
+@cached_report("capability-heatmap", permissions=("reports.ea_dashboard", "costs.view"))
 async def capability_heatmap(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1714,7 +1691,6 @@ async def capability_heatmap(
         .order_by(Card.name)
     )
     caps = caps_result.scalars().all()
-    cap_ids = [c.id for c in caps]
 
     # Get Application type schema for dynamic field resolution
     app_type_result = await db.execute(select(CardType).where(CardType.key == "Application"))
@@ -1738,10 +1714,7 @@ async def capability_heatmap(
     # Get ALL relations touching applications (for dynamic filtering by any related type)
     app_ids = [a.id for a in apps]
     rels_result = await db.execute(
-        select(Relation).where(
-            (Relation.source_id.in_(cap_ids + app_ids))
-            | (Relation.target_id.in_(cap_ids + app_ids))
-        )
+        select(Relation).where(touching(active_card_ids("BusinessCapability", "Application")))
     )
     rels = rels_result.scalars().all()
 
@@ -1762,7 +1735,7 @@ async def capability_heatmap(
     related_map: dict[str, dict] = {}
     if related_ids:
         rel_cards_result = await db.execute(
-            select(Card).where(Card.id.in_(list(related_ids)), Card.status == "ACTIVE")
+            select(Card).where(id_in(Card.id, related_ids), Card.status == "ACTIVE")
         )
         for card in rel_cards_result.scalars().all():
             related_map[str(card.id)] = {"id": str(card.id), "name": card.name, "type": card.type}
@@ -1785,27 +1758,13 @@ async def capability_heatmap(
     # Tag assignments per application (for tag filter)
     cap_app_tag_ids: dict[str, list[str]] = {}
     if app_ids:
-        ct_rows = await db.execute(select(CardTag).where(CardTag.card_id.in_(app_ids)))
+        ct_rows = await db.execute(
+            select(CardTag).where(CardTag.card_id.in_(active_card_ids("Application")))
+        )
         for ct in ct_rows.scalars().all():
             cap_app_tag_ids.setdefault(str(ct.card_id), []).append(str(ct.tag_id))
 
-    tg_rows = await db.execute(select(TagGroup).order_by(TagGroup.name))
-    cap_tag_groups_payload = []
-    for tg in tg_rows.scalars().all():
-        if tg.restrict_to_types and "Application" not in tg.restrict_to_types:
-            continue
-        t_rows = await db.execute(select(Tag).where(Tag.tag_group_id == tg.id).order_by(Tag.name))
-        cap_tag_groups_payload.append(
-            {
-                "id": str(tg.id),
-                "name": tg.name,
-                "mode": tg.mode,
-                "tags": [
-                    {"id": str(t.id), "name": t.name, "color": t.color}
-                    for t in t_rows.scalars().all()
-                ],
-            }
-        )
+    cap_tag_groups_payload = await tag_groups_for_type(db, "Application")
 
     def _app_to_dict(a):
         aid = str(a.id)
@@ -1902,15 +1861,11 @@ async def dependencies(
     # Get relations involving visible cards + relation type labels
     all_card_ids = list(sheet_map.keys())
     if all_card_ids:
-        card_uuids = [uuid.UUID(cid) for cid in all_card_ids]
-        rels_result = await db.execute(
-            select(Relation).where(
-                (Relation.source_id.in_(card_uuids)) | (Relation.target_id.in_(card_uuids))
-            )
-        )
+        scope = active_card_ids(type) if type else active_card_ids()
+        rels_result = await db.execute(select(Relation).where(touching(scope)))
+        rels = rels_result.scalars().all()
     else:
-        rels_result = await db.execute(select(Relation).where(False))
-    rels = rels_result.scalars().all()
+        rels = []
 
     rt_result = await db.execute(
         select(RelationType.key, RelationType.label, RelationType.reverse_label)
@@ -2175,8 +2130,6 @@ async def data_quality_cards(
 #  EOL Risk & Impact report
 # ---------------------------------------------------------------------------
 
-_EOL_BASE = "https://endoflife.date/api"
-
 
 def _eol_status(eol_val, support_val) -> str:
     """Classify a cycle as 'eol', 'approaching', 'supported', or 'unknown'."""
@@ -2190,7 +2143,7 @@ def _eol_status(eol_val, support_val) -> str:
             eol_date = datetime.strptime(eol_val, "%Y-%m-%d").date()
             if eol_date <= now:
                 return "eol"
-            six_months = now + timedelta(days=182)
+            six_months = now + timedelta(days=EOL_APPROACHING_DAYS)
             if eol_date <= six_months:
                 return "approaching"
         except ValueError:
@@ -2211,54 +2164,8 @@ def _eol_status(eol_val, support_val) -> str:
     return "supported" if eol_val is not None else "unknown"
 
 
-async def _fetch_product_cycles(
-    client: httpx.AsyncClient,
-    product: str,
-) -> list[dict] | None:
-    """Fetch cycles for a single product, returning None on failure."""
-    try:
-        resp = await client.get(f"{_EOL_BASE}/{product}.json", timeout=10.0)
-        if resp.status_code == 200:
-            return resp.json()
-    except httpx.HTTPError:
-        log.warning("Failed to fetch EOL data for %s", product)
-    return None
-
-
-def _manual_eol_status(lifecycle: dict | None) -> str:
-    """Classify a card with manually maintained lifecycle dates."""
-    if not lifecycle:
-        return "unknown"
-
-    now = datetime.now(timezone.utc).date()
-    eol_str = lifecycle.get("endOfLife")
-    phase_out_str = lifecycle.get("phaseOut")
-
-    # Check endOfLife date
-    if isinstance(eol_str, str) and eol_str:
-        try:
-            eol_date = datetime.strptime(eol_str, "%Y-%m-%d").date()
-            if eol_date <= now:
-                return "eol"
-            six_months = now + timedelta(days=182)
-            if eol_date <= six_months:
-                return "approaching"
-        except ValueError:
-            pass
-
-    # Check phaseOut date (analogous to support ending)
-    if isinstance(phase_out_str, str) and phase_out_str:
-        try:
-            po_date = datetime.strptime(phase_out_str, "%Y-%m-%d").date()
-            if po_date <= now:
-                return "approaching"
-        except ValueError:
-            pass
-
-    return "supported"
-
-
 @router.get("/eol")
+@cached_report("eol", permissions=("reports.ea_dashboard", "costs.view"))
 async def eol_report(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -2267,7 +2174,7 @@ async def eol_report(
 
     Returns all Applications and IT Components with linked EOL data
     (from endoflife.date API) *or* manually maintained lifecycle dates,
-    enriched with live cycle information and impact mapping
+    enriched with the stored cycle information and impact mapping
     (IT Component → related Applications).
 
     Each item includes a ``source`` field: ``"api"`` for items linked
@@ -2275,14 +2182,19 @@ async def eol_report(
     ``endOfLife`` lifecycle date.
     """
     await PermissionService.require_permission(db, user, "reports.ea_dashboard")
-    # 1. Fetch all active Applications and ITComponents
+    # 1. Fetch all active Applications and ITComponents, with the status their
+    #    hand-maintained lifecycle dates give them (used when not API-linked)
     result = await db.execute(
-        select(Card).where(
+        select(Card, manual_eol_status_sql(Card.lifecycle)).where(
             Card.status == "ACTIVE",
             Card.type.in_(["Application", "ITComponent"]),
         )
     )
-    all_sheets = result.scalars().all()
+    manual_status: dict[uuid.UUID, str] = {}
+    all_sheets = []
+    for card, status in result.all():
+        all_sheets.append(card)
+        manual_status[card.id] = status
 
     # Split into API-linked and manually-maintained sets
     api_sheets = []
@@ -2314,17 +2226,11 @@ async def eol_report(
             },
         }
 
-    # 2. Batch-fetch unique products from endoflife.date (for API-linked items)
-    unique_products = {(card.attributes or {})["eol_product"] for card in api_sheets}
-    product_cycles: dict[str, list[dict]] = {}
-
-    if unique_products:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            tasks = {product: _fetch_product_cycles(client, product) for product in unique_products}
-            results = await asyncio.gather(*tasks.values())
-            for product, cycles in zip(tasks.keys(), results):
-                if cycles is not None:
-                    product_cycles[product] = cycles
+    # 2. Stored endoflife.date cycles of the linked products; missing or
+    #    stale ones are refreshed in the background, not waited for
+    unique_products = {str((card.attributes or {})["eol_product"]) for card in api_sheets}
+    product_cycles = await read_product_cycles(db, unique_products)
+    await db.commit()
 
     # 3. Get relations between ITComponent and Application for impact mapping
     all_eol_sheets = api_sheets + manual_sheets
@@ -2335,7 +2241,7 @@ async def eol_report(
     if it_ids:
         rels_result = await db.execute(
             select(Relation).where(
-                (Relation.source_id.in_(it_ids)) | (Relation.target_id.in_(it_ids))
+                id_in(Relation.source_id, it_ids) | id_in(Relation.target_id, it_ids)
             )
         )
         rels = rels_result.scalars().all()
@@ -2416,7 +2322,7 @@ async def eol_report(
     # 4b. Manually maintained items (lifecycle.endOfLife set, no API link)
     for card in manual_sheets:
         lifecycle = card.lifecycle or {}
-        status = _manual_eol_status(lifecycle)
+        status = manual_status[card.id]
         manual_count += 1
 
         if status in counts:
@@ -1,7 +1,7 @@
 """Repository-wide Resource management.
 
-Card resources — uploaded file attachments (``file_attachments``, binary
-blobs) and document links (``documents``, URLs) — are created and managed
+Card resources — uploaded file attachments (``file_attachments``, bytes in
+the blob store) and document links (``documents``, URLs) — are created and managed
 per card from the card's Resources tab. This module adds the missing
 repository-wide view: one searchable, filterable list across every card,
 plus a storage/usage rollup and a mixed-kind bulk delete. It backs the
@@ -11,11 +11,9 @@ Design notes
 ------------
 
 *The list is a UNION over two tables.* Both branches are built from
-**column-level** selects, never ``select(FileAttachment)`` — the entity
-select would pull ``file_attachments.data`` (a ``LargeBinary``) into
-memory for every row. Omitting the column keeps Postgres from
-de-TOASTing the payload at all, so a page of 10 MB PDFs costs the same as
-a page of links.
+**column-level** selects so their SELECT lists line up. File bytes never
+live in the row (only ``content_hash`` does), so a page of 10 MB PDFs costs
+the same as a page of links.
 
 *Placeholders are cast.* A bare bind parameter in a ``UNION`` SELECT list
 makes Postgres raise ``could not determine data type of parameter``, so
@@ -214,9 +212,8 @@ def _apply_link_filters(stmt: Select, f: _Filters) -> Select:
 def _file_branch() -> Select:
     """Column-level select over ``file_attachments``.
 
-    ``FileAttachment.data`` is deliberately absent — see the module
-    docstring. ``size`` is a plain integer column, so byte totals never
-    need the blob.
+    ``size`` is a plain integer column, so byte totals never need the
+    blob store.
     """
     return select(
         FileAttachment.id.label("id"),
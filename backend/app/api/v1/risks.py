@@ -53,7 +53,7 @@ from app.services.risk_service import (
     risk_to_dict,
     validate_status_transition,
 )
-from app.services.search_rank import rank_text, search_filter
+from app.services.search_rank import rank_text, search_match
 
 logger = logging.getLogger(__name__)
 
@@ -272,10 +272,12 @@ async def load_filtered_risks(
         stmt = stmt.where(Risk.source_type.in_(source_type))
     if search:
         stmt = stmt.where(
-            or_(
-                search_filter(Risk.title, search),
-                search_filter(Risk.description, search),
-                search_filter(Risk.reference, search),
+            search_match(
+                search,
+                Risk.title,
+                Risk.description,
+                Risk.reference,
+                vector=Risk.search_vector,
             )
         )
     if card_ids:
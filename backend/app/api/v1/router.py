@@ -13,6 +13,7 @@ from app.api.v1 import (
     capability_catalogue,
     cards,
     comments,
+    diagnostics,
     diagram_groups,
     diagrams,
     documents,
@@ -21,6 +22,7 @@ from app.api.v1 import (
     extensions,
     favorites,
     file_attachments,
+    jobs,
     metamodel,
     migration,
     mutation_batches,
@@ -71,6 +73,7 @@ api_router.include_router(soaw.router)
 api_router.include_router(eol.router)
 api_router.include_router(events.router)
 api_router.include_router(mutation_batches.router)
+api_router.include_router(jobs.router)
 api_router.include_router(users.router)
 api_router.include_router(notifications.router)
 api_router.include_router(surveys.router)
@@ -108,3 +111,4 @@ api_router.include_router(process_catalogue.router)
 api_router.include_router(value_stream_catalogue.router)
 api_router.include_router(principles_catalogue.router)
 api_router.include_router(ops.router)
+api_router.include_router(diagnostics.router)
@@ -20,6 +20,7 @@ from app.models.resource_type import ResourceType
 from app.models.user import User
 from app.services.ai_service import DEFAULT_AZURE_API_VERSION
 from app.services.app_identity import DEFAULT_APP_TITLE
+from app.services.cluster import cluster_bus
 from app.services.email_backends.base import (
     ALLOWED_METHODS as ALLOWED_EMAIL_METHODS,
 )
@@ -28,6 +29,7 @@ from app.services.email_backends.base import (
     get_backend,
 )
 from app.services.email_backends.runtime import apply_email_settings_to_runtime
+from app.services.event_partitions import DEFAULT_RETENTION_MODE, RETENTION_MODES
 from app.services.permission_service import PermissionService
 
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -95,6 +97,11 @@ DEFAULT_CURRENCY = "USD"
 DEFAULT_ARCHIVE_RETENTION_DAYS = 30
 MAX_ARCHIVE_RETENTION_DAYS = 3650  # ~10 years
 
+# Months of events kept before a partition is archived or detached
+# (app.services.event_partitions). ``0`` keeps the full history.
+DEFAULT_EVENT_RETENTION_MONTHS = 0
+MAX_EVENT_RETENTION_MONTHS = 1200  # 100 years
+
 DEFAULT_DATE_FORMAT = "DD MMM YYYY"
 ALLOWED_DATE_FORMATS = {
     "MM/DD/YYYY",
@@ -335,6 +342,7 @@ async def update_email_settings(
     await db.commit()
 
     apply_email_settings_to_runtime(email)
+    cluster_bus.publish("settings.runtime")
 
     # Return the same masked body as GET so the client can refresh its state
     # (incl. the computed `configured` flag) without a second round-trip.
@@ -477,8 +485,10 @@ async def update_app_title(
     await db.commit()
 
     # Mirror to the runtime config so email templates pick up the change
-    # without having to query the DB on every send.
+    # without having to query the DB on every send — here and in the other
+    # worker processes.
     app_config.APP_TITLE = trimmed or DEFAULT_APP_TITLE
+    cluster_bus.publish("settings.runtime")
 
     return {"ok": True}
 
@@ -1120,6 +1130,66 @@ async def update_archive_retention_days(
     return {"days": body.days}
 
 
+class EventRetentionPayload(BaseModel):
+    months: int  # whole months of events to keep; 0 = keep indefinitely
+    mode: str = DEFAULT_RETENTION_MODE  # "archive" or "detach"
+
+
+def _event_retention_response(general: dict) -> dict:
+    return {
+        "months": general.get("eventRetentionMonths", DEFAULT_EVENT_RETENTION_MONTHS),
+        "mode": general.get("eventRetentionMode", DEFAULT_RETENTION_MODE),
+    }
+
+
+@router.get("/event-retention")
+async def get_event_retention(
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Admin endpoint — how many months of events (card history, audit log) are kept."""
+    await PermissionService.require_permission(db, user, "admin.settings")
+    result = await db.execute(select(AppSettings).where(AppSettings.id == "default"))
+    row = result.scalar_one_or_none()
+    return _event_retention_response((row.general_settings if row else None) or {})
+
+
+@router.patch("/event-retention")
+async def update_event_retention(
+    body: EventRetentionPayload,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Admin endpoint — set the event retention policy.
+
+    Events are dropped a calendar month at a time once the whole month is
+    older than ``months`` (the current month counts as the first). ``archive``
+    writes each month to a gzipped file under ``EVENT_ARCHIVE_PATH`` before
+    dropping it; ``detach`` leaves it in the database outside the events
+    table. Applied by the hourly partition maintenance loop.
+    """
+    await PermissionService.require_permission(db, user, "admin.settings")
+    if body.months < 0 or body.months > MAX_EVENT_RETENTION_MONTHS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Months must be between 0 and {MAX_EVENT_RETENTION_MONTHS}",
+        )
+    if body.mode not in RETENTION_MODES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Mode must be one of: {', '.join(RETENTION_MODES)}",
+        )
+
+    row = await _get_or_create_row(db)
+    general = dict(row.general_settings or {})
+    general["eventRetentionMonths"] = body.months
+    general["eventRetentionMode"] = body.mode
+    row.general_settings = general
+    await db.commit()
+
+    return _event_retention_response(general)
+
+
 # ---------------------------------------------------------------------------
 # Logo endpoints
 # ---------------------------------------------------------------------------
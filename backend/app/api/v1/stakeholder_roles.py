@@ -19,7 +19,7 @@ from app.models.stakeholder import Stakeholder
 from app.models.stakeholder_role_definition import StakeholderRoleDefinition
 from app.models.survey import Survey
 from app.models.user import User
-from app.services.data_quality import rescore_card_type
+from app.services.data_quality import schedule_type_rescore
 from app.services.permission_service import PermissionService
 
 router = APIRouter(tags=["stakeholder-roles"])
@@ -412,10 +412,9 @@ async def create_stakeholder_role(
     )
     db.add(srd)
     # A counting role is a data-quality slot for every card of this type, so
-    # adding one moves the denominator instance-wide. See `rescore_card_type`.
+    # adding one moves the denominator instance-wide. See `schedule_type_rescore`.
     if body.counts_for_quality:
-        await db.flush()
-        await rescore_card_type(db, type_key)
+        await schedule_type_rescore(db, type_key)
     await db.commit()
     await db.refresh(srd)
     PermissionService.invalidate_srd_cache(type_key, body.key)
@@ -488,8 +487,7 @@ async def update_stakeholder_role(
     # every card of this type — both whether the slot exists at all (when this
     # is the type's only counting role) and which assignments fill it.
     if srd.counts_for_quality != quality_before:
-        await db.flush()
-        await rescore_card_type(db, type_key)
+        await schedule_type_rescore(db, type_key)
 
     await db.commit()
     await db.refresh(srd)
@@ -534,8 +532,7 @@ async def delete_stakeholder_role(
     await db.delete(srd)
     await _rewrite_jsonb_role(db, type_key, role_key, None)
     if counted:
-        await db.flush()
-        await rescore_card_type(db, type_key)
+        await schedule_type_rescore(db, type_key)
     await db.commit()
     PermissionService.invalidate_srd_cache(type_key, role_key)
 
@@ -582,8 +579,7 @@ async def archive_stakeholder_role(
     # Archiving a counting role drops it out of the data-quality slot, which
     # can leave cards whose only assignment was under that role incomplete.
     if srd.counts_for_quality:
-        await db.flush()
-        await rescore_card_type(db, type_key)
+        await schedule_type_rescore(db, type_key)
     await db.commit()
     await db.refresh(srd)
     PermissionService.invalidate_srd_cache(type_key, role_key)
@@ -619,8 +615,7 @@ async def restore_stakeholder_role(
     srd.archived_at = None
     srd.archived_by = None
     if srd.counts_for_quality:
-        await db.flush()
-        await rescore_card_type(db, type_key)
+        await schedule_type_rescore(db, type_key)
     await db.commit()
     await db.refresh(srd)
     PermissionService.invalidate_srd_cache(type_key, role_key)
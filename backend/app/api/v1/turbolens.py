@@ -58,6 +58,7 @@ from app.schemas.turbolens import (
     VendorAnalysisOut,
     VendorHierarchyOut,
 )
+from app.services.background_jobs import enqueue_job
 from app.services.permission_service import PermissionService
 from app.services.search_rank import search_filter, search_rank
 from app.services.turbolens_ai import get_ai_config, is_ai_configured
@@ -927,27 +928,33 @@ async def _load_card_meta(
 @compliance_router.post("/compliance-scan")
 async def trigger_compliance_scan(
     body: SecurityScanRequest | None,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    """Trigger the compliance (per-regulation AI gap analysis) pipeline only."""
+    """Trigger the compliance (per-regulation AI gap analysis) pipeline only.
+
+    The scan runs as a ``compliance.scan`` background job, so it survives a
+    restart and waits its turn when the job workers are busy; ``job_id``
+    can be followed (or cancelled) under ``/jobs``.
+    """
     await PermissionService.require_permission(db, user, "compliance.manage")
 
     run = await _create_analysis_run(db, AnalysisType.COMPLIANCE, user)
     # When the client doesn't filter, the service loads every enabled
     # regulation from the DB. We pass the filter through verbatim and let
     # the service intersect with the enabled set.
-    regulations = body.regulations if body else None
-    user_id = str(user.id)
-
-    async def _service(db_: AsyncSession) -> dict[str, Any]:
-        from app.services.compliance_scanner import run_compliance_scan
-
-        return await run_compliance_scan(db_, run.id, user_id, regulations=regulations)
-
-    background_tasks.add_task(_run_analysis, str(run.id), _service, "Compliance scan")
-    return {"run_id": str(run.id), "status": "running"}
+    job = await enqueue_job(
+        db,
+        "compliance.scan",
+        {
+            "run_id": str(run.id),
+            "user_id": str(user.id),
+            "regulations": body.regulations if body else None,
+        },
+        user=user,
+    )
+    await db.commit()
+    return {"run_id": str(run.id), "status": "running", "job_id": str(job.id)}
 
 
 @compliance_router.get("/active-runs")
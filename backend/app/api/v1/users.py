@@ -9,7 +9,7 @@ from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.database import get_db
 from app.models.role import Role
 from app.models.sso_invitation import SsoInvitation
@@ -553,7 +553,7 @@ async def create_user(
         else:
             auth_provider = "local"
 
-    pw_hash = hash_password(body.password) if body.password else None
+    pw_hash = await hash_password_async(body.password) if body.password else None
 
     # For local accounts created without a password, generate a single-use
     # setup token. The invite email links to /auth/set-password?token=<...>
@@ -724,7 +724,7 @@ async def update_user(
         # Block password changes for SSO users
         if u.auth_provider == "sso":
             raise HTTPException(400, "Cannot set password for SSO users")
-        u.password_hash = hash_password(data.pop("password"))
+        u.password_hash = await hash_password_async(data.pop("password"))
         # Setting a password from the admin side invalidates the one-time
         # setup link (so the legacy email link can no longer overwrite the
         # admin-chosen password). The matching SsoInvitation row is NOT
@@ -9,7 +9,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.types import Text
 
 from app.api.deps import get_current_user
 from app.api.v1.auth import _is_secure_request
@@ -26,6 +25,7 @@ from app.models.user import User
 from app.models.web_portal import WebPortal
 from app.schemas.common import WebPortalCreate, WebPortalUpdate
 from app.services import sso_service
+from app.services.attribute_index import attribute_text
 from app.services.cost_field_filter import cost_field_keys_from_card_schema
 from app.services.permission_service import PermissionService
 from app.services.public_access import (
@@ -586,7 +586,7 @@ async def get_public_portal_cards(
                 for attr_key, attr_val in parsed.items():
                     if not isinstance(attr_key, str) or not attr_key:
                         continue
-                    cond = Card.attributes[attr_key].astext.cast(Text) == str(attr_val)
+                    cond = attribute_text(attr_key) == str(attr_val)
                     q = q.where(cond)
                     count_q = count_q.where(cond)
         except (json.JSONDecodeError, TypeError):
@@ -43,9 +43,20 @@ class Settings:
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "turboea")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "turboea")
 
-    # Connection-pool sizing for the single async engine (app/database.py).
-    # The backend runs one uvicorn process, so its total connection budget is
-    # ``DB_POOL_SIZE + DB_MAX_OVERFLOW`` — 30 by default. The bundled Postgres
+    # Number of uvicorn worker processes. uvicorn reads the same variable as
+    # its ``--workers`` default, so this setting only tells the app what mode
+    # it is in. Above 1, one worker is elected (Postgres advisory lock) to run
+    # the background loops and the workers keep their in-process caches in
+    # step over LISTEN/NOTIFY — see app/services/cluster.py. A failed leader
+    # is replaced within LEADER_ELECTION_INTERVAL seconds.
+    WEB_CONCURRENCY: int = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    LEADER_ELECTION_INTERVAL: float = float(os.getenv("LEADER_ELECTION_INTERVAL", "15"))
+
+    # Connection-pool sizing for the async engine (app/database.py), per
+    # worker process. One worker's connection budget is ``DB_POOL_SIZE +
+    # DB_MAX_OVERFLOW`` — 30 by default — and with WEB_CONCURRENCY > 1 each
+    # worker also holds up to two unpooled coordination connections, so the
+    # total is ``WEB_CONCURRENCY × (pool + overflow + 2)``. The bundled Postgres
     # allows 100, but a managed instance on a low-cost plan often caps the
     # database far below 30 (``ALTER DATABASE … CONNECTION LIMIT``), which
     # surfaces as ``too many connections for database "turboea"``. Lower these
@@ -61,6 +72,148 @@ class Settings:
     # the ``MUTATION_BATCH_RETENTION_DAYS`` env var.
     MUTATION_BATCH_RETENTION_DAYS: int = int(os.getenv("MUTATION_BATCH_RETENTION_DAYS", "15"))
 
+    # File-attachment bytes live outside Postgres in a content-addressed blob
+    # store (app/services/blob_store/); rows keep only the SHA-256. ``local``
+    # writes under BLOB_STORE_PATH — relative paths resolve against the
+    # backend's working directory, i.e. the ``backend_data`` volume in Docker,
+    # so back it up together with the database. The leader's hourly sweep
+    # deletes blobs no row references that are older than the grace window.
+    BLOB_STORE_BACKEND: str = os.getenv("BLOB_STORE_BACKEND", "local")
+    BLOB_STORE_PATH: str = os.getenv("BLOB_STORE_PATH", "data/blobs")
+    BLOB_GC_GRACE_SECONDS: int = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+
+    # The events table is partitioned by month (app/services/event_partitions.py).
+    # The leader keeps EVENT_PARTITIONS_AHEAD future months created, and the
+    # admin's event retention policy (Settings → Data management) writes
+    # archived months to EVENT_ARCHIVE_PATH as gzipped JSON lines — relative
+    # to the backend's working directory, like BLOB_STORE_PATH.
+    EVENT_ARCHIVE_PATH: str = os.getenv("EVENT_ARCHIVE_PATH", "data/event-archive")
+    EVENT_PARTITIONS_AHEAD: int = int(os.getenv("EVENT_PARTITIONS_AHEAD", "2"))
+
+    # Process diagram versions are stored as compressed deltas against the
+    # latest full snapshot (app/services/diagram_versions.py); every
+    # DIAGRAM_SNAPSHOT_INTERVAL-th version is a new snapshot, which bounds both
+    # delta size and reconstruction cost. 1 stores every version in full.
+    DIAGRAM_SNAPSHOT_INTERVAL: int = max(1, int(os.getenv("DIAGRAM_SNAPSHOT_INTERVAL", "20")))
+
+    # Background jobs (app/services/background_jobs.py) are rows in
+    # ``background_jobs`` that every worker process polls for. JOB_WORKER_SLOTS
+    # is how many a process runs at once (0 leaves this process out, e.g. to
+    # keep a dedicated API worker free); JOB_CONCURRENCY caps a kind across the
+    # whole installation, as ``kind=n`` pairs overriding the kind's default
+    # (``calculations.recalculate=1,compliance.scan=1``). A running job whose
+    # worker has not reported for JOB_STALE_SECONDS is retried or failed;
+    # finished jobs are deleted after JOB_RETENTION_DAYS.
+    JOB_WORKER_SLOTS: int = max(0, int(os.getenv("JOB_WORKER_SLOTS", "2")))
+    JOB_CONCURRENCY: str = os.getenv("JOB_CONCURRENCY", "")
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "5"))
+    JOB_STALE_SECONDS: int = int(os.getenv("JOB_STALE_SECONDS", "120"))
+    JOB_RETRY_BACKOFF_SECONDS: int = int(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+    JOB_RETENTION_DAYS: int = int(os.getenv("JOB_RETENTION_DAYS", "30"))
+
+    # Data-quality rescoring after a metamodel edit (weights, required flags,
+    # counting stakeholder roles) runs as a background job that starts this
+    # many seconds after the last edit to the type, so a burst of saves costs
+    # one pass over its cards.
+    DQ_RESCORE_DEBOUNCE_SECONDS: float = float(os.getenv("DQ_RESCORE_DEBOUNCE_SECONDS", "10"))
+
+    # Removing a field or select option from a card type rewrites the stored
+    # attributes of its cards (app/services/metamodel_migration.py). Up to
+    # METAMODEL_MIGRATION_INLINE_MAX_CARDS affected cards are rewritten inside
+    # the save; more are left to a background job that commits every
+    # METAMODEL_MIGRATION_CHUNK_SIZE cards.
+    METAMODEL_MIGRATION_INLINE_MAX_CARDS: int = int(
+        os.getenv("METAMODEL_MIGRATION_INLINE_MAX_CARDS", "1000")
+    )
+    METAMODEL_MIGRATION_CHUNK_SIZE: int = max(
+        1, int(os.getenv("METAMODEL_MIGRATION_CHUNK_SIZE", "1000"))
+    )
+
+    # Per-request SQL query profiler (app/core/query_profiler.py). Counting is
+    # a dict increment per statement, so it is on by default everywhere. The
+    # ``X-Query-Count`` / ``X-Query-N-Plus-One`` response headers would show
+    # any caller how the backend queries, so they are only sent outside
+    # production unless QUERY_PROFILER_HEADERS says otherwise. The sample rate
+    # only decides how many ordinary requests land in the admin report —
+    # requests with a suspected N+1 (a statement shape repeated THRESHOLD
+    # times) are always kept.
+    QUERY_PROFILER_ENABLED: bool = os.getenv("QUERY_PROFILER_ENABLED", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    QUERY_PROFILER_HEADERS: bool = os.getenv(
+        "QUERY_PROFILER_HEADERS",
+        "false" if os.getenv("ENVIRONMENT", "development") == "production" else "true",
+    ).lower() in ("1", "true", "yes")
+    QUERY_PROFILER_SAMPLE_RATE: float = float(
+        os.getenv(
+            "QUERY_PROFILER_SAMPLE_RATE",
+            "1.0" if os.getenv("ENVIRONMENT", "development") == "development" else "0.01",
+        )
+    )
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = int(
+        os.getenv("QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", "10")
+    )
+    QUERY_PROFILER_REPORT_SIZE: int = int(os.getenv("QUERY_PROFILER_REPORT_SIZE", "200"))
+
+    # Seconds ``get_current_user`` may reuse a user row instead of selecting it
+    # again (app/services/principal_cache.py). Updates evict the entry in the
+    # process that made them and, in multi-worker mode, in its peers on commit;
+    # the TTL bounds staleness should such a notification be lost. 0 disables
+    # the cache.
+    USER_PRINCIPAL_CACHE_TTL: float = float(os.getenv("USER_PRINCIPAL_CACHE_TTL", "15"))
+
+    # Seconds the PPM portfolio Gantt may be served from a snapshot
+    # (app/services/ppm_gantt_cache.py). Writes to the initiatives, their
+    # reports, costs, tasks and stakeholders drop it in every worker; 0
+    # disables the cache.
+    PPM_GANTT_CACHE_TTL: float = float(os.getenv("PPM_GANTT_CACHE_TTL", "60"))
+
+    # Card listing totals (app/services/card_counts.py). ``?count=cached``
+    # keeps exact counts per filter combination for CARD_COUNT_CACHE_TTL
+    # seconds; writes to cards, relations and stakeholders drop them in every
+    # worker (0 disables the cache). ``?count=estimated`` trusts the planner's
+    # row estimate from CARD_COUNT_EXACT_BELOW rows up and counts exactly
+    # below that.
+    CARD_COUNT_CACHE_TTL: float = float(os.getenv("CARD_COUNT_CACHE_TTL", "300"))
+    CARD_COUNT_EXACT_BELOW: int = int(os.getenv("CARD_COUNT_EXACT_BELOW", "10000"))
+
+    # Report responses (app/services/report_cache.py) are kept per report,
+    # parameters, permission shape and landscape version; any write to cards,
+    # relations, tags, stakeholders, the metamodel or the stored endoflife.date
+    # cycles moves the version in every worker. REPORT_CACHE_SIZE caps the
+    # entries (least recently used go first); REPORT_CACHE_TTL bounds how long
+    # one is served after a change made outside the ORM. 0 in either disables
+    # the cache.
+    REPORT_CACHE_SIZE: int = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+    REPORT_CACHE_TTL: float = float(os.getenv("REPORT_CACHE_TTL", "600"))
+
+    # GET /metamodel/types and /metamodel/relation-types are served from a
+    # pre-serialized body with a strong ETag (app/services/metamodel_cache.py);
+    # any metamodel write drops it in every worker. The TTL bounds how long a
+    # body is served after a change made outside the ORM; 0 disables the cache.
+    METAMODEL_CACHE_TTL: float = float(os.getenv("METAMODEL_CACHE_TTL", "3600"))
+
+    # Card detail relation counts — GET /cards/{id}/relation-summary and the
+    # descendant roll-up (app/services/relation_rollup.py) — are kept per
+    # card until a relation, the hierarchy or the metamodel changes in any
+    # worker. The TTL bounds how long one is served after a change made
+    # outside the ORM; 0 disables the cache.
+    RELATION_SUMMARY_CACHE_TTL: float = float(os.getenv("RELATION_SUMMARY_CACHE_TTL", "300"))
+
+    # endoflife.date release cycles are kept in ``eol_product_cycles``
+    # (app/services/eol_cycles.py) and read from there by the EOL report and
+    # GET /eol/products/{product}. A product confirmed upstream more than
+    # EOL_CACHE_TTL seconds ago is revalidated (ETag / If-Modified-Since) by
+    # the ``eol.refresh_cycles`` job, EOL_REFRESH_CONCURRENCY requests at a
+    # time; readers keep the stored copy meanwhile. EOL_FIXTURE_PATH points at
+    # a JSON file of ``{"product": [cycles...]}`` used instead of the network,
+    # for air-gapped installations and demos.
+    EOL_CACHE_TTL: float = float(os.getenv("EOL_CACHE_TTL", "86400"))
+    EOL_REFRESH_CONCURRENCY: int = int(os.getenv("EOL_REFRESH_CONCURRENCY", "4"))
+    EOL_FIXTURE_PATH: str = os.getenv("EOL_FIXTURE_PATH", "")
+
     RESET_DB: bool = os.getenv("RESET_DB", "").lower() in ("1", "true", "yes")
     SEED_DEMO: bool = os.getenv("SEED_DEMO", "").lower() in ("1", "true", "yes")
     SEED_BPM: bool = os.getenv("SEED_BPM", "").lower() in ("1", "true", "yes")
@@ -68,6 +221,14 @@ class Settings:
     SEED_SECURITY: bool = os.getenv("SEED_SECURITY", "").lower() in ("1", "true", "yes")
 
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production")
+
+    # bcrypt cost factor for new password hashes (each +1 doubles the time).
+    # Existing hashes made with a different cost are upgraded transparently on
+    # the user's next successful login. Hashing runs on a dedicated thread pool
+    # of PASSWORD_HASH_CONCURRENCY workers (app/core/security.py); logins beyond
+    # that queue rather than compete for the CPU with the rest of the API.
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_CONCURRENCY: int = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "2"))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
     # Lifetime of an SSO-gated web-portal visitor session (account-less). Kept
@@ -138,6 +299,18 @@ class Settings:
     EXTENSION_MAX_WRITES_PER_BATCH: int = int(os.getenv("EXTENSION_MAX_WRITES_PER_BATCH", "500"))
     EXTENSION_MAX_BATCHES_PER_MINUTE: int = int(os.getenv("EXTENSION_MAX_BATCHES_PER_MINUTE", "60"))
 
+    # Durable extension event subscriptions (SDK 1.6) read the persisted
+    # ``events`` table past a per-extension cursor on the leader worker: how
+    # often it polls, how many events a pass reads, how many times a failing
+    # handler is retried before its event is skipped, and how long events may
+    # wait on an open transaction before a warning names it.
+    EXTENSION_EVENT_POLL_SECONDS: float = float(os.getenv("EXTENSION_EVENT_POLL_SECONDS", "5"))
+    EXTENSION_EVENT_BATCH_SIZE: int = int(os.getenv("EXTENSION_EVENT_BATCH_SIZE", "200"))
+    EXTENSION_EVENT_MAX_ATTEMPTS: int = int(os.getenv("EXTENSION_EVENT_MAX_ATTEMPTS", "5"))
+    EXTENSION_EVENT_LAG_WARN_SECONDS: float = float(
+        os.getenv("EXTENSION_EVENT_LAG_WARN_SECONDS", "300")
+    )
+
     # AI / LLM (optional — disabled by default)
     AI_PROVIDER_URL: str = os.getenv("AI_PROVIDER_URL", "")
     AI_MODEL: str = os.getenv("AI_MODEL", "")
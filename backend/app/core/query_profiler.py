@@ -0,0 +1,314 @@
+"""Per-request SQL query profiler with N+1 detection.
+
+A single ``before_cursor_execute`` listener on the SQLAlchemy ``Engine`` class
+counts every statement issued while a *profile* is active. Profiles are opened
+per HTTP request by ``QueryProfilerMiddleware`` (a pure ASGI middleware, so SSE
+and streamed CSV responses are not re-wrapped) and by ``profile_queries()`` in
+tests and scripts. They stack: a test can hold an outer profile around a client
+call while the middleware holds the inner per-request one, and both count.
+
+Statements are grouped by *shape* — the SQL text with whitespace collapsed and
+bind-parameter lists folded, so ``IN ($1, $2, $3)`` and ``IN ($1)`` land in the
+same bucket. A shape repeated ``QUERY_PROFILER_N_PLUS_ONE_THRESHOLD`` times or
+more inside one request is flagged as a likely N+1 (a per-row query inside a
+loop) and logged once per (route, shape).
+
+Overhead when no profile is active is one contextvar read per statement; with a
+profile active it is a dict increment on the raw statement text. Shapes are
+only worked out when a profile is reported, and only for a profile holding at
+least the threshold's number of statements (fewer cannot repeat a shape that
+often); each distinct statement text is normalised once per process.
+Finished profiles are sampled into a bounded in-memory ring
+(``QUERY_PROFILER_SAMPLE_RATE``) that backs the admin report at
+``GET /api/v1/diagnostics/queries``. Requests with a flagged shape are always
+kept, whatever the sample rate — they are the point of the report. The ring is
+per process and resets on restart.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+N_PLUS_ONE_HEADER = "X-Query-N-Plus-One"
+_QUERY_COUNT_KEY = QUERY_COUNT_HEADER.lower().encode()
+_N_PLUS_ONE_KEY = N_PLUS_ONE_HEADER.lower().encode()
+
+# Shapes longer than this are truncated in reports — the head of a statement
+# identifies it; the tail of a 40-column SELECT list does not.
+_SHAPE_REPORT_CHARS = 400
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# asyncpg numbered params ($1) and psycopg pyformat (%(name)s).
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s")
+# A parenthesised list of two or more placeholders — expanded IN lists.
+_PARAM_LIST_RE = re.compile(r"\(\s*\$\?(?:\s*,\s*\$\?)+\s*\)")
+# SQLAlchemy's "expanding" bind params render as __[POSTCOMPILE_name].
+_POSTCOMPILE_RE = re.compile(r"__\[POSTCOMPILE_\w+\]")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape for grouping."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _PARAM_RE.sub("$?", shape)
+    shape = _POSTCOMPILE_RE.sub("$?", shape)
+    return _PARAM_LIST_RE.sub("($?)", shape)
+
+
+class QueryProfile:
+    """Statement counts for one request (or one ``profile_queries`` block)."""
+
+    __slots__ = ("label", "route", "total", "statements", "started", "elapsed_ms")
+
+    def __init__(self, label: str | None = None) -> None:
+        self.label = label
+        self.route: str | None = None
+        self.total = 0
+        # Raw statement text → count. Normalisation is deferred to report
+        # time so the per-statement hook never runs a regex.
+        self.statements: Counter[str] = Counter()
+        self.started = time.perf_counter()
+        self.elapsed_ms: float | None = None
+
+    def record(self, statement: str) -> None:
+        self.total += 1
+        self.statements[statement] += 1
+
+    def shapes(self) -> Counter[str]:
+        shapes: Counter[str] = Counter()
+        for statement, count in self.statements.items():
+            shapes[normalize_statement(statement)] += count
+        return shapes
+
+    def n_plus_one(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        """Return ``(shape, count)`` pairs repeated at least ``threshold`` times."""
+        limit = threshold or settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+        if self.total < limit:
+            return []
+        return [(shape, n) for shape, n in self.shapes().most_common() if n >= limit]
+
+    def finish(self) -> None:
+        self.elapsed_ms = round((time.perf_counter() - self.started) * 1000, 1)
+
+    def to_dict(self, *, top: int = 5) -> dict:
+        shapes = self.shapes()
+        flagged = self.n_plus_one()
+        return {
+            "route": self.route or self.label,
+            "query_count": self.total,
+            "distinct_shapes": len(shapes),
+            "elapsed_ms": self.elapsed_ms,
+            "n_plus_one": [
+                {"shape": shape[:_SHAPE_REPORT_CHARS], "count": n} for shape, n in flagged
+            ],
+            "top_shapes": [
+                {"shape": shape[:_SHAPE_REPORT_CHARS], "count": n}
+                for shape, n in shapes.most_common(top)
+            ],
+        }
+
+
+# Stack of active profiles for the current task. A tuple, so nested
+# ``profile_queries`` blocks never mutate a parent's view.
+_active: ContextVar[tuple[QueryProfile, ...]] = ContextVar("query_profiles", default=())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profiles = _active.get()
+    if not profiles:
+        return
+    for profile in profiles:
+        profile.record(statement)
+
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+def install_query_profiler() -> None:
+    """Attach the statement listener to every SQLAlchemy engine. Idempotent."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        _installed = True
+
+
+@contextmanager
+def profile_queries(label: str | None = None) -> Iterator[QueryProfile]:
+    """Count every statement issued inside the block.
+
+    Works with any engine, including the test engine, and nests — see the
+    module docstring. The profile is finished (``elapsed_ms`` set) on exit.
+    """
+    install_query_profiler()
+    profile = QueryProfile(label)
+    token = _active.set((*_active.get(), profile))
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+        profile.finish()
+
+
+# ---------------------------------------------------------------------------
+# Sampled report
+# ---------------------------------------------------------------------------
+
+_recent: deque[dict] = deque(maxlen=max(1, settings.QUERY_PROFILER_REPORT_SIZE))
+# (route, shape) pairs already logged — bounded so a pathological route can't
+# grow it without limit; once full, new pairs are reported but not logged.
+_warned: set[tuple[str, str]] = set()
+_WARNED_MAX = 1000
+
+
+def _should_sample(flagged: bool) -> bool:
+    if flagged:
+        return True
+    rate = settings.QUERY_PROFILER_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def record_request(profile: QueryProfile, method: str) -> None:
+    """Sample a finished request profile into the admin report ring."""
+    flagged = profile.n_plus_one()
+    route = f"{method} {profile.route or profile.label or '?'}"
+    for shape, count in flagged:
+        key = (route, shape)
+        if key in _warned or len(_warned) >= _WARNED_MAX:
+            continue
+        _warned.add(key)
+        logger.warning(
+            "Possible N+1 on %s: statement shape repeated %d times in one request: %s",
+            route,
+            count,
+            shape[:_SHAPE_REPORT_CHARS],
+        )
+    if not _should_sample(bool(flagged)):
+        return
+    entry = profile.to_dict()
+    entry["route"] = route
+    entry["recorded_at"] = datetime.now(timezone.utc).isoformat()
+    _recent.append(entry)
+
+
+def recent_reports() -> list[dict]:
+    """Sampled request profiles, newest first."""
+    return list(reversed(_recent))
+
+
+def route_summary() -> list[dict]:
+    """Aggregate the sampled profiles per route, worst offenders first."""
+    by_route: dict[str, dict] = {}
+    for entry in _recent:
+        agg = by_route.setdefault(
+            entry["route"],
+            {
+                "route": entry["route"],
+                "samples": 0,
+                "total_queries": 0,
+                "max_queries": 0,
+                "n_plus_one_samples": 0,
+            },
+        )
+        agg["samples"] += 1
+        agg["total_queries"] += entry["query_count"]
+        agg["max_queries"] = max(agg["max_queries"], entry["query_count"])
+        if entry["n_plus_one"]:
+            agg["n_plus_one_samples"] += 1
+    rows = []
+    for agg in by_route.values():
+        total = agg.pop("total_queries")
+        agg["avg_queries"] = round(total / agg["samples"], 1)
+        rows.append(agg)
+    rows.sort(key=lambda r: (-r["n_plus_one_samples"], -r["max_queries"]))
+    return rows
+
+
+def clear_reports() -> None:
+    _recent.clear()
+    _warned.clear()
+
+
+# ---------------------------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------------------------
+
+
+def _route_template(scope) -> str | None:
+    """The matched route's path template, e.g. ``/api/v1/cards/{card_id}``.
+
+    FastAPI stores the matched ``APIRoute`` on the scope during routing, which
+    happens downstream of this middleware but before the response starts.
+    Depending on the FastAPI version that route carries its full path or only
+    the path below its router's prefix; in the latter case the prefix is taken
+    from the concrete request path (router prefixes never hold parameters).
+    """
+    route = scope.get("route")
+    template: str | None = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return None
+    path_parts = scope.get("path", "").rstrip("/").split("/")
+    template_parts = template.rstrip("/").split("/")
+    if len(path_parts) > len(template_parts):
+        prefix = "/".join(path_parts[: len(path_parts) - len(template_parts) + 1])
+        template = prefix + template
+    return template
+
+
+class QueryProfilerMiddleware:
+    """Profile every HTTP request and report the statement count as a header.
+
+    The headers are left off when ``QUERY_PROFILER_HEADERS`` is false — the
+    default in production — and the request is still profiled for the
+    admin report. Pure ASGI — the response stream is passed through untouched apart from the
+    headers added to ``http.response.start``. Statements issued after the
+    headers are sent (the body of a streaming response) still count towards
+    the sampled report, just not the header.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+
+            async def send_with_count(message) -> None:
+                if message["type"] == "http.response.start" and settings.QUERY_PROFILER_HEADERS:
+                    headers = list(message.get("headers", []))
+                    headers.append((_QUERY_COUNT_KEY, str(profile.total).encode()))
+                    flagged = profile.n_plus_one()
+                    if flagged:
+                        headers.append((_N_PLUS_ONE_KEY, str(len(flagged)).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_count)
+            finally:
+                profile.route = _route_template(scope) or scope.get("path")
+
+        record_request(profile, scope.get("method", ""))
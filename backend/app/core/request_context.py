@@ -0,0 +1,143 @@
+"""Per-request context: origin, batch, endpoint and the decoded access token.
+
+``RequestContextMiddleware`` runs once per HTTP request, ahead of routing. It
+mirrors the audit headers into the ``event_bus`` contextvars and decodes the
+JWT exactly once into a ``RequestPrincipal`` stored on the ASGI scope state,
+where ``get_current_user`` (``app/api/deps.py``) and the impersonation-aware
+auth endpoints read it instead of decoding the token again.
+
+Pure ASGI on purpose: Starlette's ``BaseHTTPMiddleware`` (``app.middleware
+("http")``) runs the downstream app in a separate task and pipes every response
+— SSE streams and CSV exports included — through an in-memory stream. This
+middleware only sets contextvars around the call and never touches the
+response.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+
+from starlette.requests import HTTPConnection
+
+from app.core.security import decode_access_token
+from app.services.event_bus import (
+    request_batch_id,
+    request_endpoint,
+    request_impersonation,
+    request_origin,
+)
+
+# Key under ``scope["state"]`` — i.e. ``request.state.principal``.
+_PRINCIPAL_STATE_KEY = "principal"
+
+_ORIGIN_ALLOWED = {"mcp", "web", "api"}
+
+
+@dataclass(frozen=True, slots=True)
+class RequestPrincipal:
+    """The caller as far as the access token tells: no database involved.
+
+    ``claims`` is ``None`` when there is no token or it failed verification
+    (expired, tampered, wrong issuer); ``token`` distinguishes the two.
+    """
+
+    token: str = ""
+    claims: dict | None = None
+
+    @property
+    def user_id(self) -> uuid.UUID | None:
+        sub = (self.claims or {}).get("sub")
+        if not sub:
+            return None
+        try:
+            return uuid.UUID(str(sub))
+        except ValueError:
+            return None
+
+    @property
+    def impersonated_role(self) -> str | None:
+        return (self.claims or {}).get("impersonated_role") or None
+
+
+def _token_from(conn: HTTPConnection) -> str:
+    auth = conn.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        return auth[7:]
+    # Fall back to the httpOnly cookie set by /auth/login.
+    return conn.cookies.get("access_token", "")
+
+
+def _build_principal(conn: HTTPConnection) -> RequestPrincipal:
+    token = _token_from(conn)
+    return RequestPrincipal(token=token, claims=decode_access_token(token) if token else None)
+
+
+def request_principal(conn: HTTPConnection) -> RequestPrincipal:
+    """The principal decoded by the middleware for this request.
+
+    Falls back to decoding on the spot when the middleware is not installed
+    (a bare test app, a sub-application), so callers never need to care.
+    """
+    state = conn.scope.get("state")
+    principal = state.get(_PRINCIPAL_STATE_KEY) if state is not None else None
+    if principal is None:
+        principal = _build_principal(conn)
+        conn.scope.setdefault("state", {})[_PRINCIPAL_STATE_KEY] = principal
+    return principal
+
+
+class RequestContextMiddleware:
+    """Set the per-request contextvars and decode the access token once."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        conn = HTTPConnection(scope)
+
+        # Mirror ``X-Turbo-EA-Origin`` for ``event_bus.publish``. Whitelisted
+        # so a misbehaving caller can't smuggle arbitrary strings into the
+        # audit log.
+        raw_origin = conn.headers.get("X-Turbo-EA-Origin", "").strip().lower()
+        origin = raw_origin if raw_origin in _ORIGIN_ALLOWED else None
+
+        # MCP write tools open a mutation batch and pass the id back on every
+        # subsequent write via ``X-Turbo-EA-Batch``. A malformed UUID is
+        # silently dropped — a forged header value must never land on the
+        # audit log as a real batch.
+        batch_id: uuid.UUID | None = None
+        batch_raw = conn.headers.get("X-Turbo-EA-Batch", "").strip()
+        if batch_raw:
+            try:
+                batch_id = uuid.UUID(batch_raw)
+            except ValueError:
+                batch_id = None
+
+        # Role impersonation ("View as role"): the JWT carries an
+        # ``impersonated_role`` claim. Permission checks and audit stamping
+        # both read the contextvar. An invalid token leaves it unset —
+        # get_current_user rejects the request later.
+        principal = _build_principal(conn)
+        scope.setdefault("state", {})[_PRINCIPAL_STATE_KEY] = principal
+        impersonation: tuple[str, str] | None = None
+        if principal.impersonated_role and principal.user_id:
+            impersonation = (str(principal.user_id), principal.impersonated_role)
+
+        origin_token = request_origin.set(origin)
+        batch_token = request_batch_id.set(batch_id)
+        # Label for auto-created mutation batches. The matched route isn't
+        # known yet (routing runs downstream), so the concrete path it is.
+        endpoint_token = request_endpoint.set(f"{scope.get('method', '')} {scope.get('path', '')}")
+        impersonation_token = request_impersonation.set(impersonation)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_origin.reset(origin_token)
+            request_batch_id.reset(batch_token)
+            request_endpoint.reset(endpoint_token)
+            request_impersonation.reset(impersonation_token)
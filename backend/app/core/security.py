@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import re
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -116,9 +120,57 @@ def portal_token_matches(claims: dict | None, resource: str, resource_id: uuid.U
     return claims.get("psid") == str(resource_id)
 
 
+# ---------------------------------------------------------------------------
+# Password hashing
+# ---------------------------------------------------------------------------
+#
+# A bcrypt hash or check costs 100–300 ms of CPU at the default cost factor.
+# Request handlers must use the ``*_async`` variants, which run it on a small
+# dedicated thread pool (bcrypt releases the GIL while hashing): the event loop
+# keeps serving SSE streams and API calls during a burst of logins, and the
+# pool size caps how many hashes run at once — extra logins queue instead of
+# starving the CPU. The sync functions remain for scripts and startup seeding.
+
+_BCRYPT_COST_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+_hash_pool: ThreadPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
+
+
+def _password_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ThreadPoolExecutor(
+                    max_workers=max(1, settings.PASSWORD_HASH_CONCURRENCY),
+                    thread_name_prefix="password-hash",
+                )
+    return _hash_pool
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode(), salt).decode()
 
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True when ``hashed`` was made with a cost factor other than the configured one."""
+    match = _BCRYPT_COST_RE.match(hashed or "")
+    return match is None or int(match.group(1)) != settings.BCRYPT_ROUNDS
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` off the event loop, on the bounded hashing pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool(), hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """``verify_password`` off the event loop, on the bounded hashing pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool(), verify_password, password, hashed)
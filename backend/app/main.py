@@ -15,6 +15,13 @@ from app.core.logging_config import configure_logging
 from app.core.rate_limit import limiter
 from app.database import engine
 from app.models import Base
+from app.services.cluster import (
+    LeaderElection,
+    cancel_tasks,
+    cluster_bus,
+    multi_worker,
+    startup_lock,
+)
 
 configure_logging(environment=settings.ENVIRONMENT)
 logger = logging.getLogger(__name__)
@@ -100,6 +107,119 @@ async def _purge_mutation_batches_loop() -> None:
             logger.exception("Error in mutation-batch purge loop")
 
 
+async def _blob_gc_loop() -> None:
+    """Hourly sweep of attachment blobs no ``file_attachments`` row references
+    (deleted attachments, purged cards, uploads whose insert failed). Blobs
+    touched within ``BLOB_GC_GRACE_SECONDS`` are left alone so an upload in
+    flight never loses its bytes."""
+    from app.database import async_session
+    from app.services.blob_store import collect_unreferenced_blobs, get_blob_store
+
+    while True:
+        try:
+            await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+            async with async_session() as db:
+                await collect_unreferenced_blobs(
+                    db, get_blob_store(), grace_seconds=settings.BLOB_GC_GRACE_SECONDS
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in attachment blob GC loop")
+
+
+async def _event_partition_loop() -> None:
+    """Hourly upkeep of the monthly ``events`` partitions: create the coming
+    months (and any month stranded in the default partition), then apply the
+    admin's event retention policy (``general_settings.eventRetentionMonths`` /
+    ``eventRetentionMode``, re-read each cycle; ``0`` months keeps everything).
+    """
+    from sqlalchemy import select
+
+    from app.database import async_session
+    from app.models.app_settings import AppSettings
+    from app.services.event_partitions import (
+        DEFAULT_RETENTION_MODE,
+        apply_event_retention,
+        ensure_event_partitions,
+    )
+
+    while True:
+        try:
+            await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+            async with async_session() as db:
+                await ensure_event_partitions(db)
+                settings_row = (
+                    await db.execute(select(AppSettings).where(AppSettings.id == "default"))
+                ).scalar_one_or_none()
+                general = (settings_row.general_settings if settings_row else None) or {}
+                await apply_event_retention(
+                    db,
+                    months=int(general.get("eventRetentionMonths") or 0),
+                    mode=general.get("eventRetentionMode", DEFAULT_RETENTION_MODE),
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in event partition loop")
+
+
+async def _diagram_compaction_loop() -> None:
+    """Hourly conversion of stored process diagram versions into deltas
+    against periodic snapshots (``DIAGRAM_SNAPSHOT_INTERVAL``), in batches of
+    processes — history saved before versions were delta-compressed."""
+    from app.database import async_session
+    from app.services.diagram_versions import compact_process_diagrams
+
+    while True:
+        try:
+            await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+            async with async_session() as db:
+                await compact_process_diagrams(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in process diagram compaction loop")
+
+
+async def _purge_background_jobs_loop() -> None:
+    """Hourly deletion of background jobs that finished more than
+    ``JOB_RETENTION_DAYS`` ago, with their results and errors."""
+    from app.database import async_session
+    from app.services.background_jobs import purge_finished_jobs
+
+    while True:
+        try:
+            await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+            async with async_session() as db:
+                deleted = await purge_finished_jobs(db)
+            if deleted:
+                logger.info("Purged %d finished background job(s)", deleted)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in background job purge loop")
+
+
+async def _eol_refresh_loop() -> None:
+    """Hourly check for endoflife.date cycles older than ``EOL_CACHE_TTL``;
+    queues one ``eol.refresh_cycles`` job when there are any."""
+    from app.database import async_session
+    from app.services.eol_cycles import schedule_refresh, stale_products
+
+    while True:
+        try:
+            await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+            async with async_session() as db:
+                if await stale_products(db):
+                    await schedule_refresh(db)
+                    await db.commit()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in EOL refresh loop")
+
+
 async def _ops_access_maintenance_loop() -> None:
     """Hourly maintenance for the control-plane ops API: deactivate time-boxed
     rescue accounts past ``access_expires_at`` (defense in depth on top of the
@@ -401,18 +521,6 @@ async def _promote_recurring_tasks_loop() -> None:
             await asyncio.sleep(3600)
 
 
-# Marker in app_settings.general_settings recording that the one-shot
-# canonical data-quality rescore has run on this install. The key is
-# VERSIONED: whenever the scoring rules change, bump the suffix so the next
-# boot re-scores the whole inventory once — stored scores otherwise stay
-# stale until each card is individually edited. Old markers remain in
-# app_settings harmlessly.
-#   V2 (2.52.0) — the mandatory-field gate that pins incomplete cards to 0.
-#   V3 (2.59.0) — the stakeholders bucket became a single yes/no slot instead
-#                 of one slot per role defined on the card type.
-_DQ_RESCORE_FLAG = "dataQualityCanonicalRescoreDoneV3"
-
-
 async def _one_shot_upgrade_announcement() -> None:
     """Tell every user what changed, once, on the first boot of a new version.
 
@@ -445,9 +553,10 @@ async def _one_shot_data_quality_rescore() -> None:
     see the relation/tag/stakeholder buckets) and workspace imports made by
     importer versions that scored cards before their relations were applied.
     Both inflate or depress the Dashboard's Average Completion until each card
-    is individually edited. This one-shot heals the whole inventory on the
-    first startup after upgrading; a marker in ``app_settings`` makes every
-    later boot a no-op (discussion #667).
+    is individually edited. This heals the whole inventory on the first
+    startup after upgrading; the scoring-rules fingerprint stored in
+    ``app_settings`` makes every later boot with unchanged rules a no-op
+    (discussion #667).
     """
     from app.database import async_session
 
@@ -468,27 +577,42 @@ async def _one_shot_data_quality_rescore() -> None:
 
 
 async def run_dq_rescore_once(db) -> int | None:
-    """Rescore all cards unless the settings marker says it already ran.
+    """Rescore the cards of every type whose scoring rules changed.
+
+    A type's rules are fingerprinted (``data_quality.rules_fingerprints``) and
+    the fingerprint recorded with its scores, so a boot only walks the types
+    that changed since — every type on an install that never recorded one, or
+    after ``data_quality.SCORER_VERSION`` is bumped. Older installs carry the
+    ``dataQualityCanonicalRescoreDone*`` markers this replaced; they remain in
+    app_settings harmlessly.
 
-    Returns the changed-card count, or ``None`` when the marker was set and
-    nothing was done. The caller commits.
+    Returns the changed-card count, or ``None`` when every fingerprint matched
+    and nothing was done. The caller commits.
     """
     from sqlalchemy import select
 
-    from app.models.app_settings import AppSettings
-    from app.services.data_quality import recompute_all_data_quality
+    from app.models.card import Card
+    from app.services.data_quality import (
+        recompute_all_data_quality,
+        record_fingerprints,
+        rescore_cards,
+        rules_fingerprints,
+        stored_fingerprints,
+    )
 
-    row = (
-        await db.execute(select(AppSettings).where(AppSettings.id == "default"))
-    ).scalar_one_or_none()
-    if row is not None and (row.general_settings or {}).get(_DQ_RESCORE_FLAG):
+    current = await rules_fingerprints(db)
+    stored = await stored_fingerprints(db)
+    stale = {key for key, fp in current.items() if stored.get(key) != fp}
+    if not stale and stored:
         return None
-    changed = await recompute_all_data_quality(db)
-    if row is None:
-        row = AppSettings(id="default", general_settings={}, email_settings={})
-        db.add(row)
-    row.general_settings = {**(row.general_settings or {}), _DQ_RESCORE_FLAG: True}
-    await db.flush()
+    if stale == current.keys():
+        changed = await recompute_all_data_quality(db)
+    else:
+        ids = (
+            await db.execute(select(Card.id).where(Card.type.in_(stale), Card.status != "ARCHIVED"))
+        ).scalars()
+        changed = await rescore_cards(db, list(ids))
+    await record_fingerprints(db, current)
     return changed
 
 
@@ -622,22 +746,13 @@ async def _ensure_ollama_model() -> None:
         logger.exception("[ai] Unexpected error pulling model '%s'", model)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # ── C2: Refuse startup with default secret key in non-development envs ──
-    if settings.SECRET_KEY in _DEFAULT_SECRET_KEYS:
-        env = settings.ENVIRONMENT
-        if env != "development":
-            raise RuntimeError(
-                "SECRET_KEY must be set to a strong random value in production. "
-                'Generate one with: python -c "import secrets; print(secrets.token_urlsafe(64))"'
-            )
-        else:
-            logger.warning(
-                "Using default SECRET_KEY — acceptable for development only. "
-                "Set a strong SECRET_KEY before deploying to production."
-            )
+async def _prepare_database() -> list[asyncio.Task]:
+    """Migrate the schema, hydrate runtime settings, seed, initialize extensions.
 
+    Runs under ``startup_lock`` so that with several workers only the first
+    to get there migrates and seeds; the rest find the work done. Returns the
+    extension event-dispatcher tasks for the caller to cancel on shutdown.
+    """
     from alembic.config import Config
     from sqlalchemy import inspect as sa_inspect
     from sqlalchemy import text
@@ -713,28 +828,40 @@ async def lifespan(app: FastAPI):
                 await conn.run_sync(Base.metadata.create_all)
             logger.info("[startup] create_all complete")
 
+    # Best-effort trigram indexes for text search: create_all can't build them
+    # (pg_trgm may be missing), and the extension may be enabled after the
+    # migration that first tried. A no-op once they exist.
+    from app.services.search_index import ensure_trigram_indexes
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ensure_trigram_indexes)
+
+    # Expression indexes for fields the metamodel declares ``indexed`` — they
+    # follow admin edits, so a restored or imported database may lack some.
+    # Built concurrently by a job: other replicas keep writing cards meanwhile.
+    from app.database import async_session
+    from app.services.background_jobs import enqueue_job
+
+    async with async_session() as _db:
+        await enqueue_job(_db, "metamodel.sync_attribute_indexes")
+        await _db.commit()
+
+    # Monthly event partitions for now and the months ahead, so no insert
+    # lands in the default partition while waiting for the leader's loop.
+    from app.services.event_partitions import ensure_event_partitions
+
+    async with async_session() as _db:
+        await ensure_event_partitions(_db)
+
     logger.info("[startup] Loading email settings...")
-    # Load DB-persisted email settings into runtime config
+    # Load DB-persisted email settings and the app title into runtime config.
+    # Shared with the cluster bus handler, so every worker hydrates the same way.
     from sqlalchemy import select as _sel
 
-    from app.database import async_session
-    from app.models.app_settings import AppSettings
+    from app.services.email_backends.runtime import load_runtime_settings
 
     async with async_session() as _db:
-        _res = await _db.execute(_sel(AppSettings).where(AppSettings.id == "default"))
-        _row = _res.scalar_one_or_none()
-        if _row and _row.email_settings:
-            from app.services.email_backends.runtime import apply_email_settings_to_runtime
-
-            # Shared with PATCH /settings/email and the workspace importer, so
-            # the method + OAuth/Graph fields survive a restart like smtp_*.
-            apply_email_settings_to_runtime(_row.email_settings)
-        # Seed the app title from the general_settings JSONB so email templates
-        # and any other consumers can read it off the singleton without a DB query.
-        if _row and _row.general_settings:
-            _title = (_row.general_settings.get("app_title") or "").strip()
-            if _title:
-                settings.APP_TITLE = _title
+        await load_runtime_settings(_db)
 
     logger.info("[startup] Email settings loaded, seeding metamodel...")
     # Seed default metamodel
@@ -858,129 +985,117 @@ async def lifespan(app: FastAPI):
     # ── Extension Store: mint/load the instance ID (licensing identity —
     # must exist before the registry evaluates license binding), then
     # reconcile statuses, load license/registry, run per-extension
-    # migrations, fire on_startup hooks, spawn job loops.
+    # migrations, fire on_startup hooks, spawn event dispatchers. The job
+    # loops run on the leader worker (_leader_jobs).
     from app.services.extensions.instance_id import ensure_instance_id
     from app.services.extensions.startup import initialize_extensions
 
     async with async_session() as db:
         await ensure_instance_id(db)
-    extension_job_tasks = await initialize_extensions(extension_load_report)
-
-    # Auto-configure bundled Ollama AI when AI_AUTO_CONFIGURE=true
-    ollama_task = None
-    if settings.AI_AUTO_CONFIGURE:
-        await _auto_configure_ai()
-        ollama_task = asyncio.create_task(_ensure_ollama_model())
-
-    # Start background task for auto-purging archived cards after 30 days
-    purge_task = asyncio.create_task(_purge_archived_cards_loop())
-
-    # Audit-log retention loop — deletes mutation_batches older than the
-    # configured window (default 15 days). Same cadence as the archived-
-    # card purge; events with batch_id pointing at the deleted rows just
-    # have their batch_id NULLed (FK is ON DELETE SET NULL).
-    batch_purge_task = asyncio.create_task(_purge_mutation_batches_loop())
+    return await initialize_extensions(extension_load_report)
 
-    # Capture an initial KPI baseline (no-op if table already has rows) and
-    # start the daily snapshot loop that powers dashboard trend indicators.
-    await _ensure_initial_kpi_snapshot()
-    kpi_task = asyncio.create_task(_kpi_snapshot_loop())
 
-    # Start the daily mitigation-task promotion loop that lifts
-    # scheduled cycles to open once their lead window opens.
-    promote_task = asyncio.create_task(_promote_recurring_tasks_loop())
-
-    # Daily extension-license auto-renewal from the store (no-op for
-    # manually issued licenses and on air-gapped installs).
-    license_refresh_task = asyncio.create_task(_license_refresh_loop())
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ── C2: Refuse startup with default secret key in non-development envs ──
+    if settings.SECRET_KEY in _DEFAULT_SECRET_KEYS:
+        env = settings.ENVIRONMENT
+        if env != "development":
+            raise RuntimeError(
+                "SECRET_KEY must be set to a strong random value in production. "
+                'Generate one with: python -c "import secrets; print(secrets.token_urlsafe(64))"'
+            )
+        else:
+            logger.warning(
+                "Using default SECRET_KEY — acceptable for development only. "
+                "Set a strong SECRET_KEY before deploying to production."
+            )
 
-    # Daily "a newer release exists" check that notifies administrators via the
-    # bell. Notification only — never downloads or installs anything.
-    update_check_task = asyncio.create_task(_update_check_loop())
+    async with startup_lock():
+        extension_dispatch_tasks = await _prepare_database()
+        # Auto-configure bundled Ollama AI when AI_AUTO_CONFIGURE=true
+        if settings.AI_AUTO_CONFIGURE:
+            await _auto_configure_ai()
 
-    # Daily "new / updated extensions in the store" check that notifies
-    # administrators via the bell. Notification only — never installs anything.
-    extension_store_task = asyncio.create_task(_extension_store_check_loop())
+    if multi_worker():
+        await cluster_bus.start()
+        logger.info("[startup] Multi-worker mode (WEB_CONCURRENCY=%d)", settings.WEB_CONCURRENCY)
 
-    # One-shot canonical data-quality rescore (guarded by a settings marker;
-    # a no-op on every boot after the first successful run).
-    dq_rescore_task = asyncio.create_task(_one_shot_data_quality_rescore())
+    # The maintenance loops run once per installation: with several workers
+    # the elected leader runs them, otherwise this process does.
+    leader = LeaderElection(_leader_jobs())
+    leader_task = asyncio.create_task(leader.run(), name="leader-election")
 
-    # One-shot "the app was updated" announcement to every user (guarded by a
-    # settings marker; a no-op on every boot that is not a version change).
-    upgrade_announce_task = asyncio.create_task(_one_shot_upgrade_announcement())
+    # Every worker drains the background job queue, unless JOB_WORKER_SLOTS=0.
+    worker_tasks = []
+    if settings.JOB_WORKER_SLOTS > 0:
+        from app.services.background_jobs import JobWorker
 
-    # Hourly ops-access maintenance: expire rescue accounts + purge ops nonces.
-    ops_access_task = asyncio.create_task(_ops_access_maintenance_loop())
+        worker_tasks.append(asyncio.create_task(JobWorker().run(), name="job-worker"))
 
     yield
 
-    # Cancel background tasks on shutdown
-    for ext_task in extension_job_tasks:
-        ext_task.cancel()
-    for ext_task in extension_job_tasks:
-        try:
-            await ext_task
-        except asyncio.CancelledError:
-            pass
-    purge_task.cancel()
-    try:
-        await purge_task
-    except asyncio.CancelledError:
-        pass
-    batch_purge_task.cancel()
-    try:
-        await batch_purge_task
-    except asyncio.CancelledError:
-        pass
-    kpi_task.cancel()
-    try:
-        await kpi_task
-    except asyncio.CancelledError:
-        pass
-    promote_task.cancel()
-    try:
-        await promote_task
-    except asyncio.CancelledError:
-        pass
-    license_refresh_task.cancel()
-    try:
-        await license_refresh_task
-    except asyncio.CancelledError:
-        pass
-    update_check_task.cancel()
-    try:
-        await update_check_task
-    except asyncio.CancelledError:
-        pass
-    extension_store_task.cancel()
-    try:
-        await extension_store_task
-    except asyncio.CancelledError:
-        pass
-    ops_access_task.cancel()
-    try:
-        await ops_access_task
-    except asyncio.CancelledError:
-        pass
-    if not dq_rescore_task.done():
-        dq_rescore_task.cancel()
-        try:
-            await dq_rescore_task
-        except asyncio.CancelledError:
-            pass
-    if not upgrade_announce_task.done():
-        upgrade_announce_task.cancel()
-        try:
-            await upgrade_announce_task
-        except asyncio.CancelledError:
-            pass
-    if ollama_task and not ollama_task.done():
-        ollama_task.cancel()
-        try:
-            await ollama_task
-        except asyncio.CancelledError:
-            pass
+    # Cancel background tasks on shutdown; running jobs go back to the queue.
+    await cancel_tasks([*worker_tasks, leader_task, *extension_dispatch_tasks])
+    await cluster_bus.stop()
+
+
+def _leader_jobs() -> list:
+    """Background work that must run in exactly one worker process."""
+    from app.services.extensions.startup import run_extension_jobs
+
+    async def kpi_snapshots() -> None:
+        # Capture an initial KPI baseline (no-op if table already has rows)
+        # before the daily snapshot loop that powers dashboard trend indicators.
+        await _ensure_initial_kpi_snapshot()
+        await _kpi_snapshot_loop()
+
+    jobs = [
+        # Extension job loops and durable event consumers (each gated on
+        # enablement + entitlement per tick).
+        lambda: run_extension_jobs(extension_load_report),
+        # Auto-purge archived cards after the configured retention window.
+        _purge_archived_cards_loop,
+        # Audit-log retention loop — deletes mutation_batches older than the
+        # configured window (default 15 days). Same cadence as the archived-
+        # card purge; events with batch_id pointing at the deleted rows just
+        # have their batch_id NULLed (FK is ON DELETE SET NULL).
+        _purge_mutation_batches_loop,
+        # Hourly deletion of attachment blobs no row references any more.
+        _blob_gc_loop,
+        # Hourly creation of upcoming event partitions and event retention.
+        _event_partition_loop,
+        # Hourly delta compaction of stored process diagram versions.
+        _diagram_compaction_loop,
+        # Hourly deletion of finished background jobs past JOB_RETENTION_DAYS.
+        _purge_background_jobs_loop,
+        # Hourly revalidation of stale endoflife.date cycles (as a background job).
+        _eol_refresh_loop,
+        kpi_snapshots,
+        # Daily mitigation-task promotion loop that lifts scheduled cycles to
+        # open once their lead window opens.
+        _promote_recurring_tasks_loop,
+        # Daily extension-license auto-renewal from the store (no-op for
+        # manually issued licenses and on air-gapped installs).
+        _license_refresh_loop,
+        # Daily "a newer release exists" check that notifies administrators via
+        # the bell. Notification only — never downloads or installs anything.
+        _update_check_loop,
+        # Daily "new / updated extensions in the store" check that notifies
+        # administrators via the bell. Notification only — never installs anything.
+        _extension_store_check_loop,
+        # One-shot canonical data-quality rescore (guarded by a settings marker;
+        # a no-op on every boot after the first successful run).
+        _one_shot_data_quality_rescore,
+        # One-shot "the app was updated" announcement to every user (guarded by
+        # a settings marker; a no-op on every boot that is not a version change).
+        _one_shot_upgrade_announcement,
+        # Hourly ops-access maintenance: expire rescue accounts + purge ops nonces.
+        _ops_access_maintenance_loop,
+    ]
+    if settings.AI_AUTO_CONFIGURE:
+        jobs.append(_ensure_ollama_model)
+    return jobs
 
 
 # ── H6: Conditionally disable OpenAPI docs in production ──
@@ -1006,96 +1121,29 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "X-Turbo-EA-Origin", "X-Turbo-EA-Batch"],
 )
 
-
-# ── Request origin tracking ──
-# The MCP server sets `X-Turbo-EA-Origin: mcp` on every backend call so the
-# audit trail can distinguish AI-agent-driven writes from web-UI writes.
-# `event_bus.publish` reads this contextvar and stamps it into the event
-# payload. Unknown / absent header => no tag (keeps existing UI events clean).
-import uuid as _uuid_for_batch  # noqa: E402
-
-from app.core.security import decode_access_token as _decode_token_for_impersonation  # noqa: E402
-from app.services.event_bus import (  # noqa: E402
-    request_batch_id as _request_batch_id,
-)
-from app.services.event_bus import (  # noqa: E402
-    request_endpoint as _request_endpoint,
-)
-from app.services.event_bus import (  # noqa: E402
-    request_impersonation as _request_impersonation,
-)
-from app.services.event_bus import (  # noqa: E402
-    request_origin as _request_origin,
+# ── Per-request SQL query profiler ──
+# Counts statements per request (``X-Query-Count`` response header), flags
+# repeated statement shapes as likely N+1s and samples the results into the
+# admin report at ``GET /api/v1/diagnostics/queries``. Pure ASGI, so streamed
+# responses pass through untouched. Disable with QUERY_PROFILER_ENABLED=false.
+from app.core.query_profiler import (  # noqa: E402
+    QueryProfilerMiddleware,
+    install_query_profiler,
 )
 
-_ORIGIN_ALLOWED = {"mcp", "web", "api"}
-
-
-async def capture_request_origin(request, call_next):
-    """Middleware that mirrors the request's ``X-Turbo-EA-Origin`` header
-    into a contextvar consumed by ``event_bus.publish``. Exported for
-    re-use in the test app fixture so audit-tagging behaviour is covered
-    end-to-end."""
-    raw = request.headers.get("X-Turbo-EA-Origin", "").strip().lower()
-    # Whitelist accepted values so a misbehaving caller can't smuggle
-    # arbitrary strings into the audit log.
-    origin: str | None = raw if raw in _ORIGIN_ALLOWED else None
-    token = _request_origin.set(origin)
-
-    # MCP write tools open a mutation batch and pass the id back on every
-    # subsequent write via ``X-Turbo-EA-Batch``. Mirror it into the
-    # event-bus contextvar so emitted events stamp the batch id. A bogus
-    # / malformed UUID is silently dropped — we never want a header value
-    # an attacker can forge to land on the audit log as a real batch.
-    batch_raw = request.headers.get("X-Turbo-EA-Batch", "").strip()
-    batch_id: _uuid_for_batch.UUID | None = None
-    if batch_raw:
-        try:
-            batch_id = _uuid_for_batch.UUID(batch_raw)
-        except ValueError:
-            batch_id = None
-    batch_token = _request_batch_id.set(batch_id)
-
-    # Capture an endpoint label (e.g. "PATCH /api/v1/cards/<id>") so
-    # auto-created mutation batches for non-MCP web/api writes land with
-    # a meaningful Tool column in the audit log. The matched FastAPI
-    # route isn't on ``request.scope`` yet at this point (routing runs
-    # downstream of this middleware), so the raw URL path is the best
-    # we can do — concrete UUIDs included.
-    endpoint_token = _request_endpoint.set(f"{request.method} {request.url.path}")
-
-    # Role-impersonation context: when an admin has activated a "View as
-    # role" session, the JWT carries an ``impersonated_role`` claim. Decode
-    # the token here (no DB round-trip — it's pure-Python) so that downstream
-    # permission checks via PermissionService and audit stamping via
-    # event_bus.publish both see the same impersonation state. JWT decode
-    # failures (missing/expired/tampered) silently leave the contextvar
-    # unset — request auth itself runs later in get_current_user and will
-    # reject the request there.
-    raw_auth = request.headers.get("Authorization", "")
-    raw_token = (
-        raw_auth[7:] if raw_auth.startswith("Bearer ") else request.cookies.get("access_token", "")
-    )
-    impersonation_pair: tuple[str, str] | None = None
-    if raw_token:
-        payload = _decode_token_for_impersonation(raw_token)
-        if payload:
-            impersonated_role = payload.get("impersonated_role")
-            sub = payload.get("sub")
-            if impersonated_role and sub:
-                impersonation_pair = (str(sub), str(impersonated_role))
-    impersonation_token = _request_impersonation.set(impersonation_pair)
+install_query_profiler()
+app.add_middleware(QueryProfilerMiddleware)
 
-    try:
-        return await call_next(request)
-    finally:
-        _request_origin.reset(token)
-        _request_batch_id.reset(batch_token)
-        _request_endpoint.reset(endpoint_token)
-        _request_impersonation.reset(impersonation_token)
 
+# ── Request context ──
+# The MCP server sets `X-Turbo-EA-Origin: mcp` on every backend call so the
+# audit trail can distinguish AI-agent-driven writes from web-UI writes;
+# `event_bus.publish` reads the contextvars this middleware sets. It also
+# decodes the access token once per request for get_current_user and the
+# role-impersonation checks. Pure ASGI — see app/core/request_context.py.
+from app.core.request_context import RequestContextMiddleware  # noqa: E402
 
-app.middleware("http")(capture_request_origin)
+app.add_middleware(RequestContextMiddleware)
 
 # ── Extension Store: load vendor-signed extensions BEFORE mounting the API ──
 # Routes are static once the app serves, so extension routers must be mounted
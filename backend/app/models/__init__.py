@@ -1,6 +1,7 @@
 from app.models.app_settings import AppSettings
 from app.models.architecture_decision import ArchitectureDecision
 from app.models.architecture_decision_card import ArchitectureDecisionCard
+from app.models.background_job import BackgroundJob
 from app.models.base import Base
 from app.models.bookmark import Bookmark
 from app.models.calculation import Calculation
@@ -13,9 +14,11 @@ from app.models.diagram_favorite import DiagramFavorite
 from app.models.diagram_group import DiagramGroup, diagram_group_members
 from app.models.document import Document
 from app.models.ea_principle import EAPrinciple
+from app.models.eol_product_cycles import EolProductCycles
 from app.models.event import Event
 from app.models.extension import (
     Extension,
+    ExtensionEventCursor,
     ExtensionInstall,
     ExtensionLicense,
     ExtensionSchemaVersion,
@@ -86,6 +89,7 @@ __all__ = [
     "TurboLensVendorHierarchy",
     "ArchitectureDecision",
     "ArchitectureDecisionCard",
+    "BackgroundJob",
     "Base",
     "FileAttachment",
     "User",
@@ -108,8 +112,10 @@ __all__ = [
     "ExtensionInstall",
     "ExtensionLicense",
     "ExtensionSchemaVersion",
+    "ExtensionEventCursor",
     "Document",
     "EAPrinciple",
+    "EolProductCycles",
     "Bookmark",
     "Calculation",
     "Diagram",
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDMixin
@@ -16,6 +16,15 @@ class ArchitectureDecision(Base, UUIDMixin, TimestampMixin):
 
     reference_number: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Maintained by Postgres; backs multi-word search (see Card.search_vector).
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(reference_number, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     status: Mapped[str] = mapped_column(String(50), default="draft")
     # Statuses: draft, in_review, signed
 
@@ -51,3 +60,7 @@ class ArchitectureDecision(Base, UUIDMixin, TimestampMixin):
     parent = relationship(
         "ArchitectureDecision", remote_side="ArchitectureDecision.id", lazy="noload"
     )
+
+    __table_args__ = (
+        Index("ix_architecture_decisions_search_vector", "search_vector", postgresql_using="gin"),
+    )
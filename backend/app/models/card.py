@@ -3,8 +3,8 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Computed, DateTime, Float, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDMixin
@@ -32,6 +32,17 @@ class Card(Base, UUIDMixin, TimestampMixin):
     # feature off. Distinct from ``external_id`` (import identity).
     reference: Mapped[str | None] = mapped_column(String(64), unique=True, index=True)
     alias: Mapped[str | None] = mapped_column(String(500))
+    # Maintained by Postgres on every write; backs multi-word search
+    # (``search_rank.search_match``). Deferred so entity loads never fetch it.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(alias, '') || ' ' "
+            "|| coalesce(reference, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL")
@@ -50,3 +61,19 @@ class Card(Base, UUIDMixin, TimestampMixin):
     )
     tags = relationship("Tag", secondary="card_tags", lazy="noload")
     stakeholders = relationship("Stakeholder", back_populates="card", lazy="noload")
+
+    __table_args__ = (
+        Index("ix_cards_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves attribute containment filters (``attributes @> {...}``). Fields
+        # declared ``indexed`` also get a B-tree per type for equality and
+        # sorting — see ``app.services.attribute_index``.
+        Index(
+            "ix_cards_attributes",
+            "attributes",
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        ),
+        # Keyset order of the extension bridge's incremental sync
+        # (``iter_cards(since=...)``).
+        Index("ix_cards_updated_at_id", "updated_at", "id"),
+    )
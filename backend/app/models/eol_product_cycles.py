@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class EolProductCycles(Base):
+    """Last known endoflife.date release cycles of one product.
+
+    ``cycles`` is ``None`` when endoflife.date does not know the product.
+    ``etag`` / ``last_modified`` are the upstream validators the next refresh
+    sends back; ``checked_at`` is when the row was last confirmed upstream
+    and ``updated_at`` when its cycles last changed. Kept current by
+    ``app/services/eol_cycles.py``.
+    """
+
+    __tablename__ = "eol_product_cycles"
+
+    product: Mapped[str] = mapped_column(String(100), primary_key=True)
+    cycles: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
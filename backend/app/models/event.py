@@ -3,18 +3,41 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Sequence,
+    String,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, UUIDMixin
 
+# Write order of events across transactions; see ``Event.seq``.
+EVENT_SEQ = Sequence("events_seq", metadata=Base.metadata)
+
 
 class Event(Base, UUIDMixin):
+    """One entry of the audit trail behind card history and the activity feeds.
+
+    The table is range-partitioned by month on ``created_at`` so retention can
+    detach or archive a whole month at once instead of deleting row by row
+    (``app.services.event_partitions``). Postgres requires the partition key in
+    the primary key, hence ``(created_at, id)`` in the database; the ORM keeps
+    identifying an event by ``id`` alone.
+    """
+
     __tablename__ = "events"
 
     card_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("cards.id", ondelete="SET NULL"), index=True
+        UUID(as_uuid=True), ForeignKey("cards.id", ondelete="SET NULL")
     )
     user_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL")
@@ -27,6 +50,37 @@ class Event(Base, UUIDMixin):
         nullable=True,
         index=True,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), primary_key=True
+    )
+    # Delivery order for durable extension subscriptions
+    # (``app.services.extensions.events``): the writing transaction's id and
+    # the write order within it. ``created_at`` is the transaction's start, so
+    # it cannot tell whether an older transaction may still commit events.
+    # NULL on events written before migration 148.
+    xact_id: Mapped[int | None] = mapped_column(
+        BigInteger, server_default=text("CAST(CAST(pg_current_xact_id() AS text) AS bigint)")
+    )
+    seq: Mapped[int | None] = mapped_column(BigInteger, server_default=EVENT_SEQ.next_value())
 
     user = relationship("User", lazy="noload")
+
+    __table_args__ = (
+        # Keyset pagination walks (created_at, id) newest first: per card for
+        # the History tab here, across everything via the primary key.
+        Index("ix_events_card_id_created_at", "card_id", "created_at", "id"),
+        Index("ix_events_xact_id_seq", "xact_id", "seq"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    __mapper_args__ = {"primary_key": ["id"]}
+
+
+# Catches rows outside every monthly partition, so an insert never fails
+# because the maintenance loop has not created the month yet. Monthly
+# partitions are added by ``event_partitions.ensure_event_partitions``.
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT"),
+)
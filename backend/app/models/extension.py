@@ -1,6 +1,6 @@
 """Extension Store models.
 
-Four tables back the store:
+Five tables back the store:
 
 - ``extension_licenses`` — every uploaded license envelope (audit trail;
   exactly one row has ``is_active=True``). ``raw_text`` preserves the
@@ -11,6 +11,8 @@ Four tables back the store:
   managed by core Alembic.
 - ``extension_installs`` — async upload → verify → preview → apply
   lifecycle of a ``.teax`` bundle (mirrors ``workspace_transfers``).
+- ``extension_event_cursors`` — per-extension position in the ``events``
+  table for durable event subscriptions (SDK 1.6).
 """
 
 from __future__ import annotations
@@ -18,7 +20,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -88,3 +90,17 @@ class ExtensionInstall(UUIDMixin, TimestampMixin, Base):
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
+
+
+class ExtensionEventCursor(Base):
+    """The last event delivered to an extension's durable subscriptions,
+    as its ``(xact_id, seq)`` key in the ``events`` table."""
+
+    __tablename__ = "extension_event_cursors"
+
+    extension_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    event_xact_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    event_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
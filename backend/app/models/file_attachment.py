@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,7 +11,11 @@ from app.models.base import Base, UUIDMixin
 
 
 class FileAttachment(Base, UUIDMixin):
-    """Binary file attachment stored in the database, linked to a card."""
+    """File attachment linked to a card.
+
+    The bytes live in the blob store (app/services/blob_store/) under
+    ``content_hash``, the SHA-256 of the content; identical files share a blob.
+    """
 
     __tablename__ = "file_attachments"
 
@@ -24,7 +28,7 @@ class FileAttachment(Base, UUIDMixin):
     name: Mapped[str] = mapped_column(String(500), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(200), nullable=False)
     size: Mapped[int] = mapped_column(Integer, nullable=False)
-    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     category: Mapped[str | None] = mapped_column(String(50), nullable=True)
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy import ForeignKey, Integer, LargeBinary, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,6 +12,10 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 class ProcessDiagram(Base, UUIDMixin, TimestampMixin):
     """BPMN 2.0 diagram associated with a BusinessProcess card.
     One process has at most one active diagram (latest version).
+
+    A version is stored either as a snapshot (``bpmn_xml``) or as a delta
+    against an earlier snapshot (``bpmn_delta`` + ``delta_base_id``); read the
+    XML through ``app.services.diagram_versions.diagram_xml``.
     """
 
     __tablename__ = "process_diagrams"
@@ -22,7 +26,17 @@ class ProcessDiagram(Base, UUIDMixin, TimestampMixin):
         nullable=False,
         index=True,
     )
-    bpmn_xml: Mapped[str] = mapped_column(Text, nullable=False)
+    bpmn_xml: Mapped[str | None] = mapped_column(Text, nullable=True)
+    bpmn_delta: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    delta_base_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("process_diagrams.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    # SHA-256 of the version's XML; a save with the previous version's digest
+    # skips element extraction.
+    bpmn_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
     svg_thumbnail: Mapped[str | None] = mapped_column(Text)
     version: Mapped[int] = mapped_column(Integer, default=1)
     created_by: Mapped[uuid.UUID | None] = mapped_column(
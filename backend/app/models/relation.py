@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,3 +27,13 @@ class Relation(Base, UUIDMixin, TimestampMixin):
 
     source = relationship("Card", foreign_keys=[source_id], lazy="noload")
     target = relationship("Card", foreign_keys=[target_id], lazy="noload")
+
+    # Serves the matrix report's relation-attribute filters (``@>``).
+    __table_args__ = (
+        Index(
+            "ix_relations_attributes",
+            "attributes",
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        ),
+    )
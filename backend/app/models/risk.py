@@ -19,6 +19,7 @@ import uuid
 from datetime import date, datetime
 
 from sqlalchemy import (
+    Computed,
     Date,
     DateTime,
     ForeignKey,
@@ -28,7 +29,7 @@ from sqlalchemy import (
     Text,
     func,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDMixin
@@ -45,6 +46,16 @@ class Risk(UUIDMixin, TimestampMixin, Base):
     category: Mapped[str] = mapped_column(String(32), default="operational")
     source_type: Mapped[str] = mapped_column(String(32), default="manual")
     source_ref: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Maintained by Postgres; backs multi-word search (see Card.search_vector).
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(reference, '') "
+            "|| ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     initial_probability: Mapped[str] = mapped_column(String(16), default="medium")
     initial_impact: Mapped[str] = mapped_column(String(16), default="medium")
@@ -89,6 +100,7 @@ class Risk(UUIDMixin, TimestampMixin, Base):
         Index("ix_risks_residual_level", "residual_level"),
         Index("ix_risks_owner_id", "owner_id"),
         Index("ix_risks_source_type", "source_type"),
+        Index("ix_risks_search_vector", "search_vector", postgresql_using="gin"),
     )
 
 
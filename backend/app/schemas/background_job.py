@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class JobSubmit(BaseModel):
+    kind: str = Field(..., min_length=1, max_length=100)
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobOut(BaseModel):
+    id: UUID
+    kind: str
+    status: str
+    params: dict[str, Any]
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    progress: dict[str, Any] | None = None
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    run_after: datetime
+    created_by: UUID | None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class JobListPage(BaseModel):
+    """Paginated response for ``GET /jobs`` (``{items, total, page, page_size}``)."""
+
+    items: list[JobOut]
+    total: int
+    page: int
+    page_size: int
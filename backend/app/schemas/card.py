@@ -153,6 +153,8 @@ class CardResponse(BaseModel):
 class CardListResponse(BaseModel):
     items: list[CardResponse]
     total: int
+    # False when ``total`` is the planner's estimate (``?count=estimated``).
+    total_exact: bool = True
     page: int
     page_size: int
 
@@ -2,7 +2,8 @@
 
 A "resource" is the union of the two card-owned attachment kinds:
 
-- ``file`` — a row in ``file_attachments`` (a binary blob stored in Postgres)
+- ``file`` — a row in ``file_attachments`` (metadata plus the ``content_hash``
+  of its bytes, which live in the blob store: ``app/services/blob_store/``)
 - ``link`` — a row in ``documents`` (a URL)
 
 Both are surfaced on a card's Resources tab; these schemas back the
@@ -0,0 +1,226 @@
+"""Indexed card attributes: SQL expressions over ``cards.attributes`` and the
+indexes behind them.
+
+Card attributes live in one JSONB column, so a filter, sort or group-by on a
+field is only as fast as the index that can serve it:
+
+- **Containment** (``attributes @> '{"key": value}'``) — the shape every
+  attribute *filter* here produces — is served by the ``ix_cards_attributes``
+  GIN index (``jsonb_path_ops``) declared on the model, for every key at once.
+- **Ordering and grouping** need a B-tree on the exact expression the query
+  uses. One per key would weigh down every card write for fields nobody sorts
+  on, so an admin opts a field in with ``"indexed": true`` in its type's
+  ``fields_schema``, and ``sync_attribute_indexes`` keeps one partial
+  expression index per (type, field)::
+
+      CREATE INDEX ix_cards_attr_<digest> ON cards ((attributes ->> 'key'))
+          WHERE type = '<type>'
+
+  Number and cost fields index their numeric value instead, so they sort as
+  numbers (``attribute_number``) — a non-numeric value stored by an old import
+  indexes as NULL rather than failing the write.
+
+  A type save only queues the ``metamodel.sync_attribute_indexes`` job, which
+  builds and drops them ``CONCURRENTLY``: a build on a large inventory then
+  never holds card writes, and the save never waits for it.
+
+Queries must build their expressions with ``attribute_text`` /
+``attribute_number`` so the planner sees the indexed expression verbatim: the
+key is rendered inline, never as a bind parameter a generic plan can't match.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from sqlalchemy import (
+    Connection,
+    Numeric,
+    Text,
+    case,
+    func,
+    literal,
+    literal_column,
+    not_,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import DDL
+
+from app.models.card import Card
+from app.models.card_type import CardType
+
+logger = logging.getLogger(__name__)
+
+INDEX_PREFIX = "ix_cards_attr_"
+
+#: Field types whose values sort numerically.
+NUMERIC_FIELD_TYPES = frozenset({"number", "cost"})
+
+#: Field types that get no B-tree: a JSON array has no useful scalar order, and
+#: membership filters on it are containment, which the GIN index serves.
+UNINDEXABLE_FIELD_TYPES = frozenset({"multiple_select"})
+
+#: Sentinel meaning "this attribute has no value", mirroring EMPTY_FILTER_KEY in
+#: ``frontend/src/components/FilterSelect.tsx``.
+EMPTY_FILTER = "__empty__"
+
+
+def _key(field_key: str):
+    return literal(field_key, Text, literal_execute=True)
+
+
+def attribute_text(field_key: str, column=Card.attributes):
+    """``column ->> 'field_key'`` — the attribute's value as text."""
+    return column[_key(field_key)].astext
+
+
+def attribute_number(field_key: str, column=Card.attributes):
+    """The attribute's value as ``numeric``, or NULL when it isn't a JSON number."""
+    return case(
+        (
+            func.jsonb_typeof(column[_key(field_key)]) == literal_column("'number'"),
+            attribute_text(field_key, column).cast(Numeric),
+        )
+    )
+
+
+def attribute_sort_expression(field_key: str, field_type: str | None, column=Card.attributes):
+    """What to ``ORDER BY`` / ``GROUP BY`` for a field of the given type."""
+    if field_type in NUMERIC_FIELD_TYPES:
+        return attribute_number(field_key, column)
+    return attribute_text(field_key, column)
+
+
+def attribute_filter_clause(column, field_key: str, field_type: str | None, value: str):
+    """One predicate for a single ``field:value`` filter on a JSONB column.
+
+    Written as containment wherever the value's JSON type is known, so the
+    column's GIN index serves it. ``EMPTY_FILTER`` matches an absent or null
+    value.
+    """
+    if value == EMPTY_FILTER:
+        return or_(
+            column.is_(None),
+            not_(column.has_key(field_key)),  # noqa: W601 — JSONB ? operator
+            column[field_key].astext.is_(None),
+        )
+    if field_type == "boolean":
+        return column.contains({field_key: value == "true"})
+    if field_type in NUMERIC_FIELD_TYPES:
+        try:
+            return column.contains({field_key: float(value)})
+        except ValueError:
+            return column[field_key].astext == value
+    if field_type == "multiple_select":
+        return column.contains({field_key: [value]})
+    return column.contains({field_key: value})
+
+
+def schema_field_types(fields_schema: list | None) -> dict[str, str]:
+    """``{field key: field type}`` for every field of a ``fields_schema``."""
+    types: dict[str, str] = {}
+    for section in fields_schema or []:
+        if not isinstance(section, dict):
+            continue
+        for field in section.get("fields", []):
+            if isinstance(field, dict) and field.get("key"):
+                types[field["key"]] = field.get("type") or "text"
+    return types
+
+
+def indexed_fields(fields_schema: list | None) -> list[tuple[str, str]]:
+    """``(key, type)`` of the fields declared ``indexed`` that can take a B-tree."""
+    out: list[tuple[str, str]] = []
+    for section in fields_schema or []:
+        if not isinstance(section, dict):
+            continue
+        for field in section.get("fields", []):
+            if not isinstance(field, dict) or not field.get("indexed") or not field.get("key"):
+                continue
+            field_type = field.get("type") or "text"
+            if field_type not in UNINDEXABLE_FIELD_TYPES:
+                out.append((field["key"], field_type))
+    return out
+
+
+def attribute_index_name(type_key: str, field_key: str, field_type: str) -> str:
+    """Stable index name. Hashed: type and field keys are free-form and their
+    concatenation would overrun Postgres' 63-character identifier limit."""
+    kind = "num" if field_type in NUMERIC_FIELD_TYPES else "text"
+    digest = hashlib.sha1(f"{type_key}\x1f{field_key}\x1f{kind}".encode()).hexdigest()
+    return f"{INDEX_PREFIX}{digest[:20]}"
+
+
+def _create_index_ddl(
+    type_key: str, field_key: str, field_type: str, *, concurrently: bool = False
+) -> DDL:
+    dialect = postgresql.dialect()
+    literal_binds = {"literal_binds": True}
+    expression = attribute_sort_expression(field_key, field_type).compile(
+        dialect=dialect, compile_kwargs=literal_binds
+    )
+    where = (Card.type == type_key).compile(dialect=dialect, compile_kwargs=literal_binds)
+    name = attribute_index_name(type_key, field_key, field_type)
+    create = "CREATE INDEX CONCURRENTLY" if concurrently else "CREATE INDEX"
+    statement = f"{create} IF NOT EXISTS {name} ON cards (({expression})) WHERE {where}"
+    # DDL treats "%" as a format marker; a literal value may contain one.
+    return DDL(statement.replace("%", "%%"))
+
+
+def sync_attribute_indexes(conn: Connection, *, concurrently: bool = False) -> tuple[int, int]:
+    """Reconcile the attribute indexes with the metamodel. Returns (created, dropped).
+
+    Only what changed is touched. A plain build holds card writes until it
+    finishes; with ``concurrently`` it does not, but ``conn`` must then be in
+    autocommit mode (``build_attribute_indexes``).
+    """
+    wanted: dict[str, tuple[str, str, str]] = {}
+    for type_key, fields_schema in conn.execute(select(CardType.key, CardType.fields_schema)):
+        for field_key, field_type in indexed_fields(fields_schema):
+            name = attribute_index_name(type_key, field_key, field_type)
+            wanted[name] = (type_key, field_key, field_type)
+
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = CAST('cards' AS regclass) AND c.relname LIKE :prefix"
+        ),
+        {"prefix": INDEX_PREFIX.replace("_", r"\_") + "%"},
+    )
+    existing: dict[str, bool] = {name: valid for name, valid in rows}
+
+    # A concurrent build that failed leaves an invalid index behind: rebuild it.
+    dropped = sorted(name for name, valid in existing.items() if name not in wanted or not valid)
+    drop = "DROP INDEX CONCURRENTLY" if concurrently else "DROP INDEX"
+    for name in dropped:
+        conn.execute(DDL(f"{drop} IF EXISTS {name}"))
+    created = sorted(name for name in wanted if not existing.get(name, False))
+    for name in created:
+        conn.execute(_create_index_ddl(*wanted[name], concurrently=concurrently))
+    if created or dropped:
+        logger.info(
+            "Attribute indexes: %d created, %d dropped (%d declared)",
+            len(created),
+            len(dropped),
+            len(wanted),
+        )
+    return len(created), len(dropped)
+
+
+async def build_attribute_indexes(engine: AsyncEngine) -> tuple[int, int]:
+    """``sync_attribute_indexes`` without blocking card writes.
+
+    Runs the DDL ``CONCURRENTLY`` on an autocommit connection of ``engine``,
+    so it waits for in-flight card writes instead of holding new ones back.
+    Queued after metamodel edits as the ``metamodel.sync_attribute_indexes``
+    job.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        return await conn.run_sync(sync_attribute_indexes, concurrently=True)
@@ -0,0 +1,557 @@
+"""Persistent background jobs: a queue table and the workers that drain it.
+
+Long operations — recalculating every card of a type, rescoring data
+quality, a compliance scan — do not belong in an HTTP request, and an
+``asyncio`` task or ``BackgroundTasks`` callback is lost with the process
+that runs it. Such work is queued instead as a ``background_jobs`` row of a
+registered *kind*:
+
+- ``enqueue_job`` adds the row inside the caller's transaction; once that
+  commits, the workers are woken (peers over the cluster bus).
+- Every worker process runs a ``JobWorker`` with ``JOB_WORKER_SLOTS`` slots.
+  Claims are serialized by an advisory lock, which is what makes a kind's
+  concurrency limit hold across the whole installation.
+- A handler receives a ``JobContext``: its params, and ``progress()`` to
+  report where it is. Reporting doubles as the cancellation point — it raises
+  ``JobCancelledError`` once someone asked for the job to stop — and the worker
+  also cancels the handler's task when it sees the request.
+- A handler that raises is retried with exponential backoff while the kind
+  allows more attempts. A worker that dies mid-job stops heartbeating; after
+  ``JOB_STALE_SECONDS`` any worker puts the job back in the queue (or fails
+  it when it is out of attempts). A worker shutting down cleanly hands its
+  jobs straight back.
+
+Handlers open their own short sessions (``async with async_session()``)
+rather than being handed one, so a job never pins a pooled connection
+across slow non-database work. The built-in kinds live in
+``app/services/job_handlers.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
+
+from pydantic import BaseModel
+from sqlalchemy import CursorResult, Executable, case, delete, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import async_session
+from app.models.background_job import BackgroundJob
+from app.models.user import User
+from app.services.cluster import JOB_CLAIM_LOCK_KEY, WORKER_ID, cancel_tasks, cluster_bus
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+_WAKE_ON_COMMIT = "_background_jobs_wake"
+
+#: Cap on the exponential retry backoff.
+_MAX_BACKOFF_SECONDS = 3600
+
+
+class JobCancelledError(Exception):
+    """Raised inside a handler once its job has been asked to stop."""
+
+
+JobHandler = Callable[["JobContext"], Awaitable[dict[str, Any] | None]]
+
+
+@dataclass(frozen=True)
+class JobKind:
+    key: str
+    handler: JobHandler
+    # Jobs of this kind running at once across every worker; JOB_CONCURRENCY
+    # overrides it per installation.
+    concurrency: int = 1
+    max_attempts: int = 1
+    # Permission a user needs to submit the kind through ``POST /jobs``;
+    # kinds without one are only queued by the endpoints that own them.
+    permission: str | None = None
+    # Validates ``params`` on submission.
+    params_model: type[BaseModel] | None = None
+    # An active job of the kind with equal params is returned instead of
+    # queuing a second one.
+    unique: bool = False
+    # With ``unique``: only a *queued* job absorbs a new submission, and its
+    # start moves back to the new submission's delay, so a burst runs once
+    # after it settles. A job already running may have read the state the
+    # submission changed, so another one is queued behind it.
+    debounce: bool = False
+
+
+_kinds: dict[str, JobKind] = {}
+
+
+def register_job_kind(key: str, handler: JobHandler, **options: Any) -> JobKind:
+    kind = JobKind(key=key, handler=handler, **options)
+    _kinds[key] = kind
+    return kind
+
+
+def job_kind(key: str, **options: Any) -> Callable[[JobHandler], JobHandler]:
+    """Decorator form of ``register_job_kind``."""
+
+    def decorate(handler: JobHandler) -> JobHandler:
+        register_job_kind(key, handler, **options)
+        return handler
+
+    return decorate
+
+
+def _load_builtin_kinds() -> None:
+    import app.services.job_handlers  # noqa: F401
+
+
+def job_kinds() -> dict[str, JobKind]:
+    _load_builtin_kinds()
+    return dict(_kinds)
+
+
+def get_job_kind(key: str) -> JobKind | None:
+    _load_builtin_kinds()
+    return _kinds.get(key)
+
+
+def concurrency_limit(kind: JobKind) -> int:
+    """The kind's limit after the ``JOB_CONCURRENCY`` overrides."""
+    for pair in settings.JOB_CONCURRENCY.split(","):
+        name, _, value = pair.partition("=")
+        if name.strip() == kind.key and value.strip().isdigit():
+            return int(value)
+    return kind.concurrency
+
+
+@dataclass
+class JobContext:
+    """What a handler gets to see of its job."""
+
+    job_id: uuid.UUID
+    kind: str
+    params: dict[str, Any] = field(default_factory=dict)
+    attempt: int = 1
+    max_attempts: int = 1
+    created_by: uuid.UUID | None = None
+
+    @property
+    def last_attempt(self) -> bool:
+        return self.attempt >= self.max_attempts
+
+    async def progress(self, phase: str, current: int = 0, total: int = 0, note: str = "") -> None:
+        """Record progress; raises ``JobCancelledError`` when the job should stop."""
+        values = {
+            "progress": {"phase": phase, "current": current, "total": total, "note": note},
+            "heartbeat_at": func.now(),
+        }
+        async with async_session() as db:
+            cancel = (
+                await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id == self.job_id)
+                    .values(**values)
+                    .returning(BackgroundJob.cancel_requested)
+                )
+            ).scalar_one_or_none()
+            await db.commit()
+        if cancel:
+            raise JobCancelledError()
+
+    async def cancel_requested(self) -> bool:
+        async with async_session() as db:
+            return bool(
+                (
+                    await db.execute(
+                        select(BackgroundJob.cancel_requested).where(
+                            BackgroundJob.id == self.job_id
+                        )
+                    )
+                ).scalar_one_or_none()
+            )
+
+
+# ---------------------------------------------------------------------------
+# Queueing and cancelling (the caller's session and transaction)
+# ---------------------------------------------------------------------------
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    kind: str,
+    params: dict[str, Any] | None = None,
+    *,
+    user: User | None = None,
+    delay: float = 0,
+) -> BackgroundJob:
+    """Queue a job of ``kind``, due ``delay`` seconds from now.
+
+    Does not commit; workers wake once the caller does.
+    """
+    spec = get_job_kind(kind)
+    if spec is None:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    params = params or {}
+    run_after = datetime.now(timezone.utc) + timedelta(seconds=delay) if delay > 0 else None
+    if spec.unique:
+        stmt = (
+            select(BackgroundJob)
+            .where(
+                BackgroundJob.kind == kind,
+                BackgroundJob.status.in_((QUEUED,) if spec.debounce else ACTIVE_STATUSES),
+                BackgroundJob.params == params,
+            )
+            .limit(1)
+        )
+        if spec.debounce:
+            # A job a worker is claiming right now is as good as running.
+            stmt = stmt.with_for_update(skip_locked=True)
+        existing = (await db.execute(stmt)).scalar_one_or_none()
+        if existing is not None:
+            if spec.debounce and run_after is not None and run_after > existing.run_after:
+                existing.run_after = run_after
+            return existing
+    job = BackgroundJob(
+        kind=kind,
+        status=QUEUED,
+        params=params,
+        attempts=0,
+        max_attempts=spec.max_attempts,
+        cancel_requested=False,
+        created_by=user.id if user else None,
+    )
+    if run_after is not None:
+        job.run_after = run_after
+    db.add(job)
+    await db.flush()
+    db.sync_session.info[_WAKE_ON_COMMIT] = True
+    return job
+
+
+async def request_cancel(db: AsyncSession, job: BackgroundJob) -> None:
+    """Cancel a queued job now, or ask a running one to stop. Does not commit.
+
+    Decided by conditional updates, not by ``job.status`` as read: a worker
+    may have claimed the job since, and its run must not be marked cancelled
+    under it. ``job`` is refreshed afterwards.
+    """
+    cancelled = await _affected(
+        db,
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job.id, BackgroundJob.status == QUEUED)
+        .values(status=CANCELLED, finished_at=datetime.now(timezone.utc)),
+    )
+    if not cancelled:
+        stopping = await _affected(
+            db,
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id, BackgroundJob.status == RUNNING)
+            .values(cancel_requested=True),
+        )
+        if stopping:
+            db.sync_session.info[_WAKE_ON_COMMIT] = True
+    await db.refresh(job)
+
+
+async def _affected(db: AsyncSession, stmt: Executable) -> int:
+    """Rows an ``UPDATE`` or ``DELETE`` changed."""
+    result = cast(CursorResult[Any], await db.execute(stmt))
+    return result.rowcount or 0
+
+
+# ---------------------------------------------------------------------------
+# Worker-side state transitions (own short sessions)
+# ---------------------------------------------------------------------------
+
+
+async def claim_next_job(db: AsyncSession, worker_id: str = WORKER_ID) -> JobContext | None:
+    """Take the oldest due job whose kind is under its concurrency limit."""
+    kinds = job_kinds()
+    await db.execute(select(func.pg_advisory_xact_lock(JOB_CLAIM_LOCK_KEY)))
+    running = dict(
+        (
+            await db.execute(
+                select(BackgroundJob.kind, func.count())
+                .where(BackgroundJob.status == RUNNING)
+                .group_by(BackgroundJob.kind)
+            )
+        ).all()
+    )
+    open_kinds = [k for k, spec in kinds.items() if running.get(k, 0) < concurrency_limit(spec)]
+    job = None
+    if open_kinds:
+        job = (
+            await db.execute(
+                select(BackgroundJob)
+                .where(
+                    BackgroundJob.status == QUEUED,
+                    BackgroundJob.run_after <= func.now(),
+                    BackgroundJob.kind.in_(open_kinds),
+                )
+                .order_by(BackgroundJob.run_after, BackgroundJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+        ).scalar_one_or_none()
+    if job is None:
+        await db.commit()
+        return None
+    now = datetime.now(timezone.utc)
+    job.status = RUNNING
+    job.attempts += 1
+    job.locked_by = worker_id
+    job.started_at = now
+    job.heartbeat_at = now
+    ctx = JobContext(
+        job_id=job.id,
+        kind=job.kind,
+        params=dict(job.params or {}),
+        attempt=job.attempts,
+        max_attempts=job.max_attempts,
+        created_by=job.created_by,
+    )
+    await db.commit()
+    return ctx
+
+
+def _owned(ctx: JobContext, worker_id: str):
+    return (
+        BackgroundJob.id == ctx.job_id,
+        BackgroundJob.status == RUNNING,
+        BackgroundJob.locked_by == worker_id,
+    )
+
+
+async def _finish(ctx: JobContext, worker_id: str, **values: Any) -> None:
+    async with async_session() as db:
+        await db.execute(
+            update(BackgroundJob)
+            .where(*_owned(ctx, worker_id))
+            .values(locked_by=None, finished_at=func.now(), **values)
+        )
+        await db.commit()
+
+
+async def _retry_or_fail(ctx: JobContext, worker_id: str, error: str) -> None:
+    if ctx.last_attempt:
+        await _finish(ctx, worker_id, status=FAILED, error=error)
+        return
+    delay = min(settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (ctx.attempt - 1), _MAX_BACKOFF_SECONDS)
+    async with async_session() as db:
+        await db.execute(
+            update(BackgroundJob)
+            .where(*_owned(ctx, worker_id))
+            .values(
+                status=QUEUED,
+                locked_by=None,
+                error=error,
+                run_after=func.now() + timedelta(seconds=delay),
+            )
+        )
+        await db.commit()
+
+
+async def _release(ctx: JobContext, worker_id: str) -> None:
+    """Hand a job back to the queue without counting the interrupted attempt."""
+    async with async_session() as db:
+        await db.execute(
+            update(BackgroundJob)
+            .where(*_owned(ctx, worker_id))
+            .values(status=QUEUED, locked_by=None, attempts=BackgroundJob.attempts - 1)
+        )
+        await db.commit()
+
+
+async def recover_stale_jobs(db: AsyncSession) -> int:
+    """Requeue, or fail, running jobs whose worker stopped heartbeating."""
+    stale = (
+        BackgroundJob.status == RUNNING,
+        BackgroundJob.heartbeat_at < func.now() - timedelta(seconds=settings.JOB_STALE_SECONDS),
+    )
+    requeued = await _affected(
+        db,
+        update(BackgroundJob)
+        .where(
+            *stale,
+            BackgroundJob.attempts < BackgroundJob.max_attempts,
+            BackgroundJob.cancel_requested.is_(False),
+        )
+        .values(status=QUEUED, locked_by=None, run_after=func.now()),
+    )
+    failed = await _affected(
+        db,
+        update(BackgroundJob)
+        .where(*stale)
+        .values(
+            status=case((BackgroundJob.cancel_requested, CANCELLED), else_=FAILED),
+            error="The worker running this job stopped responding",
+            locked_by=None,
+            finished_at=func.now(),
+        ),
+    )
+    await db.commit()
+    recovered = requeued + failed
+    if recovered:
+        logger.warning("Recovered %d background job(s) from a stopped worker", recovered)
+    return recovered
+
+
+async def purge_finished_jobs(db: AsyncSession, *, retention_days: int | None = None) -> int:
+    """Delete jobs that finished more than ``JOB_RETENTION_DAYS`` ago."""
+    days = max(1, retention_days or settings.JOB_RETENTION_DAYS)
+    deleted = await _affected(
+        db,
+        delete(BackgroundJob).where(
+            BackgroundJob.status.in_(FINISHED_STATUSES),
+            BackgroundJob.finished_at < func.now() - timedelta(days=days),
+        ),
+    )
+    await db.commit()
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+_workers: set[JobWorker] = set()
+
+
+def wake_workers() -> None:
+    """Make this process's workers look for work now instead of at the next poll."""
+    for worker in _workers:
+        worker._wake.set()
+
+
+class JobWorker:
+    """Runs up to ``slots`` jobs at a time in this process."""
+
+    def __init__(self, slots: int | None = None, worker_id: str = WORKER_ID) -> None:
+        self.slots = settings.JOB_WORKER_SLOTS if slots is None else slots
+        self.worker_id = worker_id
+        self._running: dict[uuid.UUID, asyncio.Task] = {}
+        self._cancelling: set[uuid.UUID] = set()
+        self._stopping = False
+        self._wake = asyncio.Event()
+
+    async def run(self) -> None:
+        _workers.add(self)
+        try:
+            while True:
+                try:
+                    await self.tick()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Error in background job worker")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), settings.JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            _workers.discard(self)
+            self._stopping = True
+            await cancel_tasks(self._running.values())
+
+    async def tick(self) -> int:
+        """Heartbeat running jobs, recover stale ones, claim into free slots."""
+        claimed: list[JobContext] = []
+        async with async_session() as db:
+            to_stop = await self._heartbeat(db)
+            await recover_stale_jobs(db)
+            while len(self._running) + len(claimed) < self.slots:
+                ctx = await claim_next_job(db, self.worker_id)
+                if ctx is None:
+                    break
+                claimed.append(ctx)
+        for job_id in to_stop:
+            self._cancelling.add(job_id)
+            self._running[job_id].cancel()
+        for ctx in claimed:
+            self._running[ctx.job_id] = asyncio.create_task(
+                self._execute(ctx), name=f"job:{ctx.kind}:{ctx.job_id}"
+            )
+        return len(claimed)
+
+    async def join(self) -> None:
+        """Wait for the jobs this worker is running to finish."""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    async def _heartbeat(self, db: AsyncSession) -> list[uuid.UUID]:
+        """Refresh the running jobs' heartbeat; return those that must stop."""
+        if not self._running:
+            return []
+        rows = (
+            await db.execute(
+                update(BackgroundJob)
+                .where(
+                    BackgroundJob.id.in_(list(self._running)),
+                    BackgroundJob.status == RUNNING,
+                    BackgroundJob.locked_by == self.worker_id,
+                )
+                .values(heartbeat_at=func.now())
+                .returning(BackgroundJob.id, BackgroundJob.cancel_requested)
+            )
+        ).all()
+        await db.commit()
+        owned = {job_id: cancel for job_id, cancel in rows}
+        # Cancel requested, or the row is no longer ours (deleted, or
+        # recovered by a peer after this worker stalled).
+        return [
+            job_id
+            for job_id in self._running
+            if owned.get(job_id, True) and job_id not in self._cancelling
+        ]
+
+    async def _execute(self, ctx: JobContext) -> None:
+        spec = get_job_kind(ctx.kind)
+        try:
+            if spec is None:
+                raise RuntimeError(f"No handler is registered for job kind {ctx.kind!r}")
+            result = await spec.handler(ctx)
+        except asyncio.CancelledError:
+            if self._stopping:
+                await _release(ctx, self.worker_id)
+                raise
+            await _finish(ctx, self.worker_id, status=CANCELLED)
+        except JobCancelledError:
+            await _finish(ctx, self.worker_id, status=CANCELLED)
+        except Exception as exc:
+            logger.exception("Background job %s (%s) failed", ctx.job_id, ctx.kind)
+            await _retry_or_fail(ctx, self.worker_id, str(exc) or type(exc).__name__)
+        else:
+            await _finish(ctx, self.worker_id, status=SUCCEEDED, result=result)
+        finally:
+            self._running.pop(ctx.job_id, None)
+            self._cancelling.discard(ctx.job_id)
+            self._wake.set()
+
+
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_WAKE_ON_COMMIT, False):
+        wake_workers()
+        cluster_bus.publish("jobs.wake")
+
+
+def _discard_after_rollback(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop(_WAKE_ON_COMMIT, None)
+
+
+event.listen(Session, "after_commit", _wake_after_commit)
+event.listen(Session, "after_soft_rollback", _discard_after_rollback)
+cluster_bus.on("jobs.wake", lambda _payload: wake_workers())
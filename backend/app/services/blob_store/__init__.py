@@ -0,0 +1,31 @@
+"""Pluggable, content-addressed storage for file attachment bytes.
+
+The active backend is chosen by ``BLOB_STORE_BACKEND`` (``local`` by default:
+a directory on the ``backend_data`` volume). Rows in ``file_attachments`` hold
+only metadata plus the SHA-256 ``content_hash`` of their bytes, so identical
+uploads are stored once and listing a card's files never reads file content.
+"""
+
+from __future__ import annotations
+
+from app.services.blob_store.base import (
+    CHUNK_SIZE,
+    BlobNotFoundError,
+    BlobStore,
+    content_digest,
+    get_blob_store,
+    lock_blob,
+    put_blob,
+)
+from app.services.blob_store.gc import collect_unreferenced_blobs
+
+__all__ = [
+    "CHUNK_SIZE",
+    "BlobNotFoundError",
+    "BlobStore",
+    "collect_unreferenced_blobs",
+    "content_digest",
+    "get_blob_store",
+    "lock_blob",
+    "put_blob",
+]
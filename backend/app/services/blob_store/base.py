@@ -0,0 +1,113 @@
+"""Blob store contract + registry resolver.
+
+A blob is addressed by the lowercase hex SHA-256 of its bytes. Writing the same
+content twice is a no-op that only refreshes the blob's timestamp — which is
+what the garbage collector's grace window keys on (``gc.py``), so a blob that
+was just re-uploaded is never swept between its write and its row's commit.
+
+Blobs are immutable and never deleted on the request path: rows that stop
+referencing one simply leave it for the collector.
+
+Writers go through ``put_blob``, which holds a shared advisory lock on the
+digest (striped by its first byte) until the writer's transaction ends. The
+collector takes the same lock exclusively before it re-checks and deletes a
+blob, so it can never unlink content that an upload has just written or
+touched and is about to reference.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import AsyncIterator
+from typing import Protocol
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.cluster import BLOB_LOCK_KEY_BASE
+
+# Read size for streamed downloads.
+CHUNK_SIZE = 64 * 1024
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def content_digest(data: bytes) -> str:
+    """The address ``data`` is stored under."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_digest(value: str) -> bool:
+    return bool(_DIGEST_RE.match(value or ""))
+
+
+async def lock_blob(db: AsyncSession, digest: str, *, exclusive: bool = False) -> None:
+    """Hold ``digest``'s lock until ``db``'s transaction ends.
+
+    Shared for writers, exclusive for the collector. One lock per leading
+    digest byte, so a transaction writing thousands of blobs (a workspace
+    import) holds at most 256.
+    """
+    key = BLOB_LOCK_KEY_BASE + int(digest[:2], 16)
+    lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+    await db.execute(select(lock(key)))
+
+
+async def put_blob(db: AsyncSession, data: bytes) -> str:
+    """Store ``data`` in the configured store for a row ``db`` is about to write."""
+    await lock_blob(db, content_digest(data))
+    return await get_blob_store().put(data)
+
+
+class BlobNotFoundError(LookupError):
+    """No blob is stored under the requested digest."""
+
+
+class BlobStore(Protocol):
+    """Storage strategy. Implementations live in this package."""
+
+    key: str
+
+    async def put(self, data: bytes) -> str:
+        """Store ``data`` (idempotent) and return its digest."""
+        ...
+
+    async def read(self, digest: str) -> bytes: ...
+
+    async def exists(self, digest: str) -> bool: ...
+
+    def iter_range(
+        self, digest: str, start: int, stop: int, chunk_size: int = CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yield bytes ``[start, stop)`` of the blob in chunks."""
+        ...
+
+    async def list_older_than(self, cutoff: float) -> list[str]:
+        """Digests of blobs last written before the Unix time ``cutoff``."""
+        ...
+
+    async def written_before(self, digest: str, cutoff: float) -> bool:
+        """Whether the blob exists and was last written before ``cutoff``."""
+        ...
+
+    async def delete(self, digest: str) -> None: ...
+
+
+_registry: dict[str, BlobStore] = {}
+
+
+def get_blob_store() -> BlobStore:
+    """Resolve the configured backend (built once, then reused)."""
+    backend = (settings.BLOB_STORE_BACKEND or "local").lower()
+    store = _registry.get(backend)
+    if store is None:
+        if backend != "local":
+            raise RuntimeError(f"Unknown BLOB_STORE_BACKEND {backend!r}")
+        from pathlib import Path
+
+        from app.services.blob_store.local import LocalBlobStore
+
+        store = _registry[backend] = LocalBlobStore(Path(settings.BLOB_STORE_PATH))
+    return store
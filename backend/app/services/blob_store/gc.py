@@ -0,0 +1,78 @@
+"""Garbage collection of blobs no attachment row references any more.
+
+Deleting an attachment (or purging its card) only removes the row; the bytes
+may still be shared with another attachment, so the leader's hourly sweep is
+the one place blobs are deleted. Only blobs untouched for ``grace_seconds``
+are considered, which covers an upload whose blob is written but whose row
+has not committed yet.
+
+The first reference check is batched and lock-free. Each blob it finds
+unreferenced is then re-checked under its exclusive blob lock
+(``lock_blob``): no row references it and it is still older than the
+cutoff. Only then is it deleted. An upload of the same content holds the
+lock shared from before it writes or touches the blob until its row
+commits, so the sweep either sees the fresh timestamp or the committed row.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.file_attachment import FileAttachment
+from app.services.blob_store.base import BlobStore, lock_blob
+
+logger = logging.getLogger(__name__)
+
+# Digests checked against file_attachments per query.
+_CHECK_BATCH = 500
+
+
+async def collect_unreferenced_blobs(
+    db: AsyncSession, store: BlobStore, *, grace_seconds: float
+) -> int:
+    """Delete blobs older than ``grace_seconds`` no row points at. Returns the count.
+
+    Commits after each deletion, releasing that blob's lock.
+    """
+    cutoff = time.time() - grace_seconds
+    candidates = await store.list_older_than(cutoff)
+    deleted = 0
+    for start in range(0, len(candidates), _CHECK_BATCH):
+        batch = candidates[start : start + _CHECK_BATCH]
+        referenced = set(
+            (
+                await db.execute(
+                    select(FileAttachment.content_hash)
+                    .where(FileAttachment.content_hash.in_(batch))
+                    .distinct()
+                )
+            )
+            .scalars()
+            .all()
+        )
+        for digest in batch:
+            if digest not in referenced and await _delete_if_unreferenced(
+                db, store, digest, cutoff
+            ):
+                deleted += 1
+    if deleted:
+        logger.info("Deleted %d unreferenced attachment blob(s)", deleted)
+    return deleted
+
+
+async def _delete_if_unreferenced(
+    db: AsyncSession, store: BlobStore, digest: str, cutoff: float
+) -> bool:
+    await lock_blob(db, digest, exclusive=True)
+    try:
+        referenced = await db.scalar(select(exists().where(FileAttachment.content_hash == digest)))
+        if referenced or not await store.written_before(digest, cutoff):
+            return False
+        await store.delete(digest)
+        return True
+    finally:
+        await db.commit()
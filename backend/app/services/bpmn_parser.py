@@ -1,7 +1,17 @@
-"""Parse BPMN 2.0 XML and extract elements for EA cross-referencing."""
+"""Parse BPMN 2.0 XML and extract elements for EA cross-referencing.
+
+The document is read with a streaming ``iterparse``: each element is cleared
+once it has been read, so the DI section (shapes and edges, most of a large
+model) is never held in memory as a tree. Request handlers call
+``extract_bpmn_elements``, which runs the parse on a worker thread instead of
+the event loop.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import io
 from dataclasses import dataclass
 
 import defusedxml.ElementTree as ET  # noqa: N817
@@ -31,6 +41,12 @@ EXTRACTABLE_TYPES = {
     f"{{{BPMN_NS}}}boundaryEvent": "boundaryEvent",
 }
 
+_LANE = f"{{{BPMN_NS}}}lane"
+_FLOW_NODE_REF = f"{{{BPMN_NS}}}flowNodeRef"
+_DOCUMENTATION = f"{{{BPMN_NS}}}documentation"
+# Read by their parent element when it ends, so they must outlive their own end.
+_KEEP_UNTIL_PARENT = frozenset({_FLOW_NODE_REF, _DOCUMENTATION})
+
 
 @dataclass
 class ExtractedElement:
@@ -43,36 +59,63 @@ class ExtractedElement:
     sequence_order: int
 
 
-def parse_bpmn_xml(bpmn_xml: str) -> list[ExtractedElement]:
-    """Parse BPMN 2.0 XML and return extracted elements."""
-    root = ET.fromstring(bpmn_xml)
-    elements: list[ExtractedElement] = []
+def bpmn_digest(bpmn_xml: str) -> str:
+    """SHA-256 of the XML text — equal digests mean extraction can be skipped."""
+    return hashlib.sha256(bpmn_xml.encode("utf-8")).hexdigest()
 
-    # Build lane → element mapping
+
+def parse_bpmn_xml(bpmn_xml: str) -> list[ExtractedElement]:
+    """Parse BPMN 2.0 XML and return extracted elements.
+
+    Elements are ordered by type (in ``EXTRACTABLE_TYPES`` order), then by
+    position in the document; an element in nested lanes gets the innermost
+    lane's name.
+    """
+    # Start position of every element, so nested elements (a subProcess in a
+    # subProcess, a lane in a childLaneSet) keep document order although
+    # their end events arrive inside-out.
+    position = 0
+    starts: dict[int, int] = {}
+    by_type: dict[str, list[tuple[int, str, str | None, str | None]]] = {
+        tag: [] for tag in EXTRACTABLE_TYPES
+    }
+    lanes: list[tuple[int, str, list[str]]] = []
+
+    for event, elem in ET.iterparse(io.StringIO(bpmn_xml), events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag in EXTRACTABLE_TYPES or tag == _LANE:
+                starts[id(elem)] = position
+                position += 1
+            continue
+
+        if tag in EXTRACTABLE_TYPES:
+            start = starts.pop(id(elem))
+            elem_id = elem.get("id", "")
+            if elem_id:
+                doc_elem = elem.find(_DOCUMENTATION)
+                documentation = doc_elem.text if doc_elem is not None and doc_elem.text else None
+                by_type[tag].append((start, elem_id, elem.get("name"), documentation))
+        elif tag == _LANE:
+            # Direct flowNodeRef children only — nested laneSets are lanes of their own
+            refs = [ref.text.strip() for ref in elem.findall(_FLOW_NODE_REF) if ref.text]
+            lanes.append((starts.pop(id(elem)), elem.get("name", ""), refs))
+        elif tag in _KEEP_UNTIL_PARENT:
+            continue
+        elem.clear()
+
+    # Build lane → element mapping; inner lanes start later and win
     lane_map: dict[str, str] = {}  # element_id → lane_name
-    for lane in root.iter(f"{{{BPMN_NS}}}lane"):
-        lane_name = lane.get("name", "")
-        # Use findall for direct children only (iter would recurse into nested laneSets)
-        for flow_node_ref in lane.findall(f"{{{BPMN_NS}}}flowNodeRef"):
-            if flow_node_ref.text:
-                lane_map[flow_node_ref.text.strip()] = lane_name
+    for _start, lane_name, refs in sorted(lanes):
+        for ref in refs:
+            lane_map[ref] = lane_name
 
+    elements: list[ExtractedElement] = []
     order = 0
     for tag, element_type in EXTRACTABLE_TYPES.items():
-        for elem in root.iter(tag):
-            elem_id = elem.get("id", "")
-            if not elem_id:
-                continue
-
-            name = elem.get("name")
-
-            # Extract documentation
-            doc_elem = elem.find(f"{{{BPMN_NS}}}documentation")
-            documentation = doc_elem.text if doc_elem is not None and doc_elem.text else None
-
-            # Determine if automated (serviceTask, scriptTask, businessRuleTask)
-            is_automated = element_type in ("serviceTask", "scriptTask", "businessRuleTask")
-
+        # Determine if automated (serviceTask, scriptTask, businessRuleTask)
+        is_automated = element_type in ("serviceTask", "scriptTask", "businessRuleTask")
+        for _start, elem_id, name, documentation in sorted(by_type[tag]):
             elements.append(
                 ExtractedElement(
                     bpmn_element_id=elem_id,
@@ -87,3 +130,8 @@ def parse_bpmn_xml(bpmn_xml: str) -> list[ExtractedElement]:
             order += 1
 
     return elements
+
+
+async def extract_bpmn_elements(bpmn_xml: str) -> list[ExtractedElement]:
+    """``parse_bpmn_xml`` on a worker thread, keeping the event loop free."""
+    return await asyncio.to_thread(parse_bpmn_xml, bpmn_xml)
@@ -12,6 +12,7 @@ import logging
 import math
 import re
 import uuid
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 from typing import Any
 
@@ -757,11 +758,14 @@ async def run_calculations_for_card(
 
 
 MAX_SAMPLE_CARDS = 10
+PROGRESS_EVERY = 100
 
 
 async def run_calculations_for_type(
     db: AsyncSession,
     target_type_key: str,
+    *,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
 ) -> dict:
     """Bulk recalculate all cards of a given type.
 
@@ -770,6 +774,9 @@ async def run_calculations_for_type(
     message with the cards it hit. Twenty-one cards failing the same way is one
     thing to fix, not twenty-one — and the old flat list said neither, because
     it was truncated at fifty with no indication that it had been.
+
+    ``on_progress(done, total)`` is awaited every ``PROGRESS_EVERY`` cards
+    when the run is a background job.
     """
     cards_result = await db.execute(
         select(Card).where(Card.type == target_type_key, Card.status == "ACTIVE")
@@ -790,7 +797,9 @@ async def run_calculations_for_type(
     # One settings read for the whole run rather than one per card.
     fiscal_year_start = await get_fiscal_year_start(db)
 
-    for card in cards:
+    for done, card in enumerate(cards):
+        if on_progress is not None and done % PROGRESS_EVERY == 0:
+            await on_progress(done, total)
         results = await run_calculations_for_card(db, card, fiscal_year_start=fiscal_year_start)
         for r in results:
             calc_id = r["calculation_id"]
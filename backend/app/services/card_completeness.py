@@ -1,13 +1,22 @@
 """Check whether a card satisfies all mandatory-metamodel items.
 
-Pure, read-only helper. Returns the list of unsatisfied mandatory
-relation sides and tag groups for a card, which the approval-status
-handler and the data-quality calculator consume.
+Pure, read-only helpers. :func:`missing_mandatory` returns the list of
+unsatisfied mandatory relation sides and tag groups for a card, which the
+approval-status handler consumes. The rules behind it are compiled per card
+type (:func:`compile_mandatory`) and checked against facts loaded in bulk
+(:func:`load_mandatory_facts`); the data-quality scorer
+(``data_quality.compile_rules``) builds its relations and tags buckets from
+the same two calls, so the approval gate and the score cannot disagree on
+what a card is missing.
 """
 
 from __future__ import annotations
 
-from sqlalchemy import or_, select
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import exists, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.card import Card
@@ -16,120 +25,169 @@ from app.models.relation_type import RelationType
 from app.models.tag import CardTag, Tag, TagGroup
 
 
-async def missing_mandatory(db: AsyncSession, card: Card) -> dict:
-    """Return unsatisfied mandatory items + applicable counts for a card.
+@dataclass(frozen=True)
+class MandatorySide:
+    """One mandatory side of a relation type, seen from the card's type."""
+
+    key: str
+    label: str
+    side: str  # "source" | "target"
+    other_type_key: str
+
+
+@dataclass(frozen=True)
+class MandatoryTagGroup:
+    id: uuid.UUID
+    name: str
 
-    Shape:
-        {
-            "relations": [ {key, label, side, other_type_key}, ... ],
-            "tag_groups": [ {id, name}, ... ],
-            "relations_applicable": int,   # total mandatory relation sides
-            "tag_groups_applicable": int,  # total applicable mandatory groups
-        }
 
-    - A RelationType with ``source_mandatory`` and ``source_type_key == card.type``
+@dataclass(frozen=True)
+class MandatoryItems:
+    """What every card of one type must have before it can be approved."""
+
+    relation_sides: tuple[MandatorySide, ...] = ()
+    tag_groups: tuple[MandatoryTagGroup, ...] = ()
+
+
+@dataclass
+class MandatoryFacts:
+    """Which mandatory items a batch of cards satisfies."""
+
+    relations: set[tuple[uuid.UUID, str, str]] = field(default_factory=set)
+    tag_groups: set[tuple[uuid.UUID, uuid.UUID]] = field(default_factory=set)
+
+    def missing(
+        self, card_id: uuid.UUID, items: MandatoryItems
+    ) -> tuple[list[MandatorySide], list[MandatoryTagGroup]]:
+        """The relation sides and tag groups of ``items`` the card lacks."""
+        return (
+            [s for s in items.relation_sides if (card_id, s.key, s.side) not in self.relations],
+            [g for g in items.tag_groups if (card_id, g.id) not in self.tag_groups],
+        )
+
+
+async def compile_mandatory(
+    db: AsyncSession, type_keys: Iterable[str]
+) -> dict[str, MandatoryItems]:
+    """The mandatory items of each given card type, in two queries.
+
+    - A RelationType with ``source_mandatory`` and ``source_type_key == type``
       requires at least one outgoing relation of that type.
-    - A RelationType with ``target_mandatory`` and ``target_type_key == card.type``
+    - A RelationType with ``target_mandatory`` and ``target_type_key == type``
       requires at least one incoming relation of that type.
     - A TagGroup with ``mandatory`` whose ``restrict_to_types`` is null OR
-      includes the card's type requires at least one tag from that group
-      on the card. Empty mandatory groups (no tags configured) are skipped
-      to avoid an unreachable gate from an admin mis-configuration.
+      includes the type requires at least one tag from that group on the
+      card. Empty mandatory groups (no tags configured) are skipped to avoid
+      an unreachable gate from an admin mis-configuration.
     """
-    missing_relations: list[dict] = []
-    missing_tag_groups: list[dict] = []
-    relations_applicable = 0
-    tag_groups_applicable = 0
-
-    # ── Relation types touching this card's type on a mandatory side ────────
+    keys = set(type_keys)
+    if not keys:
+        return {}
+    sides: dict[str, list[MandatorySide]] = {k: [] for k in keys}
     rt_rows = await db.execute(
-        select(RelationType).where(
+        select(RelationType)
+        .where(
             or_(
-                (RelationType.source_type_key == card.type)
-                & (RelationType.source_mandatory.is_(True)),
-                (RelationType.target_type_key == card.type)
-                & (RelationType.target_mandatory.is_(True)),
+                RelationType.source_type_key.in_(keys) & RelationType.source_mandatory.is_(True),
+                RelationType.target_type_key.in_(keys) & RelationType.target_mandatory.is_(True),
             ),
             RelationType.is_hidden.is_(False),
         )
+        .order_by(RelationType.key)
     )
-    relation_types = rt_rows.scalars().all()
-
-    for rt in relation_types:
-        source_side = rt.source_type_key == card.type and rt.source_mandatory
-        target_side = rt.target_type_key == card.type and rt.target_mandatory
-
-        # Outgoing check (source side)
-        if source_side:
-            relations_applicable += 1
-            exists = await db.execute(
-                select(Relation.id)
-                .where(
-                    Relation.source_id == card.id,
-                    Relation.type == rt.key,
-                )
-                .limit(1)
+    for rt in rt_rows.scalars():
+        if rt.source_mandatory and rt.source_type_key in keys:
+            sides[rt.source_type_key].append(
+                MandatorySide(rt.key, rt.label, "source", rt.target_type_key)
+            )
+        if rt.target_mandatory and rt.target_type_key in keys:
+            sides[rt.target_type_key].append(
+                MandatorySide(rt.key, rt.reverse_label or rt.label, "target", rt.source_type_key)
+            )
+
+    tg_rows = (
+        await db.execute(
+            select(TagGroup.id, TagGroup.name, TagGroup.restrict_to_types)
+            .where(
+                TagGroup.mandatory.is_(True),
+                exists().where(Tag.tag_group_id == TagGroup.id),
             )
-            if exists.scalar_one_or_none() is None:
-                missing_relations.append(
-                    {
-                        "key": rt.key,
-                        "label": rt.label,
-                        "side": "source",
-                        "other_type_key": rt.target_type_key,
-                    }
-                )
-
-        # Incoming check (target side)
-        if target_side:
-            relations_applicable += 1
-            exists = await db.execute(
-                select(Relation.id)
-                .where(
-                    Relation.target_id == card.id,
-                    Relation.type == rt.key,
-                )
-                .limit(1)
+            .order_by(TagGroup.id)
+        )
+    ).all()
+
+    return {
+        k: MandatoryItems(
+            relation_sides=tuple(sides[k]),
+            tag_groups=tuple(
+                MandatoryTagGroup(g.id, g.name)
+                for g in tg_rows
+                if not g.restrict_to_types or k in g.restrict_to_types
+            ),
+        )
+        for k in keys
+    }
+
+
+async def load_mandatory_facts(
+    db: AsyncSession,
+    relation_cards: Iterable[tuple[uuid.UUID, MandatoryItems]],
+    tag_cards: Iterable[tuple[uuid.UUID, MandatoryItems]] = (),
+) -> MandatoryFacts:
+    """Load which mandatory relation sides (of ``relation_cards``) and tag
+    groups (of ``tag_cards``) the cards satisfy, in one query per kind."""
+    facts = MandatoryFacts()
+    relation_cards = [(c, items) for c, items in relation_cards if items.relation_sides]
+    ids = {c for c, _ in relation_cards}
+    for side, column in (("source", Relation.source_id), ("target", Relation.target_id)):
+        rel_keys = {
+            s.key for _, items in relation_cards for s in items.relation_sides if s.side == side
+        }
+        if ids and rel_keys:
+            rows = await db.execute(
+                select(column, Relation.type)
+                .where(column.in_(ids), Relation.type.in_(rel_keys))
+                .distinct()
             )
-            if exists.scalar_one_or_none() is None:
-                missing_relations.append(
-                    {
-                        "key": rt.key,
-                        "label": rt.reverse_label or rt.label,
-                        "side": "target",
-                        "other_type_key": rt.source_type_key,
-                    }
-                )
-
-    # ── Mandatory tag groups applicable to this card's type ──────────────────
-    tg_rows = await db.execute(select(TagGroup).where(TagGroup.mandatory.is_(True)))
-    tag_groups = tg_rows.scalars().all()
-
-    for tg in tag_groups:
-        if tg.restrict_to_types and card.type not in tg.restrict_to_types:
-            continue
-
-        # Skip empty mandatory groups (admin error — don't hard-block)
-        has_any_tag = await db.execute(select(Tag.id).where(Tag.tag_group_id == tg.id).limit(1))
-        if has_any_tag.scalar_one_or_none() is None:
-            continue
-
-        tag_groups_applicable += 1
-        satisfied = await db.execute(
-            select(CardTag.tag_id)
+            facts.relations.update((card_id, key, side) for card_id, key in rows)
+
+    tag_cards = [(c, items) for c, items in tag_cards if items.tag_groups]
+    if tag_cards:
+        tagged = await db.execute(
+            select(CardTag.card_id, Tag.tag_group_id)
             .join(Tag, Tag.id == CardTag.tag_id)
             .where(
-                CardTag.card_id == card.id,
-                Tag.tag_group_id == tg.id,
+                CardTag.card_id.in_({c for c, _ in tag_cards}),
+                Tag.tag_group_id.in_({g.id for _, items in tag_cards for g in items.tag_groups}),
             )
-            .limit(1)
+            .distinct()
         )
-        if satisfied.scalar_one_or_none() is None:
-            missing_tag_groups.append({"id": str(tg.id), "name": tg.name})
+        facts.tag_groups.update((card_id, group_id) for card_id, group_id in tagged)
+    return facts
+
 
+async def missing_mandatory(db: AsyncSession, card: Card) -> dict:
+    """Return unsatisfied mandatory items + applicable counts for a card.
+
+    Shape:
+        {
+            "relations": [ {key, label, side, other_type_key}, ... ],
+            "tag_groups": [ {id, name}, ... ],
+            "relations_applicable": int,   # total mandatory relation sides
+            "tag_groups_applicable": int,  # total applicable mandatory groups
+        }
+
+    The rules are :func:`compile_mandatory`'s.
+    """
+    items = (await compile_mandatory(db, [card.type]))[card.type]
+    facts = await load_mandatory_facts(db, [(card.id, items)], [(card.id, items)])
+    sides, groups = facts.missing(card.id, items)
     return {
-        "relations": missing_relations,
-        "tag_groups": missing_tag_groups,
-        "relations_applicable": relations_applicable,
-        "tag_groups_applicable": tag_groups_applicable,
+        "relations": [
+            {"key": s.key, "label": s.label, "side": s.side, "other_type_key": s.other_type_key}
+            for s in sides
+        ],
+        "tag_groups": [{"id": str(g.id), "name": g.name} for g in groups],
+        "relations_applicable": len(items.relation_sides),
+        "tag_groups_applicable": len(items.tag_groups),
     }
@@ -0,0 +1,167 @@
+"""Count strategies for card listings: exact, planner-estimated, cached.
+
+A page of the inventory is an index scan; its total is a ``COUNT(*)`` over
+every row the filters match, and with predicates such as the orphan check
+(``NOT IN`` the union of relation endpoints) the count can cost more than
+the page. Callers pick how the total is produced:
+
+- ``exact`` — run the count. The default.
+- ``estimated`` — ask the planner (``EXPLAIN``) how many rows the filtered
+  query returns. Free, but only as good as the table statistics, so below
+  ``CARD_COUNT_EXACT_BELOW`` rows the exact count is run anyway: it is cheap
+  there and a small estimate is the one a user notices being wrong.
+- ``cached`` — the exact count, kept per filter fingerprint (the compiled
+  statement and its parameters) in ``CardCountCache``.
+
+Any ORM write to cards, card types, relations or stakeholders — the rows the
+card filters read — drops every cached count at flush and again at commit,
+and the commit-time drop is sent to the other workers over the cluster bus
+(``app/services/cluster.py``). A count that overlaps such a write is not
+stored. Bulk ``UPDATE``/``DELETE`` statements bypass the ORM events;
+``CARD_COUNT_CACHE_TTL`` bounds how stale a count can get then.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any, Literal
+
+from sqlalchemy import Select, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.config import settings
+from app.models.card import Card
+from app.models.card_type import CardType
+from app.models.relation import Relation
+from app.models.stakeholder import Stakeholder
+from app.services.cluster import cluster_bus
+
+CountStrategy = Literal["exact", "estimated", "cached"]
+
+_INVALIDATE_ON_COMMIT = "_card_count_cache_invalidate"
+
+_SOURCES = (Card, CardType, Relation, Stakeholder)
+
+# Distinct filter combinations kept; the oldest is dropped beyond this.
+_MAX_ENTRIES = 1024
+
+
+class CardCountCache:
+    _entries: dict[str, tuple[Any, float]] = {}
+    # Bumped on every invalidation; a count started under an older generation
+    # may have read rows a concurrent write has since changed.
+    _generation = 0
+
+    @staticmethod
+    def _ttl() -> float:
+        return settings.CARD_COUNT_CACHE_TTL
+
+    @staticmethod
+    def generation() -> int:
+        return CardCountCache._generation
+
+    @staticmethod
+    def get(key: str) -> Any | None:
+        ttl = CardCountCache._ttl()
+        cached = CardCountCache._entries.get(key) if ttl > 0 else None
+        if cached and time.monotonic() - cached[1] < ttl:
+            return cached[0]
+        return None
+
+    @staticmethod
+    def put(key: str, value: Any, generation: int) -> None:
+        """Store a count taken while ``generation`` was current."""
+        if CardCountCache._ttl() <= 0 or generation != CardCountCache._generation:
+            return
+        entries = CardCountCache._entries
+        entries.pop(key, None)
+        while len(entries) >= _MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        entries[key] = (value, time.monotonic())
+
+    @staticmethod
+    def invalidate() -> None:
+        CardCountCache._generation += 1
+        CardCountCache._entries.clear()
+
+
+def _invalidate_on_flush(session: Session, _flush_context) -> None:
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _SOURCES) for obj in touched):
+        CardCountCache.invalidate()
+        session.info[_INVALIDATE_ON_COMMIT] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_INVALIDATE_ON_COMMIT, False):
+        CardCountCache.invalidate()
+        cluster_bus.publish("cards.counts")
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+cluster_bus.on("cards.counts", lambda _payload: CardCountCache.invalidate(), resync=True)
+
+
+def statement_fingerprint(stmt: ClauseElement) -> str:
+    """Key for a statement: its SQL and bound parameters."""
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    payload = json.dumps([str(compiled), compiled.params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + str(compiler.process(element.statement, **kw))
+
+
+async def estimate_rows(db: AsyncSession, stmt: Select) -> int:
+    """The planner's row estimate for ``stmt``, without running it."""
+    plan = (await db.execute(_Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def cached_scalar(db: AsyncSession, stmt: Select, *, key: str | None = None) -> Any:
+    """Run a scalar aggregate through ``CardCountCache``."""
+    key = key or statement_fingerprint(stmt)
+    hit = CardCountCache.get(key)
+    if hit is not None:
+        return hit
+    generation = CardCountCache.generation()
+    value = (await db.execute(stmt)).scalar() or 0
+    CardCountCache.put(key, value, generation)
+    return value
+
+
+async def count_rows(
+    db: AsyncSession, count_q: Select, *, strategy: CountStrategy = "exact"
+) -> tuple[int, bool]:
+    """Total for a ``select(func.count(...)).where(...)`` query.
+
+    Returns ``(total, exact)``; ``exact`` is false only for a planner
+    estimate. Cached counts are exact as of the last write the cache saw.
+    """
+    if strategy == "estimated":
+        # The same filters, returning rows rather than one aggregate — that is
+        # what the planner's estimate is of.
+        estimate = await estimate_rows(db, count_q.with_only_columns(Card.id))
+        if estimate >= settings.CARD_COUNT_EXACT_BELOW:
+            return estimate, False
+    if strategy == "cached":
+        return int(await cached_scalar(db, count_q)), True
+    return int((await db.execute(count_q)).scalar() or 0), True
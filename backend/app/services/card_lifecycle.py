@@ -30,7 +30,7 @@ STATUS_BREAKING_FIELDS: frozenset[str] = frozenset(
 )
 
 # Defensive cap so a corrupted parent_id chain or a typo can't blow up the worker.
-_MAX_DESCENDANTS = 10_000
+MAX_DESCENDANTS = 10_000
 
 _RECURSIVE_DESCENDANTS_SQL = text(
     """
@@ -60,7 +60,7 @@ class ChildStrategyResult:
 
 
 async def collect_descendants(
-    db: AsyncSession, root_id: uuid.UUID, *, max_nodes: int = _MAX_DESCENDANTS
+    db: AsyncSession, root_id: uuid.UUID, *, max_nodes: int = MAX_DESCENDANTS
 ) -> list[uuid.UUID]:
     """Return all descendant card IDs of `root_id` ordered deepest-first.
 
@@ -29,11 +29,16 @@ Contract notes:
 * **``dry_run``** gates event emission and notifications only; the caller
   is responsible for rolling the transaction back (savepoint), matching
   the bulk endpoints' pattern.
+* **Bulk variants** (``update_cards``, ``upsert_relations``) apply the same
+  per-row semantics, but validate against one snapshot of the types'
+  ``fields_schema`` and run calculations and data-quality scoring in one
+  pass after every row is applied, instead of once per row.
 """
 
 from __future__ import annotations
 
 import uuid
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -41,6 +46,7 @@ from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.calculation import Calculation
 from app.models.card import Card
 from app.models.card_type import CardType
 from app.models.ppm_cost_line import PpmBudgetLine, PpmCostLine
@@ -48,10 +54,12 @@ from app.models.relation import Relation
 from app.models.relation_type import RelationType
 from app.services import card_lifecycle, card_reference, notification_service
 from app.services.calculation_engine import run_calculations_for_card
+from app.services.calculation_ppm import get_fiscal_year_start
 from app.services.card_uniqueness import check_sibling_name_unique
-from app.services.data_quality import calc_data_quality
+from app.services.data_quality import calc_data_quality, rescore_cards
 from app.services.event_bus import event_bus
 from app.services.hierarchy import HIERARCHY_LEVEL_KEY
+from app.services.report_queries import id_in
 
 # Fields that PPM budget/cost lines manage — calculations must not overwrite these.
 _PPM_MANAGED_FIELDS = {"costBudget", "costActual"}
@@ -121,12 +129,38 @@ async def _assign_reference_on_create(
         card.reference = await card_reference.next_reference(db, card_type)
 
 
-async def _validate_url_attributes(db: AsyncSession, card_type: str, attributes: dict) -> None:
+# Type key -> ``fields_schema``: the metamodel snapshot a bulk write
+# validates every row against (see ``load_fields_schemas``).
+FieldsSchemas = dict[str, list | None]
+
+
+async def load_fields_schemas(db: AsyncSession, type_keys: Iterable[str]) -> FieldsSchemas:
+    """The ``fields_schema`` of each of ``type_keys`` in one query."""
+    keys = set(type_keys)
+    if not keys:
+        return {}
+    rows = await db.execute(
+        select(CardType.key, CardType.fields_schema).where(CardType.key.in_(keys))
+    )
+    return {key: schema for key, schema in rows}
+
+
+async def _fields_schema(
+    db: AsyncSession, card_type: str, schemas: FieldsSchemas | None
+) -> list | None:
+    if schemas is not None and card_type in schemas:
+        return schemas[card_type]
+    result = await db.execute(select(CardType.fields_schema).where(CardType.key == card_type))
+    return result.scalar_one_or_none()
+
+
+async def _validate_url_attributes(
+    db: AsyncSession, card_type: str, attributes: dict, *, schemas: FieldsSchemas | None = None
+) -> None:
     """Validate that any attribute whose field type is 'url' uses an allowed scheme."""
     if not attributes:
         return
-    result = await db.execute(select(CardType.fields_schema).where(CardType.key == card_type))
-    schema = result.scalar_one_or_none()
+    schema = await _fields_schema(db, card_type, schemas)
     if not schema:
         return
     url_keys: set[str] = set()
@@ -192,11 +226,15 @@ def _check_required_not_cleared(
 
 
 async def _validate_required_attributes(
-    db: AsyncSession, card_type: str, new_attrs: dict, old_attrs: dict
+    db: AsyncSession,
+    card_type: str,
+    new_attrs: dict,
+    old_attrs: dict,
+    *,
+    schemas: FieldsSchemas | None = None,
 ) -> None:
     """Fetch the type's schema and run the required-clear check against it."""
-    result = await db.execute(select(CardType.fields_schema).where(CardType.key == card_type))
-    schema = result.scalar_one_or_none()
+    schema = await _fields_schema(db, card_type, schemas)
     _check_required_not_cleared(card_type, schema, new_attrs, old_attrs)
 
 
@@ -271,13 +309,17 @@ def _check_select_options(
 
 
 async def _validate_select_attributes(
-    db: AsyncSession, card_type: str, new_attrs: dict, old_attrs: dict
+    db: AsyncSession,
+    card_type: str,
+    new_attrs: dict,
+    old_attrs: dict,
+    *,
+    schemas: FieldsSchemas | None = None,
 ) -> None:
     """Fetch the type's schema and run the option-key check against it."""
     if not new_attrs:
         return
-    result = await db.execute(select(CardType.fields_schema).where(CardType.key == card_type))
-    schema = result.scalar_one_or_none()
+    schema = await _fields_schema(db, card_type, schemas)
     _check_select_options(card_type, schema, new_attrs, old_attrs)
 
 
@@ -609,6 +651,19 @@ async def create_card(
     return card
 
 
+def _serialize_val(v: object) -> object:
+    """Convert a value to something JSON-serialisable."""
+    if v is None or isinstance(v, (str, int, float, bool)):
+        return v
+    if isinstance(v, (dict, list)):
+        return v
+    if isinstance(v, uuid.UUID):
+        return str(v)
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return str(v)
+
+
 async def update_card(
     db: AsyncSession,
     actor: WriteActor,
@@ -624,6 +679,90 @@ async def update_card(
     cost-redaction merge — permission shaping, not write semantics — must
     already have been applied by route callers.
     """
+    changes, changed_levels = await _apply_update(
+        db, actor, card, updates, strict_attributes=strict_attributes
+    )
+    if not changes:
+        return False
+
+    # Run calculated fields (skip PPM-managed cost fields if PPM data exists)
+    ppm_excl = await _get_ppm_exclusions(db, card)
+    await run_calculations_for_card(db, card, exclude_fields=ppm_excl)
+    # Re-run calcs for descendants whose level moved (after the card's own
+    # run, so a child formula reading a parent's computed field sees it fresh)
+    await _recalc_changed_descendants(db, changed_levels, card.id)
+
+    # Recalculate completion. Must run *after* the calculations, or a
+    # weighted calculated field is scored on its previous value.
+    card.data_quality = await calc_data_quality(db, card)
+
+    if not dry_run:
+        await _publish_card_updated(db, actor, card, changes)
+    return True
+
+
+async def update_cards(
+    db: AsyncSession,
+    actor: WriteActor,
+    items: Sequence[tuple[Card, dict]],
+    *,
+    dry_run: bool = False,
+) -> list[bool]:
+    """``update_card`` for many distinct cards; returns each one's changed flag.
+
+    Every row is validated against one snapshot of its type's schema and
+    applied first; calculations then run once per changed card (skipped for
+    types without active calculations) and the changed cards are rescored
+    together. A validation error on any row raises before anything is
+    published — the caller discards the transaction.
+    """
+    schemas = await load_fields_schemas(db, {card.type for card, _ in items})
+    applied: list[tuple[Card, dict, list[Card]]] = []
+    for card, updates in items:
+        changes, changed_levels = await _apply_update(db, actor, card, updates, schemas=schemas)
+        applied.append((card, changes, changed_levels))
+    changed = [(card, changes, levels) for card, changes, levels in applied if changes]
+    if not changed:
+        return [False] * len(applied)
+
+    calc_types = await _types_with_calculations(db)
+    fiscal_year_start = await get_fiscal_year_start(db) if calc_types else None
+    for card, _, changed_levels in changed:
+        if card.type in calc_types:
+            ppm_excl = await _get_ppm_exclusions(db, card)
+            await run_calculations_for_card(
+                db, card, exclude_fields=ppm_excl, fiscal_year_start=fiscal_year_start
+            )
+        await _recalc_changed_descendants(db, changed_levels, card.id)
+    await rescore_cards(db, [card.id for card, _, _ in changed])
+
+    if not dry_run:
+        for card, changes, _ in changed:
+            await _publish_card_updated(db, actor, card, changes)
+    return [bool(changes) for _, changes, _ in applied]
+
+
+async def _types_with_calculations(db: AsyncSession) -> set[str]:
+    rows = await db.execute(
+        select(Calculation.target_type_key)
+        .where(Calculation.is_active == True)  # noqa: E712
+        .distinct()
+    )
+    return set(rows.scalars())
+
+
+async def _apply_update(
+    db: AsyncSession,
+    actor: WriteActor,
+    card: Card,
+    updates: dict,
+    *,
+    strict_attributes: bool = False,
+    schemas: FieldsSchemas | None = None,
+) -> tuple[dict, list[Card]]:
+    """Validate ``updates`` and set them on ``card``. Returns the changes
+    (field → old/new) and the cards whose hierarchy level moved; calculations,
+    scoring and events are the caller's."""
     # The human-readable reference is write-once & immutable — never editable via
     # update (defensive: CardUpdate no longer carries it, but drop any stray).
     updates = dict(updates)
@@ -631,7 +770,7 @@ async def update_card(
 
     # Validate URL-typed attributes
     if "attributes" in updates and updates["attributes"]:
-        await _validate_url_attributes(db, card.type, updates["attributes"])
+        await _validate_url_attributes(db, card.type, updates["attributes"], schemas=schemas)
         if strict_attributes:
             await _validate_strict_attributes(db, card.type, updates["attributes"])
 
@@ -651,11 +790,19 @@ async def update_card(
     # dict — `{"attributes": {}}` is precisely the wipe this must catch.
     if "attributes" in updates:
         await _validate_required_attributes(
-            db, card.type, updates["attributes"] or {}, dict(card.attributes or {})
+            db,
+            card.type,
+            updates["attributes"] or {},
+            dict(card.attributes or {}),
+            schemas=schemas,
         )
         # Guard: select values must be declared options — same post-merge state.
         await _validate_select_attributes(
-            db, card.type, updates["attributes"] or {}, dict(card.attributes or {})
+            db,
+            card.type,
+            updates["attributes"] or {},
+            dict(card.attributes or {}),
+            schemas=schemas,
         )
 
     # Guard: cycle + hierarchy depth limit before applying parent change
@@ -698,7 +845,7 @@ async def update_card(
             setattr(card, field, value)
 
     if not changes:
-        return False
+        return changes, []
 
     card.updated_by = actor.user_id
     # Break approval status on edit (attribute/lifecycle changes break it)
@@ -726,56 +873,36 @@ async def update_card(
         or (card.type == "BusinessCapability" and not current_attrs.get("capabilityLevel"))
     ):
         changed_levels = await _sync_hierarchy_levels(db, card)
+    return changes, changed_levels
 
-    # Run calculated fields (skip PPM-managed cost fields if PPM data exists)
-    ppm_excl = await _get_ppm_exclusions(db, card)
-    await run_calculations_for_card(db, card, exclude_fields=ppm_excl)
-    # Re-run calcs for descendants whose level moved (after the card's own
-    # run, so a child formula reading a parent's computed field sees it fresh)
-    await _recalc_changed_descendants(db, changed_levels, card.id)
-
-    # Recalculate completion. Must run *after* the calculations, or a
-    # weighted calculated field is scored on its previous value.
-    card.data_quality = await calc_data_quality(db, card)
-
-    def _serialize_val(v: object) -> object:
-        """Convert a value to something JSON-serialisable."""
-        if v is None or isinstance(v, (str, int, float, bool)):
-            return v
-        if isinstance(v, (dict, list)):
-            return v
-        if isinstance(v, uuid.UUID):
-            return str(v)
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return str(v)
 
+async def _publish_card_updated(
+    db: AsyncSession, actor: WriteActor, card: Card, changes: dict
+) -> None:
+    """Emit ``card.updated`` and notify the card's subscribers."""
     serialised_changes = {
         k: {"old": _serialize_val(v["old"]), "new": _serialize_val(v["new"])}
         for k, v in changes.items()
     }
-    if not dry_run:
-        await event_bus.publish(
-            "card.updated",
-            _stamp_ext(actor, {"id": str(card.id), "changes": serialised_changes}),
-            db=db,
-            card_id=card.id,
-            user_id=actor.user_id,
-        )
-
-        # Notify subscribers about the update
-        changed_fields = ", ".join(changes.keys())
-        await notification_service.create_notifications_for_subscribers(
-            db,
-            card_id=card.id,
-            notif_type="card_updated",
-            title=f"{card.name} Updated",
-            message=f'{actor.display_name} updated "{card.name}" ({changed_fields})',
-            link=f"/cards/{card.id}",
-            data={"changes": list(changes.keys())},
-        )
+    await event_bus.publish(
+        "card.updated",
+        _stamp_ext(actor, {"id": str(card.id), "changes": serialised_changes}),
+        db=db,
+        card_id=card.id,
+        user_id=actor.user_id,
+    )
 
-    return True
+    # Notify subscribers about the update
+    changed_fields = ", ".join(changes.keys())
+    await notification_service.create_notifications_for_subscribers(
+        db,
+        card_id=card.id,
+        notif_type="card_updated",
+        title=f"{card.name} Updated",
+        message=f'{actor.display_name} updated "{card.name}" ({changed_fields})',
+        link=f"/cards/{card.id}",
+        data={"changes": list(changes.keys())},
+    )
 
 
 async def resolve_archive_delete_set(
@@ -945,15 +1072,17 @@ async def _emit_relation_events(
     actor_id: uuid.UUID | None,
     extra: dict | None = None,
     ext_key: str | None = None,
+    labels: tuple[str | None, str | None] | None = None,
 ) -> None:
     """Fan out a relation mutation event to both endpoints.
 
     Each side's payload carries the directional label so the history
     timeline reads naturally — the source sees the forward label
     (e.g. "supports → ITComponent X"), the target sees the reverse
-    label (e.g. "supported by ← Application Y").
+    label (e.g. "supported by ← Application Y"). ``labels`` skips the
+    lookup when the caller already holds them.
     """
-    label, reverse_label = await _resolve_relation_labels(db, rel.type)
+    label, reverse_label = labels or await _resolve_relation_labels(db, rel.type)
     forward = label or rel.type
     backward = reverse_label or label or rel.type
 
@@ -1036,24 +1165,9 @@ async def upsert_relation(
     )
     rel = existing.scalar_one_or_none()
     reused = rel is not None
-    changed: list[str] = []
-
-    if rel is None:
-        rel = Relation(
-            type=type_key,
-            source_id=source_id,
-            target_id=target_id,
-            attributes=attributes or {},
-            description=description,
-        )
-        db.add(rel)
-    else:
-        if attributes is not None and attributes != (rel.attributes or {}):
-            rel.attributes = attributes
-            changed.append("attributes")
-        if description is not None and description != rel.description:
-            rel.description = description
-            changed.append("description")
+    rel, changed = _place_relation(
+        db, rel, type_key, source_id, target_id, attributes=attributes, description=description
+    )
     await db.flush()
 
     # Run calculated fields for both source and target cards, then rescore.
@@ -1092,3 +1206,123 @@ async def upsert_relation(
             )
 
     return rel, reused, changed
+
+
+@dataclass(frozen=True)
+class RelationUpsert:
+    """One row of :func:`upsert_relations` — the ``upsert_relation`` kwargs."""
+
+    type_key: str
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+    attributes: dict | None = None
+    description: str | None = None
+
+
+async def upsert_relations(
+    db: AsyncSession,
+    actor: WriteActor,
+    items: Sequence[RelationUpsert],
+    *,
+    dry_run: bool = False,
+) -> list[tuple[Relation, bool, list[str]]]:
+    """``upsert_relation`` for many distinct ``(type, source, target)`` rows.
+
+    Existing rows are found in one query and everything is flushed once;
+    each endpoint card then has its calculations run once, however many of
+    the rows touch it, and the endpoints are rescored together. Events are
+    the same per-relation pair ``upsert_relation`` emits.
+    """
+    if not items:
+        return []
+    existing = await db.execute(
+        select(Relation).where(
+            id_in(Relation.source_id, {i.source_id for i in items}),
+            Relation.type.in_({i.type_key for i in items}),
+        )
+    )
+    by_key = {(r.type, r.source_id, r.target_id): r for r in existing.scalars()}
+    results: list[tuple[Relation, bool, list[str]]] = []
+    for item in items:
+        rel = by_key.get((item.type_key, item.source_id, item.target_id))
+        reused = rel is not None
+        rel, changed = _place_relation(
+            db,
+            rel,
+            item.type_key,
+            item.source_id,
+            item.target_id,
+            attributes=item.attributes,
+            description=item.description,
+        )
+        results.append((rel, reused, changed))
+    await db.flush()
+
+    # Calculations before scoring, as in ``upsert_relation``.
+    endpoint_ids = list(dict.fromkeys(e for i in items for e in (i.source_id, i.target_id)))
+    cards = {
+        c.id: c
+        for c in (await db.execute(select(Card).where(id_in(Card.id, endpoint_ids)))).scalars()
+    }
+    calc_types = await _types_with_calculations(db)
+    fiscal_year_start = await get_fiscal_year_start(db) if calc_types else None
+    for card_id in endpoint_ids:
+        card = cards.get(card_id)
+        if card is not None and card.type in calc_types:
+            await run_calculations_for_card(db, card, fiscal_year_start=fiscal_year_start)
+    await rescore_cards(db, list(cards))
+
+    if not dry_run:
+        label_rows = await db.execute(
+            select(RelationType.key, RelationType.label, RelationType.reverse_label).where(
+                RelationType.key.in_({i.type_key for i in items})
+            )
+        )
+        labels = {key: (label, reverse) for key, label, reverse in label_rows}
+        for rel, reused, changed in results:
+            if reused and not changed:
+                continue
+            await _emit_relation_events(
+                db,
+                event_type="relation.updated" if reused else "relation.created",
+                rel=rel,
+                source_card=cards.get(rel.source_id),
+                target_card=cards.get(rel.target_id),
+                actor_id=actor.user_id,
+                extra={"fields": changed} if reused else None,
+                ext_key=actor.ext_key,
+                labels=labels.get(rel.type, (None, None)),
+            )
+    return results
+
+
+def _place_relation(
+    db: AsyncSession,
+    rel: Relation | None,
+    type_key: str,
+    source_id: uuid.UUID,
+    target_id: uuid.UUID,
+    *,
+    attributes: dict | None,
+    description: str | None,
+) -> tuple[Relation, list[str]]:
+    """Add a new relation, or merge ``attributes`` / ``description`` onto an
+    existing one; returns it with the names of the fields that changed."""
+    changed: list[str] = []
+    if rel is None:
+        rel = Relation(
+            type=type_key,
+            source_id=source_id,
+            target_id=target_id,
+            attributes=attributes or {},
+            description=description,
+        )
+        db.add(rel)
+    else:
+        if attributes is not None and attributes != (rel.attributes or {}):
+            rel.attributes = attributes
+            changed.append("attributes")
+        if description is not None and description != rel.description:
+            rel.description = description
+            changed.append("description")
+    return rel, changed
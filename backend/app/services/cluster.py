@@ -0,0 +1,343 @@
+"""Coordination between uvicorn worker processes (``WEB_CONCURRENCY`` > 1).
+
+Everything here is built on the Postgres instance the app already uses, so a
+multi-worker install needs no extra infrastructure:
+
+- **Startup lock.** Workers start together; ``startup_lock`` makes them run
+  migrations, seeds and extension initialization one after another, so only
+  the first one does real work and the rest find the database at head.
+- **Leader election.** The background loops started in ``main.lifespan`` —
+  purges, KPI snapshots, task promotion, update and store checks, extension
+  jobs — must run once per installation, not once per worker. The worker that
+  wins ``pg_try_advisory_lock`` on a dedicated connection runs them; the others
+  retry every ``LEADER_ELECTION_INTERVAL`` seconds. The lock lives and dies
+  with that connection, so when the leader exits or loses the database a
+  follower takes over within one interval.
+- **Cluster bus.** In-process caches (PermissionService roles and stakeholder
+  role definitions, PrincipalCache, the extension registry, the runtime email
+  settings and app title) and the EventBus's live subscribers only see writes
+  made in their own process. ``cluster_bus.publish`` sends a small JSON
+  message over ``LISTEN/NOTIFY`` and every *other* worker runs the handler
+  registered for its topic. Notifications sent while a worker's listening
+  connection is down are lost, so on reconnect it clears every cache
+  registered with ``resync=True``.
+
+With a single worker (the default) none of this runs: ``startup_lock`` is a
+no-op, ``publish`` does nothing, and ``LeaderElection`` starts its jobs
+straight away — the behaviour of the single-process backend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import uuid
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "turboea_cluster"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7900
+
+# Advisory-lock keys (bigint). Arbitrary, but fixed forever: two releases
+# running side by side during a rolling restart must agree on them.
+STARTUP_LOCK_KEY = 0x5475_7262_6F45_4101
+LEADER_LOCK_KEY = 0x5475_7262_6F45_4102
+JOB_CLAIM_LOCK_KEY = 0x5475_7262_6F45_4103
+# Plus the digest's first byte (0-255): app/services/blob_store/base.py.
+BLOB_LOCK_KEY_BASE = 0x5475_7262_6F45_4200
+
+_RECONNECT_DELAY_SECONDS = 5
+
+# Distinguishes this process's own notifications from its peers'.
+WORKER_ID = uuid.uuid4().hex
+
+# Set while a peer's message is being applied, so the invalidation helpers it
+# calls don't broadcast the same message straight back.
+_remote_dispatch: ContextVar[bool] = ContextVar("cluster_remote_dispatch", default=False)
+
+_ON_COMMIT = "_cluster_publish_on_commit"
+
+Handler = Callable[[dict[str, Any]], Awaitable[None] | None]
+JobFactory = Callable[[], Coroutine[Any, Any, None]]
+
+
+def multi_worker() -> bool:
+    """True when the backend is configured to run more than one worker."""
+    return settings.WEB_CONCURRENCY > 1
+
+
+_coordination_engine: AsyncEngine | None = None
+
+
+def _engine() -> AsyncEngine:
+    """Unpooled engine for the long-lived lock and listener connections.
+
+    Kept apart from ``app.database.engine`` so they never occupy a slot of
+    the request pool; see the connection budget note in ``app.config``.
+    """
+    global _coordination_engine
+    if _coordination_engine is None:
+        _coordination_engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    return _coordination_engine
+
+
+async def cancel_tasks(tasks: Iterable[asyncio.Task]) -> None:
+    """Cancel ``tasks`` and wait for each to finish unwinding."""
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("Background task %s failed while stopping", task.get_name())
+
+
+@asynccontextmanager
+async def startup_lock():
+    """Serialize schema migrations and seeding across workers starting together."""
+    if not multi_worker():
+        yield
+        return
+    async with _engine().connect() as conn:
+        logger.info("[cluster] Waiting for the startup lock...")
+        await conn.execute(select(func.pg_advisory_lock(STARTUP_LOCK_KEY)))
+        await conn.commit()
+        try:
+            yield
+        finally:
+            await conn.execute(select(func.pg_advisory_unlock(STARTUP_LOCK_KEY)))
+            await conn.commit()
+
+
+class ClusterBus:
+    """Best-effort fan-out of small JSON messages to the other workers."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, Handler] = {}
+        self._resync_topics: set[str] = set()
+        self._outbox: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._outbox is not None
+
+    def on(self, topic: str, handler: Handler, *, resync: bool = False) -> None:
+        """Register the handler peers' ``topic`` messages are applied with.
+
+        ``resync=True`` marks a cache: the handler is also called with an empty
+        payload — meaning "drop everything" — after the listener reconnects.
+        """
+        self._handlers[topic] = handler
+        if resync:
+            self._resync_topics.add(topic)
+
+    def publish(self, topic: str, payload: dict[str, Any] | None = None) -> None:
+        """Queue ``payload`` for every other worker. Never blocks or raises."""
+        if self._outbox is None or _remote_dispatch.get():
+            return
+        message = json.dumps(
+            {"origin": WORKER_ID, "topic": topic, "payload": payload or {}}, default=str
+        )
+        size = len(message.encode())
+        if size > MAX_PAYLOAD_BYTES:
+            logger.warning("[cluster] Dropping oversized %s message (%d bytes)", topic, size)
+            return
+        self._outbox.put_nowait(message)
+
+    def publish_on_commit(self, session: Any, topic: str, payload: dict | None = None) -> None:
+        """Like ``publish``, but only once ``session`` commits.
+
+        For writes whose transaction is still open, so peers reloading from
+        the database can't read the pre-commit state.
+        """
+        sync_session = getattr(session, "sync_session", session)
+        sync_session.info.setdefault(_ON_COMMIT, []).append((topic, payload))
+
+    async def start(self) -> None:
+        if self._outbox is not None:
+            return
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._listen_loop(), name="cluster-listen"),
+            asyncio.create_task(self._send_loop(), name="cluster-send"),
+        ]
+
+    async def stop(self) -> None:
+        self._outbox = None
+        await cancel_tasks([*self._tasks, *self._pending])
+        self._tasks = []
+
+    # ── internals ───────────────────────────────────────────────────────
+
+    async def _send_loop(self) -> None:
+        from app.database import engine
+
+        outbox = self._outbox
+        if outbox is None:
+            return
+        while True:
+            batch = [await outbox.get()]
+            while not outbox.empty():
+                batch.append(outbox.get_nowait())
+            try:
+                async with engine.begin() as conn:
+                    for message in batch:
+                        await conn.execute(select(func.pg_notify(CHANNEL, message)))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[cluster] Failed to send %d message(s) to peers", len(batch))
+
+    async def _listen_loop(self) -> None:
+        connected_before = False
+        while True:
+            lost = asyncio.Event()
+            try:
+                async with _engine().connect() as conn:
+                    driver = (await conn.get_raw_connection()).driver_connection
+                    if driver is None:
+                        raise RuntimeError("listener connection has no asyncpg connection")
+                    driver.add_termination_listener(lambda _conn: lost.set())
+                    await driver.add_listener(CHANNEL, self._on_notify)
+                    if connected_before:
+                        logger.warning("[cluster] Listener reconnected — clearing shared caches")
+                        self._resync()
+                    connected_before = True
+                    while not lost.is_set():
+                        try:
+                            await asyncio.wait_for(
+                                lost.wait(), timeout=settings.LEADER_ELECTION_INTERVAL
+                            )
+                        except TimeoutError:
+                            # Heartbeat: a half-open connection only shows up
+                            # when something is sent over it.
+                            await conn.execute(select(literal(1)))
+                            await conn.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[cluster] Listener connection failed")
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if not isinstance(message, dict) or message.get("origin") == WORKER_ID:
+            return
+        self._dispatch(str(message.get("topic")), message.get("payload") or {})
+
+    def _resync(self) -> None:
+        for topic in sorted(self._resync_topics):
+            self._dispatch(topic, {})
+
+    def _dispatch(self, topic: str, payload: dict[str, Any]) -> None:
+        handler = self._handlers.get(topic)
+        if handler is None:
+            return
+        token = _remote_dispatch.set(True)
+        try:
+            result = handler(payload)
+            if inspect.isawaitable(result):
+                # The task copies the current context, flag included.
+                task = asyncio.ensure_future(result)
+                self._pending.add(task)
+                task.add_done_callback(self._handler_done)
+        except Exception:
+            logger.exception("[cluster] Handler for %s failed", topic)
+        finally:
+            _remote_dispatch.reset(token)
+
+    def _handler_done(self, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("[cluster] Async handler failed", exc_info=task.exception())
+
+
+cluster_bus = ClusterBus()
+
+
+def _publish_after_commit(session: Session) -> None:
+    for topic, payload in session.info.pop(_ON_COMMIT, ()):
+        cluster_bus.publish(topic, payload)
+
+
+def _discard_after_rollback(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop(_ON_COMMIT, None)
+
+
+event.listen(Session, "after_commit", _publish_after_commit)
+event.listen(Session, "after_soft_rollback", _discard_after_rollback)
+
+
+class LeaderElection:
+    """Run ``jobs`` in exactly one worker: whichever holds the leader lock.
+
+    Each factory is called once per term of leadership and its task cancelled
+    when the term ends (shutdown, or the lock connection failing its
+    heartbeat). Jobs must therefore tolerate a restart on another worker —
+    the existing loops all re-derive their state from the database.
+    """
+
+    def __init__(self, jobs: Sequence[JobFactory], *, interval: float | None = None) -> None:
+        self._jobs = list(jobs)
+        self._interval = interval if interval is not None else settings.LEADER_ELECTION_INTERVAL
+        self.is_leader = False
+
+    async def run(self) -> None:
+        if not multi_worker():
+            await self._lead(None)
+            return
+        while True:
+            try:
+                async with _engine().connect() as conn:
+                    acquired = await conn.scalar(select(func.pg_try_advisory_lock(LEADER_LOCK_KEY)))
+                    await conn.commit()
+                    if acquired:
+                        await self._lead(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[cluster] Leader election failed — retrying")
+            await asyncio.sleep(self._interval)
+
+    async def _lead(self, conn: Any) -> None:
+        if conn is not None:
+            logger.info("[cluster] Worker %d is now the leader", os.getpid())
+        self.is_leader = True
+        tasks: list[asyncio.Task[None]] = [asyncio.create_task(job()) for job in self._jobs]
+        try:
+            if conn is None:
+                await asyncio.Event().wait()
+            while True:
+                await asyncio.sleep(self._interval)
+                # Raises once the connection — and with it the lock — is gone.
+                await conn.execute(select(literal(1)))
+                await conn.commit()
+        finally:
+            self.is_leader = False
+            await cancel_tasks(tasks)
+            if conn is not None:
+                logger.info("[cluster] Worker %d stepped down as leader", os.getpid())
@@ -746,6 +746,7 @@ async def run_compliance_scan(
     user_id: uuid_mod.UUID | str | None,
     *,
     regulations: list[str] | None = None,
+    on_progress: ProgressCallback | None = None,
 ) -> dict[str, Any]:
     """Compliance pipeline only: per-regulation AI gap analysis.
 
@@ -759,6 +760,14 @@ async def run_compliance_scan(
     """
     run_uuid = uuid_mod.UUID(str(run_id))
     progress_cb = _progress_cb(db, run_uuid)
+    if on_progress is not None:
+        # Mirror progress to the background job running the scan, which is
+        # also where a cancellation request surfaces.
+        run_progress = progress_cb
+
+        async def progress_cb(phase: str, current: int, total: int, note: str = "") -> None:
+            await run_progress(phase, current, total, note)
+            await on_progress(phase, current, total, note)
 
     # Load enabled regulations from the DB. The optional ``regulations``
     # filter (from the request body) narrows the run to the intersection.
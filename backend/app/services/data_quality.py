@@ -22,26 +22,54 @@ This is the single source of truth: ``cards.py``, ``ppm.py`` and
 ``turbolens_commit.py`` all call :func:`calc_data_quality`. ``seed_demo.py``
 keeps its own dict-based approximation because it runs before relations/tags
 exist and cannot evaluate the mandatory buckets.
+
+Scoring is split in two so bulk rescoring stays cheap: a type's rules are
+compiled once (:func:`compile_rules` — the schema, weights, mandatory relation
+sides, mandatory tag groups and counting stakeholder roles), and each chunk of
+cards then needs one query per bucket for the facts that cannot be read off
+the row itself (:func:`_load_facts`), instead of several per card.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import uuid
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.card import Card
 from app.models.card_type import CardType
 from app.models.stakeholder import Stakeholder
 from app.models.stakeholder_role_definition import StakeholderRoleDefinition
-from app.services.card_completeness import missing_mandatory
+from app.services.card_completeness import (
+    MandatoryFacts,
+    MandatoryItems,
+    compile_mandatory,
+    load_mandatory_facts,
+)
 
 # Reserved key on CardType.section_config holding the built-in weights.
 DATA_QUALITY_CONFIG_KEY = "__dataQuality"
 _BUILT_IN_BUCKETS = ("description", "lifecycle", "relations", "tags", "stakeholders")
 
+# Version of the scoring rules themselves, folded into ``rules_fingerprints``.
+# Bump it whenever the math below changes so the next boot re-scores the whole
+# inventory once — stored scores otherwise stay stale until each card is
+# individually edited.
+#   2 (2.52.0) — the mandatory-field gate that pins incomplete cards to 0.
+#   3 (2.59.0) — the stakeholders bucket became a single yes/no slot instead
+#                of one slot per role defined on the card type.
+SCORER_VERSION = 3
+
+# Key in app_settings.general_settings holding the per-type fingerprints of
+# the rules the stored scores were computed with.
+FINGERPRINT_SETTINGS_KEY = "dataQualityRulesFingerprint"
+
 
 def _bucket_weight(dq_cfg: dict, name: str) -> float:
     """Return the admin-tuned weight for a built-in contributor.
@@ -55,94 +83,190 @@ def _bucket_weight(dq_cfg: dict, name: str) -> float:
     return w if w > 0 else 0.0
 
 
-async def calc_data_quality(db: AsyncSession, card: Card) -> float:
-    """Calculate a card's data-quality score (0-100) from weighted completeness."""
-    result = await db.execute(
-        select(CardType.fields_schema, CardType.subtypes, CardType.section_config).where(
-            CardType.key == card.type
+@dataclass(frozen=True)
+class ScoringRules:
+    """One card type's scoring rules, compiled once and applied to many cards."""
+
+    type_key: str
+    # (key, required-gate?, weight) in schema order; weight 0 = not scored.
+    fields: tuple[tuple[str, bool, float], ...] = ()
+    hidden_by_subtype: dict[str, frozenset[str]] = field(default_factory=dict)
+    weights: dict[str, float] = field(default_factory=dict)
+    # Mandatory relation sides and tag groups, as the approval gate sees them.
+    mandatory: MandatoryItems = MandatoryItems()
+    # Active roles whose assignment fills the stakeholders slot.
+    stakeholder_roles: frozenset[str] = frozenset()
+
+    def as_key(self) -> list:
+        """A JSON-able form of the rules, for ``rules_fingerprint``."""
+        return [
+            self.type_key,
+            [list(f) for f in self.fields],
+            {k: sorted(v) for k, v in sorted(self.hidden_by_subtype.items())},
+            sorted(self.weights.items()),
+            sorted([s.key, s.side] for s in self.mandatory.relation_sides),
+            sorted(str(g.id) for g in self.mandatory.tag_groups),
+            sorted(self.stakeholder_roles),
+        ]
+
+
+def _compile_fields(schema: list | None) -> tuple[tuple[str, bool, float], ...]:
+    fields = []
+    for section in schema or []:
+        for f in section.get("fields", []):
+            # Boolean fields are exempt from the gate (a switch always has a
+            # value) and so are readonly (calculated) fields, whose value the
+            # user cannot enter by hand.
+            gate = bool(f.get("required") and f.get("type") != "boolean" and not f.get("readonly"))
+            weight = f.get("weight", 1)
+            fields.append((f["key"], gate, weight if weight > 0 else 0))
+    return tuple(fields)
+
+
+async def compile_rules(
+    db: AsyncSession, type_keys: Iterable[str] | None = None
+) -> dict[str, ScoringRules]:
+    """Compile the scoring rules of the given card types (all when ``None``).
+
+    Five queries regardless of how many types are asked for. Types that do not
+    exist are absent from the result; their cards score 0.
+    """
+    stmt = select(
+        CardType.key, CardType.fields_schema, CardType.subtypes, CardType.section_config
+    ).order_by(CardType.key)
+    if type_keys is not None:
+        keys = set(type_keys)
+        if not keys:
+            return {}
+        stmt = stmt.where(CardType.key.in_(keys))
+    types = (await db.execute(stmt)).all()
+    if not types:
+        return {}
+    keys = {row.key for row in types}
+
+    mandatory = await compile_mandatory(db, keys)
+
+    roles: dict[str, set[str]] = {k: set() for k in keys}
+    role_rows = await db.execute(
+        select(StakeholderRoleDefinition.card_type_key, StakeholderRoleDefinition.key).where(
+            StakeholderRoleDefinition.card_type_key.in_(keys),
+            StakeholderRoleDefinition.is_archived.is_(False),
+            StakeholderRoleDefinition.counts_for_quality.is_(True),
         )
     )
-    row = result.one_or_none()
-    if not row:
-        return 0.0
-    schema, subtypes, section_config = row
+    for type_key, role_key in role_rows:
+        roles[type_key].add(role_key)
+
+    compiled: dict[str, ScoringRules] = {}
+    for row in types:
+        dq_cfg = (row.section_config or {}).get(DATA_QUALITY_CONFIG_KEY) or {}
+        compiled[row.key] = ScoringRules(
+            type_key=row.key,
+            fields=_compile_fields(row.fields_schema),
+            hidden_by_subtype={
+                st["key"]: frozenset(st.get("hidden_fields", []))
+                for st in reversed(row.subtypes or [])
+                if st.get("key")
+            },
+            weights={b: _bucket_weight(dq_cfg, b) for b in _BUILT_IN_BUCKETS},
+            mandatory=mandatory[row.key],
+            stakeholder_roles=frozenset(roles[row.key]),
+        )
+    return compiled
 
-    dq_cfg = (section_config or {}).get(DATA_QUALITY_CONFIG_KEY) or {}
 
-    # Determine hidden fields for the card's subtype
-    hidden_keys: set[str] = set()
-    if card.subtype and subtypes:
-        for st in subtypes:
-            if st.get("key") == card.subtype:
-                hidden_keys = set(st.get("hidden_fields", []))
-                break
+@dataclass
+class _Facts:
+    """What a batch of cards has of the things their rules ask for."""
 
-    total_weight = 0.0
-    filled_weight = 0.0
+    mandatory: MandatoryFacts = field(default_factory=MandatoryFacts)
+    roles: set[tuple[uuid.UUID, str]] = field(default_factory=set)
+
+
+async def _load_facts(
+    db: AsyncSession, rules: dict[str, ScoringRules], cards: Sequence[Card]
+) -> _Facts:
+    """Load the relation, tag and stakeholder facts of ``cards`` in one query each."""
+    facts = _Facts()
+    applicable = [(c, rules[c.type]) for c in cards if c.type in rules]
+    if not applicable:
+        return facts
+
+    facts.mandatory = await load_mandatory_facts(
+        db,
+        [(c.id, r.mandatory) for c, r in applicable if r.weights["relations"] > 0],
+        [(c.id, r.mandatory) for c, r in applicable if r.weights["tags"] > 0],
+    )
+
+    ids = {c.id for c, r in applicable if r.weights["stakeholders"] > 0 and r.stakeholder_roles}
+    role_keys = {k for _, r in applicable for k in r.stakeholder_roles}
+    if ids:
+        held = await db.execute(
+            select(Stakeholder.card_id, Stakeholder.role)
+            .where(Stakeholder.card_id.in_(ids), Stakeholder.role.in_(role_keys))
+            .distinct()
+        )
+        facts.roles.update((card_id, role) for card_id, role in held)
+    return facts
+
+
+def _is_empty(val: object) -> bool:
+    return val is None or val == "" or val == []
+
+
+def _score(rules: ScoringRules, card: Card, facts: _Facts) -> float:
+    """Score one card against its compiled rules; pure, no I/O."""
+    hidden = rules.hidden_by_subtype.get(card.subtype, frozenset()) if card.subtype else frozenset()
     attrs = card.attributes or {}
 
     # Mandatory-field gate: while any visible required field is empty, the
     # score is pinned to 0 — the regular weighted calculation only applies once
-    # every mandatory field is filled. Boolean fields are exempt (a switch
-    # always has a value) and so are readonly (calculated) fields, whose value
-    # the user cannot enter by hand.
-    for section in schema:
-        for field in section.get("fields", []):
-            if (
-                not field.get("required")
-                or field["key"] in hidden_keys
-                or field.get("type") == "boolean"
-                or field.get("readonly")
-            ):
-                continue
-            val = attrs.get(field["key"])
-            if val is None or val == "" or val == []:
-                return 0.0
-
-    for section in schema:
-        for field in section.get("fields", []):
-            if field["key"] in hidden_keys:
-                continue
-            weight = field.get("weight", 1)
-            if weight <= 0:
-                continue
-            total_weight += weight
-            val = attrs.get(field["key"])
-            # `[]` is an emptied multiple_select — the mandatory gate above and
-            # `_is_empty_attr` both read it as empty, so scoring it as filled
-            # was a self-contradiction. `False` stays excluded by the identity
-            # check (a boolean set to false is "not filled" for scoring); `0`
-            # stays filled.
-            if val is not None and val != "" and val != [] and val is not False:
-                filled_weight += weight
+    # every mandatory field is filled.
+    for key, gate, _ in rules.fields:
+        if gate and key not in hidden and _is_empty(attrs.get(key)):
+            return 0.0
+
+    total_weight = 0.0
+    filled_weight = 0.0
+    for key, _, weight in rules.fields:
+        if key in hidden or weight <= 0:
+            continue
+        total_weight += weight
+        val = attrs.get(key)
+        # `[]` is an emptied multiple_select — the mandatory gate above and
+        # `_is_empty_attr` both read it as empty, so scoring it as filled
+        # was a self-contradiction. `False` stays excluded by the identity
+        # check (a boolean set to false is "not filled" for scoring); `0`
+        # stays filled.
+        if not _is_empty(val) and val is not False:
+            filled_weight += weight
+
+    w = rules.weights
 
     # Description bucket (admin-tunable; default weight 1, 0 = exclude)
-    desc_w = _bucket_weight(dq_cfg, "description")
-    if desc_w > 0:
-        total_weight += desc_w
+    if w["description"] > 0:
+        total_weight += w["description"]
         if card.description and card.description.strip():
-            filled_weight += desc_w
+            filled_weight += w["description"]
 
     # Lifecycle bucket (at least one date set)
-    lc_w = _bucket_weight(dq_cfg, "lifecycle")
-    if lc_w > 0:
-        total_weight += lc_w
+    if w["lifecycle"] > 0:
+        total_weight += w["lifecycle"]
         lc = card.lifecycle or {}
         if any(lc.get(p) for p in ("plan", "phaseIn", "active", "phaseOut", "endOfLife")):
-            filled_weight += lc_w
+            filled_weight += w["lifecycle"]
 
     # Mandatory relation sides and mandatory tag groups: each applicable item
-    # contributes its bucket weight to total, and to filled only when satisfied.
-    rel_w = _bucket_weight(dq_cfg, "relations")
-    tag_w = _bucket_weight(dq_cfg, "tags")
-    if rel_w > 0 or tag_w > 0:
-        state = await missing_mandatory(db, card)
-        if rel_w > 0:
-            total_weight += state["relations_applicable"] * rel_w
-            filled_weight += (state["relations_applicable"] - len(state["relations"])) * rel_w
-        if tag_w > 0:
-            total_weight += state["tag_groups_applicable"] * tag_w
-            filled_weight += (state["tag_groups_applicable"] - len(state["tag_groups"])) * tag_w
+    # contributes its bucket weight to total, and to filled only when satisfied
+    # — the same items the approval gate reports missing.
+    sides, groups = rules.mandatory.relation_sides, rules.mandatory.tag_groups
+    missing_sides, missing_groups = facts.mandatory.missing(card.id, rules.mandatory)
+    if w["relations"] > 0:
+        total_weight += len(sides) * w["relations"]
+        filled_weight += (len(sides) - len(missing_sides)) * w["relations"]
+    if w["tags"] > 0:
+        total_weight += len(groups) * w["tags"]
+        filled_weight += (len(groups) - len(missing_groups)) * w["tags"]
 
     # Stakeholders bucket: ONE yes/no slot, exactly like description and
     # lifecycle — is anybody assigned to this card, in a role that counts?
@@ -152,47 +276,41 @@ async def calc_data_quality(db: AsyncSession, card: Card) -> float:
     # Score-composition bar draws it as a single slice, so a type carrying both
     # `responsible` and `observer` silently cost two slots and a card with an
     # owner named but nobody watching was capped at half the bucket (#944).
-    # Relations and tags keep their per-item multiplication below — each
+    # Relations and tags keep their per-item multiplication above — each
     # mandatory item genuinely has to be satisfied — but stakeholder roles
     # carry no mandatory flag, so "all of them or a partial score" was never a
     # rule anyone declared.
     #
     # `counts_for_quality` is what keeps this honest: a purely passive role
     # (the built-in `observer`) is excluded, so watching a card can never stand
-    # in for owning it. Archived and non-counting roles are filtered out of
-    # `role_keys`, so an assignment held under one does not fill the slot.
-    stake_w = _bucket_weight(dq_cfg, "stakeholders")
-    if stake_w > 0:
-        role_rows = await db.execute(
-            select(StakeholderRoleDefinition.key).where(
-                StakeholderRoleDefinition.card_type_key == card.type,
-                StakeholderRoleDefinition.is_archived.is_(False),
-                StakeholderRoleDefinition.counts_for_quality.is_(True),
-            )
-        )
-        role_keys = list(role_rows.scalars().all())
-        # A type with no counting roles adds no slot at all, rather than one
-        # nobody could ever fill.
-        if role_keys:
-            total_weight += stake_w
-            held = await db.execute(
-                select(Stakeholder.id)
-                .where(
-                    Stakeholder.card_id == card.id,
-                    Stakeholder.role.in_(role_keys),
-                )
-                .limit(1)
-            )
-            if held.scalar_one_or_none() is not None:
-                filled_weight += stake_w
+    # in for owning it. Archived and non-counting roles are left out of the
+    # compiled `stakeholder_roles`, so an assignment held under one does not
+    # fill the slot. A type with no counting roles adds no slot at all, rather
+    # than one nobody could ever fill.
+    if w["stakeholders"] > 0 and rules.stakeholder_roles:
+        total_weight += w["stakeholders"]
+        if any((card.id, role) in facts.roles for role in rules.stakeholder_roles):
+            filled_weight += w["stakeholders"]
 
     if total_weight == 0:
         return 0.0
     return round((filled_weight / total_weight) * 100, 1)
 
 
+async def calc_data_quality(db: AsyncSession, card: Card) -> float:
+    """Calculate a card's data-quality score (0-100) from weighted completeness."""
+    rules = await compile_rules(db, [card.type])
+    if card.type not in rules:
+        return 0.0
+    return _score(rules[card.type], card, await _load_facts(db, rules, [card]))
+
+
 async def rescore_cards(
-    db: AsyncSession, card_ids: Iterable[uuid.UUID], *, chunk_size: int = 500
+    db: AsyncSession,
+    card_ids: Iterable[uuid.UUID],
+    *,
+    chunk_size: int = 500,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
 ) -> int:
     """Rescore the given cards; return how many stored scores changed.
 
@@ -203,38 +321,78 @@ async def rescore_cards(
 
     Never commits and never flushes: the caller owns the transaction, and in
     the bulk endpoints it owns a dry-run savepoint that must still be able to
-    discard everything this wrote.
+    discard everything this wrote. ``on_progress(done, total)`` is awaited
+    before each chunk.
     """
     ids = list(dict.fromkeys(card_ids))
     changed = 0
+    rules: dict[str, ScoringRules] = {}
+    looked_up: set[str] = set()
     for i in range(0, len(ids), chunk_size):
+        if on_progress is not None:
+            await on_progress(i, len(ids))
         chunk = ids[i : i + chunk_size]
         cards = (await db.execute(select(Card).where(Card.id.in_(chunk)))).scalars().all()
+        # Each type's rules are compiled the first time one of its cards shows
+        # up and reused for the rest of the pass.
+        unseen = {c.type for c in cards} - looked_up
+        if unseen:
+            rules.update(await compile_rules(db, unseen))
+            looked_up |= unseen
+        facts = await _load_facts(db, rules, cards)
         for card in cards:
-            score = await calc_data_quality(db, card)
+            score = _score(rules[card.type], card, facts) if card.type in rules else 0.0
             if card.data_quality != score:
                 card.data_quality = score
                 changed += 1
     return changed
 
 
-async def rescore_card_type(db: AsyncSession, type_key: str) -> int:
+async def rescore_card_type(
+    db: AsyncSession,
+    type_key: str,
+    *,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> int:
     """Rescore every active card of a type after a scoring-config change.
 
     Changing a card type's weights, or which of its stakeholder roles count,
-    moves the denominator for every card of that type at once — so the change
-    has to take effect immediately rather than waiting for each card to be
-    edited. Does not commit; the caller owns the transaction.
+    moves the denominator for every card of that type at once. Does not
+    commit; the caller owns the transaction. Admin edits go through
+    :func:`schedule_type_rescore` instead of calling this directly.
     """
     ids = list(
         (
             await db.execute(select(Card.id).where(Card.type == type_key, Card.status == "ACTIVE"))
         ).scalars()
     )
-    return await rescore_cards(db, ids)
+    return await rescore_cards(db, ids, on_progress=on_progress)
 
 
-async def recompute_all_data_quality(db: AsyncSession, *, chunk_size: int = 500) -> int:
+async def schedule_type_rescore(db: AsyncSession, type_key: str) -> None:
+    """Queue a rescore of every card of a type, ``DQ_RESCORE_DEBOUNCE_SECONDS`` out.
+
+    An admin tuning weights saves several times in a row; each save pushes the
+    one queued ``data_quality.rescore_type`` job back instead of walking the
+    inventory again, so the burst costs a single pass once it settles. Does
+    not commit — the job becomes visible with the caller's edit.
+    """
+    from app.services.background_jobs import enqueue_job
+
+    await enqueue_job(
+        db,
+        "data_quality.rescore_type",
+        {"type_key": type_key},
+        delay=settings.DQ_RESCORE_DEBOUNCE_SECONDS,
+    )
+
+
+async def recompute_all_data_quality(
+    db: AsyncSession,
+    *,
+    chunk_size: int = 500,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> int:
     """Rescore ``data_quality`` for every non-archived card. Returns the count
     of cards whose stored score changed.
 
@@ -244,6 +402,52 @@ async def recompute_all_data_quality(db: AsyncSession, *, chunk_size: int = 500)
     the same math everywhere.
     """
     ids = list((await db.execute(select(Card.id).where(Card.status != "ARCHIVED"))).scalars().all())
-    changed = await rescore_cards(db, ids, chunk_size=chunk_size)
+    changed = await rescore_cards(db, ids, chunk_size=chunk_size, on_progress=on_progress)
     await db.flush()
     return changed
+
+
+async def rules_fingerprints(
+    db: AsyncSession, type_keys: Iterable[str] | None = None
+) -> dict[str, str]:
+    """Hash of each type's compiled scoring rules, salted with ``SCORER_VERSION``.
+
+    A type's stored scores are canonical for as long as its hash is the one
+    recorded when they were last computed (:func:`record_fingerprints`), which
+    is what lets the boot-time rescore skip the types nobody changed.
+    """
+    return {
+        key: hashlib.sha256(
+            json.dumps([SCORER_VERSION, rules.as_key()], default=str).encode()
+        ).hexdigest()
+        for key, rules in (await compile_rules(db, type_keys)).items()
+    }
+
+
+async def stored_fingerprints(db: AsyncSession) -> dict[str, str]:
+    """The per-type fingerprints recorded with the stored scores."""
+    from app.models.app_settings import AppSettings
+
+    general = (
+        await db.execute(select(AppSettings.general_settings).where(AppSettings.id == "default"))
+    ).scalar_one_or_none() or {}
+    stored = general.get(FINGERPRINT_SETTINGS_KEY)
+    return stored if isinstance(stored, dict) else {}
+
+
+async def record_fingerprints(db: AsyncSession, fingerprints: dict[str, str]) -> None:
+    """Record that the given types' stored scores match these rules. Flushes."""
+    from app.models.app_settings import AppSettings
+
+    row = await db.get(AppSettings, "default")
+    if row is None:
+        row = AppSettings(id="default", general_settings={}, email_settings={})
+        db.add(row)
+    general = dict(row.general_settings or {})
+    stored = general.get(FINGERPRINT_SETTINGS_KEY)
+    general[FINGERPRINT_SETTINGS_KEY] = {
+        **(stored if isinstance(stored, dict) else {}),
+        **fingerprints,
+    }
+    row.general_settings = general
+    await db.flush()
@@ -0,0 +1,222 @@
+"""Delta-compressed storage of BPMN process diagram versions.
+
+Every save in the process modeller adds a ``process_diagrams`` row, and two
+consecutive versions usually differ by a handful of lines of a document that
+can run to hundreds of KB. A version is therefore stored as either
+
+- a **snapshot** — the full XML in ``bpmn_xml``, or
+- a **delta** — ``bpmn_xml`` is NULL, ``bpmn_delta`` holds the zlib-compressed
+  line edit script that turns the snapshot ``delta_base_id`` into this
+  version's XML.
+
+A save deltas against the latest snapshot and starts a new one every
+``DIAGRAM_SNAPSHOT_INTERVAL`` versions, or whenever the delta would not be
+much smaller than the XML itself, so any version is rebuilt from its own row
+plus one snapshot. History written before deltas existed is converted by
+``compact_process_diagrams``, which the leader runs hourly.
+
+Readers never touch the columns directly: ``diagram_xml`` returns a version's
+XML whichever way it is stored.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import difflib
+import json
+import logging
+import uuid
+import zlib
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.process_diagram import ProcessDiagram
+
+logger = logging.getLogger(__name__)
+
+#: First byte of every encoded delta, so the format can evolve.
+_FORMAT = b"\x01"
+
+#: A delta is only kept when it is at most this share of the XML's size.
+MAX_DELTA_RATIO = 0.1
+
+#: Processes compacted per pass (largest histories first).
+_COMPACT_BATCH = 50
+
+
+def encode_delta(base: str, text: str) -> bytes:
+    """Encode ``text`` as a compressed line edit script against ``base``.
+
+    The script is a JSON list whose items are either ``[start, end]`` — copy
+    those lines of ``base`` — or a string to insert verbatim.
+    """
+    base_lines = base.splitlines(keepends=True)
+    new_lines = text.splitlines(keepends=True)
+    ops: list = []
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(new_lines[j1:j2]))
+    payload = json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _FORMAT + zlib.compress(payload, 9)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild the text ``encode_delta(base, text)`` was made from."""
+    if delta[:1] != _FORMAT:
+        raise ValueError(f"Unknown diagram delta format {delta[:1]!r}")
+    ops = json.loads(zlib.decompress(delta[1:]).decode("utf-8"))
+    base_lines = base.splitlines(keepends=True)
+    out: list[str] = []
+    for op in ops:
+        if isinstance(op, list):
+            out.extend(base_lines[op[0] : op[1]])
+        else:
+            out.append(op)
+    return "".join(out)
+
+
+def _checked_delta(base: str, text: str) -> bytes | None:
+    """The delta from ``base`` to ``text``, or None when a snapshot is better.
+
+    The delta is decoded again before it is accepted: the full text is about to
+    be dropped, so a codec bug must not cost a version.
+    """
+    delta = encode_delta(base, text)
+    if len(delta) > len(text) * MAX_DELTA_RATIO:
+        return None
+    if apply_delta(base, delta) != text:
+        logger.error("Diagram delta did not round-trip; storing a snapshot")
+        return None
+    return delta
+
+
+async def diagram_xml(db: AsyncSession, diagram: ProcessDiagram) -> str:
+    """Return the BPMN XML of ``diagram``, applying its delta if it has one."""
+    deltas: list[bytes] = []
+    row: ProcessDiagram | None = diagram
+    while row is not None and row.bpmn_xml is None:
+        deltas.append(row.bpmn_delta or b"")
+        # A compaction racing a save can leave a delta whose base became a
+        # delta itself, so follow the chain; bases are always older versions.
+        row = await db.get(ProcessDiagram, row.delta_base_id) if row.delta_base_id else None
+    text = row.bpmn_xml if row is not None else None
+    if text is None:
+        raise ValueError(f"Process diagram {diagram.id} has no snapshot to rebuild from")
+    for delta in reversed(deltas):
+        text = apply_delta(text, delta)
+    return text
+
+
+async def version_storage(
+    db: AsyncSession,
+    current: ProcessDiagram | None,
+    bpmn_xml: str,
+    version: int,
+) -> dict:
+    """Column values storing ``bpmn_xml`` as the version after ``current``."""
+    interval = settings.DIAGRAM_SNAPSHOT_INTERVAL
+    if current is None or interval <= 1:
+        return {"bpmn_xml": bpmn_xml}
+    base = current
+    if base.bpmn_xml is None and base.delta_base_id:
+        snapshot = await db.get(ProcessDiagram, base.delta_base_id)
+        if snapshot is None:
+            return {"bpmn_xml": bpmn_xml}
+        base = snapshot
+    if base.bpmn_xml is None or version - base.version >= interval:
+        return {"bpmn_xml": bpmn_xml}
+    delta = await asyncio.to_thread(_checked_delta, base.bpmn_xml, bpmn_xml)
+    if delta is None:
+        return {"bpmn_xml": bpmn_xml}
+    return {"bpmn_xml": None, "bpmn_delta": delta, "delta_base_id": base.id}
+
+
+async def _compact_process(db: AsyncSession, process_id: uuid.UUID, interval: int) -> int:
+    referenced = set(
+        (
+            await db.execute(
+                select(ProcessDiagram.delta_base_id)
+                .where(
+                    ProcessDiagram.process_id == process_id,
+                    ProcessDiagram.delta_base_id.is_not(None),
+                )
+                .distinct()
+            )
+        ).scalars()
+    )
+    snapshots = (
+        await db.execute(
+            select(ProcessDiagram.id, ProcessDiagram.version)
+            .where(
+                ProcessDiagram.process_id == process_id,
+                ProcessDiagram.bpmn_xml.is_not(None),
+            )
+            .order_by(ProcessDiagram.version, ProcessDiagram.created_at)
+        )
+    ).all()
+
+    converted = 0
+    anchor: tuple[uuid.UUID, int, str] | None = None
+    for row_id, version in snapshots:
+        # One version's XML at a time: a long history would not fit in memory.
+        text = (
+            await db.execute(select(ProcessDiagram.bpmn_xml).where(ProcessDiagram.id == row_id))
+        ).scalar_one_or_none()
+        if text is None:
+            # Deleted, or stored as a delta, since the listing.
+            continue
+        delta = None
+        if anchor is not None and row_id not in referenced and version - anchor[1] < interval:
+            delta = await asyncio.to_thread(_checked_delta, anchor[2], text)
+        if anchor is None or delta is None:
+            anchor = (row_id, version, text)
+            continue
+        await db.execute(
+            update(ProcessDiagram)
+            .where(ProcessDiagram.id == row_id, ProcessDiagram.bpmn_xml.is_not(None))
+            .values(bpmn_xml=None, bpmn_delta=delta, delta_base_id=anchor[0])
+        )
+        converted += 1
+    return converted
+
+
+async def compact_process_diagrams(db: AsyncSession, *, interval: int | None = None) -> int:
+    """Convert stored snapshots into deltas where the snapshot cadence allows.
+
+    Picks the processes keeping more snapshots than one per ``interval``
+    versions, largest histories first, and commits after each. A snapshot
+    some delta is built on is never converted. Returns the number of versions
+    converted.
+    """
+    interval = interval or settings.DIAGRAM_SNAPSHOT_INTERVAL
+    if interval <= 1:
+        return 0
+    snapshot_count = func.count(ProcessDiagram.id)
+    version_span = func.max(ProcessDiagram.version) - func.min(ProcessDiagram.version)
+    candidates = (
+        (
+            await db.execute(
+                select(ProcessDiagram.process_id)
+                .where(ProcessDiagram.bpmn_xml.is_not(None))
+                .group_by(ProcessDiagram.process_id)
+                .having(snapshot_count > 1 + version_span / interval)
+                .order_by(snapshot_count.desc())
+                .limit(_COMPACT_BATCH)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    converted = 0
+    for process_id in candidates:
+        converted += await _compact_process(db, process_id, interval)
+        await db.commit()
+    if converted:
+        logger.info("Compacted %d process diagram versions into deltas", converted)
+    return converted
@@ -5,12 +5,20 @@ the ``settings`` singleton" — used by app startup, ``PATCH /settings/email``,
 and the workspace-transfer importer. Keeping one implementation prevents the
 three call sites from drifting (a stale startup copy once silently dropped the
 OAuth fields on restart).
+
+``load_runtime_settings`` re-reads the stored row — email settings plus the
+app title — and is what startup runs, and what the other uvicorn workers run
+when a peer announces a change on the cluster bus.
 """
 
 from __future__ import annotations
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.config import settings as app_config
 from app.core.encryption import decrypt_value
+from app.services.cluster import cluster_bus
 
 # New-style fields are applied on key presence so an admin can clear a value
 # (e.g. remove a custom scope or a rotated service-account key) without a
@@ -59,3 +67,29 @@ def apply_email_settings_to_runtime(email: dict) -> None:
     from app.services.email_backends import oauth
 
     oauth.reset_cache()
+
+
+async def load_runtime_settings(db: AsyncSession) -> None:
+    """Hydrate the email settings and app title from ``app_settings``."""
+    from app.models.app_settings import AppSettings
+    from app.services.app_identity import DEFAULT_APP_TITLE
+
+    row = (
+        await db.execute(select(AppSettings).where(AppSettings.id == "default"))
+    ).scalar_one_or_none()
+    if row and row.email_settings:
+        apply_email_settings_to_runtime(row.email_settings)
+    # The title lives in the general_settings JSONB; email templates and other
+    # consumers read it off the singleton without a DB query.
+    title = ((row.general_settings or {}).get("app_title") or "").strip() if row else ""
+    app_config.APP_TITLE = title or DEFAULT_APP_TITLE
+
+
+async def _reload_for_peer(_payload: dict) -> None:
+    from app.database import async_session
+
+    async with async_session() as db:
+        await load_runtime_settings(db)
+
+
+cluster_bus.on("settings.runtime", _reload_for_peer, resync=True)
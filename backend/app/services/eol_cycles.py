@@ -0,0 +1,265 @@
+"""Local copy of endoflife.date release cycles, refreshed in the background.
+
+The EOL report fetched ``{product}.json`` from endoflife.date for every
+linked product each time it was built, so the report took as long as the
+slowest product, failed soft on an unreachable upstream (every linked card
+showed ``unknown``), and did not work at all on an air-gapped install.
+``GET /eol/products/{product}`` proxied the same call for the card page.
+
+Cycles are now kept per product in ``eol_product_cycles``:
+
+- ``read_product_cycles`` is the stale-while-revalidate read path. It
+  returns whatever is stored and queues an ``eol.refresh_cycles`` job when a
+  product is missing or was last confirmed more than ``EOL_CACHE_TTL``
+  seconds ago. It never touches the network.
+- ``refresh_product_cycles`` revalidates products in batches, at most
+  ``EOL_REFRESH_CONCURRENCY`` requests in flight, sending the stored
+  ``ETag`` / ``Last-Modified`` back so an unchanged product costs a ``304``.
+  A product endoflife.date does not know is stored without cycles; a failed
+  request leaves the stored row alone and is retried by the next refresh.
+- With ``EOL_FIXTURE_PATH`` set, the refresh reads a local JSON file of
+  ``{"product": [cycles...]}`` instead of the network.
+
+A refresh that changes a product's cycles writes through the ORM and so
+moves the landscape version the report cache keys on
+(``app/services/report_cache.py``); a ``304`` only moves ``checked_at``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import select, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.card import Card
+from app.models.eol_product_cycles import EolProductCycles
+
+logger = logging.getLogger(__name__)
+
+EOL_BASE = "https://endoflife.date/api"
+
+# SSRF guard: product names end up in the request path.
+PRODUCT_NAME = re.compile(r"^[a-zA-Z0-9._-]{1,100}$")
+
+# Products revalidated (and committed) per round.
+_BATCH_SIZE = 50
+
+_fixture: tuple[str, float, dict[str, list[dict]]] | None = None
+
+
+def load_fixture() -> dict[str, list[dict]] | None:
+    """The ``EOL_FIXTURE_PATH`` file, re-read when it changes; ``None`` when unset."""
+    global _fixture
+    path = settings.EOL_FIXTURE_PATH
+    if not path:
+        return None
+    mtime = os.path.getmtime(path)
+    if _fixture is None or _fixture[0] != path or _fixture[1] != mtime:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected an object of product -> cycles")
+        _fixture = (path, mtime, data)
+    return _fixture[2]
+
+
+def _cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.EOL_CACHE_TTL)
+
+
+def is_stale(row: EolProductCycles) -> bool:
+    return row.checked_at < _cutoff()
+
+
+async def read_product_cycles(db: AsyncSession, products: Iterable[str]) -> dict[str, list[dict]]:
+    """Stored cycles per product, without waiting on endoflife.date.
+
+    Products with no stored cycles are left out. Queues a refresh when any
+    product is missing or stale; does not commit.
+    """
+    products = {p for p in products if PRODUCT_NAME.match(p)}
+    if not products:
+        return {}
+    rows = (
+        (await db.execute(select(EolProductCycles).where(EolProductCycles.product.in_(products))))
+        .scalars()
+        .all()
+    )
+    if len(rows) < len(products) or any(is_stale(row) for row in rows):
+        await schedule_refresh(db)
+    return {row.product: row.cycles for row in rows if row.cycles is not None}
+
+
+async def schedule_refresh(db: AsyncSession) -> None:
+    """Queue the (single) ``eol.refresh_cycles`` job. Does not commit."""
+    from app.services.background_jobs import enqueue_job
+
+    await enqueue_job(db, "eol.refresh_cycles")
+
+
+async def stale_products(db: AsyncSession) -> list[str]:
+    """Products a card links or the table holds that are missing or stale."""
+    linked = select(Card.attributes["eol_product"].astext.label("product")).where(
+        Card.status != "ARCHIVED", Card.attributes["eol_product"].astext.is_not(None)
+    )
+    known = select(EolProductCycles.product)
+    candidates = union(linked, known).subquery()
+    fresh = select(EolProductCycles.product).where(EolProductCycles.checked_at >= _cutoff())
+    rows = await db.execute(
+        select(candidates.c.product)
+        .where(candidates.c.product.not_in(fresh))
+        .order_by(candidates.c.product)
+    )
+    return [p for p in rows.scalars() if PRODUCT_NAME.match(p)]
+
+
+@dataclass(frozen=True)
+class _Fetched:
+    # "updated", "unchanged", "not_found" or "failed"
+    outcome: str
+    cycles: list[dict] | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+async def _fetch(
+    client: httpx.AsyncClient,
+    product: str,
+    row: EolProductCycles | None,
+) -> _Fetched:
+    headers = {}
+    if row is not None and row.cycles is not None:
+        if row.etag:
+            headers["If-None-Match"] = row.etag
+        if row.last_modified:
+            headers["If-Modified-Since"] = row.last_modified
+    try:
+        resp = await client.get(f"{EOL_BASE}/{product}.json", headers=headers)
+        if resp.status_code == 304:
+            return _Fetched("unchanged")
+        if resp.status_code == 404:
+            return _Fetched("not_found")
+        resp.raise_for_status()
+        cycles = resp.json()
+    except (httpx.HTTPError, ValueError) as exc:
+        logger.warning("endoflife.date API error for product '%s': %s", product, exc)
+        return _Fetched("failed")
+    if not isinstance(cycles, list):
+        logger.warning("endoflife.date returned no cycle list for product '%s'", product)
+        return _Fetched("failed")
+    return _Fetched(
+        "updated",
+        cycles,
+        resp.headers.get("ETag"),
+        resp.headers.get("Last-Modified"),
+    )
+
+
+def _from_fixture(fixture: dict[str, list[dict]], product: str) -> _Fetched:
+    cycles = fixture.get(product)
+    return _Fetched("updated", cycles) if isinstance(cycles, list) else _Fetched("not_found")
+
+
+async def refresh_product_cycles(
+    db: AsyncSession,
+    products: list[str] | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> dict[str, int]:
+    """Revalidate ``products`` (default: every stale one) against endoflife.date.
+
+    Commits after each batch of ``_BATCH_SIZE`` products. Returns how many
+    products were updated, unchanged, not found and failed.
+    """
+    if products is None:
+        products = await stale_products(db)
+    products = [p for p in dict.fromkeys(products) if PRODUCT_NAME.match(p)]
+    counts = {"updated": 0, "unchanged": 0, "not_found": 0, "failed": 0}
+    if not products:
+        return counts
+    fixture = load_fixture()
+    own_client = client is None
+    http = client if client is not None else httpx.AsyncClient(timeout=15.0)
+    limit = asyncio.Semaphore(max(settings.EOL_REFRESH_CONCURRENCY, 1))
+
+    async def fetch(product: str, row: EolProductCycles | None) -> _Fetched:
+        if fixture is not None:
+            return _from_fixture(fixture, product)
+        async with limit:
+            return await _fetch(http, product, row)
+
+    try:
+        for start in range(0, len(products), _BATCH_SIZE):
+            if on_progress is not None:
+                await on_progress(start, len(products))
+            batch = products[start : start + _BATCH_SIZE]
+            rows = {
+                row.product: row
+                for row in (
+                    await db.execute(
+                        select(EolProductCycles).where(EolProductCycles.product.in_(batch))
+                    )
+                ).scalars()
+            }
+            results = await asyncio.gather(*(fetch(p, rows.get(p)) for p in batch))
+            now = datetime.now(timezone.utc)
+            confirmed: list[str] = []
+            for product, fetched in zip(batch, results, strict=True):
+                row = rows.get(product)
+                outcome = fetched.outcome
+                if row is not None and outcome in ("updated", "not_found"):
+                    if row.cycles == fetched.cycles:
+                        # Same content without a 304 (or still unknown upstream).
+                        outcome = "unchanged"
+                elif row is None and outcome == "unchanged":
+                    outcome = "failed"
+                counts[outcome] += 1
+                if outcome == "failed":
+                    continue
+                if outcome == "unchanged":
+                    assert row is not None  # a 304 without a stored copy counts as failed
+                    confirmed.append(product)
+                    if fetched.etag and fetched.etag != row.etag:
+                        await db.execute(
+                            update(EolProductCycles)
+                            .where(EolProductCycles.product == product)
+                            .values(etag=fetched.etag, last_modified=fetched.last_modified)
+                            .execution_options(synchronize_session=False)
+                        )
+                    continue
+                if row is None:
+                    row = EolProductCycles(product=product)
+                    db.add(row)
+                row.cycles = fetched.cycles
+                row.etag = fetched.etag
+                row.last_modified = fetched.last_modified
+                row.checked_at = now
+                row.updated_at = now
+            if confirmed:
+                # Core statements skip the flush events, so a confirmation
+                # leaves cached reports alone.
+                await db.execute(
+                    update(EolProductCycles)
+                    .where(EolProductCycles.product.in_(confirmed))
+                    .values(checked_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+    finally:
+        if own_client:
+            await http.aclose()
+    if on_progress is not None:
+        await on_progress(len(products), len(products))
+    logger.info("Refreshed endoflife.date cycles: %s", counts)
+    return counts
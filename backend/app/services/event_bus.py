@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import uuid
 from contextvars import ContextVar
 from datetime import datetime, timezone
@@ -9,6 +10,7 @@ from typing import Any, AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.event import Event
+from app.services.cluster import MAX_PAYLOAD_BYTES, cluster_bus
 
 # Set by `OriginMiddleware` in `app.main` from the `X-Turbo-EA-Origin`
 # request header. ``publish()`` reads this and stamps the event payload so
@@ -32,7 +34,7 @@ request_batch_id: ContextVar[uuid.UUID | None] = ContextVar("request_batch_id",
 # the audit log's Tool column.
 request_endpoint: ContextVar[str | None] = ContextVar("request_endpoint", default=None)
 
-# Set by ``capture_request_origin`` in ``app.main`` when the request's JWT
+# Set by ``RequestContextMiddleware`` (app/core/request_context.py) when the request's JWT
 # carries an ``impersonated_role`` claim — i.e. an admin has activated a
 # "View as role" session from the user menu. Tuple is
 # (impersonator_user_id, impersonated_role_key). ``publish()`` stamps both
@@ -63,9 +65,32 @@ _NO_AUTO_BATCH_PREFIXES: frozenset[str] = frozenset(
 )
 
 
+# Data values longer than this are dropped from events relayed to other
+# workers when the whole message would not fit in one NOTIFY payload. Short
+# scalars — ``user_id`` above all, which the SSE visibility filter keys on —
+# survive; the full payload is always in the ``events`` table.
+_PEER_VALUE_LIMIT = 200
+
+
+def _for_peers(message: dict[str, Any]) -> dict[str, Any]:
+    """``message`` trimmed to fit a cluster-bus notification."""
+    if len(json.dumps(message, default=str)) < MAX_PAYLOAD_BYTES - 200:
+        return message
+    data = {
+        key: value
+        for key, value in (message.get("data") or {}).items()
+        if value is None or len(json.dumps(value, default=str)) <= _PEER_VALUE_LIMIT
+    }
+    return {**message, "data": data}
+
+
 class EventBus:
     def __init__(self) -> None:
+        # Live subscribers (the SSE stream) get events published by any worker
+        # process; local-only subscribers get this process's own events. With
+        # a single worker the two are the same thing.
         self._subscribers: list[asyncio.Queue] = []
+        self._local_subscribers: list[asyncio.Queue] = []
 
     async def publish(
         self,
@@ -151,16 +176,28 @@ class EventBus:
             "batch_id": str(effective_batch_id) if effective_batch_id else None,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
+        self._deliver(message, self._subscribers)
+        self._deliver(message, self._local_subscribers)
+        cluster_bus.publish("event", _for_peers(message))
+
+    def deliver_remote(self, message: dict[str, Any]) -> None:
+        """Hand an event published by another worker to the live subscribers."""
+        self._deliver(message, self._subscribers)
+
+    @staticmethod
+    def _deliver(message: dict[str, Any], subscribers: list[asyncio.Queue]) -> None:
         dead: list[asyncio.Queue] = []
-        for q in self._subscribers:
+        for q in subscribers:
             try:
                 q.put_nowait(message)
             except asyncio.QueueFull:
                 dead.append(q)
         for q in dead:
-            self._subscribers.remove(q)
+            subscribers.remove(q)
 
-    async def subscribe(self) -> AsyncGenerator[dict[str, Any], None]:
+    async def subscribe(
+        self, *, include_remote: bool = True
+    ) -> AsyncGenerator[dict[str, Any], None]:
         """Yield each published event as a raw dict.
 
         The SSE endpoint (`events.py`) is responsible for filtering events per
@@ -168,16 +205,23 @@ class EventBus:
         and for SSE serialization. Keeping this generic — yielding the raw
         message rather than a pre-formatted ``data: …`` string — is what lets
         the route apply per-user authorization before anything is sent.
+
+        ``include_remote=False`` restricts the stream to events published in
+        this process — for consumers that act on each event once per
+        installation (extension event handlers), where every worker relaying
+        every other worker's events would multiply the work.
         """
+        subscribers = self._subscribers if include_remote else self._local_subscribers
         q: asyncio.Queue = asyncio.Queue(maxsize=256)
-        self._subscribers.append(q)
+        subscribers.append(q)
         try:
             while True:
                 msg = await q.get()
                 yield msg
         finally:
-            if q in self._subscribers:
-                self._subscribers.remove(q)
+            if q in subscribers:
+                subscribers.remove(q)
 
 
 event_bus = EventBus()
+cluster_bus.on("event", event_bus.deliver_remote)
@@ -0,0 +1,226 @@
+"""Monthly partitions of the ``events`` table and their retention.
+
+``events`` is range-partitioned on ``created_at`` (migration 141): one child
+table per calendar month (UTC), named ``events_y2026m10``, plus
+``events_default`` for any row whose month has no partition yet. The
+leader's maintenance loop keeps this shape:
+
+- ``ensure_event_partitions`` creates the current month and the next
+  ``EVENT_PARTITIONS_AHEAD`` ones before any row needs them, and gives every
+  month that nonetheless reached the default partition (imports, back-dated
+  seed data) its own partition, moving those rows across. The default
+  partition therefore stays (nearly) empty, which keeps creating partitions
+  cheap: Postgres must scan it on every attach.
+- ``apply_event_retention`` enforces the admin's retention policy
+  (``general_settings.eventRetentionMonths``, 0 = keep everything) a whole
+  month at a time, instead of a ``DELETE`` that would bloat the table:
+
+  - ``archive`` writes the month to ``<EVENT_ARCHIVE_PATH>/events_y2024m01.jsonl.gz``
+    (one JSON object per line), then detaches and drops the partition;
+  - ``detach`` only detaches it, renamed ``events_y2024m01_detached`` — the
+    rows leave every reader but stay in the database for a DBA to inspect,
+    re-attach, dump or drop.
+
+Partition DDL needs literal bounds, so it is written as SQL text here; the
+bounds are computed datetimes and the names are built from them, never from
+input.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.event import Event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION = "events_default"
+RETENTION_MODES = ("archive", "detach")
+DEFAULT_RETENTION_MODE = "archive"
+
+_PARTITION_NAME = re.compile(r"^events_y(\d{4})m(\d{2})$")
+_EXPORT_CHUNK_ROWS = 2000
+
+
+def month_floor(moment: datetime) -> datetime:
+    """Midnight UTC on the first day of ``moment``'s month."""
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + (month.month - 1) + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"events_y{month.year:04d}m{month.month:02d}"
+
+
+async def list_event_partitions(db: AsyncSession) -> dict[str, datetime]:
+    """``{partition name: first instant of its month}`` for the attached months."""
+    rows = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'events'::regclass"
+        )
+    )
+    partitions: dict[str, datetime] = {}
+    for (name,) in rows.all():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[name] = datetime(
+                int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc
+            )
+    return partitions
+
+
+async def _create_partition(db: AsyncSession, month: datetime) -> None:
+    name = partition_name(month)
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    # Built standalone and attached, rather than CREATE ... PARTITION OF, so
+    # the month's rows can first be moved out of the default partition —
+    # attaching a range the default partition still holds rows for fails.
+    await db.execute(text(f"CREATE TABLE {name} (LIKE events INCLUDING DEFAULTS)"))
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": month, "upper": add_months(month, 1)},
+    )
+    await db.execute(
+        text(
+            f"ALTER TABLE events ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+
+
+async def ensure_event_partitions(
+    db: AsyncSession, *, now: datetime | None = None, ahead: int | None = None
+) -> list[str]:
+    """Create missing monthly partitions. Returns the names created; commits."""
+    now = now or datetime.now(timezone.utc)
+    ahead = settings.EVENT_PARTITIONS_AHEAD if ahead is None else ahead
+    existing = set((await list_event_partitions(db)).values())
+
+    wanted = {add_months(month_floor(now), offset) for offset in range(max(0, ahead) + 1)}
+    stray = await db.execute(
+        text(
+            f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+            f"FROM {DEFAULT_PARTITION}"
+        )
+    )
+    wanted |= {month.replace(tzinfo=timezone.utc) for (month,) in stray.all()}
+
+    created: list[str] = []
+    for month in sorted(wanted - existing):
+        await _create_partition(db, month)
+        created.append(partition_name(month))
+    await db.commit()
+    if created:
+        logger.info("Created event partitions: %s", ", ".join(created))
+    return created
+
+
+def _archive_line(row) -> str:
+    return json.dumps(
+        {
+            "id": str(row.id),
+            "card_id": str(row.card_id) if row.card_id else None,
+            "user_id": str(row.user_id) if row.user_id else None,
+            "event_type": row.event_type,
+            "data": row.data,
+            "batch_id": str(row.batch_id) if row.batch_id else None,
+            "created_at": row.created_at.isoformat(),
+        },
+        default=str,
+        ensure_ascii=False,
+    )
+
+
+async def _archive_partition(db: AsyncSession, month: datetime, archive_dir: Path) -> Path:
+    """Write one month of events to a gzipped JSON-lines file; returns its path.
+
+    Written under a temporary name and renamed into place, so a crash never
+    leaves a truncated archive that looks complete.
+    """
+    await asyncio.to_thread(archive_dir.mkdir, parents=True, exist_ok=True)
+    target = archive_dir / f"{partition_name(month)}.jsonl.gz"
+    partial = target.with_name(target.name + ".partial")
+    table = Event.__table__
+    base = (
+        select(table)
+        .where(table.c.created_at >= month, table.c.created_at < add_months(month, 1))
+        .order_by(table.c.created_at, table.c.id)
+        .limit(_EXPORT_CHUNK_ROWS)
+    )
+    # Keyset chunks rather than a server-side cursor: asyncpg keeps a cursor's
+    # portal open until the transaction ends, and an open portal on the
+    # partition blocks the DETACH that follows in this transaction.
+    handle = await asyncio.to_thread(gzip.open, partial, "wt", encoding="utf-8")
+    try:
+        stmt = base
+        while rows := (await db.execute(stmt)).all():
+            lines = "".join(_archive_line(row) + "\n" for row in rows)
+            await asyncio.to_thread(handle.write, lines)
+            last = rows[-1]
+            stmt = base.where(
+                tuple_(table.c.created_at, table.c.id) > tuple_(last.created_at, last.id)
+            )
+    finally:
+        await asyncio.to_thread(handle.close)
+    await asyncio.to_thread(os.replace, partial, target)
+    return target
+
+
+async def apply_event_retention(
+    db: AsyncSession,
+    *,
+    months: int,
+    mode: str = DEFAULT_RETENTION_MODE,
+    archive_dir: Path | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Archive or detach every month entirely older than ``months`` months.
+
+    The current month always counts as the first: with ``months=12`` in
+    October 2026, everything before November 2025 goes. Returns the names of
+    the partitions handled; commits after each one.
+    """
+    if months <= 0:
+        return []
+    if mode not in RETENTION_MODES:
+        raise ValueError(f"Unknown event retention mode {mode!r}")
+    cutoff = add_months(month_floor(now or datetime.now(timezone.utc)), 1 - months)
+    archive_dir = archive_dir or Path(settings.EVENT_ARCHIVE_PATH)
+
+    handled: list[str] = []
+    partitions = await list_event_partitions(db)
+    for name, month in sorted(partitions.items(), key=lambda item: item[1]):
+        if add_months(month, 1) > cutoff:
+            continue
+        if mode == "archive":
+            path = await _archive_partition(db, month, archive_dir)
+            await db.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+            await db.execute(text(f"DROP TABLE {name}"))
+            logger.info("Archived event partition %s to %s", name, path)
+        else:
+            await db.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+            await db.execute(text(f"ALTER TABLE {name} RENAME TO {name}_detached"))
+            logger.info("Detached event partition %s as %s_detached", name, name)
+        await db.commit()
+        handled.append(name)
+    return handled
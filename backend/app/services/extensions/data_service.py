@@ -10,7 +10,11 @@ Design invariants (mirroring ``todos_bridge``):
   ``core.cards.write``, which implies it).
 * **Short sessions.** Each call opens its own ``async_session`` and closes
   it before returning — the bridge never hands an extension a session and
-  never holds one across non-DB work.
+  never holds one across non-DB work. The one exception is ``iter_cards``
+  (SDK 1.7), which streams from a server-side cursor and so keeps its one
+  session open until the iteration ends; the bulk reads (``get_cards``,
+  ``get_relations_for``) each use a single session and query however many
+  ids they are given.
 * **Wire-shaped payloads, never ORM rows.** Results are frozen dataclasses
   (:class:`~app.services.extensions.sdk.ExtCard`,
   :class:`~app.services.extensions.sdk.ExtRelation`) or plain dicts with
@@ -30,7 +34,9 @@ Design invariants (mirroring ``todos_bridge``):
   switch, and supports ``dry_run`` (validate, then discard — no commit, no
   events). ``update_card`` MERGES the attributes patch so an enrichment
   write never wipes keys it does not carry; there is no hard delete and no
-  relation delete.
+  relation delete. The bulk writes (``update_cards``, ``upsert_relations``,
+  SDK 1.8) pass the same guards, with every row counted against the
+  per-batch cap, and apply all-or-nothing in one session.
 """
 
 from __future__ import annotations
@@ -38,10 +44,11 @@ from __future__ import annotations
 import time
 import uuid
 from collections import deque
-from collections.abc import AsyncIterator, Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from contextlib import asynccontextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, TypeVar
 
 from fastapi import HTTPException
@@ -67,6 +74,7 @@ from app.services.extensions.sdk import (
     ExtensionPermissionError,
     ExtRelation,
 )
+from app.services.report_queries import id_in
 from app.services.search_rank import search_filter, search_rank
 
 READ_GRANTS = frozenset({"core.cards.read", "core.cards.write"})
@@ -74,6 +82,11 @@ WRITE_GRANT = "core.cards.write"
 
 MAX_PAGE_SIZE = 500
 
+# Ids accepted by one bulk read (get_cards / get_relations_for), and rows
+# fetched per round trip from a streamed read's server-side cursor.
+MAX_BULK_IDS = 5000
+STREAM_CHUNK_SIZE = 500
+
 # Card fields an extension update may touch. Everything else — reference,
 # external_id (import identity), status / approval_status (workflow-owned),
 # audit columns — is refused with an explicit error rather than ignored.
@@ -81,6 +94,9 @@ UPDATABLE_CARD_FIELDS = frozenset(
     {"name", "description", "subtype", "parent_id", "lifecycle", "attributes", "alias"}
 )
 
+# Keys of one ``upsert_relations`` item — the ``upsert_relation`` kwargs.
+_RELATION_UPSERT_KEYS = frozenset({"type", "source_id", "target_id", "attributes", "description"})
+
 _T = TypeVar("_T")
 
 
@@ -117,6 +133,58 @@ def _parse_uuid(value: str, what: str) -> uuid.UUID:
         raise ExtensionDataError(f"Invalid {what}: {value!r}") from e
 
 
+def _parse_ids(values: Sequence[str]) -> list[uuid.UUID]:
+    """Distinct valid ids in the order given; malformed ones are dropped,
+    as the single-id reads return nothing for them."""
+    if isinstance(values, str):
+        raise ExtensionDataError("Expected a sequence of ids, not a single string")
+    if len(values) > MAX_BULK_IDS:
+        raise ExtensionDataError(f"At most {MAX_BULK_IDS} ids per bulk read (got {len(values)})")
+    ids: dict[uuid.UUID, None] = {}
+    for value in values:
+        try:
+            ids[uuid.UUID(value)] = None
+        except (TypeError, ValueError):
+            continue
+    return list(ids)
+
+
+def _check_updatable(patch: dict[str, Any]) -> None:
+    refused = sorted(set(patch) - UPDATABLE_CARD_FIELDS)
+    if refused:
+        raise ExtensionDataError(
+            f"Field(s) not writable via the extension bridge: {', '.join(refused)} "
+            f"(writable: {', '.join(sorted(UPDATABLE_CARD_FIELDS))})"
+        )
+
+
+def _merge_patch(card: Card, patch: dict[str, Any]) -> dict[str, Any]:
+    """The update payload for ``patch``: ``attributes`` merged onto the
+    stored dict, a key set to ``None`` removed."""
+    updates = dict(patch)
+    if "attributes" in updates:
+        incoming = updates["attributes"] or {}
+        if not isinstance(incoming, dict):
+            raise ExtensionDataError("attributes patch must be a dict")
+        merged = dict(card.attributes or {})
+        for k, v in incoming.items():
+            if v is None:
+                merged.pop(k, None)
+            else:
+                merged[k] = v
+        updates["attributes"] = merged
+    return updates
+
+
+def _parse_since(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError as e:
+            raise ExtensionDataError(f"Invalid since timestamp: {value!r}") from e
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 def _to_ext_card(card: Card) -> ExtCard:
     return ExtCard(
         id=str(card.id),
@@ -295,6 +363,86 @@ class ExtensionData:
             rels = (await db.execute(q)).scalars().all()
             return [_to_ext_relation(r) for r in rels]
 
+    # -- bulk / streaming reads (SDK 1.7) ------------------------------------
+
+    async def get_cards(self, card_ids: Sequence[str]) -> list[ExtCard]:
+        """The cards with these ids, in the order asked for, from one query.
+        Unknown and malformed ids are left out (``get_card`` returns
+        ``None`` for them); at most :data:`MAX_BULK_IDS` ids per call."""
+        self._require(write=False)
+        ids = _parse_ids(card_ids)
+        if not ids:
+            return []
+        async with async_session() as db:
+            cards = (await db.execute(select(Card).where(id_in(Card.id, ids)))).scalars().all()
+            by_id = {card.id: card for card in cards}
+            return [_to_ext_card(by_id[cid]) for cid in ids if cid in by_id]
+
+    async def iter_cards(
+        self,
+        *,
+        type: str | None = None,  # noqa: A002 - mirrors GET /cards
+        since: datetime | str | None = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[ExtCard]:
+        """Every card matching the filters, oldest change first.
+
+        Ordered by ``(updated_at, id)`` so an incremental sync can store the
+        last ``updated_at`` it saw and pass it back as ``since`` (inclusive)
+        next run. Hidden-type cards are always excluded, archived cards only
+        when ``include_archived`` — a sync that mirrors archivals wants them.
+        Streams from a server-side cursor in one session; the grant is
+        re-checked every :data:`STREAM_CHUNK_SIZE` cards.
+        """
+        self._require(write=False)
+        hidden_types_sq = select(CardType.key).where(CardType.is_hidden == True)  # noqa: E712
+        q = select(Card).where(Card.type.not_in(hidden_types_sq))
+        if type:
+            q = q.where(Card.type == type)
+        if not include_archived:
+            q = q.where(Card.status == "ACTIVE")
+        if since is not None:
+            q = q.where(Card.updated_at >= _parse_since(since))
+        q = q.order_by(Card.updated_at.asc(), Card.id.asc()).execution_options(
+            yield_per=STREAM_CHUNK_SIZE
+        )
+        async with async_session() as db:
+            streamed = 0
+            async for card in await db.stream_scalars(q):
+                if streamed and streamed % STREAM_CHUNK_SIZE == 0:
+                    self._require(write=False)
+                streamed += 1
+                yield _to_ext_card(card)
+
+    async def get_relations_for(self, card_ids: Sequence[str]) -> dict[str, list[ExtRelation]]:
+        """``get_relations`` for many cards in one query: every requested
+        (valid) id maps to the relations touching it, empty when there are
+        none. A relation between two requested cards appears under both."""
+        self._require(write=False)
+        ids = _parse_ids(card_ids)
+        by_card: dict[str, list[ExtRelation]] = {str(cid): [] for cid in ids}
+        if not ids:
+            return by_card
+        src = aliased(Card)
+        tgt = aliased(Card)
+        q = (
+            select(Relation)
+            .join(src, Relation.source_id == src.id)
+            .join(tgt, Relation.target_id == tgt.id)
+            .where(or_(id_in(Relation.source_id, ids), id_in(Relation.target_id, ids)))
+            .where(src.status != "ARCHIVED", tgt.status != "ARCHIVED")
+            .order_by(Relation.type.asc(), Relation.id.asc())
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        async with async_session() as db:
+            async for rel in await db.stream_scalars(q):
+                ext = _to_ext_relation(rel)
+                if ext.source_id in by_card:
+                    by_card[ext.source_id].append(ext)
+                if ext.target_id in by_card and ext.target_id != ext.source_id:
+                    by_card[ext.target_id].append(ext)
+        return by_card
+
     async def get_card_types(self) -> list[dict]:
         self._require(write=False)
         async with async_session() as db:
@@ -354,11 +502,11 @@ class ExtensionData:
             )
         window.append(now)
 
-    def _count_write_in_batch(self) -> None:
+    def _count_write_in_batch(self, writes: int = 1) -> None:
         active = _active_batch.get()
         if active is None:
             return
-        active.writes += 1
+        active.writes += writes
         if active.writes > settings.EXTENSION_MAX_WRITES_PER_BATCH:
             raise ExtensionDataError(
                 f"Batch {active.label!r} exceeded the per-batch write cap "
@@ -411,14 +559,19 @@ class ExtensionData:
             _active_batch.reset(active_token)
 
     async def _write(
-        self, op: Callable[[AsyncSession], Awaitable[_T]], *, dry_run: bool = False
+        self,
+        op: Callable[[AsyncSession], Awaitable[_T]],
+        *,
+        dry_run: bool = False,
+        writes: int = 1,
     ) -> _T:
         """Run ``op(db)`` in a fresh short session with ext provenance.
 
         Inside an open ``batch()`` scope the write joins that batch;
         otherwise it opens (and commits) its own single-op batch. A dry-run
         write validates and then discards the session without committing —
-        no rows, no events, no audit trail.
+        no rows, no events, no audit trail. ``writes`` is how many rows
+        ``op`` writes, counted against the per-batch cap.
         """
         self._require(write=True)
         self._require_writes_enabled()
@@ -442,7 +595,7 @@ class ExtensionData:
 
         active = _active_batch.get()
         if active is not None:
-            self._count_write_in_batch()
+            self._count_write_in_batch(writes)
             async with async_session() as db:
                 try:
                     result = await op(db)
@@ -452,6 +605,11 @@ class ExtensionData:
                 return result
 
         # Implicit single-op batch (todos-bridge shape).
+        if writes > settings.EXTENSION_MAX_WRITES_PER_BATCH:
+            raise ExtensionDataError(
+                f"{writes} writes exceed the per-batch write cap "
+                f"({settings.EXTENSION_MAX_WRITES_PER_BATCH})"
+            )
         self._count_batch_against_rate()
         origin_token = request_origin.set("ext")
         batch_token = None
@@ -527,29 +685,13 @@ class ExtensionData:
         so an enrichment write can never wipe keys it does not carry. Fields
         outside :data:`UPDATABLE_CARD_FIELDS` are refused."""
         cid = _parse_uuid(card_id, "card id")
-        refused = sorted(set(patch) - UPDATABLE_CARD_FIELDS)
-        if refused:
-            raise ExtensionDataError(
-                f"Field(s) not writable via the extension bridge: {', '.join(refused)} "
-                f"(writable: {', '.join(sorted(UPDATABLE_CARD_FIELDS))})"
-            )
+        _check_updatable(patch)
 
         async def op(db: AsyncSession) -> ExtCard:
             card = (await db.execute(select(Card).where(Card.id == cid))).scalar_one_or_none()
             if card is None:
                 raise ExtensionDataError(f"Card {card_id} not found")
-            updates = dict(patch)
-            if "attributes" in updates:
-                incoming = updates["attributes"] or {}
-                if not isinstance(incoming, dict):
-                    raise ExtensionDataError("attributes patch must be a dict")
-                merged = dict(card.attributes or {})
-                for k, v in incoming.items():
-                    if v is None:
-                        merged.pop(k, None)
-                    else:
-                        merged[k] = v
-                updates["attributes"] = merged
+            updates = _merge_patch(card, patch)
             await card_write_service.update_card(db, self._actor(), card, updates, dry_run=dry_run)
             await db.flush()
             await db.refresh(card)
@@ -635,3 +777,102 @@ class ExtensionData:
             return _to_ext_relation(rel)
 
         return await self._write(op, dry_run=dry_run)
+
+    # -- bulk writes (SDK 1.8) -----------------------------------------------
+
+    async def update_cards(
+        self,
+        updates: Sequence[tuple[str, dict[str, Any]]],
+        *,
+        dry_run: bool = False,
+    ) -> list[ExtCard]:
+        """``update_card`` for many ``(card_id, patch)`` pairs in one
+        transaction: all of them apply or none do. Same merge rules and
+        refused fields; each card may appear once. Every pair counts
+        against the per-batch write cap."""
+        parsed: dict[uuid.UUID, dict[str, Any]] = {}
+        for card_id, patch in updates:
+            cid = _parse_uuid(card_id, "card id")
+            if cid in parsed:
+                raise ExtensionDataError(f"Card {card_id} appears more than once")
+            _check_updatable(patch)
+            parsed[cid] = patch
+        if not parsed:
+            return []
+
+        async def op(db: AsyncSession) -> list[ExtCard]:
+            q = select(Card).where(id_in(Card.id, parsed))
+            cards = {c.id: c for c in (await db.execute(q)).scalars()}
+            items = []
+            for cid, patch in parsed.items():
+                card = cards.get(cid)
+                if card is None:
+                    raise ExtensionDataError(f"Card {cid} not found")
+                items.append((card, _merge_patch(card, patch)))
+            await card_write_service.update_cards(db, self._actor(), items, dry_run=dry_run)
+            await db.flush()
+            # One reload for the server-side timestamps the flush expired.
+            await db.execute(q.execution_options(populate_existing=True))
+            return [_to_ext_card(cards[cid]) for cid in parsed]
+
+        return await self._write(op, dry_run=dry_run, writes=len(parsed))
+
+    async def upsert_relations(
+        self,
+        relations: Sequence[dict[str, Any]],
+        *,
+        dry_run: bool = False,
+    ) -> list[ExtRelation]:
+        """``upsert_relation`` for many relations in one transaction: each
+        item takes its keyword arguments (``type``, ``source_id``,
+        ``target_id``, optional ``attributes`` / ``description``). All apply
+        or none do; a ``(type, source, target)`` may appear once."""
+        items: dict[tuple[str, uuid.UUID, uuid.UUID], card_write_service.RelationUpsert] = {}
+        for rel in relations:
+            unknown = sorted(set(rel) - _RELATION_UPSERT_KEYS)
+            if unknown or "type" not in rel:
+                raise ExtensionDataError(
+                    "Relation items take type, source_id, target_id, attributes "
+                    f"and description (got {', '.join(sorted(rel))})"
+                )
+            for end in ("source_id", "target_id"):
+                if not isinstance(rel.get(end), str):
+                    raise ExtensionDataError(f"Relation items need {end} as a string")
+            item = card_write_service.RelationUpsert(
+                type_key=rel["type"],
+                source_id=_parse_uuid(rel["source_id"], "source_id"),
+                target_id=_parse_uuid(rel["target_id"], "target_id"),
+                attributes=rel.get("attributes"),
+                description=rel.get("description"),
+            )
+            key = (item.type_key, item.source_id, item.target_id)
+            if key in items:
+                raise ExtensionDataError(
+                    f"Relation {item.type_key} {item.source_id} -> {item.target_id} "
+                    "appears more than once"
+                )
+            items[key] = item
+        if not items:
+            return []
+
+        async def op(db: AsyncSession) -> list[ExtRelation]:
+            endpoints = {e for _, source, target in items for e in (source, target)}
+            found = set(
+                (await db.execute(select(Card.id).where(id_in(Card.id, endpoints)))).scalars()
+            )
+            missing = sorted(str(e) for e in endpoints - found)
+            if missing:
+                raise ExtensionDataError(f"Card(s) not found: {', '.join(missing)}")
+            results = await card_write_service.upsert_relations(
+                db, self._actor(), list(items.values()), dry_run=dry_run
+            )
+            await db.flush()
+            rels = [rel for rel, _, _ in results]
+            await db.execute(
+                select(Relation)
+                .where(id_in(Relation.id, [r.id for r in rels]))
+                .execution_options(populate_existing=True)
+            )
+            return [_to_ext_relation(rel) for rel in rels]
+
+        return await self._write(op, dry_run=dry_run, writes=len(items))
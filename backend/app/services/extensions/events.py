@@ -19,17 +19,45 @@ Delivery is gated twice: at registration a subscription whose prefix no
 misconfig), and per event via ``registry.grants_for`` so disabling the
 extension or a license lapse pauses delivery immediately, exactly like the
 job supervisor.
+
+With several uvicorn workers each one dispatches only the events published
+in its own process (``subscribe(include_remote=False)``), so every event
+still reaches a handler once, not once per worker.
+
+Durable subscriptions (SDK 1.6, ``EventSubscription.durable``) skip the bus.
+One consumer task per extension, run on the elected leader worker, reads the
+persisted ``events`` table in ``(xact_id, seq)`` order — writing transaction,
+then write order — past the cursor stored in ``extension_event_cursors`` and
+hands each event to every matching durable handler. The cursor is written
+after the handlers return, so a restart, a disable or a license lapse
+replays from the last event delivered — at-least-once. Only events below the
+oldest transaction still in progress (``pg_snapshot_xmin``) are read: every
+transaction there has ended, so no event can still commit behind the cursor,
+however long a transaction stays open. That horizon is server-wide: a
+session left idle in a transaction anywhere holds every consumer back, and
+a warning names it once events have waited
+``EXTENSION_EVENT_LAG_WARN_SECONDS``.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+import uuid
 from typing import Any
 
+from sqlalchemy import BigInteger, Text, cast, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+from app.models.event import Event
+from app.models.extension import ExtensionEventCursor
 from app.services.event_bus import event_bus
 from app.services.extensions.jobs import build_context
-from app.services.extensions.loader import LoadReport
+from app.services.extensions.loader import LoadedExtension, LoadReport
 from app.services.extensions.registry import extension_registry
 from app.services.extensions.sdk import EventSubscription, ExtensionContext
 
@@ -44,8 +72,8 @@ EVENT_SCOPE_GRANTS: dict[str, tuple[str, ...]] = {
     # restored/deleted/approval_status, plus batch variants) and relation.*
     # (created/updated/deleted). Events caused by an extension's own data-
     # bridge writes carry data["ext"] and are suppressed by the default
-    # include_self=False; delivery is at-most-once, so handlers pair with a
-    # periodic reconcile job.
+    # include_self=False; live delivery is at-most-once, durable delivery
+    # (SDK 1.6) at-least-once.
     "core.events.card": ("card.", "relation."),
 }
 
@@ -91,7 +119,7 @@ def _deliverable(key: str, sub: EventSubscription, message: dict[str, Any]) -> b
 async def _relay_loop(key: str, subs: list[EventSubscription], private_q: asyncio.Queue) -> None:
     """Drain the global bus immediately; never block on the extension."""
     dropped = 0
-    async for message in event_bus.subscribe():
+    async for message in event_bus.subscribe(include_remote=False):
         for sub in subs:
             if not _deliverable(key, sub, message):
                 continue
@@ -134,33 +162,40 @@ async def _worker_loop(key: str, ctx: ExtensionContext, private_q: asyncio.Queue
             )
 
 
+def _usable_subscriptions(ext: LoadedExtension) -> list[EventSubscription]:
+    """The extension's subscriptions whose prefix a declared grant covers."""
+    hook = getattr(ext.instance, "get_event_handlers", None)
+    if hook is None:
+        return []
+    try:
+        subs = list(hook() or [])
+    except Exception:  # noqa: BLE001
+        logger.exception("Extension %s get_event_handlers() failed", ext.key)
+        return []
+    declared = _declared_prefixes(ext.key)
+    usable_subs: list[EventSubscription] = []
+    for sub in subs:
+        if not any(sub.prefix.startswith(p) or p.startswith(sub.prefix) for p in declared):
+            logger.warning(
+                "Extension %s subscribes to %r but declares no covering "
+                "core.events.* grant — subscription skipped",
+                ext.key,
+                sub.prefix,
+            )
+            continue
+        usable_subs.append(sub)
+    return usable_subs
+
+
 def start_extension_event_dispatchers(report: LoadReport) -> list[asyncio.Task]:
-    """Spawn relay + worker tasks per subscribing extension. Caller cancels
-    the returned tasks on shutdown (same contract as job loops)."""
+    """Spawn relay + worker tasks per extension with live subscriptions.
+    Caller cancels the returned tasks on shutdown (same contract as job
+    loops)."""
     tasks: list[asyncio.Task] = []
     for ext in report.loaded:
         if ext.instance is None:
             continue
-        hook = getattr(ext.instance, "get_event_handlers", None)
-        if hook is None:
-            continue
-        try:
-            subs = list(hook() or [])
-        except Exception:  # noqa: BLE001
-            logger.exception("Extension %s get_event_handlers() failed", ext.key)
-            continue
-        declared = _declared_prefixes(ext.key)
-        usable_subs: list[EventSubscription] = []
-        for sub in subs:
-            if not any(sub.prefix.startswith(p) or p.startswith(sub.prefix) for p in declared):
-                logger.warning(
-                    "Extension %s subscribes to %r but declares no covering "
-                    "core.events.* grant — subscription skipped",
-                    ext.key,
-                    sub.prefix,
-                )
-                continue
-            usable_subs.append(sub)
+        usable_subs = [sub for sub in _usable_subscriptions(ext) if not sub.durable]
         if not usable_subs:
             continue
         ctx = build_context(ext.key)
@@ -183,3 +218,214 @@ def start_extension_event_dispatchers(report: LoadReport) -> list[asyncio.Task]:
             len(usable_subs),
         )
     return tasks
+
+
+# ---------------------------------------------------------------------------
+# Durable subscriptions (SDK 1.6)
+# ---------------------------------------------------------------------------
+
+
+def _event_message(event: Event) -> dict[str, Any]:
+    """A persisted event in the shape of a live bus message, plus its id."""
+    return {
+        "event": event.event_type,
+        "data": event.data or {},
+        "card_id": str(event.card_id) if event.card_id else None,
+        "batch_id": str(event.batch_id) if event.batch_id else None,
+        "timestamp": event.created_at.isoformat(),
+        "event_id": str(event.id),
+    }
+
+
+async def _save_cursor(db: AsyncSession, key: str, xact_id: int, seq: int) -> None:
+    stmt = insert(ExtensionEventCursor).values(
+        extension_key=key, event_xact_id=xact_id, event_seq=seq
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ExtensionEventCursor.extension_key],
+            set_={
+                "event_xact_id": stmt.excluded.event_xact_id,
+                "event_seq": stmt.excluded.event_seq,
+                "updated_at": func.now(),
+            },
+        )
+    )
+    await db.commit()
+
+
+def _oldest_open_transaction():
+    """Id of the oldest transaction still in progress, as ``events.xact_id``
+    stores it: every event below it is committed or rolled back for good."""
+    return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+
+# Per extension: the read horizon last seen and when it was first seen.
+_horizons: dict[str, tuple[int, float]] = {}
+
+
+async def _warn_if_held_back(
+    db: AsyncSession, key: str, horizon: int, cursor: tuple[int, int]
+) -> None:
+    """Log the open transaction holding ``key``'s events back once the
+    horizon has not moved for ``EXTENSION_EVENT_LAG_WARN_SECONDS``."""
+    now = time.monotonic()
+    seen = _horizons.get(key)
+    if seen is None or seen[0] != horizon:
+        _horizons[key] = (horizon, now)
+        return
+    if now - seen[1] < settings.EXTENSION_EVENT_LAG_WARN_SECONDS:
+        return
+    _horizons[key] = (horizon, now)  # at most once per period
+    lag = (
+        await db.execute(
+            select(func.extract("epoch", func.now() - func.min(Event.created_at))).where(
+                tuple_(Event.xact_id, Event.seq) > tuple_(*cursor), Event.xact_id >= horizon
+            )
+        )
+    ).scalar()
+    if lag is None:
+        return
+    holder = (
+        await db.execute(
+            text(
+                "SELECT pid, state, now() - xact_start FROM pg_stat_activity "
+                "WHERE backend_xid IS NOT NULL ORDER BY age(backend_xid) DESC LIMIT 1"
+            )
+        )
+    ).first()
+    logger.warning(
+        "Durable events for extension %s held back for %ds by an open transaction "
+        "(pid %s, %s, open for %s)",
+        key,
+        int(lag),
+        *(holder or ("?", "?", "?")),
+    )
+
+
+async def _read_events(key: str, subs: list[EventSubscription]) -> list[Event]:
+    """The next batch of finished events matching ``subs`` past ``key``'s
+    cursor. A first run starts the cursor at the oldest open transaction."""
+    async with async_session() as db:
+        horizon = (await db.execute(select(_oldest_open_transaction()))).scalar_one()
+        row = (
+            await db.execute(
+                select(ExtensionEventCursor.event_xact_id, ExtensionEventCursor.event_seq).where(
+                    ExtensionEventCursor.extension_key == key
+                )
+            )
+        ).first()
+        if row is None:
+            await _save_cursor(db, key, horizon, 0)
+            return []
+        cursor = (row[0], row[1])
+        stmt = (
+            select(Event)
+            .where(
+                tuple_(Event.xact_id, Event.seq) > tuple_(*cursor),
+                Event.xact_id < horizon,
+                or_(*(Event.event_type.startswith(sub.prefix) for sub in subs)),
+            )
+            .order_by(Event.xact_id, Event.seq)
+            .limit(settings.EXTENSION_EVENT_BATCH_SIZE)
+        )
+        events = list((await db.execute(stmt)).scalars().all())
+        if len(events) < settings.EXTENSION_EVENT_BATCH_SIZE:
+            await _warn_if_held_back(db, key, horizon, cursor)
+        return events
+
+
+async def pump_durable_events(
+    key: str,
+    subs: list[EventSubscription],
+    ctx: ExtensionContext,
+    failures: dict[uuid.UUID, int],
+) -> int:
+    """Deliver one batch of persisted events to ``key``'s durable handlers.
+
+    Returns how many events the cursor moved past. A handler failure stops
+    the pass at that event, to be retried next pass, until it has failed
+    ``EXTENSION_EVENT_MAX_ATTEMPTS`` times and is skipped; ``failures``
+    carries the counts between passes.
+    """
+    events = await _read_events(key, subs)
+    delivered: Event | None = None
+    count = 0
+    for event in events:
+        message = _event_message(event)
+        try:
+            for sub in subs:
+                if _deliverable(key, sub, message):
+                    async with asyncio.timeout(HANDLER_TIMEOUT_SECONDS):
+                        await sub.handler(ctx, message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            attempts = failures.get(event.id, 0) + 1
+            if attempts < settings.EXTENSION_EVENT_MAX_ATTEMPTS:
+                failures[event.id] = attempts
+                logger.warning(
+                    "Extension %s handler for %s failed (attempt %d) — will retry",
+                    key,
+                    event.event_type,
+                    attempts,
+                    exc_info=True,
+                )
+                break
+            failures.pop(event.id, None)
+            logger.exception(
+                "Extension %s handler for %s failed %d times — event skipped",
+                key,
+                event.event_type,
+                attempts,
+            )
+        else:
+            failures.pop(event.id, None)
+        delivered = event
+        count += 1
+    if delivered is not None and delivered.xact_id is not None and delivered.seq is not None:
+        async with async_session() as db:
+            await _save_cursor(db, key, delivered.xact_id, delivered.seq)
+    return count
+
+
+async def _durable_loop(key: str, subs: list[EventSubscription], ctx: ExtensionContext) -> None:
+    """Pump while a full batch comes back, otherwise poll; paused, without
+    moving the cursor, while the extension is disabled or unlicensed."""
+    failures: dict[uuid.UUID, int] = {}
+    while True:
+        try:
+            # No granted prefix: disabled, unlicensed or pending restart.
+            if _granted_prefixes(key):
+                count = await pump_durable_events(key, subs, ctx, failures)
+                if count >= settings.EXTENSION_EVENT_BATCH_SIZE:
+                    continue
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Extension %s durable event pass failed — retrying", key)
+        await asyncio.sleep(settings.EXTENSION_EVENT_POLL_SECONDS)
+
+
+def start_durable_event_consumers(report: LoadReport) -> list[asyncio.Task]:
+    """Spawn one consumer task per extension with durable subscriptions.
+    Runs on the leader worker only; the caller cancels the tasks."""
+    tasks: list[asyncio.Task] = []
+    for ext in report.loaded:
+        if ext.instance is None:
+            continue
+        durable_subs = [sub for sub in _usable_subscriptions(ext) if sub.durable]
+        if not durable_subs:
+            continue
+        tasks.append(
+            asyncio.create_task(
+                _durable_loop(ext.key, durable_subs, build_context(ext.key)),
+                name=f"ext:{ext.key}:durable-events",
+            )
+        )
+        logger.info(
+            "Started durable event consumer for extension %s (%d subscription(s))",
+            ext.key,
+            len(durable_subs),
+        )
+    return tasks
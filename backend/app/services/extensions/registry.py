@@ -6,10 +6,10 @@ the admin mutations (license upload, enable/disable, install, uninstall).
 Keeping it in memory means the per-request ``require_extension`` gate
 never touches the database on the hot path.
 
-Single-container assumption: license or enable/disable changes made on
-one backend replica are not pushed to others — today Turbo EA deploys a
-single backend container, so this is fine; scale-out would need a
-restart per replica (documented limitation).
+Every refresh is announced on the cluster bus, so with several uvicorn
+workers (``WEB_CONCURRENCY``) the peers reload their snapshot too. Separate
+backend *containers* are not covered — each keeps its own snapshot until
+restarted (documented limitation).
 """
 
 from __future__ import annotations
@@ -22,6 +22,7 @@ from typing import Literal
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.cluster import cluster_bus
 from app.services.extensions.license import (
     LicenseDocument,
     LicenseError,
@@ -90,6 +91,10 @@ class ExtensionRegistry:
         license that no longer verifies (e.g. the vendor key changed
         between releases) is treated as absent — fail closed, log loud.
         """
+        await self._load_from_db(db)
+        cluster_bus.publish("extensions.registry")
+
+    async def _load_from_db(self, db: AsyncSession) -> None:
         from app.models.extension import Extension, ExtensionLicense
 
         rows = (
@@ -224,3 +229,13 @@ class ExtensionRegistry:
 
 
 extension_registry = ExtensionRegistry()
+
+
+async def _refresh_for_peer(_payload: dict) -> None:
+    from app.database import async_session
+
+    async with async_session() as db:
+        await extension_registry.refresh_from_db(db)
+
+
+cluster_bus.on("extensions.registry", _refresh_for_peer, resync=True)
@@ -27,7 +27,7 @@ warns on a newer minor.
 from __future__ import annotations
 
 import logging
-from collections.abc import Awaitable, Callable, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
 from datetime import datetime
@@ -133,12 +133,55 @@ from app.database import get_db  # noqa: F401
 #   caused by this extension's own bridge writes carry ``data["ext"]`` and
 #   are filtered by the default ``include_self=False``, so a sync loop
 #   cannot form; pair handlers with a periodic reconcile job — delivery is
-#   at-most-once (bounded drop-oldest queue).
+#   at-most-once (bounded drop-oldest queue). SDK 1.6 adds durable delivery.
 # - ``ExtensionJob.cron`` — a 5-field UTC cron expression as an alternative
 #   to ``interval_seconds`` (exactly one of the two must be set). Numeric
 #   fields only; day-of-month/day-of-week use the classic vixie OR rule.
 
-SDK_VERSION = "1.5"
+# --- SDK 1.6 — durable event subscriptions -----------------------------------
+# 1.6 added one additive field (existing 1.x extensions load and run
+# unchanged):
+#
+# - ``EventSubscription(durable=True)`` — the subscription consumes the
+#   persisted ``events`` table instead of the in-memory bus, from a cursor
+#   core stores per extension (``extension_event_cursors``). Delivery is
+#   at-least-once, on one worker per installation, ordered by the
+#   transaction that wrote each event (then write order within it) — not
+#   strictly commit order: an event waits until every transaction older
+#   than its own has ended, so a long transaction delays later events
+#   instead of being overtaken by them. The
+#   cursor moves past an event only once every durable handler matching it
+#   has returned, so events published while the instance was down, the
+#   extension disabled or its license lapsed are delivered afterwards, and a
+#   failing handler is retried (``EXTENSION_EVENT_MAX_ATTEMPTS``) before the
+#   event is skipped. Messages carry ``event_id`` so a handler can tell a
+#   redelivery apart. A connector on durable subscriptions no longer needs a
+#   periodic full reconcile; the first run starts at the oldest transaction
+#   in progress, so an initial sync is still the extension's own job.
+
+# --- SDK 1.7 — bulk and streaming reads ---------------------------------------
+# 1.7 added three reads to ``ctx.data`` (existing 1.x extensions load and
+# run unchanged), so a connector syncing a large inventory stops paying a
+# session and a query per card:
+#
+# - ``get_cards(ids)`` — many cards from one query, in the order asked for.
+# - ``iter_cards(type=, since=, include_archived=)`` — an async iterator over
+#   every matching card ordered by ``(updated_at, id)``, streamed from a
+#   server-side cursor. Store the last ``updated_at`` seen and pass it back
+#   as ``since`` for an incremental sync.
+# - ``get_relations_for(ids)`` — ``get_relations`` for many cards at once,
+#   keyed by card id.
+
+# --- SDK 1.8 — bulk writes -----------------------------------------------------
+# 1.8 added ``ctx.data.update_cards([(id, patch), ...])`` and
+# ``ctx.data.upsert_relations([{type, source_id, target_id, ...}, ...])``
+# (existing 1.x extensions load and run unchanged). Each applies its rows
+# in one transaction, all or nothing, validated against one snapshot of the
+# metamodel, with calculations and data-quality scoring run once per
+# affected card. The write guards are unchanged; every row counts against
+# EXTENSION_MAX_WRITES_PER_BATCH.
+
+SDK_VERSION = "1.8"
 
 
 @dataclass(frozen=True)
@@ -392,6 +435,25 @@ class DataBridge(Protocol):
 
     async def get_relations(self, card_id: str) -> list[ExtRelation]: ...
 
+    async def get_cards(self, card_ids: Sequence[str]) -> list[ExtCard]:
+        """Many cards in one query, in the order asked for (SDK 1.7)."""
+        ...
+
+    def iter_cards(
+        self,
+        *,
+        type: str | None = None,  # noqa: A002 - mirrors GET /cards
+        since: datetime | str | None = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[ExtCard]:
+        """Every matching card ordered by ``(updated_at, id)``, streamed;
+        ``since`` is inclusive (SDK 1.7)."""
+        ...
+
+    async def get_relations_for(self, card_ids: Sequence[str]) -> dict[str, list[ExtRelation]]:
+        """``get_relations`` for many cards at once, keyed by card id (SDK 1.7)."""
+        ...
+
     async def get_card_types(self) -> list[dict]: ...
 
     async def get_relation_types(self) -> list[dict]: ...
@@ -438,6 +500,26 @@ class DataBridge(Protocol):
         dry_run: bool = False,
     ) -> ExtRelation: ...
 
+    async def update_cards(
+        self,
+        updates: Sequence[tuple[str, dict[str, Any]]],
+        *,
+        dry_run: bool = False,
+    ) -> list[ExtCard]:
+        """``update_card`` for many ``(card_id, patch)`` pairs, all or
+        nothing (SDK 1.8)."""
+        ...
+
+    async def upsert_relations(
+        self,
+        relations: Sequence[dict[str, Any]],
+        *,
+        dry_run: bool = False,
+    ) -> list[ExtRelation]:
+        """``upsert_relation`` for many items of its keyword arguments, all
+        or nothing (SDK 1.8)."""
+        ...
+
 
 @dataclass
 class ExtensionContext:
@@ -488,12 +570,16 @@ class EventSubscription:
     with a 30s timeout and a crash is logged, never fatal. ``include_self``
     controls whether events caused by this extension's own bridge writes
     (``data["ext"] == key``) are delivered — the default ``False`` breaks
-    the write→event→handler→write sync loop by construction.
+    the write→event→handler→write sync loop by construction. ``durable``
+    (SDK 1.6) switches the subscription from live at-most-once delivery to
+    at-least-once delivery from the persisted ``events`` table; its messages
+    also carry ``event_id``.
     """
 
     prefix: str
     handler: Callable[["ExtensionContext", dict[str, Any]], Awaitable[None]]
     include_self: bool = False
+    durable: bool = False
 
 
 class SupportsEventHandlers(Protocol):
@@ -4,7 +4,10 @@ Runs inside ``app.main``'s lifespan after core Alembic migrations and
 seeds: reconciles the ``extensions`` table with what the boot-time
 loader actually loaded, refreshes the in-memory registry, runs
 per-extension schema migrations, fires ``on_startup`` hooks, and spawns
-job loops. Every step is fail-soft per extension.
+event dispatchers. Every step is fail-soft per extension. Job loops and
+durable event consumers are started separately by ``run_extension_jobs``,
+which the lifespan runs on the elected leader worker only
+(app/services/cluster.py).
 """
 
 from __future__ import annotations
@@ -15,7 +18,11 @@ import logging
 from sqlalchemy import select
 
 from app.database import async_session
-from app.services.extensions.events import start_extension_event_dispatchers
+from app.services.cluster import cancel_tasks
+from app.services.extensions.events import (
+    start_durable_event_consumers,
+    start_extension_event_dispatchers,
+)
 from app.services.extensions.jobs import build_context, start_extension_jobs
 from app.services.extensions.loader import LoadReport
 from app.services.extensions.migrations import run_extension_migrations
@@ -55,7 +62,7 @@ async def _reconcile_rows(report: LoadReport) -> None:
 
 
 async def initialize_extensions(report: LoadReport) -> list[asyncio.Task]:
-    """Full lifespan init. Returns job tasks for the caller to cancel on shutdown."""
+    """Full lifespan init. Returns dispatcher tasks for the caller to cancel on shutdown."""
     try:
         await _reconcile_rows(report)
         async with async_session() as db:
@@ -103,4 +110,14 @@ async def initialize_extensions(report: LoadReport) -> list[asyncio.Task]:
         except Exception:
             logger.exception("Extension %s on_startup() failed", ext.key)
 
-    return start_extension_jobs(report) + start_extension_event_dispatchers(report)
+    return start_extension_event_dispatchers(report)
+
+
+async def run_extension_jobs(report: LoadReport) -> None:
+    """Run every declared extension job loop and durable event consumer
+    until cancelled."""
+    tasks = [*start_extension_jobs(report), *start_durable_event_consumers(report)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await cancel_tasks(tasks)
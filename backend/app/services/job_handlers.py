@@ -0,0 +1,186 @@
+"""Built-in background job kinds (see ``app/services/background_jobs.py``).
+
+- ``calculations.recalculate`` — run every calculation on every active card
+  of a type; the result is the same grouped report
+  ``POST /calculations/recalculate/{type_key}`` returns.
+- ``data_quality.rescore`` — rescore ``data_quality`` on every card.
+- ``data_quality.rescore_type`` — rescore one card type's cards after its
+  scoring rules changed; queued, debounced, by ``schedule_type_rescore``.
+- ``metamodel.migrate_attributes`` — strip removed fields and select options
+  from the cards of a type in chunks; queued by ``PATCH /metamodel/types``
+  when the edit touches too many cards to rewrite inside the request.
+- ``metamodel.sync_attribute_indexes`` — build and drop the expression
+  indexes of ``indexed`` fields without blocking card writes; queued by the
+  type endpoints and at startup (``app/services/attribute_index.py``).
+- ``compliance.scan`` — the compliance scan behind
+  ``POST /compliance/compliance-scan``, which still records its run and
+  findings in the TurboLens tables.
+- ``eol.refresh_cycles`` — revalidate the stored endoflife.date cycles of
+  every missing or stale product; queued by the EOL readers and hourly by
+  the leader (``app/services/eol_cycles.py``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.database import async_session, engine
+from app.models.turbolens import TurboLensAnalysisRun
+from app.services.background_jobs import JobCancelledError, JobContext, job_kind
+
+
+class RecalculateParams(BaseModel):
+    type_key: str = Field(..., min_length=1, max_length=100)
+
+
+@job_kind(
+    "calculations.recalculate",
+    permission="admin.metamodel",
+    params_model=RecalculateParams,
+    unique=True,
+)
+async def recalculate_type(ctx: JobContext) -> dict[str, Any]:
+    from app.services.calculation_engine import run_calculations_for_type
+
+    async def on_progress(done: int, total: int) -> None:
+        await ctx.progress("cards", done, total)
+
+    async with async_session() as db:
+        return await run_calculations_for_type(db, ctx.params["type_key"], on_progress=on_progress)
+
+
+@job_kind("data_quality.rescore", permission="admin.metamodel", unique=True, max_attempts=3)
+async def rescore_data_quality(ctx: JobContext) -> dict[str, Any]:
+    from app.services.data_quality import recompute_all_data_quality
+
+    async def on_progress(done: int, total: int) -> None:
+        await ctx.progress("cards", done, total)
+
+    async with async_session() as db:
+        changed = await recompute_all_data_quality(db, on_progress=on_progress)
+        await db.commit()
+    return {"cards_changed": changed}
+
+
+@job_kind("data_quality.rescore_type", unique=True, debounce=True, max_attempts=3)
+async def rescore_data_quality_type(ctx: JobContext) -> dict[str, Any]:
+    """Params: ``type_key``."""
+    from app.services.data_quality import (
+        record_fingerprints,
+        rescore_card_type,
+        rules_fingerprints,
+    )
+
+    async def on_progress(done: int, total: int) -> None:
+        await ctx.progress("cards", done, total)
+
+    type_key = ctx.params["type_key"]
+    async with async_session() as db:
+        # Fingerprinted before the pass: an edit landing mid-pass queues
+        # another job and leaves the recorded rules behind, so a restart in
+        # between still rescores the type.
+        fingerprint = await rules_fingerprints(db, [type_key])
+        changed = await rescore_card_type(db, type_key, on_progress=on_progress)
+        await record_fingerprints(db, fingerprint)
+        await db.commit()
+    return {"cards_changed": changed}
+
+
+@job_kind("metamodel.migrate_attributes", max_attempts=3)
+async def migrate_attributes(ctx: JobContext) -> dict[str, Any]:
+    """Params: ``type_key``, ``migration`` (``AttributeMigration.to_params``)."""
+    from sqlalchemy import select
+
+    from app.models.card_type import CardType
+    from app.services.data_quality import schedule_type_rescore
+    from app.services.metamodel_migration import AttributeMigration, run_attribute_migration
+
+    async def on_progress(done: int, total: int) -> None:
+        await ctx.progress("cards", done, total)
+
+    type_key = ctx.params["type_key"]
+    async with async_session() as db:
+        schema = (
+            await db.execute(select(CardType.fields_schema).where(CardType.key == type_key))
+        ).scalar_one_or_none()
+        # Re-read at run time: whatever the admin added back since the save
+        # that queued this job keeps its values.
+        migration = AttributeMigration.from_params(ctx.params["migration"]).still_removed(schema)
+        changed = await run_attribute_migration(db, type_key, migration, on_progress=on_progress)
+        if changed:
+            await schedule_type_rescore(db, type_key)
+            await db.commit()
+    return {"cards_changed": changed}
+
+
+@job_kind("metamodel.sync_attribute_indexes", unique=True, debounce=True, max_attempts=3)
+async def sync_attribute_indexes(ctx: JobContext) -> dict[str, Any]:
+    """Reconcile the attribute indexes with the metamodel as it is now."""
+    from app.services.attribute_index import build_attribute_indexes
+
+    created, dropped = await build_attribute_indexes(engine)
+    return {"created": created, "dropped": dropped}
+
+
+async def _close_analysis_run(run_id: uuid.UUID, *, error: str) -> None:
+    async with async_session() as db:
+        run = await db.get(TurboLensAnalysisRun, run_id)
+        if run is not None and run.status == "running":
+            run.status = "failed"
+            run.completed_at = datetime.now(timezone.utc)
+            run.error_message = error
+            await db.commit()
+
+
+@job_kind("compliance.scan", max_attempts=2)
+async def compliance_scan(ctx: JobContext) -> dict[str, Any]:
+    """Params: ``run_id`` (the TurboLens analysis run), ``user_id``, ``regulations``."""
+    from app.services.compliance_scanner import run_compliance_scan
+
+    run_id = uuid.UUID(ctx.params["run_id"])
+    try:
+        async with async_session() as db:
+            result = await run_compliance_scan(
+                db,
+                run_id,
+                ctx.params.get("user_id"),
+                regulations=ctx.params.get("regulations"),
+                on_progress=ctx.progress,
+            )
+            run = await db.get(TurboLensAnalysisRun, run_id)
+            if run is not None:
+                run.status = "completed"
+                run.completed_at = datetime.now(timezone.utc)
+                run.results = result
+            await db.commit()
+        return {"run_id": str(run_id)}
+    except JobCancelledError:
+        await _close_analysis_run(run_id, error="Cancelled")
+        raise
+    except asyncio.CancelledError:
+        # Also raised when the worker shuts down and requeues the job.
+        if await ctx.cancel_requested():
+            await _close_analysis_run(run_id, error="Cancelled")
+        raise
+    except Exception as exc:
+        # A retried attempt reuses the run; close it only when none is left.
+        if ctx.last_attempt:
+            await _close_analysis_run(run_id, error=str(exc))
+        raise
+
+
+@job_kind("eol.refresh_cycles", unique=True, max_attempts=2)
+async def refresh_eol_cycles(ctx: JobContext) -> dict[str, Any]:
+    """Revalidate every missing or stale product in ``eol_product_cycles``."""
+    from app.services.eol_cycles import refresh_product_cycles
+
+    async def on_progress(done: int, total: int) -> None:
+        await ctx.progress("products", done, total)
+
+    async with async_session() as db:
+        return await refresh_product_cycles(db, on_progress=on_progress)
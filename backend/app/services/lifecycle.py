@@ -4,11 +4,21 @@ The phase precedence used here — ``endOfLife`` before ``phaseOut`` before
 ``active`` … — is the same array the frontend's ``LifecycleBadge`` and the
 inventory grid use, so a card's "current phase" is identical everywhere it is
 displayed or sorted. Keep the three in sync.
+
+``lifecycle_phase_sql`` and ``manual_eol_status_sql`` are the same rules as
+SQL expressions over the ``lifecycle`` JSONB column, for reports that group
+or filter a whole table by phase or EOL status in one query instead of
+loading every card's lifecycle into Python. Dates are compared as ISO
+``YYYY-MM-DD`` text, which orders the same as the dates; a value not in that
+form, or naming a day that does not exist (``2024-13-45``, ``2023-02-29``),
+counts as unset, as an unparseable one does in Python.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import ColumnElement, Date, Integer, case, cast, extract, func, literal, or_, text
 
 # Most-advanced phase first: a card whose endOfLife date has passed is at end
 # of life even though its `active` date also passed.
@@ -55,3 +65,83 @@ def lifecycle_rank(lifecycle: dict | None) -> int:
     if phase is None:
         return len(PHASE_PRECEDENCE)
     return PHASE_PRECEDENCE.index(phase)
+
+
+# How far ahead an end-of-life date makes a card "approaching" in the EOL report.
+EOL_APPROACHING_DAYS = 182
+
+# ISO date, optionally followed by a time (``fromisoformat`` accepts both).
+# Year 0001-9999, month 01-12, day 01-31, as Python's ``date`` takes them;
+# whether the day exists in its month is checked by ``_date_text``.
+_YMD = r"^(?!0000)\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])"
+_ISO_DATE_OR_DATETIME = _YMD + r"($|T)"
+_ISO_DATE = _YMD + r"$"
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _date_text(lifecycle: ColumnElement, phase: str, pattern: str) -> ColumnElement:
+    """``lifecycle[phase]`` as ``YYYY-MM-DD`` text, NULL when unset, malformed
+    or not a real day."""
+    value = lifecycle[phase].astext
+    month_start = cast(func.substr(value, 1, 7) + "-01", Date)
+    days_in_month = extract("day", month_start + text("interval '1 month - 1 day'"))
+    # Nested so the cast only ever sees text the pattern has vetted.
+    real_day = case(
+        (cast(func.substr(value, 9, 2), Integer) <= days_in_month, func.substr(value, 1, 10)),
+        else_=None,
+    )
+    return case((value.op("~")(pattern), real_day), else_=None)
+
+
+def lifecycle_phase_sql(lifecycle: ColumnElement, today: date | None = None) -> ColumnElement:
+    """SQL twin of ``current_lifecycle_phase`` over a JSONB ``lifecycle`` column."""
+    today_text = literal((today or _utc_today()).isoformat())
+    reached = [
+        (_date_text(lifecycle, phase, _ISO_DATE_OR_DATETIME) <= today_text, phase)
+        for phase in PHASE_PRECEDENCE
+    ]
+    # Every set date is still ahead: the earliest phase that has a value.
+    upcoming = [
+        (func.coalesce(lifecycle[phase].astext, "") != "", phase) for phase in PHASE_CHRONOLOGICAL
+    ]
+    return case(*reached, *upcoming, else_=None)
+
+
+def lifecycle_rank_sql(lifecycle: ColumnElement, today: date | None = None) -> ColumnElement:
+    """SQL twin of ``lifecycle_rank``."""
+    phase = lifecycle_phase_sql(lifecycle, today)
+    return case(
+        *((phase == p, i) for i, p in enumerate(PHASE_PRECEDENCE)),
+        else_=len(PHASE_PRECEDENCE),
+    )
+
+
+def manual_eol_status_sql(lifecycle: ColumnElement, today: date | None = None) -> ColumnElement:
+    """EOL status from hand-maintained lifecycle dates: ``eol``, ``approaching``,
+    ``supported`` or ``unknown`` (no lifecycle at all).
+
+    ``endOfLife`` passed is ``eol``; ``endOfLife`` within
+    ``EOL_APPROACHING_DAYS`` or ``phaseOut`` passed (support ending) is
+    ``approaching``.
+    """
+    today = today or _utc_today()
+    today_text = literal(today.isoformat())
+    horizon_text = literal((today + timedelta(days=EOL_APPROACHING_DAYS)).isoformat())
+    eol = _date_text(lifecycle, "endOfLife", _ISO_DATE)
+    phase_out = _date_text(lifecycle, "phaseOut", _ISO_DATE)
+    return case(
+        (
+            or_(
+                func.coalesce(func.jsonb_typeof(lifecycle), "null") == "null",
+                lifecycle == func.jsonb_build_object(),
+            ),
+            "unknown",
+        ),
+        (eol <= today_text, "eol"),
+        (eol <= horizon_text, "approaching"),
+        (phase_out <= today_text, "approaching"),
+        else_="supported",
+    )
@@ -0,0 +1,111 @@
+"""Pre-serialized metamodel listings, revalidated by ETag.
+
+Nearly every frontend view and every MCP session starts with
+``GET /metamodel/types`` and ``GET /metamodel/relation-types``, and both
+serialized every type — full ``fields_schema``, translations, subtypes — on
+each call, for data that changes perhaps weekly. ``MetamodelCache`` keeps
+the JSON body of each listing (per query) with a strong ETag derived from
+its bytes, so a repeat call is a dictionary lookup and a client presenting
+the ETag in ``If-None-Match`` gets a ``304`` without a body. The ETag is a
+hash of the content, so every worker hands out the same one for the same
+metamodel and a rebuild that changed nothing keeps the clients' copies
+valid.
+
+Any ORM write to a card type or relation type — including ORM-enabled
+``update(CardType)`` statements such as an extension hiding its content
+pack — drops every entry at flush (or execution) and again at commit, and
+the commit-time drop is sent to the other workers over the cluster bus
+(``app/services/cluster.py``). A build that overlaps such a write is not
+stored. Raw SQL against ``card_types`` / ``relation_types`` bypasses the ORM
+events; ``METAMODEL_CACHE_TTL`` bounds how stale an entry can get then.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.config import settings
+from app.models.card_type import CardType
+from app.models.relation_type import RelationType
+from app.services.cluster import cluster_bus
+
+_INVALIDATE_ON_COMMIT = "_metamodel_cache_invalidate"
+
+_SOURCES = (CardType, RelationType)
+
+# Listings are keyed by their query; a caller cycling through made-up
+# ``type_key`` filters must not grow the cache without bound.
+_MAX_ENTRIES = 256
+
+
+def etag_for(body: bytes) -> str:
+    """Strong validator for ``body``."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class MetamodelCache:
+    # key -> (body, etag, stored at)
+    _entries: dict[Hashable, tuple[bytes, str, float]] = {}
+    # Bumped on every invalidation; a build started under an older generation
+    # may have read rows a concurrent write has since changed.
+    _generation = 0
+
+    @staticmethod
+    def generation() -> int:
+        return MetamodelCache._generation
+
+    @staticmethod
+    def get(key: Hashable) -> tuple[bytes, str] | None:
+        ttl = settings.METAMODEL_CACHE_TTL
+        cached = MetamodelCache._entries.get(key) if ttl > 0 else None
+        if cached and time.monotonic() - cached[2] < ttl:
+            return cached[0], cached[1]
+        return None
+
+    @staticmethod
+    def put(key: Hashable, body: bytes, generation: int) -> tuple[bytes, str]:
+        """Store a body built while ``generation`` was current; returns it with its ETag."""
+        etag = etag_for(body)
+        if settings.METAMODEL_CACHE_TTL > 0 and generation == MetamodelCache._generation:
+            entries = MetamodelCache._entries
+            if len(entries) >= _MAX_ENTRIES and key not in entries:
+                entries.clear()
+            entries[key] = (body, etag, time.monotonic())
+        return body, etag
+
+    @staticmethod
+    def invalidate() -> None:
+        MetamodelCache._generation += 1
+        MetamodelCache._entries.clear()
+
+
+def _invalidate_on_flush(session: Session, _flush_context) -> None:
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _SOURCES) for obj in touched):
+        MetamodelCache.invalidate()
+        session.info[_INVALIDATE_ON_COMMIT] = True
+
+
+def _invalidate_on_bulk_write(state: ORMExecuteState) -> None:
+    if (state.is_update or state.is_delete) and any(
+        m.class_ in _SOURCES for m in state.all_mappers
+    ):
+        MetamodelCache.invalidate()
+        state.session.info[_INVALIDATE_ON_COMMIT] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_INVALIDATE_ON_COMMIT, False):
+        MetamodelCache.invalidate()
+        cluster_bus.publish("metamodel.listings")
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "do_orm_execute", _invalidate_on_bulk_write)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+cluster_bus.on("metamodel.listings", lambda _payload: MetamodelCache.invalidate(), resync=True)
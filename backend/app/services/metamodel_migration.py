@@ -0,0 +1,316 @@
+"""Card attribute migrations for metamodel edits.
+
+Removing a field from a card type strips its key from every card of the
+type; removing a select option clears it (``single_select``) or filters it
+out of the list (``multiple_select``). This used to be one ``UPDATE`` over
+the whole type per removed field and per removed option, all inside the
+``PATCH /metamodel/types/{key}`` request — on a large type that held the
+admin's save and locked the table for as long as the statements took.
+
+An edit is now compiled into one :class:`AttributeMigration`:
+
+- ``plan_attribute_migration`` diffs the old and new ``fields_schema``.
+- ``preview_attribute_migration`` counts the affected cards — overall, per
+  field and per option — in one query, for the editor to show before the
+  admin saves.
+- ``run_attribute_migration`` rewrites each affected card once, with a
+  single expression covering every removed field and option, in chunks of
+  ``METAMODEL_MIGRATION_CHUNK_SIZE`` cards committed separately.
+
+``PATCH`` runs a migration touching at most
+``METAMODEL_MIGRATION_INLINE_MAX_CARDS`` cards in the request, and queues
+anything larger as a ``metamodel.migrate_attributes`` background job with
+progress. A queued migration re-reads the type's schema when it runs and
+leaves alone whatever was re-added in the meantime.
+
+Extension-contributed fields (stamped ``ext``) are never stripped: an
+extension's disable/uninstall path removes them from the schema *while
+preserving the stored values* (see ``field_contributions``), and a manual
+metamodel edit that drops the field honours the same contract.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Text
+
+from app.config import settings
+from app.services.card_counts import CardCountCache
+from app.services.cluster import cluster_bus
+from app.services.relation_rollup import RelationSummaryCache
+from app.services.report_cache import LandscapeVersion
+
+logger = logging.getLogger(__name__)
+
+_TEXT_ARRAY = ARRAY(Text())
+_UUID_ARRAY = ARRAY(PG_UUID(as_uuid=True))
+
+
+def _fields_by_key(schema: list[dict] | None) -> dict[str, dict]:
+    return {f["key"]: f for section in schema or [] for f in section.get("fields", [])}
+
+
+def _option_keys(f: dict) -> set[str]:
+    return {o["key"] for o in f.get("options") or [] if isinstance(o, dict) and "key" in o}
+
+
+@dataclass(frozen=True)
+class AttributeMigration:
+    """What a schema change removes from the cards of one type."""
+
+    removed_fields: tuple[str, ...] = ()
+    # field key -> removed option keys
+    single_select: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    multiple_select: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.removed_fields or self.single_select or self.multiple_select)
+
+    def to_params(self) -> dict[str, Any]:
+        return {
+            "removed_fields": list(self.removed_fields),
+            "single_select": {k: list(v) for k, v in self.single_select.items()},
+            "multiple_select": {k: list(v) for k, v in self.multiple_select.items()},
+        }
+
+    @classmethod
+    def from_params(cls, params: dict[str, Any]) -> AttributeMigration:
+        return cls(
+            removed_fields=tuple(params.get("removed_fields") or ()),
+            single_select={k: tuple(v) for k, v in (params.get("single_select") or {}).items()},
+            multiple_select={k: tuple(v) for k, v in (params.get("multiple_select") or {}).items()},
+        )
+
+    def still_removed(self, schema: list[dict] | None) -> AttributeMigration:
+        """This migration minus what ``schema`` declares again."""
+        fields = _fields_by_key(schema)
+
+        def options(selects: dict[str, tuple[str, ...]]) -> dict[str, tuple[str, ...]]:
+            kept = {}
+            for fk, opts in selects.items():
+                live = _option_keys(fields[fk]) if fk in fields else set()
+                remaining = tuple(o for o in opts if o not in live)
+                if remaining:
+                    kept[fk] = remaining
+            return kept
+
+        return AttributeMigration(
+            removed_fields=tuple(fk for fk in self.removed_fields if fk not in fields),
+            single_select=options(self.single_select),
+            multiple_select=options(self.multiple_select),
+        )
+
+
+def plan_attribute_migration(
+    old_schema: list[dict] | None, new_schema: list[dict] | None
+) -> AttributeMigration:
+    """The attribute data a change from ``old_schema`` to ``new_schema`` removes."""
+    old_fields = _fields_by_key(old_schema)
+    new_fields = _fields_by_key(new_schema)
+    removed = []
+    for fk in sorted(old_fields.keys() - new_fields.keys()):
+        if old_fields[fk].get("ext"):
+            logger.info("Keeping values of removed extension-owned field '%s'", fk)
+            continue
+        removed.append(fk)
+    single: dict[str, tuple[str, ...]] = {}
+    multiple: dict[str, tuple[str, ...]] = {}
+    for fk, new_field in new_fields.items():
+        old_field = old_fields.get(fk)
+        if not old_field:
+            continue
+        field_type = old_field.get("type", "text")
+        if field_type not in ("single_select", "multiple_select"):
+            continue
+        gone = tuple(sorted(_option_keys(old_field) - _option_keys(new_field)))
+        if gone:
+            (single if field_type == "single_select" else multiple)[fk] = gone
+    return AttributeMigration(tuple(removed), single, multiple)
+
+
+class _Compiled:
+    """SQL fragments for one migration, with their bind parameters."""
+
+    def __init__(self, migration: AttributeMigration) -> None:
+        self.params: dict[str, Any] = {}
+        self.types: dict[str, Any] = {}
+        # (label, field key, option key or None, condition)
+        self.counters: list[tuple[str, str, str | None, str]] = []
+        drops: list[str] = []
+        sets: list[str] = []
+        conditions: list[str] = []
+
+        if migration.removed_fields:
+            self._array("rf", list(migration.removed_fields))
+            conditions.append("attributes ?| :rf")
+            for i, fk in enumerate(migration.removed_fields):
+                self.params[f"rf{i}"] = fk
+                self.counters.append(("field", fk, None, f"attributes ? :rf{i}"))
+
+        for i, (fk, opts) in enumerate(migration.single_select.items()):
+            self.params[f"sf{i}"] = fk
+            self._array(f"so{i}", list(opts))
+            matches = f"attributes ->> :sf{i} = ANY(:so{i})"
+            conditions.append(matches)
+            drops.append(f"CASE WHEN {matches} THEN CAST(:sf{i} AS text) END")
+            for j, opt in enumerate(opts):
+                self.params[f"so{i}_{j}"] = opt
+                self.counters.append(("option", fk, opt, f"attributes ->> :sf{i} = :so{i}_{j}"))
+
+        for i, (fk, opts) in enumerate(migration.multiple_select.items()):
+            self.params[f"mf{i}"] = fk
+            self._array(f"mo{i}", list(opts))
+            is_list = f"jsonb_typeof(attributes -> :mf{i}) = 'array'"
+            matches = f"({is_list} AND attributes -> :mf{i} ?| :mo{i})"
+            conditions.append(matches)
+            sets.append(
+                f"CASE WHEN {matches} THEN jsonb_build_object(CAST(:mf{i} AS text), COALESCE("
+                f"(SELECT jsonb_agg(e) FROM jsonb_array_elements(attributes -> :mf{i}) e "
+                f"WHERE NOT (e #>> '{{}}' = ANY(:mo{i}))), '[]'::jsonb)) "
+                "ELSE '{}'::jsonb END"
+            )
+            for j, opt in enumerate(opts):
+                self.params[f"mo{i}_{j}"] = opt
+                self.counters.append(
+                    ("option", fk, opt, f"({is_list} AND attributes -> :mf{i} ? :mo{i}_{j})")
+                )
+
+        self.condition = " OR ".join(f"({c})" for c in conditions) or "false"
+        expr = "attributes"
+        if migration.removed_fields or drops:
+            parts = []
+            if migration.removed_fields:
+                parts.append("CAST(:rf AS text[])")
+            if drops:
+                parts.append(f"array_remove(ARRAY[{', '.join(drops)}]::text[], NULL)")
+            expr = f"{expr} - ({' || '.join(parts)})"
+        for s in sets:
+            expr = f"({expr}) || {s}"
+        self.expression = expr
+
+    def _array(self, name: str, values: list[str]) -> None:
+        self.params[name] = values
+        self.types[name] = _TEXT_ARRAY
+
+    def statement(self, sql: str):
+        stmt = text(sql)
+        if self.types:
+            stmt = stmt.bindparams(*(bindparam(k, type_=t) for k, t in self.types.items()))
+        return stmt
+
+
+async def preview_attribute_migration(
+    db: AsyncSession, type_key: str, migration: AttributeMigration
+) -> dict[str, Any]:
+    """How many cards of ``type_key`` the migration changes, in one query.
+
+    ``cards`` counts every affected card (archived ones included — they are
+    migrated too); ``fields`` and ``options`` break it down per removed
+    field and per removed option.
+    """
+    result: dict[str, Any] = {"cards": 0, "fields": [], "options": []}
+    if not migration:
+        return result
+    compiled = _Compiled(migration)
+    columns = [f"count(*) FILTER (WHERE {compiled.condition})"] + [
+        f"count(*) FILTER (WHERE {cond})" for _, _, _, cond in compiled.counters
+    ]
+    row = (
+        await db.execute(
+            compiled.statement(f"SELECT {', '.join(columns)} FROM cards WHERE type = :type_key"),
+            {**compiled.params, "type_key": type_key},
+        )
+    ).one()
+    result["cards"] = row[0]
+    for (kind, fk, opt, _), count in zip(compiled.counters, row[1:], strict=True):
+        if kind == "field":
+            result["fields"].append({"field_key": fk, "card_count": count})
+        else:
+            result["options"].append({"field_key": fk, "option_key": opt, "card_count": count})
+    return result
+
+
+def _announce_card_writes() -> None:
+    """What the ORM commit hooks do after a card write, for the raw
+    ``UPDATE`` below they never see: report responses, card counts and
+    relation summaries move on, here and on the other workers."""
+    LandscapeVersion.bump()
+    cluster_bus.publish("reports.landscape")
+    CardCountCache.invalidate()
+    cluster_bus.publish("cards.counts")
+    RelationSummaryCache.invalidate()
+    cluster_bus.publish("cards.relation_summary")
+
+
+async def run_attribute_migration(
+    db: AsyncSession,
+    type_key: str,
+    migration: AttributeMigration,
+    *,
+    chunk_size: int | None = None,
+    commit: bool = True,
+    total: int | None = None,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> int:
+    """Apply ``migration`` to the cards of ``type_key``; returns how many changed.
+
+    Cards are walked in id order, ``chunk_size`` at a time, each chunk one
+    ``UPDATE`` — committed on its own when ``commit`` so no lock outlives a
+    chunk. With ``commit=False`` the caller's transaction holds the whole
+    pass (the in-request path for small types), and its own card-type write
+    invalidates the caches at commit; committed chunks invalidate them one by
+    one (``_announce_card_writes``). ``on_progress(done, total)``
+    is awaited before each chunk; ``total`` skips counting the affected
+    cards when the caller already has.
+    """
+    if not migration:
+        return 0
+    chunk_size = chunk_size or settings.METAMODEL_MIGRATION_CHUNK_SIZE
+    compiled = _Compiled(migration)
+    select_ids = compiled.statement(
+        "SELECT id FROM cards WHERE type = :type_key AND id > :after "
+        f"AND ({compiled.condition}) ORDER BY id LIMIT :limit"
+    )
+    update_chunk = compiled.statement(
+        f"UPDATE cards SET attributes = {compiled.expression} WHERE id = ANY(:ids)"
+    ).bindparams(bindparam("ids", type_=_UUID_ARRAY))
+    if total is None:
+        total = (await preview_attribute_migration(db, type_key, migration))["cards"]
+    done = 0
+    after = uuid.UUID(int=0)
+    while True:
+        if on_progress is not None:
+            await on_progress(done, total)
+        ids = list(
+            (
+                await db.execute(
+                    select_ids,
+                    {
+                        **compiled.params,
+                        "type_key": type_key,
+                        "after": after,
+                        "limit": chunk_size,
+                    },
+                )
+            ).scalars()
+        )
+        if not ids:
+            break
+        await db.execute(update_chunk, {**compiled.params, "ids": ids})
+        if commit:
+            await db.commit()
+            _announce_card_writes()
+        done += len(ids)
+        after = ids[-1]
+    if done:
+        logger.info("Migrated attributes of %d card(s) of type '%s'", done, type_key)
+    return done
@@ -15,6 +15,7 @@ from app.models.role import Role
 from app.models.stakeholder import Stakeholder
 from app.models.stakeholder_role_definition import StakeholderRoleDefinition
 from app.models.user import User
+from app.services.cluster import cluster_bus
 from app.services.event_bus import request_impersonation
 
 
@@ -22,7 +23,7 @@ def _effective_role(user: User) -> str:
     """Return the role key to use for app-level permission checks.
 
     When the request's JWT carries an ``impersonated_role`` claim the
-    middleware in ``app.main`` stashes ``(impersonator_id, role)`` on the
+    ``RequestContextMiddleware`` stashes ``(impersonator_id, role)`` on the
     ``request_impersonation`` contextvar. We use the impersonated role for
     app-level lookups but only when the contextvar's impersonator id
     matches the current user — guards against the (impossible-in-practice)
@@ -310,15 +311,16 @@ class PermissionService:
 
     @staticmethod
     def invalidate_role_cache(role_key: str | None = None) -> None:
-        """Invalidate role cache."""
+        """Invalidate role cache, here and in the other worker processes."""
         if role_key:
             PermissionService._role_cache.pop(role_key, None)
         else:
             PermissionService._role_cache.clear()
+        cluster_bus.publish("permissions.role", {"role_key": role_key})
 
     @staticmethod
     def invalidate_srd_cache(type_key: str | None = None, role_key: str | None = None) -> None:
-        """Invalidate stakeholder role definition cache."""
+        """Invalidate stakeholder role definition cache, here and in the other workers."""
         if type_key and role_key:
             PermissionService._srd_cache.pop((type_key, role_key), None)
         elif type_key:
@@ -327,3 +329,18 @@ class PermissionService:
                 del PermissionService._srd_cache[k]
         else:
             PermissionService._srd_cache.clear()
+        cluster_bus.publish("permissions.srd", {"type_key": type_key, "role_key": role_key})
+
+
+cluster_bus.on(
+    "permissions.role",
+    lambda payload: PermissionService.invalidate_role_cache(payload.get("role_key")),
+    resync=True,
+)
+cluster_bus.on(
+    "permissions.srd",
+    lambda payload: PermissionService.invalidate_srd_cache(
+        payload.get("type_key"), payload.get("role_key")
+    ),
+    resync=True,
+)
@@ -0,0 +1,99 @@
+"""Short-TTL snapshot of the PPM portfolio Gantt, keyed by ``group_by``.
+
+Every PPM user opening the portfolio view asks for the same rows — the
+Gantt is not filtered per user beyond the ``ppm.view`` gate — and assembling
+them reads every active initiative with its latest status report, cost and
+budget totals, stakeholders and grouping relations. The snapshot is kept for
+``PPM_GANTT_CACHE_TTL`` seconds.
+
+Any ORM write to a row the Gantt is built from — cards, relations, status
+reports, cost and budget lines, tasks, stakeholders, users — drops every
+snapshot at flush and again at commit, and the commit-time drop is sent to the
+other workers over the cluster bus (``app/services/cluster.py``). A build that
+overlaps such a write is not stored. Bulk ``UPDATE``/``DELETE`` statements
+bypass the ORM events; the TTL bounds how stale a snapshot can get then.
+"""
+
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.card import Card
+from app.models.ppm_cost_line import PpmBudgetLine, PpmCostLine
+from app.models.ppm_status_report import PpmStatusReport
+from app.models.ppm_task import PpmTask
+from app.models.relation import Relation
+from app.models.stakeholder import Stakeholder
+from app.models.user import User
+from app.schemas.ppm import PpmGanttItem
+from app.services.cluster import cluster_bus
+
+_INVALIDATE_ON_COMMIT = "_ppm_gantt_cache_invalidate"
+
+_SOURCES = (
+    Card,
+    Relation,
+    PpmStatusReport,
+    PpmCostLine,
+    PpmBudgetLine,
+    PpmTask,
+    Stakeholder,
+    User,
+)
+
+
+class PpmGanttCache:
+    _entries: dict[str, tuple[list[PpmGanttItem], float]] = {}
+    # Bumped on every invalidation; a build started under an older generation
+    # may have read rows a concurrent write has since changed.
+    _generation = 0
+
+    @staticmethod
+    def _ttl() -> float:
+        return settings.PPM_GANTT_CACHE_TTL
+
+    @staticmethod
+    def generation() -> int:
+        return PpmGanttCache._generation
+
+    @staticmethod
+    def get(group_by: str | None) -> list[PpmGanttItem] | None:
+        ttl = PpmGanttCache._ttl()
+        cached = PpmGanttCache._entries.get(group_by or "") if ttl > 0 else None
+        if cached and time.monotonic() - cached[1] < ttl:
+            return list(cached[0])
+        return None
+
+    @staticmethod
+    def put(group_by: str | None, items: list[PpmGanttItem], generation: int) -> None:
+        """Store a snapshot built while ``generation`` was current."""
+        if PpmGanttCache._ttl() <= 0 or generation != PpmGanttCache._generation:
+            return
+        PpmGanttCache._entries[group_by or ""] = (list(items), time.monotonic())
+
+    @staticmethod
+    def invalidate() -> None:
+        PpmGanttCache._generation += 1
+        PpmGanttCache._entries.clear()
+
+
+def _invalidate_on_flush(session: Session, _flush_context) -> None:
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _SOURCES) for obj in touched):
+        PpmGanttCache.invalidate()
+        session.info[_INVALIDATE_ON_COMMIT] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_INVALIDATE_ON_COMMIT, False):
+        PpmGanttCache.invalidate()
+        cluster_bus.publish("ppm.gantt")
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+cluster_bus.on("ppm.gantt", lambda _payload: PpmGanttCache.invalidate(), resync=True)
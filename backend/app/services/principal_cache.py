@@ -0,0 +1,106 @@
+"""Short-TTL cache of authenticated users, keyed by user id.
+
+``get_current_user`` runs on nearly every API call, and without a cache each
+of them starts with ``SELECT … FROM users WHERE id = …``. This cache keeps a
+snapshot of the user row's column values for ``USER_PRINCIPAL_CACHE_TTL``
+seconds and rebuilds the ``User`` straight into the request's session from it
+(``Session.merge(load=False)`` — no SELECT), so handlers still receive an
+attached instance they can read and modify as before.
+
+Every ORM update or delete of a ``User`` evicts its entry, both at flush and
+again at commit (so a concurrent request can't re-cache the pre-commit row).
+All user writes in the codebase go through the ORM. With several workers the
+commit-time eviction is also sent to the peers over the cluster bus
+(``app/services/cluster.py``); the TTL then only bounds how long a worker that
+missed the notification may serve a stale row. Access-expiry checks run
+against the snapshot on every request regardless.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+import uuid
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+from app.services.cluster import cluster_bus
+
+_EVICT_ON_COMMIT = "_principal_cache_evict"
+
+
+class PrincipalCache:
+    _entries: dict[uuid.UUID, tuple[dict, float]] = {}
+    # Hard cap on entries; reached only with very many distinct active users
+    # inside one TTL window, and then the cache simply starts over.
+    MAX_ENTRIES = 10_000
+
+    @staticmethod
+    def _ttl() -> float:
+        return settings.USER_PRINCIPAL_CACHE_TTL
+
+    @staticmethod
+    def _snapshot(user: User) -> dict:
+        state = inspect(user)
+        return {
+            attr.key: copy.deepcopy(state.dict[attr.key])
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+
+    @staticmethod
+    async def load(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+        """Return the user attached to ``db``, from the cache when fresh."""
+        ttl = PrincipalCache._ttl()
+        now = time.monotonic()
+        cached = PrincipalCache._entries.get(user_id) if ttl > 0 else None
+        if cached and now - cached[1] < ttl:
+            detached = User(**copy.deepcopy(cached[0]))
+            make_transient_to_detached(detached)
+            return await db.merge(detached, load=False)
+
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is not None and ttl > 0:
+            if len(PrincipalCache._entries) >= PrincipalCache.MAX_ENTRIES:
+                PrincipalCache._entries.clear()
+            PrincipalCache._entries[user_id] = (PrincipalCache._snapshot(user), now)
+        return user
+
+    @staticmethod
+    def invalidate(user_id: uuid.UUID | None = None) -> None:
+        """Drop one user's entry, or every entry."""
+        if user_id is None:
+            PrincipalCache._entries.clear()
+        else:
+            PrincipalCache._entries.pop(user_id, None)
+
+
+def _evict_on_write(mapper, connection, target: User) -> None:
+    if target.id is None:
+        return
+    PrincipalCache.invalidate(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_EVICT_ON_COMMIT, set()).add(target.id)
+
+
+def _evict_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_EVICT_ON_COMMIT, ()):
+        PrincipalCache.invalidate(user_id)
+        cluster_bus.publish("principal", {"user_id": str(user_id)})
+
+
+def _evict_for_peer(payload: dict) -> None:
+    user_id = payload.get("user_id")
+    PrincipalCache.invalidate(uuid.UUID(user_id) if user_id else None)
+
+
+event.listen(User, "after_update", _evict_on_write)
+event.listen(User, "after_delete", _evict_on_write)
+event.listen(Session, "after_commit", _evict_after_commit)
+cluster_bus.on("principal", _evict_for_peer, resync=True)
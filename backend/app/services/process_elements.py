@@ -0,0 +1,74 @@
+"""Keep a process's ``process_elements`` rows in step with its BPMN.
+
+Saving a diagram or publishing a flow revision re-extracts the BPMN elements.
+Most saves move a shape or rename one task, so rows are compared on their
+extracted fields and only elements that were added, removed or actually
+changed are written; the user-maintained EA links on the rows are never
+touched here.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.process_element import ProcessElement
+from app.services.bpmn_parser import ExtractedElement
+
+#: The columns extraction owns.
+EXTRACTED_FIELDS = (
+    "element_type",
+    "name",
+    "documentation",
+    "lane_name",
+    "is_automated",
+    "sequence_order",
+)
+
+
+@dataclass
+class ElementChanges:
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+
+
+async def upsert_extracted_elements(
+    db: AsyncSession,
+    process_id: uuid.UUID,
+    extracted: list[ExtractedElement],
+) -> ElementChanges:
+    """Write the difference between ``extracted`` and the stored elements."""
+    columns = [getattr(ProcessElement, f) for f in EXTRACTED_FIELDS]
+    result = await db.execute(
+        select(ProcessElement.id, ProcessElement.bpmn_element_id, *columns).where(
+            ProcessElement.process_id == process_id
+        )
+    )
+    existing = {row.bpmn_element_id: row for row in result.all()}
+
+    changes = ElementChanges()
+    new_ids = {e.bpmn_element_id for e in extracted}
+    removed = [row.id for bpmn_id, row in existing.items() if bpmn_id not in new_ids]
+    if removed:
+        await db.execute(delete(ProcessElement).where(ProcessElement.id.in_(removed)))
+        changes.removed = len(removed)
+
+    updates: list[dict] = []
+    for ext in extracted:
+        values = {f: getattr(ext, f) for f in EXTRACTED_FIELDS}
+        old = existing.get(ext.bpmn_element_id)
+        if old is None:
+            db.add(
+                ProcessElement(process_id=process_id, bpmn_element_id=ext.bpmn_element_id, **values)
+            )
+            changes.added += 1
+        elif any(getattr(old, f) != v for f, v in values.items()):
+            updates.append({"id": old.id, **values})
+    if updates:
+        await db.execute(update(ProcessElement), updates)
+        changes.updated = len(updates)
+    return changes
@@ -0,0 +1,199 @@
+"""Relation counts for the card detail page: per card and over its subtree.
+
+Opening a card asks for ``GET /cards/{id}/relation-summary`` (neighbour
+counts per relation type and direction) and
+``GET /cards/{id}/descendant-relations/summary`` (the "+N in sub-items"
+roll-up). The roll-up used to load every descendant card and every relation
+touching one of them into Python to count distinct peers — for an L1
+capability with thousands of descendants, the slowest call on the page.
+
+``descendant_peers`` now resolves the roll-up in one statement: a recursive
+walk of the subtree, the relations of its active cards, and the three
+exclusions agreed on discussion #863 (peers inside the subtree, peers the
+root already links directly, archived or hidden-type cards) — returning
+either the distinct-peer count per relation type or, for one relation type,
+each peer with the descendants that link it.
+
+Both summaries are kept per card in ``RelationSummaryCache``. Their inputs
+are relations, the hierarchy (``parent_id``), card status and type, and the
+relation and card types' labels and visibility; an ORM write to any of them
+drops every entry at flush and again at commit, and the commit-time drop is
+sent to the other workers over the cluster bus (``app/services/cluster.py``).
+A build that overlaps such a write is not stored, and edits to anything
+else on a card (name, attributes, lifecycle) leave the entries alone — the
+relation summary's parent name is read afresh on every request. Bulk
+``UPDATE``/``DELETE`` statements bypass the ORM events;
+``RELATION_SUMMARY_CACHE_TTL`` bounds how stale an entry can get then.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.card import Card
+from app.models.card_type import CardType
+from app.models.relation import Relation
+from app.models.relation_type import RelationType
+from app.services.card_lifecycle import MAX_DESCENDANTS
+from app.services.cluster import cluster_bus
+
+_INVALIDATE_ON_COMMIT = "_relation_summary_cache_invalidate"
+
+# Card columns the summaries read; any other card edit keeps the entries.
+_CARD_COLUMNS = ("parent_id", "status", "type")
+
+_MAX_ENTRIES = 4096
+
+
+# ``subtree`` is every descendant (same depth guard as
+# ``card_lifecycle.collect_descendants``), emptied when it exceeds the node
+# cap so a pathological tree degrades to "no roll-up". ``edges`` orients each
+# relation of an active descendant as (owner, peer).
+_EDGES_CTE = """
+WITH RECURSIVE descendants(id, depth) AS (
+    SELECT c.id, 1 FROM cards c WHERE c.parent_id = :root_id
+    UNION ALL
+    SELECT c.id, d.depth + 1
+    FROM cards c JOIN descendants d ON c.parent_id = d.id
+    WHERE d.depth < 64
+),
+subtree AS (
+    SELECT id FROM descendants
+    WHERE (SELECT count(*) FROM descendants) <= :max_nodes
+),
+owners AS (
+    SELECT c.id FROM cards c JOIN subtree s ON s.id = c.id WHERE c.status = 'ACTIVE'
+),
+excluded AS (
+    SELECT c.id FROM cards c
+    WHERE c.status = 'ARCHIVED'
+       OR c.type IN (SELECT key FROM card_types WHERE is_hidden)
+),
+edges AS (
+    SELECT r.type,
+           CASE WHEN r.source_id IN (SELECT id FROM owners)
+                THEN r.source_id ELSE r.target_id END AS owner_id,
+           CASE WHEN r.source_id IN (SELECT id FROM owners)
+                THEN r.target_id ELSE r.source_id END AS peer_id
+    FROM relations r
+    WHERE (r.source_id IN (SELECT id FROM owners) OR r.target_id IN (SELECT id FROM owners))
+      AND r.source_id NOT IN (SELECT id FROM excluded)
+      AND r.target_id NOT IN (SELECT id FROM excluded)
+      AND (CAST(:relation_type AS text) IS NULL OR r.type = :relation_type)
+),
+peers AS (
+    SELECT e.type, e.owner_id, e.peer_id FROM edges e
+    WHERE e.peer_id <> :root_id
+      AND e.peer_id NOT IN (SELECT id FROM owners)
+      AND NOT EXISTS (
+          SELECT 1 FROM relations d
+          WHERE d.type = e.type
+            AND ((d.source_id = :root_id AND d.target_id = e.peer_id)
+              OR (d.target_id = :root_id AND d.source_id = e.peer_id))
+      )
+)
+"""
+
+_COUNT_SQL = text(
+    _EDGES_CTE + "SELECT type, count(DISTINCT peer_id) FROM peers GROUP BY type ORDER BY type"
+)
+
+_PEERS_SQL = text(
+    _EDGES_CTE + "SELECT peer_id, array_agg(DISTINCT owner_id) FROM peers GROUP BY peer_id"
+)
+
+
+async def descendant_peer_counts(db: AsyncSession, root_id: uuid.UUID) -> dict[str, int]:
+    """``relation_type_key -> distinct peers reachable only through descendants``."""
+    rows = await db.execute(
+        _COUNT_SQL,
+        {"root_id": root_id, "max_nodes": MAX_DESCENDANTS, "relation_type": None},
+    )
+    return {rel_type: int(count) for rel_type, count in rows.all()}
+
+
+async def descendant_peers(
+    db: AsyncSession, root_id: uuid.UUID, relation_type: str
+) -> dict[uuid.UUID, list[uuid.UUID]]:
+    """``peer_id -> [descendant ids linking it]`` for one relation type."""
+    rows = await db.execute(
+        _PEERS_SQL,
+        {"root_id": root_id, "max_nodes": MAX_DESCENDANTS, "relation_type": relation_type},
+    )
+    return {peer_id: list(owner_ids) for peer_id, owner_ids in rows.all()}
+
+
+class RelationSummaryCache:
+    # (kind, card id) -> (value, stored at)
+    _entries: dict[tuple[str, uuid.UUID], tuple[Any, float]] = {}
+    # Bumped on every invalidation; a build started under an older generation
+    # may have read rows a concurrent write has since changed.
+    _generation = 0
+
+    @staticmethod
+    def generation() -> int:
+        return RelationSummaryCache._generation
+
+    @staticmethod
+    def get(kind: str, card_id: uuid.UUID) -> Any | None:
+        ttl = settings.RELATION_SUMMARY_CACHE_TTL
+        cached = RelationSummaryCache._entries.get((kind, card_id)) if ttl > 0 else None
+        if cached and time.monotonic() - cached[1] < ttl:
+            return cached[0]
+        return None
+
+    @staticmethod
+    def put(kind: str, card_id: uuid.UUID, value: Any, generation: int) -> None:
+        """Store a value built while ``generation`` was current."""
+        if (
+            settings.RELATION_SUMMARY_CACHE_TTL <= 0
+            or generation != RelationSummaryCache._generation
+        ):
+            return
+        entries = RelationSummaryCache._entries
+        if len(entries) >= _MAX_ENTRIES and (kind, card_id) not in entries:
+            entries.clear()
+        entries[(kind, card_id)] = (value, time.monotonic())
+
+    @staticmethod
+    def invalidate() -> None:
+        RelationSummaryCache._generation += 1
+        RelationSummaryCache._entries.clear()
+
+
+def _affects_summaries(obj: object, session: Session) -> bool:
+    if isinstance(obj, Relation | RelationType | CardType):
+        return True
+    if not isinstance(obj, Card):
+        return False
+    if obj in session.new or obj in session.deleted:
+        return True
+    state = inspect(obj)
+    return any(state.attrs[col].history.has_changes() for col in _CARD_COLUMNS)
+
+
+def _invalidate_on_flush(session: Session, _flush_context) -> None:
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(_affects_summaries(obj, session) for obj in touched):
+        RelationSummaryCache.invalidate()
+        session.info[_INVALIDATE_ON_COMMIT] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_INVALIDATE_ON_COMMIT, False):
+        RelationSummaryCache.invalidate()
+        cluster_bus.publish("cards.relation_summary")
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+cluster_bus.on(
+    "cards.relation_summary", lambda _payload: RelationSummaryCache.invalidate(), resync=True
+)
@@ -0,0 +1,174 @@
+"""Cached report responses, keyed on the landscape version.
+
+The heavy reports (landscape, portfolio, matrix, roadmap, cost treemap,
+capability heatmap, EOL) are rebuilt from the raw tables on every request,
+yet the landscape behind them changes a few times an hour while many users
+open the same reports. ``LandscapeVersion`` is a counter that every ORM
+write to the rows reports read — cards, relations, tags, stakeholders and
+the metamodel — bumps at flush and again at commit; the commit-time bump is
+sent to the other workers over the cluster bus (``app/services/cluster.py``).
+
+``cached_report`` wraps a report endpoint and keeps its response per
+(report, normalized parameters, permission shape, version) in an LRU of
+``REPORT_CACHE_SIZE`` entries. The permission shape is the caller's answer
+to every app permission the report's gates and redactions read, so a
+response is only ever served to a caller the endpoint would have built the
+same response for — a caller failing a gate never finds an entry, because
+a refused request is never stored. Entries of an older version are never
+looked up again and age out of the LRU.
+
+The EOL report also reads the stored endoflife.date cycles
+(``eol_product_cycles``); a refresh that changes them moves the version too.
+Bulk ``UPDATE``/``DELETE`` statements bypass the ORM events; the attribute
+migration of a metamodel edit bumps the version itself after each chunk it
+commits, and elsewhere ``REPORT_CACHE_TTL`` bounds how stale a response can
+get.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.card import Card
+from app.models.card_type import CardType
+from app.models.eol_product_cycles import EolProductCycles
+from app.models.relation import Relation
+from app.models.relation_type import RelationType
+from app.models.stakeholder import Stakeholder
+from app.models.stakeholder_role_definition import StakeholderRoleDefinition
+from app.models.tag import CardTag, Tag, TagGroup
+from app.services.cluster import cluster_bus
+from app.services.permission_service import PermissionService
+
+_BUMP_ON_COMMIT = "_landscape_version_bump"
+
+_SOURCES = (
+    Card,
+    CardType,
+    EolProductCycles,
+    Relation,
+    RelationType,
+    Tag,
+    TagGroup,
+    CardTag,
+    Stakeholder,
+    StakeholderRoleDefinition,
+)
+
+
+class LandscapeVersion:
+    """Process-local counter of landscape writes; only ever increases."""
+
+    _value = 0
+
+    @staticmethod
+    def current() -> int:
+        return LandscapeVersion._value
+
+    @staticmethod
+    def bump() -> None:
+        LandscapeVersion._value += 1
+
+
+def _bump_on_flush(session: Session, _flush_context) -> None:
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _SOURCES) for obj in touched):
+        LandscapeVersion.bump()
+        session.info[_BUMP_ON_COMMIT] = True
+
+
+def _bump_after_commit(session: Session) -> None:
+    if session.info.pop(_BUMP_ON_COMMIT, False):
+        LandscapeVersion.bump()
+        cluster_bus.publish("reports.landscape")
+
+
+event.listen(Session, "after_flush", _bump_on_flush)
+event.listen(Session, "after_commit", _bump_after_commit)
+cluster_bus.on("reports.landscape", lambda _payload: LandscapeVersion.bump(), resync=True)
+
+
+class ReportCache:
+    _entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+    @staticmethod
+    def get(key: str) -> Any | None:
+        ttl = settings.REPORT_CACHE_TTL
+        cached = ReportCache._entries.get(key) if ttl > 0 else None
+        if cached is None:
+            return None
+        if time.monotonic() - cached[1] >= ttl:
+            del ReportCache._entries[key]
+            return None
+        ReportCache._entries.move_to_end(key)
+        return cached[0]
+
+    @staticmethod
+    def put(key: str, value: Any) -> None:
+        size = settings.REPORT_CACHE_SIZE
+        if settings.REPORT_CACHE_TTL <= 0 or size <= 0:
+            return
+        entries = ReportCache._entries
+        entries[key] = (value, time.monotonic())
+        entries.move_to_end(key)
+        while len(entries) > size:
+            entries.popitem(last=False)
+
+    @staticmethod
+    def clear() -> None:
+        ReportCache._entries.clear()
+
+
+def _normalize(value: Any) -> Any:
+    # Repeatable query parameters are filters or sums here, never orderings.
+    if isinstance(value, list | tuple | set | frozenset):
+        return sorted(_normalize(v) for v in value)
+    return value
+
+
+def report_key(name: str, params: dict[str, Any], shape: Sequence[bool], version: int) -> str:
+    payload = json.dumps(
+        [name, {k: _normalize(v) for k, v in sorted(params.items())}, list(shape), version],
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def cached_report(name: str, *, permissions: Sequence[str]) -> Callable[[F], F]:
+    """Serve a report endpoint from ``ReportCache``.
+
+    ``permissions`` must list every app permission the endpoint checks or
+    reads — its gates and anything it redacts on. The endpoint must take
+    ``db`` and ``user`` as keyword arguments, as FastAPI passes them.
+    """
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            db, user = kwargs["db"], kwargs["user"]
+            shape = [await PermissionService.has_app_permission(db, user, p) for p in permissions]
+            params = {k: v for k, v in kwargs.items() if k not in ("db", "user")}
+            key = report_key(name, params, shape, LandscapeVersion.current())
+            hit = ReportCache.get(key)
+            if hit is not None:
+                return hit
+            result = await fn(*args, **kwargs)
+            ReportCache.put(key, result)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
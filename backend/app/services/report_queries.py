@@ -0,0 +1,95 @@
+"""Selections shared by the report builders, expressed in SQL.
+
+The reports used to load a card set, collect its ids and send them back in
+``IN (...)`` lists — one bound parameter per card, twice over for the
+"relations touching these cards" pattern. With tens of thousands of cards
+that is a statement the server parses and plans afresh every time, and one
+that outgrows the driver's parameter limit. The helpers here express the
+same selections without a parameter per row:
+
+- ``active_card_ids`` — the id subquery of active cards of some types, to
+  be used inside ``IN (SELECT ...)`` rather than materialised.
+- ``touching`` — relations with either end in such a subquery, and
+  ``between`` — relations joining two of them.
+- ``id_in`` — a Python-side id set as one ``= ANY($1::uuid[])`` parameter,
+  for the sets only known after a first query (related cards, ancestors).
+- ``tag_groups_for_type`` — the tag groups applicable to a type with their
+  tags, in one query instead of one per group.
+
+``tests/api/test_report_query_plans.py`` holds the per-report regression
+tests: a fixed statement count and bound-parameter count regardless of the
+size of the landscape.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, and_, any_, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+
+from app.models.card import Card
+from app.models.relation import Relation
+from app.models.tag import Tag, TagGroup
+
+_UUID_ARRAY = ARRAY(PG_UUID(as_uuid=True))
+
+
+def active_card_ids(*type_keys: str) -> Select:
+    """``SELECT id`` of the active cards of ``type_keys`` (of any type if none)."""
+    stmt = select(Card.id).where(Card.status == "ACTIVE")
+    if len(type_keys) == 1:
+        stmt = stmt.where(Card.type == type_keys[0])
+    elif type_keys:
+        stmt = stmt.where(Card.type.in_(type_keys))
+    return stmt
+
+
+def touching(card_ids: Select) -> ColumnElement[bool]:
+    """Relations with their source or target among ``card_ids``."""
+    return or_(Relation.source_id.in_(card_ids), Relation.target_id.in_(card_ids))
+
+
+def between(a_ids: Select, b_ids: Select) -> ColumnElement[bool]:
+    """Relations with one end among ``a_ids`` and the other among ``b_ids``."""
+    return or_(
+        and_(Relation.source_id.in_(a_ids), Relation.target_id.in_(b_ids)),
+        and_(Relation.source_id.in_(b_ids), Relation.target_id.in_(a_ids)),
+    )
+
+
+def id_in(
+    column: ColumnElement[Any] | QueryableAttribute[Any], ids: Iterable[uuid.UUID | str]
+) -> ColumnElement[bool]:
+    """``column = ANY(:ids)`` — one array parameter whatever the set size."""
+    values = [i if isinstance(i, uuid.UUID) else uuid.UUID(i) for i in ids]
+    return column == any_(literal(values, _UUID_ARRAY))
+
+
+async def tag_groups_for_type(db: AsyncSession, type_key: str) -> list[dict]:
+    """Tag groups applicable to ``type_key``, each with its tags, by name."""
+    rows = await db.execute(
+        select(TagGroup, Tag)
+        .outerjoin(Tag, Tag.tag_group_id == TagGroup.id)
+        .order_by(TagGroup.name, TagGroup.id, Tag.name)
+    )
+    groups: dict[uuid.UUID, dict] = {}
+    for tg, tag in rows.all():
+        if tg.restrict_to_types and type_key not in tg.restrict_to_types:
+            continue
+        group = groups.get(tg.id)
+        if group is None:
+            group = groups[tg.id] = {
+                "id": str(tg.id),
+                "name": tg.name,
+                "mode": tg.mode,
+                "tags": [],
+            }
+        if tag is not None:
+            group["tags"].append({"id": str(tag.id), "name": tag.name, "color": tag.color})
+    return list(groups.values())
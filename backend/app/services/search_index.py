@@ -0,0 +1,80 @@
+"""Indexes behind free-text search (``app.services.search_rank``).
+
+Two kinds, for the two ways a search term matches:
+
+- **Substring** (``ILIKE '%q%'`` via ``search_filter``) — what every search
+  box has always done, and what the ranking tiers are defined over. A plain
+  B-tree can't serve a leading wildcard, so without help each keystroke is a
+  sequential scan. ``pg_trgm`` GIN indexes on the searched columns let
+  Postgres answer it from the index instead.
+- **Word prefixes in any order** (``search_vector @@ to_tsquery``) — the
+  ``search_vector`` generated column on cards, risks and ADRs, maintained by
+  Postgres itself on every write and GIN-indexed in the model. It lets a
+  multi-word query ("payroll workday") find a row whose words appear in
+  another order or spread over name, alias, reference and description.
+
+The tsvector side is core Postgres and lives in the models. ``pg_trgm`` is a
+contrib extension: the bundled image ships it, but a managed instance may not
+offer it or may not let the application role create it. Search stays correct
+without it — only slower — so the trigram indexes are best-effort: installed
+by migration 139 and re-checked on every startup (``ensure_trigram_indexes``),
+which also covers fresh databases built by ``create_all`` and extensions
+enabled after the upgrade.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import DDL, Connection, text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# table -> columns searched with ILIKE. Keep in step with the callers of
+# ``search_filter`` / ``search_match`` on these tables.
+TRIGRAM_COLUMNS: dict[str, tuple[str, ...]] = {
+    "cards": ("name", "alias", "reference", "description"),
+    "risks": ("title", "reference", "description"),
+    "architecture_decisions": ("title", "reference_number"),
+}
+
+
+def trigram_index_name(table: str, column: str) -> str:
+    return f"ix_{table}_{column}_trgm"
+
+
+def _pg_trgm_ready(conn: Connection) -> bool:
+    if conn.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")):
+        return True
+    if not conn.scalar(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")):
+        return False
+    try:
+        with conn.begin_nested():
+            conn.execute(DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as exc:
+        logger.warning("pg_trgm is available but could not be enabled: %s", exc.orig)
+        return False
+    return True
+
+
+def ensure_trigram_indexes(conn: Connection) -> bool:
+    """Create any missing trigram index. Returns False when pg_trgm is unusable.
+
+    Idempotent and cheap once the indexes exist (``IF NOT EXISTS``).
+    """
+    if not _pg_trgm_ready(conn):
+        logger.warning(
+            "pg_trgm is not available — text search runs without trigram indexes "
+            "(correct, but a sequential scan on large inventories)"
+        )
+        return False
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            conn.execute(
+                DDL(
+                    f"CREATE INDEX IF NOT EXISTS {trigram_index_name(table, column)} "
+                    f"ON {table} USING gin ({column} gin_trgm_ops)"
+                )
+            )
+    return True
@@ -13,6 +13,9 @@ surprise, so the rule lives here and every endpoint applies it.
 The client mirrors these tiers in `frontend/src/lib/searchRank.ts` so a picker
 can re-rank its loaded page during the debounce window without the order
 jumping when the server response lands. Change one and change the other.
+
+*Which* rows match is decided separately (``search_match``), against indexes
+described in ``app.services.search_index``; ranking only orders the matches.
 """
 
 from __future__ import annotations
@@ -20,7 +23,8 @@ from __future__ import annotations
 import re
 from typing import Any
 
-from sqlalchemy import case, func
+from sqlalchemy import case, cast, func, literal, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.elements import ColumnElement
 
@@ -32,7 +36,7 @@ from sqlalchemy.sql.elements import ColumnElement
 # both accepted without pretending the two hierarchies are related.
 SearchColumn = InstrumentedAttribute[Any]
 
-__all__ = ["like_literal", "rank_text", "search_rank", "search_filter"]
+__all__ = ["like_literal", "rank_text", "search_rank", "search_filter", "search_match"]
 
 
 def like_literal(value: str) -> str:
@@ -88,6 +92,37 @@ def search_filter(column: SearchColumn, search: str) -> ColumnElement[bool]:
     return column.ilike(f"%{like_literal(search)}%", escape="\\")
 
 
+# Letters and digits only: every other character is either a word boundary
+# or tsquery syntax, so nothing the user types reaches the query parser raw.
+_QUERY_WORDS = re.compile(r"[^\W_]+")
+
+
+def search_match(
+    search: str, *columns: SearchColumn, vector: SearchColumn | None = None
+) -> ColumnElement[bool]:
+    """Rows where ``search`` is a substring of any of ``columns`` — or, given
+    the table's ``search_vector``, where every word of a multi-word query
+    starts a word somewhere in the row, in any order.
+
+    The substring half is ``search_filter`` per column (trigram-indexed where
+    ``pg_trgm`` exists). A single word needs nothing more: a substring match
+    already covers every word-prefix match. With two or more terms the
+    vector adds "payroll workday" → "Workday Payroll"; such rows rank as
+    "no match on the name" (tier 4) unless the phrase also occurs there.
+    """
+    clauses = [search_filter(column, search) for column in columns]
+    terms = search.lower().split()
+    words = [word for term in terms for word in _QUERY_WORDS.findall(term)]
+    if vector is not None and len(terms) > 1 and words:
+        query = " & ".join(f"{word}:*" for word in words)
+        clauses.append(
+            vector.op("@@", is_comparison=True)(
+                func.to_tsquery(cast(literal("simple"), REGCONFIG), query)
+            )
+        )
+    return or_(*clauses)
+
+
 # Word boundaries in real names are as often `-`, `/`, `.` or `(` as a space.
 _WORD_BOUNDARY = re.compile(r"[^a-z0-9]")
 
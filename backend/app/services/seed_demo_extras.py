@@ -30,6 +30,7 @@ from app.models.stakeholder import Stakeholder
 from app.models.survey import Survey, SurveyResponse
 from app.models.todo import Todo
 from app.models.user import User
+from app.services.blob_store import put_blob
 from app.services.principles_catalogue_service import get_catalogue_principle
 from app.services.seed_markers import demo_seed_completed, mark_demo_seed_completed
 
@@ -1373,7 +1374,7 @@ async def seed_extras_demo_data(db: AsyncSession) -> dict:
                 name=file_name,
                 mime_type=mime_type,
                 size=len(payload),
-                data=payload,
+                content_hash=await put_blob(db, payload),
                 category=category,
                 created_by=admin_id,
             )
@@ -0,0 +1,468 @@
+"""Parametrised large-workspace seeder for the scale benchmark.
+
+The demo seeders (``seed_demo``, ``seed_demo_bpm``, ``seed_demo_ppm``,
+``seed_demo_security``) build a hand-written NexaTech landscape of a few hundred
+cards — realistic, but far too small to show how a query behaves at 50k cards.
+This seeder generates a synthetic landscape of any size on top of the seeded
+metamodel, for ``scripts/benchmark.py``:
+
+* a deep, wide BusinessCapability tree (``capability_depth`` levels of
+  ``capability_fanout`` children) plus hierarchical Organizations;
+* the remaining card budget spread over the other built-in types in roughly
+  the proportions of a real inventory, with lifecycle dates, attribute values
+  drawn from each type's ``fields_schema`` and the built-in ``hierarchyLevel``;
+* relations sampled over the *real* relation types, so every report sees the
+  source/target pairs it expects;
+* tag groups, stakeholder assignments, draw.io diagrams linked to their cards,
+  BPMN process diagrams and per-card history events.
+
+Everything derives from one ``random.Random(profile.seed)`` — UUIDs included —
+so the same profile always produces the same workspace and benchmark runs are
+comparable across versions. Rows go in through chunked multi-row INSERTs;
+the ORM unit-of-work would dominate the seeding time at this size.
+
+Never called on startup: it refuses to run against a database that already
+holds cards.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.card import Card
+from app.models.card_type import CardType
+from app.models.diagram import Diagram, diagram_cards
+from app.models.event import Event
+from app.models.process_diagram import ProcessDiagram
+from app.models.relation import Relation
+from app.models.relation_type import RelationType
+from app.models.stakeholder import Stakeholder
+from app.models.stakeholder_role_definition import StakeholderRoleDefinition
+from app.models.tag import CardTag, Tag, TagGroup
+from app.services.seed_demo_extras import _make_cell, _make_edge, _wrap_xml
+
+# Rows per INSERT statement. asyncpg caps a statement at 32767 bind
+# parameters; the widest table here (cards) binds 14 columns per row.
+_CHUNK = 1000
+
+# Share of the non-capability card budget per type. Organizations are
+# hierarchical too but shallow; BusinessCapability gets its own tree.
+_TYPE_WEIGHTS: dict[str, float] = {
+    "Application": 0.30,
+    "ITComponent": 0.22,
+    "Interface": 0.12,
+    "DataObject": 0.10,
+    "BusinessProcess": 0.06,
+    "Initiative": 0.05,
+    "Organization": 0.04,
+    "Provider": 0.04,
+    "TechCategory": 0.02,
+    "BusinessContext": 0.02,
+    "Objective": 0.02,
+    "Platform": 0.01,
+}
+
+_LIFECYCLE_PHASES = ("plan", "phaseIn", "active", "phaseOut", "endOfLife")
+
+
+@dataclass(frozen=True)
+class ScaleProfile:
+    """Size of the generated workspace. See ``PRESETS`` for named sizes."""
+
+    cards: int = 50_000
+    relations: int = 200_000
+    capability_depth: int = 5
+    capability_fanout: int = 5
+    diagrams: int = 500
+    cards_per_diagram: int = 40
+    process_diagrams: int = 300
+    tag_groups: int = 8
+    tags_per_group: int = 6
+    stakeholder_share: float = 0.3
+    events_per_card: int = 2
+    seed: int = 42
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+PRESETS: dict[str, ScaleProfile] = {
+    # Smoke-sized: seeds in seconds, for checking the harness itself.
+    "small": ScaleProfile(
+        cards=2_000,
+        relations=8_000,
+        capability_depth=3,
+        capability_fanout=5,
+        diagrams=20,
+        process_diagrams=20,
+    ),
+    "medium": ScaleProfile(
+        cards=10_000,
+        relations=40_000,
+        capability_depth=4,
+        capability_fanout=5,
+        diagrams=100,
+        process_diagrams=80,
+    ),
+    "large": ScaleProfile(),
+}
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _lifecycle(rng: random.Random, today: date) -> dict:
+    """A plausible lifecycle: a contiguous run of phases around today."""
+    start = today - timedelta(days=rng.randint(-365, 3650))
+    first = rng.randint(0, 2)
+    last = rng.randint(first, len(_LIFECYCLE_PHASES) - 1)
+    out: dict[str, str] = {}
+    current = start
+    for phase in _LIFECYCLE_PHASES[first : last + 1]:
+        out[phase] = current.isoformat()
+        current += timedelta(days=rng.randint(90, 1200))
+    return out
+
+
+def _field_value(rng: random.Random, field: dict):
+    ftype = field.get("type")
+    options = [o.get("key") for o in field.get("options") or [] if o.get("key")]
+    if ftype == "single_select" and options:
+        return rng.choice(options)
+    if ftype == "multiple_select" and options:
+        return rng.sample(options, k=rng.randint(1, min(3, len(options))))
+    if ftype == "cost":
+        return round(rng.uniform(1_000, 2_000_000), 2)
+    if ftype == "number":
+        return rng.randint(0, 1000)
+    if ftype == "boolean":
+        return rng.random() < 0.5
+    if ftype == "date":
+        return (date(2015, 1, 1) + timedelta(days=rng.randint(0, 5000))).isoformat()
+    return None
+
+
+def _attributes(rng: random.Random, fields: list[dict], level: int | None) -> dict:
+    attrs: dict = {}
+    for field in fields:
+        # Leave ~30% of fields empty so data-quality scores and the
+        # "missing value" report paths have something to find.
+        if field.get("readonly") or rng.random() < 0.3:
+            continue
+        value = _field_value(rng, field)
+        if value is not None:
+            attrs[field["key"]] = value
+    if level is not None:
+        attrs["hierarchyLevel"] = level
+    return attrs
+
+
+def _bpmn_xml(rng: random.Random, process_id: uuid.UUID, tasks: int) -> str:
+    """A linear BPMN process with ``tasks`` user tasks and its DI shapes."""
+    pid = f"Process_{process_id.hex[:8]}"
+    nodes = ['<bpmn:startEvent id="Start_1" name="Start"/>']
+    shapes = [
+        '<bpmndi:BPMNShape id="Start_1_di" bpmnElement="Start_1">'
+        '<dc:Bounds x="100" y="100" width="36" height="36"/></bpmndi:BPMNShape>'
+    ]
+    flows = []
+    prev = "Start_1"
+    for i in range(tasks):
+        tid = f"Task_{i}"
+        nodes.append(f'<bpmn:userTask id="{tid}" name="Step {i + 1} {rng.randint(100, 999)}"/>')
+        flows.append(f'<bpmn:sequenceFlow id="Flow_{i}" sourceRef="{prev}" targetRef="{tid}"/>')
+        shapes.append(
+            f'<bpmndi:BPMNShape id="{tid}_di" bpmnElement="{tid}">'
+            f'<dc:Bounds x="{180 + i * 140}" y="78" width="100" height="80"/></bpmndi:BPMNShape>'
+        )
+        prev = tid
+    nodes.append('<bpmn:endEvent id="End_1" name="End"/>')
+    flows.append(f'<bpmn:sequenceFlow id="Flow_end" sourceRef="{prev}" targetRef="End_1"/>')
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" '
+        'xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" '
+        'xmlns:dc="http://www.omg.org/spec/DD/20100524/DC" id="Definitions_1" '
+        'targetNamespace="http://bpmn.io/schema/bpmn">'
+        f'<bpmn:process id="{pid}" isExecutable="false">{"".join(nodes)}{"".join(flows)}'
+        "</bpmn:process>"
+        f'<bpmndi:BPMNDiagram id="Diagram_1"><bpmndi:BPMNPlane id="Plane_1" bpmnElement="{pid}">'
+        f"{''.join(shapes)}</bpmndi:BPMNPlane></bpmndi:BPMNDiagram>"
+        "</bpmn:definitions>"
+    )
+
+
+async def _insert_chunked(db: AsyncSession, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), _CHUNK):
+        await db.execute(insert(table), rows[start : start + _CHUNK])
+
+
+def _tree(
+    rng: random.Random,
+    type_key: str,
+    label: str,
+    depth: int,
+    fanout: int,
+    budget: int,
+) -> list[tuple[uuid.UUID, uuid.UUID | None, int, str]]:
+    """Breadth-first tree of at most ``budget`` nodes: (id, parent, level, name)."""
+    nodes: list[tuple[uuid.UUID, uuid.UUID | None, int, str]] = []
+    frontier: list[tuple[uuid.UUID | None, int, str]] = [(None, 0, "")]
+    while frontier and len(nodes) < budget:
+        next_frontier: list[tuple[uuid.UUID | None, int, str]] = []
+        for parent, level, path in frontier:
+            if level >= depth:
+                continue
+            for i in range(fanout if parent else max(fanout, 8)):
+                if len(nodes) >= budget:
+                    break
+                node_path = f"{path}.{i + 1}" if path else str(i + 1)
+                node_id = _uuid(rng)
+                nodes.append((node_id, parent, level + 1, f"{label} {node_path}"))
+                next_frontier.append((node_id, level + 1, node_path))
+        frontier = next_frontier
+    return nodes
+
+
+async def seed_scale_workspace(
+    db: AsyncSession, profile: ScaleProfile, *, admin_id: uuid.UUID | None = None
+) -> dict:
+    """Insert a synthetic workspace sized by ``profile``. Returns row counts.
+
+    Requires the metamodel (``seed_metamodel``) and refuses to run when any
+    card already exists. The caller commits.
+    """
+    if (await db.execute(select(Card.id).limit(1))).scalar_one_or_none() is not None:
+        raise RuntimeError("seed_scale_workspace needs an empty inventory")
+
+    rng = random.Random(profile.seed)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+
+    types = {
+        ct.key: ct
+        for ct in (
+            await db.execute(select(CardType).where(CardType.is_hidden == False))  # noqa: E712
+        ).scalars()
+    }
+    if "BusinessCapability" not in types:
+        raise RuntimeError("seed the metamodel before the scale workspace")
+    fields_by_type = {
+        key: [f for s in (ct.fields_schema or []) for f in s.get("fields", [])]
+        for key, ct in types.items()
+    }
+
+    # ---- Cards ------------------------------------------------------------
+    card_rows: list[dict] = []
+    ids_by_type: dict[str, list[uuid.UUID]] = {}
+
+    def add_card(
+        card_id: uuid.UUID, type_key: str, name: str, parent: uuid.UUID | None, level: int | None
+    ) -> None:
+        ct = types[type_key]
+        subtypes = [s.get("key") for s in ct.subtypes or [] if s.get("key")]
+        card_rows.append(
+            {
+                "id": card_id,
+                "type": type_key,
+                "subtype": rng.choice(subtypes) if subtypes else None,
+                "name": name,
+                "description": f"Synthetic {ct.label} generated for scale benchmarks.",
+                "parent_id": parent,
+                "lifecycle": _lifecycle(rng, today),
+                "attributes": _attributes(
+                    rng, fields_by_type[type_key], level if ct.has_hierarchy else None
+                ),
+                "status": "ACTIVE",
+                "approval_status": rng.choice(("DRAFT", "APPROVED", "APPROVED", "BROKEN")),
+                "data_quality": round(rng.uniform(10, 100), 1),
+                "created_by": admin_id,
+                "updated_by": admin_id,
+                "created_at": now - timedelta(days=rng.randint(0, 900)),
+                "updated_at": now - timedelta(days=rng.randint(0, 200)),
+            }
+        )
+        ids_by_type.setdefault(type_key, []).append(card_id)
+
+    cap_budget = min(profile.cards // 4, profile.cards)
+    for node_id, parent, level, name in _tree(
+        rng,
+        "BusinessCapability",
+        "Capability",
+        profile.capability_depth,
+        profile.capability_fanout,
+        cap_budget,
+    ):
+        add_card(node_id, "BusinessCapability", name, parent, level)
+
+    remaining = profile.cards - len(card_rows)
+    weights = {k: w for k, w in _TYPE_WEIGHTS.items() if k in types}
+    total_weight = sum(weights.values()) or 1
+    for type_key, weight in weights.items():
+        count = int(remaining * weight / total_weight)
+        label = types[type_key].label
+        if types[type_key].has_hierarchy and type_key in ("Organization", "BusinessProcess"):
+            for node_id, parent, level, name in _tree(rng, type_key, label, 3, 4, count):
+                add_card(node_id, type_key, name, parent, level)
+        else:
+            flat_level = 1 if types[type_key].has_hierarchy else None
+            for i in range(count):
+                add_card(_uuid(rng), type_key, f"{label} {i + 1:05d}", None, flat_level)
+
+    await _insert_chunked(db, Card.__table__, card_rows)
+
+    # ---- Relations ----------------------------------------------------------
+    rel_types = [
+        rt
+        for rt in (await db.execute(select(RelationType))).scalars()
+        if ids_by_type.get(rt.source_type_key) and ids_by_type.get(rt.target_type_key)
+    ]
+    relation_rows: list[dict] = []
+    seen: set[tuple[str, uuid.UUID, uuid.UUID]] = set()
+    attempts = 0
+    while rel_types and len(relation_rows) < profile.relations and attempts < profile.relations * 3:
+        attempts += 1
+        rt = rng.choice(rel_types)
+        src = rng.choice(ids_by_type[rt.source_type_key])
+        tgt = rng.choice(ids_by_type[rt.target_type_key])
+        if src == tgt or (rt.key, src, tgt) in seen:
+            continue
+        seen.add((rt.key, src, tgt))
+        relation_rows.append(
+            {
+                "id": _uuid(rng),
+                "type": rt.key,
+                "source_id": src,
+                "target_id": tgt,
+                "attributes": {},
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    await _insert_chunked(db, Relation.__table__, relation_rows)
+
+    # ---- Tags -----------------------------------------------------------------
+    all_ids = [row["id"] for row in card_rows]
+    tag_ids: list[uuid.UUID] = []
+    for g in range(profile.tag_groups):
+        group = TagGroup(id=_uuid(rng), name=f"Scale group {g + 1}", mode="multi")
+        db.add(group)
+        for t in range(profile.tags_per_group):
+            tag = Tag(id=_uuid(rng), tag_group_id=group.id, name=f"Tag {g + 1}.{t + 1}")
+            db.add(tag)
+            tag_ids.append(tag.id)
+    await db.flush()
+    card_tag_rows = []
+    if tag_ids:
+        for card_id in all_ids:
+            for tag_id in rng.sample(tag_ids, k=rng.randint(0, min(3, len(tag_ids)))):
+                card_tag_rows.append({"card_id": card_id, "tag_id": tag_id})
+    await _insert_chunked(db, CardTag.__table__, card_tag_rows)
+
+    # ---- Stakeholders ---------------------------------------------------------
+    stakeholder_rows: list[dict] = []
+    if admin_id is not None:
+        role_by_type: dict[str, str] = {}
+        for srd in (
+            await db.execute(
+                select(StakeholderRoleDefinition).order_by(StakeholderRoleDefinition.sort_order)
+            )
+        ).scalars():
+            role_by_type.setdefault(srd.card_type_key, srd.key)
+        for row in card_rows:
+            role = role_by_type.get(row["type"])
+            if role and rng.random() < profile.stakeholder_share:
+                stakeholder_rows.append(
+                    {"id": _uuid(rng), "card_id": row["id"], "user_id": admin_id, "role": role}
+                )
+    await _insert_chunked(db, Stakeholder.__table__, stakeholder_rows)
+
+    # ---- Diagrams ---------------------------------------------------------
+    diagram_rows: list[dict] = []
+    diagram_card_rows: list[dict] = []
+    type_of = {row["id"]: row["type"] for row in card_rows}
+    for d in range(profile.diagrams):
+        members = rng.sample(all_ids, k=min(profile.cards_per_diagram, len(all_ids)))
+        cells = []
+        for i, card_id in enumerate(members):
+            cells.append(
+                _make_cell(
+                    f"c{i}",
+                    f"Card {i}",
+                    str(card_id),
+                    type_of[card_id],
+                    40 + (i % 8) * 220,
+                    40 + (i // 8) * 110,
+                )
+            )
+            if i:
+                cells.append(_make_edge(f"e{i}", f"c{i - 1}", f"c{i}"))
+        diagram_id = _uuid(rng)
+        diagram_rows.append(
+            {
+                "id": diagram_id,
+                "name": f"Scale diagram {d + 1:04d}",
+                "data": {"xml": _wrap_xml("".join(cells))},
+                "created_by": admin_id,
+                "is_published": False,
+            }
+        )
+        diagram_card_rows.extend({"diagram_id": diagram_id, "card_id": c} for c in members)
+    await _insert_chunked(db, Diagram.__table__, diagram_rows)
+    await _insert_chunked(db, diagram_cards, diagram_card_rows)
+
+    process_ids = ids_by_type.get("BusinessProcess", [])
+    process_rows = [
+        {
+            "id": _uuid(rng),
+            "process_id": pid,
+            "bpmn_xml": _bpmn_xml(rng, pid, rng.randint(5, 40)),
+            "version": 1,
+            "created_by": admin_id,
+        }
+        for pid in process_ids[: profile.process_diagrams]
+    ]
+    await _insert_chunked(db, ProcessDiagram.__table__, process_rows)
+
+    # ---- History events -------------------------------------------------------
+    event_rows: list[dict] = []
+    for row in card_rows:
+        for n in range(profile.events_per_card):
+            event_rows.append(
+                {
+                    "id": _uuid(rng),
+                    "card_id": row["id"],
+                    "user_id": admin_id,
+                    "event_type": "card.created" if n == 0 else "card.updated",
+                    "data": {"name": row["name"]},
+                    "created_at": row["created_at"] + timedelta(days=n * rng.randint(1, 60)),
+                }
+            )
+    await _insert_chunked(db, Event.__table__, event_rows)
+    await db.flush()
+
+    return {
+        "cards": len(card_rows),
+        "cards_by_type": {k: len(v) for k, v in sorted(ids_by_type.items())},
+        "relations": len(relation_rows),
+        "card_tags": len(card_tag_rows),
+        "stakeholders": len(stakeholder_rows),
+        "diagrams": len(diagram_rows),
+        "process_diagrams": len(process_rows),
+        "events": len(event_rows),
+        "max_capability_level": max(
+            (
+                r["attributes"].get("hierarchyLevel", 0)
+                for r in card_rows
+                if r["type"] == "BusinessCapability"
+            ),
+            default=0,
+        ),
+    }
@@ -43,6 +43,7 @@ from app.models.tag import CardTag, Tag, TagGroup
 from app.models.user import User
 from app.services import card_reference
 from app.services.card_resolver import CardResolver
+from app.services.cluster import cluster_bus
 from app.services.email_backends.runtime import apply_email_settings_to_runtime
 from app.services.workspace_io import exporter as exp
 from app.services.workspace_io import schema
@@ -625,8 +626,10 @@ async def _apply_settings(db, bundle: WorkspaceBundle, sr: SectionResult, dry_ru
             row_obj.email_settings = merged_email
             sr.updated += 1
             # Mirror the imported settings into the runtime singleton so the
-            # new method/transport takes effect without a restart.
+            # new method/transport takes effect without a restart — in the
+            # other workers too, once the import commits.
             apply_email_settings_to_runtime(merged_email)
+            cluster_bus.publish_on_commit(db, "settings.runtime")
         else:
             sr.skip("identical")
     if incoming.get("custom_logo_mime"):
@@ -20,6 +20,8 @@ resolves verbatim with no remapping. Only three things need translation:
   resolved via the email→id map on import.
 * **binary/large assets** — ``LargeBinary``, or a Text/JSONB column holding
   diagram/BPMN XML. Offloaded to ``assets/<sheet>/<pk>__<col>`` in the zip.
+  Bytes kept in the blob store (a content-hash column) travel the same way, so
+  a bundle never carries store-specific hashes.
 
 Idempotency: a row whose preserved PK already exists on the target is skipped.
 """
@@ -37,6 +39,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.blob_store import content_digest, get_blob_store, put_blob
 from app.services.card_resolver import CardResolver
 from app.services.workspace_io import schema
 from app.services.workspace_io.bundle import WorkspaceBundle
@@ -62,6 +65,10 @@ class EntitySection:
     # the rest of the dict inline — e.g. ("data", "xml", "drawio") writes a real
     # .drawio file from ``data["xml"]`` and stores the remaining keys as JSON.
     json_asset_columns: tuple[tuple[str, str, str], ...] = ()  # (column, subkey, ext)
+    # A content-hash column whose bytes live in the blob store, exported as the
+    # asset ``<name>__asset`` — e.g. ("content_hash", "data", "bin") keeps the
+    # file attachments' bundle format from before the bytes left Postgres.
+    blob_asset_columns: tuple[tuple[str, str, str], ...] = ()  # (column, name, ext)
     # When set, asset files for this section are named from this column's value
     # (the original filename, e.g. "report.pdf") instead of "<pk>__<col>.<ext>".
     filename_column: str | None = None
@@ -78,10 +85,16 @@ class EntitySection:
             | set(self.user_fk_columns)
             | {a[0] for a in self.asset_columns}
             | {a[0] for a in self.json_asset_columns}
+            | {a[0] for a in self.blob_asset_columns}
             | set(self.exclude_columns)
             | _TIMESTAMP_COLUMNS
         )
-        return [c.name for c in self.model.__table__.columns if c.name not in managed]
+        # Generated columns (e.g. ``search_vector``) are Postgres's to write.
+        return [
+            c.name
+            for c in self.model.__table__.columns
+            if c.name not in managed and c.computed is None
+        ]
 
     def pk_columns(self) -> list[str]:
         return [c.name for c in self.model.__table__.primary_key.columns]
@@ -94,6 +107,8 @@ class EntitySection:
             cols.append(f"{c}__email")
         for c, _kind, _ext in self.asset_columns:
             cols.append(f"{c}__asset")
+        for _col, name, _ext in self.blob_asset_columns:
+            cols.append(f"{name}__asset")
         for c, subkey, _ext in self.json_asset_columns:
             cols += [f"{c}__meta", f"{c}__{subkey}__asset"]
         return cols
@@ -177,6 +192,13 @@ def _decode_asset(raw: bytes | None, kind: str) -> Any:
     raise ValueError(f"Unknown asset kind {kind!r}")
 
 
+def _asset_path(section: EntitySection, obj: Any, pk: Any, name: str, ext: str) -> str:
+    fname = getattr(obj, section.filename_column, None) if section.filename_column else None
+    if fname:
+        return f"{section.sheet}/{pk}__{_safe_filename(str(fname))}"
+    return f"{section.sheet}/{pk}__{name}.{ext}"
+
+
 def build_card_ref(card: Any, card_map: dict[Any, Any]) -> str:
     """Full ``parent_path / name`` reference for a card (root→name, escaped)."""
     segments: list[str] = []
@@ -226,16 +248,17 @@ async def export_entity_section(
             if content is None:
                 out[f"{col}__asset"] = None
                 continue
-            pk = getattr(obj, pk0)
-            fname = None
-            if section.filename_column:
-                fname = getattr(obj, section.filename_column, None)
-            if fname:
-                path = f"{section.sheet}/{pk}__{_safe_filename(str(fname))}"
-            else:
-                path = f"{section.sheet}/{pk}__{col}.{ext}"
+            path = _asset_path(section, obj, getattr(obj, pk0), col, ext)
             assets[path] = _encode_asset(content, kind)
             out[f"{col}__asset"] = path
+        for col, name, ext in section.blob_asset_columns:
+            digest = getattr(obj, col)
+            if not digest:
+                out[f"{name}__asset"] = None
+                continue
+            path = _asset_path(section, obj, getattr(obj, pk0), name, ext)
+            assets[path] = await get_blob_store().read(digest)
+            out[f"{name}__asset"] = path
         for col, subkey, ext in section.json_asset_columns:
             content = getattr(obj, col)
             data = content if isinstance(content, dict) else {}
@@ -359,6 +382,28 @@ async def apply_entity_section(
             path = row.get(f"{col}__asset")
             kwargs[col] = _decode_asset(bundle.assets.get(str(path)), kind) if path else None
 
+        missing_asset: str | None = None
+        for col, name, _ext in section.blob_asset_columns:
+            path = row.get(f"{name}__asset")
+            content = bundle.assets.get(str(path)) if path else None
+            if content is None:
+                if not _nullable(model, col):
+                    missing_asset = f"{name}__asset = {path!r}"
+                    break
+                kwargs[col] = None
+                continue
+            # A dry run only needs the hash; the store is written for real imports.
+            if dry_run:
+                kwargs[col] = content_digest(content)
+            else:
+                kwargs[col] = await put_blob(db, content)
+        if missing_asset:
+            sr.conflict += 1
+            sr.errors.append(
+                f"{section.sheet}: required asset {missing_asset} missing — row skipped"
+            )
+            continue
+
         for col, subkey, _ext in section.json_asset_columns:
             meta_raw = row.get(f"{col}__meta")
             data = json.loads(meta_raw) if isinstance(meta_raw, str) and meta_raw else {}
@@ -76,7 +76,8 @@ ENTITY_SECTIONS: tuple[EntitySection, ...] = (
         FileAttachment,
         card_fk_columns=("card_id",),
         user_fk_columns=("created_by",),
-        asset_columns=(("data", "bytes", "bin"),),
+        # Bytes live in the blob store; the bundle still carries them as data__asset.
+        blob_asset_columns=(("content_hash", "data", "bin"),),
         filename_column="name",  # keep the original filename + extension
     ),
     EntitySection(
@@ -105,12 +106,19 @@ ENTITY_SECTIONS: tuple[EntitySection, ...] = (
     EntitySection("DiagramGroups", DiagramGroup, user_fk_columns=("created_by",)),
     EntitySection("DiagramFavorites", DiagramFavorite, user_fk_columns=("user_id",)),
     # --- BPM --------------------------------------------------------------
+    # Delta versions travel as stored; ``delta_base_id`` is an intra-module FK
+    # (preserved verbatim) and their snapshot is applied first.
     EntitySection(
         "ProcessDiagrams",
         ProcessDiagram,
         card_fk_columns=("process_id",),
         user_fk_columns=("created_by",),
-        asset_columns=(("bpmn_xml", "text", "bpmn"), ("svg_thumbnail", "text", "svg")),
+        self_parent_column="delta_base_id",
+        asset_columns=(
+            ("bpmn_xml", "text", "bpmn"),
+            ("bpmn_delta", "bytes", "delta"),
+            ("svg_thumbnail", "text", "svg"),
+        ),
     ),
     EntitySection(
         "ProcessElements",
@@ -293,6 +293,24 @@ class TestLogin:
         assert response.status_code == 403
         assert "sso" in response.json()["detail"].lower()
 
+    async def test_login_rehashes_when_cost_changes(self, client, db, monkeypatch):
+        import bcrypt
+
+        from app.config import settings
+
+        user = await create_user(db, email="rehash@test.com", password="ValidPassword1")
+        user.password_hash = bcrypt.hashpw(b"ValidPassword1", bcrypt.gensalt(rounds=4)).decode()
+        await db.flush()
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "rehash@test.com", "password": "ValidPassword1"},
+        )
+        assert response.status_code == 200
+        await db.refresh(user)
+        assert user.password_hash.startswith("$2b$05$")
+
 
 # ---------------------------------------------------------------------------
 # GET /auth/me
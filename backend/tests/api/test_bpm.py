@@ -408,3 +408,116 @@ class TestSaveDiagramDryRun:
             .all()
         )
         assert len(rows) == 1
+
+
+def _large_bpmn(renamed: int | None = None) -> str:
+    tasks = "".join(
+        f'    <bpmn:task id="Task_{i}" name="{"Renamed" if i == renamed else f"Step {i}"}" />\n'
+        for i in range(300)
+    )
+    return _MINIMAL_BPMN.replace('    <bpmn:task id="T1" name="Pick item" />\n', tasks)
+
+
+class TestDiagramVersionDeltas:
+    async def _save(self, client, admin, process, xml):
+        resp = await client.put(
+            f"/api/v1/bpm/processes/{process.id}/diagram",
+            json={"bpmn_xml": xml},
+            headers=auth_headers(admin),
+        )
+        assert resp.status_code == 200, resp.text
+
+    async def test_versions_are_rebuilt_from_deltas(self, client, db, bpm_env):
+        admin, process = bpm_env["admin"], bpm_env["process"]
+        texts = [_large_bpmn(renamed=i) for i in range(3)]
+        for xml in texts:
+            await self._save(client, admin, process, xml)
+
+        resp = await client.get(
+            f"/api/v1/bpm/processes/{process.id}/diagram/versions",
+            headers=auth_headers(admin),
+        )
+        assert [(v["version"], v["stored_as"]) for v in resp.json()] == [
+            (3, "delta"),
+            (2, "delta"),
+            (1, "snapshot"),
+        ]
+
+        latest = await client.get(
+            f"/api/v1/bpm/processes/{process.id}/diagram", headers=auth_headers(admin)
+        )
+        assert latest.json()["bpmn_xml"] == texts[2]
+        second = await client.get(
+            f"/api/v1/bpm/processes/{process.id}/diagram/versions/2",
+            headers=auth_headers(admin),
+        )
+        assert second.json()["bpmn_xml"] == texts[1]
+        export = await client.get(
+            f"/api/v1/bpm/processes/{process.id}/diagram/export/bpmn",
+            params={"version": 2},
+            headers=auth_headers(admin),
+        )
+        assert export.text == texts[1]
+
+    async def test_missing_version_is_404(self, client, db, bpm_env):
+        resp = await client.get(
+            f"/api/v1/bpm/processes/{bpm_env['process'].id}/diagram/versions/9",
+            headers=auth_headers(bpm_env["admin"]),
+        )
+        assert resp.status_code == 404
+
+    async def test_delete_removes_snapshots_and_deltas(self, client, db, bpm_env):
+        admin, process = bpm_env["admin"], bpm_env["process"]
+        for i in range(3):
+            await self._save(client, admin, process, _large_bpmn(renamed=i))
+        resp = await client.delete(
+            f"/api/v1/bpm/processes/{process.id}/diagram", headers=auth_headers(admin)
+        )
+        assert resp.status_code == 200
+        rows = await db.execute(
+            select(ProcessDiagram.id).where(ProcessDiagram.process_id == process.id)
+        )
+        assert rows.all() == []
+
+
+class TestDiagramElementExtraction:
+    async def test_unchanged_xml_skips_extraction(self, client, db, bpm_env):
+        admin, process = bpm_env["admin"], bpm_env["process"]
+        url = f"/api/v1/bpm/processes/{process.id}/diagram"
+        first = await client.put(url, json={"bpmn_xml": _large_bpmn()}, headers=auth_headers(admin))
+        again = await client.put(url, json={"bpmn_xml": _large_bpmn()}, headers=auth_headers(admin))
+        assert again.json()["version"] == 2
+        assert again.json()["element_count"] == first.json()["element_count"]
+        assert int(again.headers["X-Query-Count"]) < int(first.headers["X-Query-Count"])
+
+    async def test_renamed_task_updates_element_in_place(self, client, db, bpm_env):
+        admin, process = bpm_env["admin"], bpm_env["process"]
+        url = f"/api/v1/bpm/processes/{process.id}/diagram"
+        await client.put(url, json={"bpmn_xml": _large_bpmn()}, headers=auth_headers(admin))
+        before = dict(
+            (
+                await db.execute(
+                    select(ProcessElement.bpmn_element_id, ProcessElement.id).where(
+                        ProcessElement.process_id == process.id
+                    )
+                )
+            ).all()
+        )
+        resp = await client.put(
+            url, json={"bpmn_xml": _large_bpmn(renamed=5)}, headers=auth_headers(admin)
+        )
+        assert resp.status_code == 200
+        process_id = process.id
+        db.expire_all()
+        rows = (
+            (
+                await db.execute(
+                    select(ProcessElement).where(ProcessElement.process_id == process_id)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        # Rows are updated in place, never deleted and re-created.
+        assert {r.bpmn_element_id: r.id for r in rows} == before
+        assert next(r for r in rows if r.bpmn_element_id == "Task_5").name == "Renamed"
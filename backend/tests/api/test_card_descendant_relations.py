@@ -11,6 +11,8 @@ from __future__ import annotations
 import pytest
 
 from app.core.permissions import MEMBER_PERMISSIONS, VIEWER_PERMISSIONS
+from app.core.query_profiler import profile_queries
+from app.services.relation_rollup import RelationSummaryCache
 from tests.conftest import (
     auth_headers,
     create_card,
@@ -268,6 +270,27 @@ class TestDescendantRelationRows:
         assert len(body["rows"]) == 1
         assert body["rows"][0]["name"] == "App3"
 
+    async def test_rows_page_after_the_last_row_received(self, client, db, rollup_env):
+        # App1 and App2 tie on every sort key but the name.
+        rollup_env["app3"].subtype = "biz"
+        await db.flush()
+        url = (
+            f"/api/v1/cards/{rollup_env['root'].id}/descendant-relations"
+            "?relation_type=capToApp&page_size=2"
+        )
+        headers = auth_headers(rollup_env["admin"])
+        first = (await client.get(url, headers=headers)).json()
+        last = first["rows"][-1]["id"]
+        second = (await client.get(f"{url}&after_id={last}", headers=headers)).json()
+
+        assert [row["name"] for row in first["rows"]] == ["App3", "App1"]
+        assert [row["name"] for row in second["rows"]] == ["App2"]
+        assert second["total"] == 3
+
+        stranger = rollup_env["leaf_a"].id
+        r = await client.get(f"{url}&after_id={stranger}", headers=headers)
+        assert r.status_code == 400
+
     async def test_unknown_relation_type_returns_empty(self, client, db, rollup_env):
         r = await _rows(client, rollup_env["root"], rollup_env["admin"], rel_type="nope")
         assert r.status_code == 200, r.text
@@ -278,3 +301,85 @@ class TestDescendantRelationRows:
         r = await _rows(client, rollup_env["root"], viewer)
         assert r.status_code == 200, r.text
         assert r.json()["total"] == 3
+
+
+class TestRollupQueries:
+    async def test_summary_is_one_statement_whatever_the_subtree(self, client, db, rollup_env):
+        async def statements():
+            with profile_queries() as profile:
+                r = await _summary(client, rollup_env["root"], rollup_env["admin"])
+            assert r.status_code == 200, r.text
+            return profile.total
+
+        await statements()  # warm the per-process caches
+        RelationSummaryCache.invalidate()
+        small = await statements()
+        parent = rollup_env["leaf_a"]
+        for i in range(20):
+            parent = await create_card(
+                db, card_type="BusinessCapability", name=f"Deep {i}", parent_id=parent.id
+            )
+            app = await create_card(db, card_type="Application", name=f"Deep app {i}")
+            await create_relation(db, type_key="capToApp", source_id=parent.id, target_id=app.id)
+
+        assert await statements() == small
+        body = (await _summary(client, rollup_env["root"], rollup_env["admin"])).json()
+        assert body == [{"relation_type_key": "capToApp", "count": 23}]
+
+
+class TestSummaryCache:
+    async def test_repeat_summary_is_served_from_the_cache(self, client, db, rollup_env):
+        root, admin = rollup_env["root"], rollup_env["admin"]
+        await _summary(client, root, admin)
+        await client.get(f"/api/v1/cards/{root.id}/relation-summary", headers=auth_headers(admin))
+
+        with profile_queries() as profile:
+            again = await _summary(client, root, admin)
+            await client.get(
+                f"/api/v1/cards/{root.id}/relation-summary", headers=auth_headers(admin)
+            )
+        assert again.json() == [{"relation_type_key": "capToApp", "count": 3}]
+        assert not any("relations" in s for s in profile.statements)
+
+    async def test_new_relation_refreshes_the_summary(self, client, db, rollup_env):
+        root, admin = rollup_env["root"], rollup_env["admin"]
+        assert (await _summary(client, root, admin)).json()[0]["count"] == 3
+
+        app4 = await create_card(db, card_type="Application", name="App4")
+        await create_relation(
+            db, type_key="capToApp", source_id=rollup_env["sub_a"].id, target_id=app4.id
+        )
+
+        assert (await _summary(client, root, admin)).json()[0]["count"] == 4
+
+    async def test_reparenting_refreshes_the_summary(self, client, db, rollup_env):
+        root, admin = rollup_env["root"], rollup_env["admin"]
+        assert (await _summary(client, root, admin)).json()[0]["count"] == 3
+
+        rollup_env["sub_b"].parent_id = None
+        await db.flush()
+
+        # App3 was only reachable through SubB; App2 is still linked by LeafA.
+        assert (await _summary(client, root, admin)).json()[0]["count"] == 2
+
+    async def test_renamed_parent_shows_in_the_cached_summary(self, client, db, rollup_env):
+        sub_a, admin = rollup_env["sub_a"], rollup_env["admin"]
+        url = f"/api/v1/cards/{sub_a.id}/relation-summary"
+        first = await client.get(url, headers=auth_headers(admin))
+        assert first.json()["hierarchy"]["parent_name"] == "Cap"
+
+        rollup_env["root"].name = "Capabilities"
+        await db.flush()
+
+        again = await client.get(url, headers=auth_headers(admin))
+        assert again.json()["hierarchy"]["parent_name"] == "Capabilities"
+        assert RelationSummaryCache.get("relations", sub_a.id).hierarchy.parent_name == "Cap"
+
+    async def test_unrelated_card_edit_keeps_the_entries(self, client, db, rollup_env):
+        await _summary(client, rollup_env["root"], rollup_env["admin"])
+        generation = RelationSummaryCache.generation()
+
+        rollup_env["leaf_a"].name = "Leaf A renamed"
+        await db.flush()
+
+        assert RelationSummaryCache.generation() == generation
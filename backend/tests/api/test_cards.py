@@ -19,6 +19,7 @@ from tests.conftest import (
     create_relation_type,
     create_role,
     create_user,
+    query_budget,
 )
 
 
@@ -297,6 +298,94 @@ class TestListCards:
         )
         assert response.json()["total"] == 0
 
+    async def test_search_matches_alias_and_reference(self, client, db, cards_env):
+        admin = cards_env["admin"]
+        aliased = await create_card(db, card_type="Application", name="Ledger", user_id=admin.id)
+        aliased.alias = "General Accounting"
+        referenced = await create_card(db, card_type="Application", name="Hub", user_id=admin.id)
+        referenced.reference = "APP-04711"
+        await db.flush()
+
+        for term, expected in (("accounting", "Ledger"), ("app-0471", "Hub")):
+            response = await client.get(f"/api/v1/cards?search={term}", headers=auth_headers(admin))
+            assert [item["name"] for item in response.json()["items"]] == [expected]
+
+    async def test_multi_word_search_matches_words_in_any_order(self, client, db, cards_env):
+        """Each word prefixes a word somewhere in the card; name hits still rank first."""
+        admin = cards_env["admin"]
+        await create_card(db, card_type="Application", name="Workday Payroll", user_id=admin.id)
+        await create_card(
+            db,
+            card_type="Application",
+            name="Time Tracking",
+            description="Feeds hours into payroll at Workday",
+            user_id=admin.id,
+        )
+        await create_card(db, card_type="Application", name="Payroll Workday", user_id=admin.id)
+        await create_card(db, card_type="Application", name="Payroll", user_id=admin.id)
+
+        response = await client.get(
+            "/api/v1/cards?search=payroll%20work", headers=auth_headers(admin)
+        )
+        names = [item["name"] for item in response.json()["items"]]
+        assert names == ["Payroll Workday", "Time Tracking", "Workday Payroll"]
+
+    async def test_attribute_filter(self, client, db, cards_env):
+        """Values of one field OR together; `__empty__` matches a missing value."""
+        admin = cards_env["admin"]
+        await create_card(
+            db, card_type="Application", name="High", attributes={"riskLevel": "high"}
+        )
+        await create_card(db, card_type="Application", name="Low", attributes={"riskLevel": "low"})
+        await create_card(db, card_type="Application", name="Unrated")
+
+        response = await client.get(
+            "/api/v1/cards?type=Application&attr=riskLevel:high", headers=auth_headers(admin)
+        )
+        assert [item["name"] for item in response.json()["items"]] == ["High"]
+        assert response.json()["total"] == 1
+
+        response = await client.get(
+            "/api/v1/cards?type=Application&attr=riskLevel:high&attr=riskLevel:__empty__",
+            headers=auth_headers(admin),
+        )
+        assert [item["name"] for item in response.json()["items"]] == ["High", "Unrated"]
+
+    async def test_attribute_filter_needs_a_declared_field(self, client, db, cards_env):
+        admin = cards_env["admin"]
+        for query in ("type=Application&attr=riskLvl:high", "attr=riskLevel:high"):
+            response = await client.get(f"/api/v1/cards?{query}", headers=auth_headers(admin))
+            assert response.status_code == 400
+
+    async def test_sort_by_cost_attribute_is_numeric(self, client, db, cards_env):
+        """Text order would put 10000 before 900; cards without a value go last."""
+        admin = cards_env["admin"]
+        await create_card(
+            db, card_type="Application", name="Big", attributes={"costTotalAnnual": 10000}
+        )
+        await create_card(
+            db, card_type="Application", name="Small", attributes={"costTotalAnnual": 900}
+        )
+        await create_card(db, card_type="Application", name="Unpriced")
+
+        for direction, expected in (
+            ("asc", ["Small", "Big", "Unpriced"]),
+            ("desc", ["Big", "Small", "Unpriced"]),
+        ):
+            response = await client.get(
+                "/api/v1/cards?type=Application&sort_by=attributes.costTotalAnnual"
+                f"&sort_dir={direction}",
+                headers=auth_headers(admin),
+            )
+            assert [item["name"] for item in response.json()["items"]] == expected
+
+    async def test_cost_attribute_filter_requires_costs_view(self, client, db, cards_env):
+        response = await client.get(
+            "/api/v1/cards?type=Application&attr=costTotalAnnual:900",
+            headers=auth_headers(cards_env["viewer"]),
+        )
+        assert response.status_code == 403
+
     async def test_pagination_has_a_stable_tiebreaker(self, client, db, cards_env):
         """Same-named cards must not duplicate or vanish across pages."""
         admin = cards_env["admin"]
@@ -655,6 +744,66 @@ class TestCardCounts:
         assert "Application" in keys
         assert "HiddenType" not in keys
 
+    async def test_counts_are_cached_until_a_card_changes(self, client, db, cards_env):
+        admin = cards_env["admin"]
+        await create_card(db, card_type="Application", name="First", user_id=admin.id)
+        await db.flush()
+        first = await client.get("/api/v1/cards/counts", headers=auth_headers(admin))
+        assert first.json()["total"] == 1
+
+        with query_budget(4):
+            again = await client.get("/api/v1/cards/counts", headers=auth_headers(admin))
+        assert again.json() == first.json()
+
+        await create_card(db, card_type="Application", name="Second", user_id=admin.id)
+        resp = await client.get("/api/v1/cards/counts", headers=auth_headers(admin))
+        assert resp.json()["total"] == 2
+
+
+# ---------------------------------------------------------------------------
+# GET /cards?count=...  (count strategies for the list total)
+# ---------------------------------------------------------------------------
+
+
+class TestListCountStrategies:
+    async def test_every_strategy_reports_the_total(self, client, db, cards_env):
+        admin = cards_env["admin"]
+        for i in range(3):
+            await create_card(db, card_type="Application", name=f"App {i}", user_id=admin.id)
+        await db.flush()
+        for strategy in ("exact", "cached", "estimated"):
+            resp = await client.get(
+                "/api/v1/cards",
+                params={"count": strategy, "page_size": 2},
+                headers=auth_headers(admin),
+            )
+            assert resp.status_code == 200, strategy
+            body = resp.json()
+            # A small estimate is replaced by the exact count.
+            assert body["total"] == 3, strategy
+            assert body["total_exact"] is True
+            assert len(body["items"]) == 2
+
+    async def test_estimate_above_the_threshold_is_flagged(
+        self, client, db, cards_env, monkeypatch
+    ):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "CARD_COUNT_EXACT_BELOW", 0)
+        await create_card(db, card_type="Application", name="Only", user_id=cards_env["admin"].id)
+        resp = await client.get(
+            "/api/v1/cards", params={"count": "estimated"}, headers=auth_headers(cards_env["admin"])
+        )
+        body = resp.json()
+        assert body["total_exact"] is False
+        assert body["total"] >= 0
+
+    async def test_unknown_strategy_is_rejected(self, client, cards_env):
+        resp = await client.get(
+            "/api/v1/cards", params={"count": "psychic"}, headers=auth_headers(cards_env["admin"])
+        )
+        assert resp.status_code == 422
+
 
 # ---------------------------------------------------------------------------
 # GET /cards?ids=...  (batch fetch for diagram view perspectives)
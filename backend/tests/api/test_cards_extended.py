@@ -283,6 +283,51 @@ class TestGetHistory:
         page2_ids = {e["id"] for e in page2}
         assert page1_ids.isdisjoint(page2_ids)
 
+    async def test_history_keyset_pagination(self, client, db, env):
+        """before/before_id walk the history newest first without gaps or repeats,
+        including events that share a timestamp."""
+        from datetime import datetime, timezone
+
+        from app.models.event import Event
+
+        admin = env["admin"]
+        card = await create_card(db, card_type="Application", name="Keyset App", user_id=admin.id)
+        same_moment = datetime(2026, 5, 1, 12, tzinfo=timezone.utc)
+        for i in range(5):
+            db.add(
+                Event(
+                    card_id=card.id,
+                    event_type="card.updated",
+                    data={"i": i},
+                    created_at=same_moment if i < 4 else datetime(2026, 6, 1, tzinfo=timezone.utc),
+                )
+            )
+        await db.flush()
+
+        seen: list[dict] = []
+        params = "page_size=2"
+        while True:
+            resp = await client.get(
+                f"/api/v1/cards/{card.id}/history?{params}",
+                headers=auth_headers(admin),
+            )
+            assert resp.status_code == 200
+            page = resp.json()
+            if not page:
+                break
+            seen.extend(page)
+            last = page[-1]
+            params = (
+                f"page_size=2&before={last['created_at'].replace('+', '%2B')}"
+                f"&before_id={last['id']}"
+            )
+
+        assert len(seen) == 5
+        assert len({e["id"] for e in seen}) == 5
+        assert seen[0]["data"] == {"i": 4}
+        keys = [(e["created_at"], e["id"]) for e in seen]
+        assert keys == sorted(keys, reverse=True)
+
 
 # ===========================================================================
 # PATCH /cards/bulk
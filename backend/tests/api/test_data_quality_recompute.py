@@ -299,10 +299,34 @@ class TestTagRescore:
 # ---------------------------------------------------------------------------
 
 
+async def _run_debounced_rescores(db, monkeypatch) -> None:
+    """Make the queued rescore jobs due and run them on the test session."""
+    from contextlib import asynccontextmanager
+
+    from sqlalchemy import func, update
+
+    from app.models.background_job import BackgroundJob
+    from app.services import background_jobs as jobs_mod
+    from app.services import job_handlers as handlers_mod
+
+    @asynccontextmanager
+    async def fake_session():
+        yield db
+
+    monkeypatch.setattr(jobs_mod, "async_session", fake_session)
+    monkeypatch.setattr(handlers_mod, "async_session", fake_session)
+    await db.execute(
+        update(BackgroundJob).where(BackgroundJob.status == "queued").values(run_after=func.now())
+    )
+    worker = jobs_mod.JobWorker(slots=1)
+    while await worker.tick():
+        await worker.join()
+
+
 class TestCountsForQualityToggle:
-    async def test_turning_a_role_on_rescores_the_type(self, client, db, stake_env):
+    async def test_turning_a_role_on_rescores_the_type(self, client, db, stake_env, monkeypatch):
         """An admin who decides observers *do* count should see every card of
-        the type re-score immediately, not on each card's next edit."""
+        the type re-score in the queued pass, not on each card's next edit."""
         admin, member, card = stake_env["admin"], stake_env["member"], stake_env["card"]
         await client.post(
             f"/api/v1/cards/{card.id}/stakeholders",
@@ -318,6 +342,7 @@ class TestCountsForQualityToggle:
         )
         assert resp.status_code == 200
         assert resp.json()["counts_for_quality"] is True
+        await _run_debounced_rescores(db, monkeypatch)
         assert await _score(db, card.id) == 100.0
 
     async def test_calculated_field_is_scored_on_the_first_save(self, client, db):
@@ -6,8 +6,13 @@ to avoid real network requests during tests.
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from sqlalchemy import insert, select
+
+from app.models.background_job import BackgroundJob
+from app.models.eol_product_cycles import EolProductCycles
 from tests.conftest import (
     auth_headers,
     create_card,
@@ -134,6 +139,7 @@ class TestGetProductCycles:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = mock_cycles
+        mock_response.headers = {"ETag": '"abc"'}
         mock_response.raise_for_status = MagicMock()
 
         mock_client = AsyncMock()
@@ -150,6 +156,98 @@ class TestGetProductCycles:
         assert len(data) == 2
         assert data[0]["cycle"] == "3.12"
 
+        # Kept locally: the next call does not go upstream.
+        with patch("app.api.v1.eol._client", mock_client):
+            resp = await client.get(
+                "/api/v1/eol/products/python",
+                headers=auth_headers(admin),
+            )
+        assert resp.status_code == 200
+        assert resp.json() == data
+        assert mock_client.get.await_count == 1
+
+    async def test_concurrent_first_fetch_serves_the_stored_copy(self, client, db):
+        """Losing the race to store a new product is not an error."""
+        await create_role(db, key="admin", label="Admin", permissions={"*": True})
+        admin = await create_user(db, email="admin@test.com", role="admin")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"cycle": "3.12"}]
+        mock_response.headers = {}
+        mock_response.raise_for_status = MagicMock()
+
+        async def racing_get(url, headers=None):
+            # Another request stores the product while this one is upstream.
+            await db.execute(
+                insert(EolProductCycles).values(
+                    product="python",
+                    cycles=[{"cycle": "3.13"}],
+                    checked_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+            return mock_response
+
+        mock_client = AsyncMock()
+        mock_client.get = racing_get
+        mock_client.is_closed = False
+        with patch("app.api.v1.eol._client", mock_client):
+            resp = await client.get(
+                "/api/v1/eol/products/python",
+                headers=auth_headers(admin),
+            )
+        assert resp.status_code == 200
+        assert [c["cycle"] for c in resp.json()] == ["3.13"]
+
+    async def test_stale_product_served_while_refresh_is_queued(self, client, db):
+        """A stale copy is returned at once and a background refresh queued."""
+        await create_role(db, key="admin", label="Admin", permissions={"*": True})
+        admin = await create_user(db, email="admin@test.com", role="admin")
+        db.add(
+            EolProductCycles(
+                product="python",
+                cycles=[{"cycle": "3.12"}],
+                checked_at=datetime.now(timezone.utc) - timedelta(days=30),
+            )
+        )
+        await db.flush()
+
+        mock_client = AsyncMock()
+        mock_client.is_closed = False
+        with patch("app.api.v1.eol._client", mock_client):
+            resp = await client.get(
+                "/api/v1/eol/products/python",
+                headers=auth_headers(admin),
+            )
+        assert resp.status_code == 200
+        assert resp.json()[0]["cycle"] == "3.12"
+        mock_client.get.assert_not_awaited()
+        jobs = await db.execute(
+            select(BackgroundJob).where(BackgroundJob.kind == "eol.refresh_cycles")
+        )
+        assert len(jobs.scalars().all()) == 1
+
+    async def test_unknown_product_not_found(self, client, db):
+        """A product endoflife.date does not know is a 404, and remembered."""
+        await create_role(db, key="admin", label="Admin", permissions={"*": True})
+        admin = await create_user(db, email="admin@test.com", role="admin")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_client.is_closed = False
+
+        with patch("app.api.v1.eol._client", mock_client):
+            for _ in range(2):
+                resp = await client.get(
+                    "/api/v1/eol/products/nope",
+                    headers=auth_headers(admin),
+                )
+                assert resp.status_code == 404
+        assert mock_client.get.await_count == 1
+
     async def test_get_product_invalid_name_characters(self, client, db):
         """Product names with invalid characters (SSRF prevention) should return 400."""
         await create_role(db, key="admin", label="Admin", permissions={"*": True})
@@ -328,3 +426,52 @@ class TestEolPermissions:
         """EOL endpoints require authentication."""
         resp = await client.get("/api/v1/eol/products")
         assert resp.status_code == 401
+
+
+# ---------------------------------------------------------------
+# GET /reports/eol  (reads the stored cycles)
+# ---------------------------------------------------------------
+
+
+class TestEolReport:
+    async def test_report_uses_stored_cycles_without_network(self, client, db):
+        """Linked cards are classified from the stored cycles; a product with
+        none stored is ``unknown`` until the queued refresh has run."""
+        await create_role(db, key="admin", label="Admin", permissions={"*": True})
+        admin = await create_user(db, email="admin@test.com", role="admin")
+        await create_card_type(db, key="ITComponent", label="IT Component")
+        for name, product, cycle in (
+            ("Old Python", "python", "3.8"),
+            ("New Python", "python", "3.12"),
+            ("Node", "nodejs", "22"),
+        ):
+            await create_card(
+                db,
+                card_type="ITComponent",
+                name=name,
+                attributes={"eol_product": product, "eol_cycle": cycle},
+            )
+        db.add(
+            EolProductCycles(
+                product="python",
+                cycles=[
+                    {"cycle": "3.12", "eol": "2999-10-02"},
+                    {"cycle": "3.8", "eol": "2024-10-07"},
+                ],
+                checked_at=datetime.now(timezone.utc),
+            )
+        )
+        await db.flush()
+
+        with patch(
+            "httpx.AsyncHTTPTransport.handle_async_request",
+            side_effect=AssertionError("network used"),
+        ):
+            resp = await client.get("/api/v1/reports/eol", headers=auth_headers(admin))
+        assert resp.status_code == 200
+        statuses = {item["name"]: item["status"] for item in resp.json()["items"]}
+        assert statuses == {"Old Python": "eol", "New Python": "supported", "Node": "unknown"}
+        jobs = await db.execute(
+            select(BackgroundJob).where(BackgroundJob.kind == "eol.refresh_cycles")
+        )
+        assert len(jobs.scalars().all()) == 1
@@ -6,8 +6,11 @@ These tests require a PostgreSQL test database and an HTTP test client.
 from __future__ import annotations
 
 import pytest
+from sqlalchemy import select
 
 from app.core.permissions import VIEWER_PERMISSIONS
+from app.models.file_attachment import FileAttachment
+from app.services.blob_store import content_digest, get_blob_store
 from tests.conftest import (
     auth_headers,
     create_card,
@@ -243,6 +246,77 @@ class TestDownloadFile:
         assert f"filename*=UTF-8''{quote(unicode_name, safe='')}" in disposition
 
 
+class TestDownloadRangesAndValidators:
+    @pytest.fixture
+    async def uploaded(self, client, file_env):
+        resp = await client.post(
+            f"/api/v1/cards/{file_env['card'].id}/file-attachments",
+            files={"file": ("digits.txt", b"0123456789", "text/plain")},
+            headers=auth_headers(file_env["admin"]),
+        )
+        return f"/api/v1/file-attachments/{resp.json()['id']}/download"
+
+    async def test_full_download_carries_etag_of_content_hash(self, client, file_env, uploaded):
+        resp = await client.get(uploaded, headers=auth_headers(file_env["admin"]))
+        assert resp.status_code == 200
+        assert resp.headers["etag"] == f'"{content_digest(b"0123456789")}"'
+        assert resp.headers["accept-ranges"] == "bytes"
+        assert resp.headers["content-length"] == "10"
+
+    async def test_if_none_match_returns_304(self, client, file_env, uploaded):
+        headers = auth_headers(file_env["admin"])
+        etag = (await client.get(uploaded, headers=headers)).headers["etag"]
+        resp = await client.get(uploaded, headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    @pytest.mark.parametrize(
+        ("range_header", "body", "content_range"),
+        [
+            ("bytes=2-5", b"2345", "bytes 2-5/10"),
+            ("bytes=7-", b"789", "bytes 7-9/10"),
+            ("bytes=-3", b"789", "bytes 7-9/10"),
+            ("bytes=8-100", b"89", "bytes 8-9/10"),
+        ],
+    )
+    async def test_single_range_returns_206(
+        self, client, file_env, uploaded, range_header, body, content_range
+    ):
+        headers = {**auth_headers(file_env["admin"]), "Range": range_header}
+        resp = await client.get(uploaded, headers=headers)
+        assert resp.status_code == 206
+        assert resp.content == body
+        assert resp.headers["content-range"] == content_range
+        assert resp.headers["content-length"] == str(len(body))
+
+    async def test_unsatisfiable_range_returns_416(self, client, file_env, uploaded):
+        headers = {**auth_headers(file_env["admin"]), "Range": "bytes=10-"}
+        resp = await client.get(uploaded, headers=headers)
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == "bytes */10"
+
+    async def test_multi_range_and_stale_if_range_get_full_body(self, client, file_env, uploaded):
+        headers = auth_headers(file_env["admin"])
+        multi = await client.get(uploaded, headers={**headers, "Range": "bytes=0-1,4-5"})
+        assert multi.status_code == 200
+        assert multi.content == b"0123456789"
+        stale = await client.get(
+            uploaded, headers={**headers, "Range": "bytes=0-1", "If-Range": '"other"'}
+        )
+        assert stale.status_code == 200
+        assert stale.content == b"0123456789"
+
+    async def test_identical_uploads_share_one_blob(self, client, db, file_env):
+        headers = auth_headers(file_env["admin"])
+        url = f"/api/v1/cards/{file_env['card'].id}/file-attachments"
+        for name in ("one.txt", "two.txt"):
+            await client.post(url, files={"file": (name, b"same", "text/plain")}, headers=headers)
+        hashes = (await db.execute(select(FileAttachment.content_hash))).scalars().all()
+        assert hashes == [content_digest(b"same")] * 2
+        assert await get_blob_store().read(hashes[0]) == b"same"
+
+
 # -------------------------------------------------------------------
 # DELETE /file-attachments/{id}
 # -------------------------------------------------------------------
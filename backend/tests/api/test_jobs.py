@@ -0,0 +1,170 @@
+"""Integration tests for the /jobs endpoints and the built-in job kinds."""
+
+from __future__ import annotations
+
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.permissions import MEMBER_PERMISSIONS
+from app.models.background_job import BackgroundJob
+from app.services import background_jobs as jobs_mod
+from app.services import job_handlers as handlers_mod
+from app.services.background_jobs import JobWorker
+from tests.conftest import (
+    auth_headers,
+    create_card,
+    create_card_type,
+    create_role,
+    create_user,
+)
+
+BASE = "/api/v1/jobs"
+
+
+@pytest.fixture(autouse=True)
+def _patch_session(monkeypatch, db):
+    @asynccontextmanager
+    async def fake_session():
+        yield db
+
+    monkeypatch.setattr(jobs_mod, "async_session", fake_session)
+    monkeypatch.setattr(handlers_mod, "async_session", fake_session)
+
+
+@pytest.fixture
+async def env(db):
+    await create_role(db, key="admin", label="Admin", permissions={"*": True})
+    await create_role(db, key="member", label="Member", permissions=MEMBER_PERMISSIONS)
+    await create_card_type(db, key="Application", label="Application")
+    admin = await create_user(db, email="admin@test.com", role="admin")
+    member = await create_user(db, email="member@test.com", role="member")
+    return {"admin": admin, "member": member}
+
+
+async def _run_queued() -> None:
+    worker = JobWorker(slots=1)
+    while await worker.tick():
+        await worker.join()
+
+
+class TestSubmit:
+    async def test_recalculation_runs_as_a_job(self, client, db, env):
+        await create_card(db, name="One")
+        await create_card(db, name="Two")
+        headers = auth_headers(env["admin"])
+
+        resp = await client.post(
+            BASE,
+            json={"kind": "calculations.recalculate", "params": {"type_key": "Application"}},
+            headers=headers,
+        )
+        assert resp.status_code == 202, resp.text
+        job = resp.json()
+        assert job["status"] == "queued"
+        assert job["created_by"] == str(env["admin"].id)
+
+        await _run_queued()
+
+        resp = await client.get(f"{BASE}/{job['id']}", headers=headers)
+        assert resp.status_code == 200
+        done = resp.json()
+        assert done["status"] == "succeeded", done
+        assert done["result"]["cards_processed"] == 2
+        assert done["progress"]["phase"] == "cards"
+
+    async def test_equal_active_job_is_reused(self, client, env):
+        headers = auth_headers(env["admin"])
+        body = {"kind": "data_quality.rescore"}
+        first = await client.post(BASE, json=body, headers=headers)
+        second = await client.post(BASE, json=body, headers=headers)
+        assert first.json()["id"] == second.json()["id"]
+
+    async def test_kind_permission_is_enforced(self, client, env):
+        resp = await client.post(
+            BASE, json={"kind": "data_quality.rescore"}, headers=auth_headers(env["member"])
+        )
+        assert resp.status_code == 403
+
+    async def test_internal_and_unknown_kinds_are_refused(self, client, env):
+        headers = auth_headers(env["admin"])
+        for kind in ("compliance.scan", "no.such.kind"):
+            resp = await client.post(BASE, json={"kind": kind}, headers=headers)
+            assert resp.status_code == 400, kind
+
+    async def test_params_are_validated(self, client, env):
+        resp = await client.post(
+            BASE,
+            json={"kind": "calculations.recalculate", "params": {}},
+            headers=auth_headers(env["admin"]),
+        )
+        assert resp.status_code == 422
+
+
+class TestVisibility:
+    async def test_users_see_their_own_jobs_admins_see_all(self, client, db, env):
+        mine = BackgroundJob(kind="data_quality.rescore", created_by=env["member"].id)
+        theirs = BackgroundJob(kind="data_quality.rescore", created_by=env["admin"].id)
+        db.add_all([mine, theirs])
+        await db.flush()
+        mine_id, theirs_id = str(mine.id), str(theirs.id)
+
+        resp = await client.get(BASE, headers=auth_headers(env["member"]))
+        assert [j["id"] for j in resp.json()["items"]] == [mine_id]
+        resp = await client.get(f"{BASE}/{theirs_id}", headers=auth_headers(env["member"]))
+        assert resp.status_code == 403
+
+        resp = await client.get(BASE, headers=auth_headers(env["admin"]))
+        assert resp.json()["total"] == 2
+        resp = await client.get(
+            BASE, params={"status": "succeeded"}, headers=auth_headers(env["admin"])
+        )
+        assert resp.json()["total"] == 0
+
+
+class TestCancel:
+    async def test_cancel_queued_then_refuse_a_second_cancel(self, client, env):
+        headers = auth_headers(env["admin"])
+        job = (
+            await client.post(BASE, json={"kind": "data_quality.rescore"}, headers=headers)
+        ).json()
+
+        resp = await client.post(f"{BASE}/{job['id']}/cancel", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "cancelled"
+
+        resp = await client.post(f"{BASE}/{job['id']}/cancel", headers=headers)
+        assert resp.status_code == 409
+
+    async def test_cancel_running_sets_the_request_flag(self, client, db, env):
+        job = BackgroundJob(
+            kind="data_quality.rescore", status="running", created_by=env["admin"].id
+        )
+        db.add(job)
+        await db.flush()
+
+        resp = await client.post(f"{BASE}/{job.id}/cancel", headers=auth_headers(env["admin"]))
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["status"] == "running"
+        assert body["cancel_requested"] is True
+
+
+async def test_compliance_scan_is_queued_as_a_job(client, db, env):
+    resp = await client.post(
+        "/api/v1/compliance/compliance-scan",
+        json={"regulations": ["gdpr"]},
+        headers=auth_headers(env["admin"]),
+    )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+
+    job = await db.get(BackgroundJob, uuid.UUID(body["job_id"]))
+    assert job.kind == "compliance.scan"
+    assert job.status == "queued"
+    assert job.params == {
+        "run_id": body["run_id"],
+        "user_id": str(env["admin"].id),
+        "regulations": ["gdpr"],
+    }
@@ -6,10 +6,13 @@ These tests require a PostgreSQL test database and an HTTP test client.
 from __future__ import annotations
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from app.core.permissions import VIEWER_PERMISSIONS
+from app.core.query_profiler import profile_queries
+from app.models.background_job import BackgroundJob
 from app.models.card_type import CardType
+from app.services.attribute_index import attribute_index_name
 from tests.conftest import (
     auth_headers,
     create_card,
@@ -76,6 +79,68 @@ class TestListTypes:
         assert "HiddenType" in keys
 
 
+class TestListingRevalidation:
+    async def test_unchanged_listing_is_a_304(self, client, db, metamodel_env):
+        headers = auth_headers(metamodel_env["viewer"])
+        await create_card_type(db, key="Application", label="Application")
+
+        first = await client.get("/api/v1/metamodel/types", headers=headers)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        with profile_queries() as profile:
+            again = await client.get(
+                "/api/v1/metamodel/types", headers={**headers, "If-None-Match": etag}
+            )
+        assert again.status_code == 304
+        assert again.content == b""
+        assert not any("card_types" in s for s in profile.statements)
+
+    async def test_metamodel_write_changes_the_etag(self, client, db, metamodel_env):
+        await create_card_type(db, key="Application", label="Application")
+        first = await client.get(
+            "/api/v1/metamodel/types", headers=auth_headers(metamodel_env["viewer"])
+        )
+
+        await client.patch(
+            "/api/v1/metamodel/types/Application",
+            json={"label": "Enterprise Application"},
+            headers=auth_headers(metamodel_env["admin"]),
+        )
+        after = await client.get(
+            "/api/v1/metamodel/types",
+            headers={
+                **auth_headers(metamodel_env["viewer"]),
+                "If-None-Match": first.headers["etag"],
+            },
+        )
+
+        assert after.status_code == 200
+        assert after.headers["etag"] != first.headers["etag"]
+        labels = {t["key"]: t["label"] for t in after.json()}
+        assert labels["Application"] == "Enterprise Application"
+
+    async def test_bulk_update_drops_relation_listing(self, client, db, metamodel_env):
+        from sqlalchemy import update
+
+        from app.models.relation_type import RelationType
+
+        headers = auth_headers(metamodel_env["viewer"])
+        await create_card_type(db, key="Application", label="Application")
+        await create_card_type(db, key="ITComponent", label="IT Component")
+        await create_relation_type(
+            db, key="relAppToITC", source_type_key="Application", target_type_key="ITComponent"
+        )
+        path = "/api/v1/metamodel/relation-types?type_key=Application"
+        assert [r["key"] for r in (await client.get(path, headers=headers)).json()] == [
+            "relAppToITC"
+        ]
+
+        await db.execute(update(RelationType).values(is_hidden=True))
+
+        assert (await client.get(path, headers=headers)).json() == []
+
+
 class TestCreateType:
     async def test_create_custom_type(self, client, db, metamodel_env):
         admin = metamodel_env["admin"]
@@ -159,6 +224,186 @@ class TestUpdateType:
         )
         assert stored.scalar_one() == {}
 
+    async def test_indexed_field_queues_an_index_build(self, client, db, metamodel_env):
+        """The save only queues the build; the job runs it ``CONCURRENTLY``."""
+        admin = metamodel_env["admin"]
+        await create_card_type(db, key="Application", label="Application")
+        schema = [
+            {
+                "section": "General",
+                "fields": [{"key": "riskLevel", "label": "Risk", "type": "text", "indexed": True}],
+            }
+        ]
+
+        response = await client.patch(
+            "/api/v1/metamodel/types/Application",
+            json={"fields_schema": schema},
+            headers=auth_headers(admin),
+        )
+
+        assert response.status_code == 200
+        job = await db.execute(
+            select(BackgroundJob.status).where(
+                BackgroundJob.kind == "metamodel.sync_attribute_indexes"
+            )
+        )
+        assert job.scalar_one() == "queued"
+        name = attribute_index_name("Application", "riskLevel", "text")
+        found = await db.execute(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": name}
+        )
+        assert found.scalar() is None
+
+
+_SELECT_SCHEMA = [
+    {
+        "section": "General",
+        "fields": [
+            {"key": "note", "label": "Note", "type": "text"},
+            {
+                "key": "tier",
+                "label": "Tier",
+                "type": "single_select",
+                "options": [{"key": "gold", "label": "Gold"}, {"key": "bronze", "label": "Bronze"}],
+            },
+            {
+                "key": "regions",
+                "label": "Regions",
+                "type": "multiple_select",
+                "options": [{"key": "eu", "label": "EU"}, {"key": "us", "label": "US"}],
+            },
+        ],
+    }
+]
+
+# Drops ``note``, the ``bronze`` tier and the ``us`` region.
+_TRIMMED_SCHEMA = [
+    {
+        "section": "General",
+        "fields": [
+            {
+                "key": "tier",
+                "label": "Tier",
+                "type": "single_select",
+                "options": [{"key": "gold", "label": "Gold"}],
+            },
+            {
+                "key": "regions",
+                "label": "Regions",
+                "type": "multiple_select",
+                "options": [{"key": "eu", "label": "EU"}],
+            },
+        ],
+    }
+]
+
+
+async def _select_cards(db):
+    await create_card_type(db, key="Application", label="Application", fields_schema=_SELECT_SCHEMA)
+    return [
+        await create_card(
+            db,
+            card_type="Application",
+            name="A",
+            attributes={"note": "x", "tier": "bronze", "regions": ["eu", "us"]},
+        ),
+        await create_card(
+            db, card_type="Application", name="B", attributes={"tier": "gold", "regions": ["us"]}
+        ),
+        await create_card(db, card_type="Application", name="C", attributes={"tier": "gold"}),
+    ]
+
+
+async def _run_queued_jobs(db, monkeypatch) -> None:
+    from contextlib import asynccontextmanager
+
+    from app.services import background_jobs as jobs_mod
+    from app.services import job_handlers as handlers_mod
+
+    @asynccontextmanager
+    async def fake_session():
+        yield db
+
+    monkeypatch.setattr(jobs_mod, "async_session", fake_session)
+    monkeypatch.setattr(handlers_mod, "async_session", fake_session)
+    worker = jobs_mod.JobWorker(slots=1)
+    while await worker.tick():
+        await worker.join()
+
+
+class TestSchemaChangeMigration:
+    async def test_preview_counts_affected_cards(self, client, db, metamodel_env):
+        await _select_cards(db)
+
+        resp = await client.post(
+            "/api/v1/metamodel/types/Application/fields-schema/preview",
+            json={"fields_schema": _TRIMMED_SCHEMA},
+            headers=auth_headers(metamodel_env["admin"]),
+        )
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["cards"] == 2
+        assert body["background"] is False
+        assert body["fields"] == [{"field_key": "note", "card_count": 1}]
+        assert body["options"] == [
+            {"field_key": "tier", "option_key": "bronze", "card_count": 1},
+            {"field_key": "regions", "option_key": "us", "card_count": 2},
+        ]
+
+    async def test_preview_requires_metamodel_admin(self, client, db, metamodel_env):
+        await create_card_type(db, key="Application", label="Application")
+        resp = await client.post(
+            "/api/v1/metamodel/types/Application/fields-schema/preview",
+            json={"fields_schema": []},
+            headers=auth_headers(metamodel_env["viewer"]),
+        )
+        assert resp.status_code == 403
+
+    async def test_small_type_is_migrated_in_the_request(self, client, db, metamodel_env):
+        a, b, c = await _select_cards(db)
+
+        resp = await client.patch(
+            "/api/v1/metamodel/types/Application",
+            json={"fields_schema": _TRIMMED_SCHEMA},
+            headers=auth_headers(metamodel_env["admin"]),
+        )
+
+        assert resp.status_code == 200
+        assert "data_migration" not in resp.json()
+        for card in (a, b, c):
+            await db.refresh(card)
+        assert a.attributes == {"regions": ["eu"]}
+        assert b.attributes == {"tier": "gold", "regions": []}
+        assert c.attributes == {"tier": "gold"}
+
+    async def test_large_type_is_migrated_by_a_job(self, client, db, metamodel_env, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "METAMODEL_MIGRATION_INLINE_MAX_CARDS", 1)
+        a, _, _ = await _select_cards(db)
+
+        resp = await client.patch(
+            "/api/v1/metamodel/types/Application",
+            json={"fields_schema": _TRIMMED_SCHEMA},
+            headers=auth_headers(metamodel_env["admin"]),
+        )
+
+        assert resp.status_code == 200
+        migration = resp.json()["data_migration"]
+        assert migration["card_count"] == 2
+        await db.refresh(a)
+        assert a.attributes["tier"] == "bronze"  # untouched until the job runs
+
+        await _run_queued_jobs(db, monkeypatch)
+        job = await client.get(
+            f"/api/v1/jobs/{migration['job_id']}", headers=auth_headers(metamodel_env["admin"])
+        )
+        assert job.json()["status"] == "succeeded"
+        assert job.json()["result"] == {"cards_changed": 2}
+        await db.refresh(a)
+        assert a.attributes == {"regions": ["eu"]}
+
 
 class TestTypeColor:
     async def test_recolor_builtin_type(self, client, db, metamodel_env):
@@ -1226,9 +1471,9 @@ class TestSuccessorRelationType:
 
 class TestScoringSignatureRequiredFlag:
     """Toggling `required` on a field must change the scoring signature so the
-    type save triggers `_recompute_data_quality_for_type` — the mandatory-field
-    gate pins incomplete cards to 0 and their stored scores must refresh
-    immediately, not on next edit."""
+    type save queues `schedule_type_rescore` — the mandatory-field gate pins
+    incomplete cards to 0 and their stored scores must refresh, not wait for
+    each card's next edit."""
 
     def test_required_toggle_changes_signature(self):
         from app.api.v1.metamodel import _scoring_signature
@@ -7,9 +7,14 @@ Integration tests requiring a PostgreSQL test database.
 
 from __future__ import annotations
 
+from datetime import date
+
 import pytest
 
 from app.core.permissions import VIEWER_PERMISSIONS
+from app.models.ppm_cost_line import PpmBudgetLine, PpmCostLine
+from app.models.ppm_status_report import PpmStatusReport
+from app.models.stakeholder import Stakeholder
 from tests.conftest import (
     auth_headers,
     create_card,
@@ -18,6 +23,7 @@ from tests.conftest import (
     create_relation_type,
     create_role,
     create_user,
+    query_budget,
 )
 
 
@@ -239,6 +245,108 @@ class TestPpmGantt:
         assert data[0]["group_name"] is None
 
 
+# ---------------------------------------------------------------------------
+# Query budgets and the Gantt snapshot
+# ---------------------------------------------------------------------------
+
+_PORTFOLIO = 15
+
+
+@pytest.fixture
+async def portfolio(db, ppm_env):
+    """Initiatives that each have a reporter, a stakeholder, a cost and a budget."""
+    admin = ppm_env["admin"]
+    initiatives = []
+    for i in range(_PORTFOLIO):
+        reporter = await create_user(db, email=f"pm{i}@test.com", role="admin")
+        card = await create_card(
+            db,
+            card_type="Initiative",
+            name=f"Initiative {i:02d}",
+            user_id=admin.id,
+            subtype="Project",
+            attributes={"initiativeStatus": "Active"},
+        )
+        db.add_all(
+            [
+                PpmStatusReport(
+                    initiative_id=card.id,
+                    reporter_id=reporter.id,
+                    report_date=date(2026, 1, 1),
+                    cost_health="atRisk",
+                ),
+                PpmStatusReport(
+                    initiative_id=card.id,
+                    reporter_id=reporter.id,
+                    report_date=date(2026, 2, 1),
+                    cost_health="offTrack",
+                ),
+                Stakeholder(card_id=card.id, user_id=reporter.id, role="responsible"),
+                PpmCostLine(
+                    initiative_id=card.id, description="Licence", category="opex", actual=10
+                ),
+                PpmBudgetLine(initiative_id=card.id, fiscal_year=2026, category="opex", amount=25),
+            ]
+        )
+        initiatives.append(card)
+    await db.flush()
+    return initiatives
+
+
+class TestPpmPortfolioQueries:
+    async def test_gantt_is_bulk_loaded(self, client, ppm_env, portfolio):
+        with query_budget(12):
+            resp = await client.get(
+                "/api/v1/reports/ppm/gantt", headers=auth_headers(ppm_env["admin"])
+            )
+        assert resp.status_code == 200
+        items = resp.json()
+        assert len(items) == _PORTFOLIO
+        first = next(i for i in items if i["name"] == "Initiative 00")
+        assert first["latest_report"]["report_date"] == "2026-02-01"
+        assert first["latest_report"]["reporter"]["id"] == first["stakeholders"][0]["user_id"]
+        assert [s["role_key"] for s in first["stakeholders"]] == ["responsible"]
+        assert first["opex_actual"] == 10
+        assert first["opex_planned"] == 25
+
+    async def test_dashboard_is_bulk_loaded(self, client, ppm_env, portfolio):
+        with query_budget(10):
+            resp = await client.get(
+                "/api/v1/reports/ppm/dashboard", headers=auth_headers(ppm_env["admin"])
+            )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total_initiatives"] == _PORTFOLIO
+        assert data["by_status"] == {"Active": _PORTFOLIO}
+        assert data["health_cost"]["offTrack"] == _PORTFOLIO
+        assert data["total_budget"] == 25 * _PORTFOLIO
+        assert data["total_actual"] == 10 * _PORTFOLIO
+
+    async def test_gantt_snapshot_dropped_by_ppm_writes(self, client, db, ppm_env, portfolio):
+        headers = auth_headers(ppm_env["admin"])
+        url = "/api/v1/reports/ppm/gantt"
+        first = await client.get(url, headers=headers)
+        cached = await client.get(url, headers=headers)
+        assert cached.json() == first.json()
+        assert int(cached.headers["X-Query-Count"]) < int(first.headers["X-Query-Count"])
+
+        db.add(Stakeholder(card_id=portfolio[0].id, user_id=ppm_env["viewer"].id, role="sponsor"))
+        await db.flush()
+        resp = await client.get(url, headers=headers)
+        item = next(i for i in resp.json() if i["id"] == str(portfolio[0].id))
+        assert sorted(s["role_key"] for s in item["stakeholders"]) == ["responsible", "sponsor"]
+
+        db.add(
+            PpmCostLine(
+                initiative_id=portfolio[0].id, description="Ext", category="capex", actual=5
+            )
+        )
+        await db.flush()
+        resp = await client.get(url, headers=headers)
+        item = next(i for i in resp.json() if i["id"] == str(portfolio[0].id))
+        assert item["capex_actual"] == 5
+
+
 # ---------------------------------------------------------------------------
 # Group Options
 # ---------------------------------------------------------------------------
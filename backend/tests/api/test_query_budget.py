@@ -0,0 +1,102 @@
+"""SQL query budgets for hot endpoints.
+
+Each test seeds enough rows to trip the N+1 detector (the default threshold
+is 10 repeats of one statement shape) and asserts both a fixed statement
+budget and the absence of per-row queries — so a regression that reintroduces
+a query inside a loop fails here instead of surfacing as a slow page.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core import query_profiler
+from tests.conftest import (
+    auth_headers,
+    create_card,
+    create_card_type,
+    create_relation,
+    create_relation_type,
+    create_role,
+    create_user,
+    query_budget,
+)
+
+_CARDS = 15
+
+
+@pytest.fixture
+async def env(db):
+    await create_role(db, key="admin", label="Admin", permissions={"*": True})
+    await create_role(db, key="viewer", label="Viewer", permissions={"inventory.view": True})
+    await create_card_type(db, key="Application", label="Application")
+    await create_card_type(db, key="ITComponent", label="IT Component")
+    await create_relation_type(db)
+    admin = await create_user(db, email="admin@test.com", role="admin")
+    viewer = await create_user(db, email="viewer@test.com", role="viewer")
+    itc = await create_card(db, card_type="ITComponent", name="Postgres", user_id=admin.id)
+    apps = []
+    for i in range(_CARDS):
+        app = await create_card(db, name=f"App {i:02d}", user_id=admin.id)
+        await create_relation(db, source_id=app.id, target_id=itc.id)
+        apps.append(app)
+    return {"admin": admin, "viewer": viewer, "apps": apps, "itc": itc}
+
+
+class TestQueryBudgets:
+    async def test_list_cards(self, client, env):
+        with query_budget(10):
+            resp = await client.get("/api/v1/cards", headers=auth_headers(env["admin"]))
+        assert resp.status_code == 200
+        assert resp.json()["total"] == _CARDS + 1
+
+    async def test_get_card(self, client, env):
+        card = env["apps"][0]
+        with query_budget(10):
+            resp = await client.get(f"/api/v1/cards/{card.id}", headers=auth_headers(env["admin"]))
+        assert resp.status_code == 200
+
+    async def test_relations_of_card(self, client, env):
+        with query_budget(5):
+            resp = await client.get(
+                "/api/v1/relations",
+                params={"card_id": str(env["itc"].id)},
+                headers=auth_headers(env["admin"]),
+            )
+        assert resp.status_code == 200
+        assert len(resp.json()) == _CARDS
+
+    async def test_dashboard(self, client, env):
+        with query_budget(15):
+            resp = await client.get("/api/v1/reports/dashboard", headers=auth_headers(env["admin"]))
+        assert resp.status_code == 200
+
+
+class TestQueryCountHeader:
+    async def test_header_present(self, client, env):
+        resp = await client.get("/api/v1/cards", headers=auth_headers(env["admin"]))
+        assert int(resp.headers["X-Query-Count"]) > 0
+
+
+class TestDiagnosticsReport:
+    async def test_report_lists_route_template(self, client, env):
+        query_profiler.clear_reports()
+        card = env["apps"][0]
+        await client.get(f"/api/v1/cards/{card.id}", headers=auth_headers(env["admin"]))
+        resp = await client.get("/api/v1/diagnostics/queries", headers=auth_headers(env["admin"]))
+        assert resp.status_code == 200
+        routes = [r["route"] for r in resp.json()["routes"]]
+        assert "GET /api/v1/cards/{card_id}" in routes
+
+    async def test_requires_admin_settings(self, client, env):
+        resp = await client.get("/api/v1/diagnostics/queries", headers=auth_headers(env["viewer"]))
+        assert resp.status_code == 403
+
+    async def test_clear(self, client, env):
+        resp = await client.delete(
+            "/api/v1/diagnostics/queries", headers=auth_headers(env["admin"])
+        )
+        assert resp.status_code == 204
+        # Only the clearing request itself, recorded after it ran.
+        recent = query_profiler.recent_reports()
+        assert [r["route"] for r in recent] == ["DELETE /api/v1/diagnostics/queries"]
@@ -0,0 +1,138 @@
+"""Query-plan regression tests for the report builders.
+
+Every report here must issue the same statements whatever the size of the
+landscape: no statement count growing with the number of tag groups, and no
+bound-parameter count growing with the number of cards (``IN`` lists of
+collected ids). Each test builds a small landscape, profiles the report,
+grows the landscape and profiles it again.
+"""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from app.core.query_profiler import profile_queries
+from app.models.tag import CardTag, Tag, TagGroup
+from tests.conftest import (
+    auth_headers,
+    create_card,
+    create_card_type,
+    create_relation,
+    create_relation_type,
+    create_role,
+    create_user,
+)
+
+_PLACEHOLDER_RE = re.compile(r"\$\d+")
+
+# More than any report binds for its own filters; an id list would exceed it.
+_MAX_PARAMS = 8
+
+_RELATIONS = (
+    ("relAppToBC", "Application", "BusinessCapability"),
+    ("relAppToOrg", "Application", "Organization"),
+    ("relAppToITC", "Application", "ITComponent"),
+    ("relProcessToBC", "BusinessProcess", "BusinessCapability"),
+    ("relProcessToApp", "BusinessProcess", "Application"),
+    ("relProcessDependency", "BusinessProcess", "BusinessProcess"),
+    ("relProcessToOrg", "BusinessProcess", "Organization"),
+    ("relProcessToBizCtx", "BusinessProcess", "BusinessContext"),
+)
+
+
+@pytest.fixture
+async def admin(db):
+    await create_role(db, key="admin", label="Admin", permissions={"*": True})
+    for key in (
+        "Application",
+        "BusinessCapability",
+        "Organization",
+        "ITComponent",
+        "BusinessProcess",
+        "BusinessContext",
+    ):
+        await create_card_type(db, key=key, label=key, has_hierarchy=key == "BusinessCapability")
+    for key, source, target in _RELATIONS:
+        await create_relation_type(
+            db, key=key, label=key, source_type_key=source, target_type_key=target
+        )
+    return await create_user(db, email="admin@test.com", role="admin")
+
+
+async def _grow(db, n: int) -> None:
+    """Add ``n`` of each card type, related the way the reports read them."""
+    for i in range(n):
+        cards = {}
+        for key in (
+            "Application",
+            "BusinessCapability",
+            "Organization",
+            "ITComponent",
+            "BusinessProcess",
+            "BusinessContext",
+        ):
+            cards[key] = await create_card(
+                db,
+                card_type=key,
+                name=f"{key} {n}-{i}",
+                attributes={"eol_product": "python", "eol_cycle": "3.8"}
+                if key == "ITComponent"
+                else {"costTotalAnnual": 100},
+                lifecycle={"active": "2024-01-01", "endOfLife": "2030-01-01"},
+            )
+        for key, source, target in _RELATIONS:
+            await create_relation(
+                db,
+                type_key=key,
+                source_id=cards[source].id,
+                target_id=cards[target].id,
+            )
+        group = TagGroup(name=f"Group {n}-{i}", mode="multi")
+        db.add(group)
+        await db.flush()
+        tag = Tag(tag_group_id=group.id, name=f"Tag {n}-{i}")
+        db.add(tag)
+        await db.flush()
+        db.add(CardTag(card_id=cards["Application"].id, tag_id=tag.id))
+        await db.flush()
+
+
+async def _profile(client, user, path: str):
+    with profile_queries() as profile:
+        resp = await client.get(f"/api/v1/reports/{path}", headers=auth_headers(user))
+    assert resp.status_code == 200, resp.text
+    params = max(len(_PLACEHOLDER_RE.findall(s)) for s in profile.statements)
+    return profile.total, params
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "capability-heatmap",
+        "app-portfolio",
+        "landscape",
+        "dependencies",
+        "cost-treemap?type=Application&cost_field=costTotalAnnual&group_by=Organization",
+        "bpm/capability-process-matrix",
+        "bpm/process-application-matrix",
+        "bpm/process-dependencies",
+        "bpm/process-organization-matrix",
+        "bpm/element-application-map",
+        "bpm/process-map",
+        "bpm/value-stream-matrix",
+    ],
+)
+async def test_report_plan_is_independent_of_landscape_size(client, db, admin, path):
+    await _grow(db, 1)
+    await _profile(client, admin, path)  # warm the per-process caches
+
+    await _grow(db, 2)
+    small = await _profile(client, admin, path)
+
+    await _grow(db, 12)
+    large = await _profile(client, admin, path)
+
+    assert large[0] == small[0], "statement count grew with the landscape"
+    assert large[1] <= _MAX_PARAMS, f"a statement bound {large[1]} parameters"
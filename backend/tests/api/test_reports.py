@@ -131,6 +131,42 @@ class TestDashboard:
         assert dist["0-25"] >= 1
         assert dist["75-100"] >= 1
 
+    async def test_dashboard_lifecycle_distribution(self, client, db, reports_env):
+        """Each active card counts under its current phase; no dates → ``none``.
+
+        A card whose dates all lie in the future counts under the earliest one.
+        """
+        admin = reports_env["admin"]
+        lifecycles = [
+            {"plan": "2000-01-01", "active": "2001-01-01"},
+            {"active": "2001-01-01", "endOfLife": "2002-01-01"},
+            {"plan": "2999-01-01"},
+            {"phaseIn": "2000-01-01T00:00:00Z"},
+            {},
+        ]
+        for i, lc in enumerate(lifecycles):
+            await create_card(db, name=f"App {i}", user_id=admin.id, lifecycle=lc)
+        await create_card(
+            db,
+            name="Archived",
+            user_id=admin.id,
+            status="ARCHIVED",
+            lifecycle={"active": "2001-01-01"},
+        )
+        resp = await client.get(
+            "/api/v1/reports/dashboard",
+            headers=auth_headers(admin),
+        )
+        assert resp.status_code == 200
+        assert resp.json()["lifecycle_distribution"] == {
+            "plan": 1,
+            "phaseIn": 1,
+            "active": 1,
+            "phaseOut": 0,
+            "endOfLife": 1,
+            "none": 1,
+        }
+
     async def test_dashboard_viewer_can_access(self, client, db, reports_env):
         """Users with reports.ea_dashboard permission can view."""
         viewer = reports_env["viewer"]
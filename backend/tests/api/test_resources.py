@@ -19,6 +19,7 @@ from app.core.permissions import VIEWER_PERMISSIONS
 from app.models.document import Document
 from app.models.event import Event
 from app.models.file_attachment import FileAttachment
+from app.services.blob_store import content_digest
 from tests.conftest import (
     auth_headers,
     create_card,
@@ -42,7 +43,7 @@ async def _add_file(
         name=name,
         mime_type=mime,
         size=size,
-        data=b"x" * size,
+        content_hash=content_digest(b"x" * size),
         category=category,
         created_by=by,
         created_at=at or T0,
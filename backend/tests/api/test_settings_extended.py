@@ -618,3 +618,43 @@ class TestArchiveRetentionDays:
             headers=auth_headers(member),
         )
         assert resp.status_code == 403
+
+
+class TestEventRetention:
+    async def test_default_keeps_everything(self, client, db, ext_settings_env):
+        admin = ext_settings_env["admin"]
+        resp = await client.get("/api/v1/settings/event-retention", headers=auth_headers(admin))
+        assert resp.status_code == 200
+        assert resp.json() == {"months": 0, "mode": "archive"}
+
+    async def test_admin_can_set_policy(self, client, db, ext_settings_env):
+        admin = ext_settings_env["admin"]
+        resp = await client.patch(
+            "/api/v1/settings/event-retention",
+            json={"months": 24, "mode": "detach"},
+            headers=auth_headers(admin),
+        )
+        assert resp.status_code == 200
+        get_resp = await client.get("/api/v1/settings/event-retention", headers=auth_headers(admin))
+        assert get_resp.json() == {"months": 24, "mode": "detach"}
+
+    @pytest.mark.parametrize(
+        "body", [{"months": -1}, {"months": 1201}, {"months": 12, "mode": "delete"}]
+    )
+    async def test_invalid_policy_rejected(self, client, db, ext_settings_env, body):
+        admin = ext_settings_env["admin"]
+        resp = await client.patch(
+            "/api/v1/settings/event-retention", json=body, headers=auth_headers(admin)
+        )
+        assert resp.status_code == 422
+
+    async def test_member_cannot_read_or_set_policy(self, client, db, ext_settings_env):
+        member = ext_settings_env["member"]
+        headers = auth_headers(member)
+        assert (
+            await client.get("/api/v1/settings/event-retention", headers=headers)
+        ).status_code == 403
+        resp = await client.patch(
+            "/api/v1/settings/event-retention", json={"months": 12}, headers=headers
+        )
+        assert resp.status_code == 403
@@ -10,13 +10,17 @@ Provides:
 from __future__ import annotations
 
 import os
+import tempfile
 import uuid
 
 # Set test environment BEFORE any app imports so Settings() picks them up.
 os.environ.setdefault("SECRET_KEY", "test-secret-key-for-pytest-only")
 os.environ.setdefault("ENVIRONMENT", "development")
+# Attachment bytes written by tests go to a throwaway directory.
+os.environ.setdefault("BLOB_STORE_PATH", tempfile.mkdtemp(prefix="turboea-blobs-"))
 
 import asyncio
+from contextlib import contextmanager
 
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -169,11 +173,13 @@ async def app(db):
     test_app.state.limiter = limiter
     test_app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-    # Mirror the production origin-tracking middleware so tests can verify
-    # the audit log tags `X-Turbo-EA-Origin: mcp` writes correctly.
-    from app.main import capture_request_origin
+    # Mirror the production middleware stack so tests cover audit tagging
+    # (`X-Turbo-EA-Origin: mcp`), impersonation and query counting end-to-end.
+    from app.core.query_profiler import QueryProfilerMiddleware
+    from app.core.request_context import RequestContextMiddleware
 
-    test_app.middleware("http")(capture_request_origin)
+    test_app.add_middleware(QueryProfilerMiddleware)
+    test_app.add_middleware(RequestContextMiddleware)
 
     test_app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -195,6 +201,35 @@ async def client(app):
         yield c
 
 
+# ---------------------------------------------------------------------------
+# SQL query budgets
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def query_budget(max_queries: int, *, allow_n_plus_one: bool = False):
+    """Fail the test if the block issues more than ``max_queries`` statements.
+
+    Also fails when any statement shape repeats often enough to look like an
+    N+1 (see ``app.core.query_profiler``) unless ``allow_n_plus_one`` is set.
+    Wrap a single client call so fixture setup doesn't count::
+
+        with query_budget(12):
+            resp = await client.get("/api/v1/cards", headers=auth_headers(user))
+    """
+    from app.core.query_profiler import profile_queries
+
+    with profile_queries("test") as profile:
+        yield profile
+    shapes = "\n".join(f"  {n}x {shape[:200]}" for shape, n in profile.shapes().most_common(5))
+    assert profile.total <= max_queries, (
+        f"Query budget exceeded: {profile.total} statements > {max_queries}\n{shapes}"
+    )
+    if not allow_n_plus_one:
+        flagged = profile.n_plus_one()
+        assert not flagged, f"N+1 pattern detected: {flagged[0][1]}x {flagged[0][0][:200]}"
+
+
 # ---------------------------------------------------------------------------
 # Permission cache cleanup (autouse)
 # ---------------------------------------------------------------------------
@@ -203,13 +238,31 @@ async def client(app):
 @pytest.fixture(autouse=True)
 def _clear_permission_cache():
     """Ensure permission caches are empty before and after every test."""
+    from app.services.card_counts import CardCountCache
+    from app.services.metamodel_cache import MetamodelCache
     from app.services.permission_service import PermissionService
+    from app.services.ppm_gantt_cache import PpmGanttCache
+    from app.services.principal_cache import PrincipalCache
+    from app.services.relation_rollup import RelationSummaryCache
+    from app.services.report_cache import ReportCache
 
     PermissionService._role_cache.clear()
     PermissionService._srd_cache.clear()
+    PrincipalCache.invalidate()
+    PpmGanttCache.invalidate()
+    CardCountCache.invalidate()
+    MetamodelCache.invalidate()
+    RelationSummaryCache.invalidate()
+    ReportCache.clear()
     yield
     PermissionService._role_cache.clear()
     PermissionService._srd_cache.clear()
+    PrincipalCache.invalidate()
+    PpmGanttCache.invalidate()
+    CardCountCache.invalidate()
+    MetamodelCache.invalidate()
+    RelationSummaryCache.invalidate()
+    ReportCache.clear()
 
 
 @pytest.fixture(autouse=True)
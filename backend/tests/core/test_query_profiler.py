@@ -0,0 +1,163 @@
+"""Unit tests for the per-request SQL query profiler (app/core/query_profiler.py).
+
+No database required — statements are recorded directly on the profile.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core import query_profiler
+from app.core.query_profiler import (
+    QueryProfile,
+    QueryProfilerMiddleware,
+    normalize_statement,
+    profile_queries,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_report():
+    query_profiler.clear_reports()
+    yield
+    query_profiler.clear_reports()
+
+
+class TestNormalizeStatement:
+    def test_collapses_whitespace(self):
+        assert normalize_statement("SELECT  a\n  FROM   t") == "SELECT a FROM t"
+
+    def test_folds_numbered_params(self):
+        assert normalize_statement("SELECT a FROM t WHERE id = $1") == (
+            "SELECT a FROM t WHERE id = $?"
+        )
+
+    def test_expanded_in_lists_share_a_shape(self):
+        one = normalize_statement("SELECT a FROM t WHERE id IN ($1)")
+        three = normalize_statement("SELECT a FROM t WHERE id IN ($1, $2, $3)")
+        assert one == three
+
+    def test_pyformat_and_postcompile(self):
+        assert normalize_statement("SELECT 1 WHERE x = %(x_1)s") == "SELECT 1 WHERE x = $?"
+        assert normalize_statement("WHERE id IN (__[POSTCOMPILE_id_1])") == "WHERE id IN ($?)"
+
+
+class TestQueryProfile:
+    def test_counts_and_shapes(self):
+        p = QueryProfile()
+        for i in range(3):
+            params = ", ".join(f"${n}" for n in range(i + 1))
+            p.record(f"SELECT * FROM users WHERE id IN ({params})")
+        p.record("SELECT 1")
+        assert p.total == 4
+        assert p.shapes().most_common(1)[0][1] == 3
+
+    def test_n_plus_one_threshold(self):
+        p = QueryProfile()
+        for _ in range(4):
+            p.record("SELECT * FROM stakeholders WHERE card_id = $1")
+        assert p.n_plus_one(threshold=5) == []
+        assert p.n_plus_one(threshold=4) == [("SELECT * FROM stakeholders WHERE card_id = $?", 4)]
+
+    def test_small_profiles_are_not_normalised(self, monkeypatch):
+        def fail(statement):
+            raise AssertionError("normalised")
+
+        monkeypatch.setattr(query_profiler, "normalize_statement", fail)
+        p = QueryProfile()
+        for _ in range(4):
+            p.record("SELECT * FROM stakeholders WHERE card_id = $1")
+        assert p.n_plus_one(threshold=5) == []
+
+    def test_to_dict_prefers_route_over_label(self):
+        p = QueryProfile("label")
+        p.route = "/api/v1/cards"
+        p.finish()
+        out = p.to_dict()
+        assert out["route"] == "/api/v1/cards"
+        assert out["elapsed_ms"] is not None
+
+
+class TestProfileStack:
+    def test_nested_profiles_both_count(self):
+        with profile_queries("outer") as outer:
+            with profile_queries("inner") as inner:
+                query_profiler._before_cursor_execute(None, None, "SELECT 1", (), None, False)
+            query_profiler._before_cursor_execute(None, None, "SELECT 2", (), None, False)
+        assert inner.total == 1
+        assert outer.total == 2
+
+    def test_no_profile_is_a_noop(self):
+        query_profiler._before_cursor_execute(None, None, "SELECT 1", (), None, False)
+
+
+class TestReport:
+    def test_flagged_requests_are_always_sampled(self, monkeypatch):
+        monkeypatch.setattr(query_profiler.settings, "QUERY_PROFILER_SAMPLE_RATE", 0.0)
+        monkeypatch.setattr(query_profiler.settings, "QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 3)
+        quiet = QueryProfile()
+        quiet.record("SELECT 1")
+        quiet.route = "/api/v1/a"
+        query_profiler.record_request(quiet, "GET")
+        noisy = QueryProfile()
+        for _ in range(3):
+            noisy.record("SELECT name FROM users WHERE id = $1")
+        noisy.route = "/api/v1/b"
+        query_profiler.record_request(noisy, "GET")
+
+        recent = query_profiler.recent_reports()
+        assert [r["route"] for r in recent] == ["GET /api/v1/b"]
+        summary = query_profiler.route_summary()
+        assert summary[0]["n_plus_one_samples"] == 1
+        assert summary[0]["avg_queries"] == 3
+
+
+class TestMiddleware:
+    async def test_adds_query_count_header(self):
+        async def app(scope, receive, send):
+            query_profiler._before_cursor_execute(None, None, "SELECT 1", (), None, False)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/x"}
+        await QueryProfilerMiddleware(app)(scope, None, send)
+        headers = dict(sent[0]["headers"])
+        assert headers[b"x-query-count"] == b"1"
+        assert b"x-query-n-plus-one" not in headers
+        assert query_profiler.recent_reports()[0]["route"] == "GET /api/v1/x"
+
+    async def test_headers_can_be_withheld_but_the_request_is_profiled(self, monkeypatch):
+        monkeypatch.setattr(query_profiler.settings, "QUERY_PROFILER_HEADERS", False)
+
+        async def app(scope, receive, send):
+            query_profiler._before_cursor_execute(None, None, "SELECT 1", (), None, False)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/x"}
+        await QueryProfilerMiddleware(app)(scope, None, send)
+        assert sent[0]["headers"] == []
+        assert query_profiler.recent_reports()[0]["query_count"] == 1
+
+    async def test_disabled_passes_through(self, monkeypatch):
+        monkeypatch.setattr(query_profiler.settings, "QUERY_PROFILER_ENABLED", False)
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await QueryProfilerMiddleware(app)({"type": "http", "path": "/"}, None, send)
+        assert sent[0]["headers"] == []
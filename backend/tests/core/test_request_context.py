@@ -0,0 +1,102 @@
+"""Unit tests for the pure-ASGI request context middleware."""
+
+from __future__ import annotations
+
+import uuid
+
+from app.core.request_context import (
+    RequestContextMiddleware,
+    RequestPrincipal,
+    request_principal,
+)
+from app.core.security import create_access_token
+from app.services.event_bus import (
+    request_batch_id,
+    request_endpoint,
+    request_impersonation,
+    request_origin,
+)
+
+
+def _scope(headers: dict[str, str]) -> dict:
+    return {
+        "type": "http",
+        "method": "PATCH",
+        "path": "/api/v1/cards/x",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+
+
+async def _run(headers: dict[str, str]) -> tuple[dict, dict]:
+    seen: dict = {}
+
+    async def app(scope, receive, send):
+        seen["origin"] = request_origin.get()
+        seen["batch"] = request_batch_id.get()
+        seen["endpoint"] = request_endpoint.get()
+        seen["impersonation"] = request_impersonation.get()
+        seen["principal"] = scope["state"]["principal"]
+
+    scope = _scope(headers)
+    await RequestContextMiddleware(app)(scope, None, None)
+    return seen, scope
+
+
+class TestRequestPrincipal:
+    def test_user_id_and_impersonation(self):
+        uid = uuid.uuid4()
+        p = RequestPrincipal(token="t", claims={"sub": str(uid), "impersonated_role": "viewer"})
+        assert p.user_id == uid
+        assert p.impersonated_role == "viewer"
+
+    def test_malformed_sub(self):
+        assert RequestPrincipal(token="t", claims={"sub": "nope"}).user_id is None
+
+
+class TestRequestContextMiddleware:
+    async def test_sets_and_resets_contextvars(self):
+        batch = uuid.uuid4()
+        seen, _ = await _run({"X-Turbo-EA-Origin": "MCP", "X-Turbo-EA-Batch": str(batch)})
+        assert seen["origin"] == "mcp"
+        assert seen["batch"] == batch
+        assert seen["endpoint"] == "PATCH /api/v1/cards/x"
+        assert request_origin.get() is None
+        assert request_batch_id.get() is None
+
+    async def test_rejects_unknown_origin_and_bad_batch(self):
+        seen, _ = await _run({"X-Turbo-EA-Origin": "evil", "X-Turbo-EA-Batch": "zzz"})
+        assert seen["origin"] is None
+        assert seen["batch"] is None
+
+    async def test_decodes_token_once_into_scope_state(self):
+        uid = uuid.uuid4()
+        token = create_access_token(uid, "admin", impersonated_role="viewer")
+        seen, scope = await _run({"Authorization": f"Bearer {token}"})
+        principal = seen["principal"]
+        assert principal.user_id == uid
+        assert seen["impersonation"] == (str(uid), "viewer")
+
+        # Downstream consumers reuse the stored principal rather than decoding.
+        from starlette.requests import HTTPConnection
+
+        assert request_principal(HTTPConnection(scope)) is principal
+
+    async def test_cookie_token(self):
+        uid = uuid.uuid4()
+        token = create_access_token(uid, "member")
+        seen, _ = await _run({"Cookie": f"access_token={token}"})
+        assert seen["principal"].user_id == uid
+        assert seen["impersonation"] is None
+
+    async def test_invalid_token_leaves_claims_empty(self):
+        seen, _ = await _run({"Authorization": "Bearer not.a.token"})
+        assert seen["principal"].token == "not.a.token"
+        assert seen["principal"].claims is None
+
+    def test_fallback_without_middleware(self):
+        from starlette.requests import HTTPConnection
+
+        uid = uuid.uuid4()
+        token = create_access_token(uid, "member")
+        conn = HTTPConnection(_scope({"Authorization": f"Bearer {token}"}))
+        assert request_principal(conn).user_id == uid
@@ -16,7 +16,10 @@ from app.core.security import (
     create_access_token,
     decode_access_token,
     hash_password,
+    hash_password_async,
+    password_needs_rehash,
     verify_password,
+    verify_password_async,
 )
 
 # ---------------------------------------------------------------------------
@@ -151,3 +154,35 @@ class TestPasswordHashing:
     def test_verify_wrong_password(self):
         hashed = hash_password("mypassword")
         assert verify_password("wrongpassword", hashed) is False
+
+    def test_needs_rehash_on_cost_change(self, monkeypatch):
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+        hashed = hash_password("mypassword")
+        assert hashed.startswith("$2b$04$")
+        assert password_needs_rehash(hashed) is False
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+        assert password_needs_rehash(hashed) is True
+
+    def test_needs_rehash_for_unknown_format(self):
+        assert password_needs_rehash("not-a-bcrypt-hash") is True
+
+    async def test_async_variants_run_off_the_loop(self, monkeypatch):
+        import threading
+
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+        loop_thread = threading.get_ident()
+        seen: list[int] = []
+
+        from app.core import security
+
+        original = security.hash_password
+
+        def spy(password: str) -> str:
+            seen.append(threading.get_ident())
+            return original(password)
+
+        monkeypatch.setattr(security, "hash_password", spy)
+        hashed = await hash_password_async("mypassword")
+        assert seen and seen[0] != loop_thread
+        assert await verify_password_async("mypassword", hashed) is True
+        assert await verify_password_async("wrong", hashed) is False
@@ -0,0 +1,76 @@
+"""Round-trip test for migration 138 (attachment bytes → blob store).
+
+The migration is run against the test database inside the ``db`` fixture's
+transaction — Postgres DDL is transactional, so the schema is restored when
+the test rolls back. Downgrade first recreates the pre-138 ``data`` column
+from the store, then upgrade moves the bytes back out in batches.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from app.models.file_attachment import FileAttachment
+from app.services.blob_store import content_digest, get_blob_store
+from tests.conftest import create_card, create_card_type, create_user
+
+_MIG_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "alembic"
+    / "versions"
+    / "138_file_attachment_blob_store.py"
+)
+_spec = importlib.util.spec_from_file_location("mig138", _MIG_PATH)
+mig = importlib.util.module_from_spec(_spec)
+assert _spec and _spec.loader
+_spec.loader.exec_module(mig)
+
+
+def _run(step):
+    def runner(sync_conn):
+        with Operations.context(MigrationContext.configure(sync_conn)):
+            step()
+
+    return runner
+
+
+async def test_downgrade_then_upgrade_round_trips_bytes(db, monkeypatch):
+    monkeypatch.setattr(mig, "_BATCH_ROWS", 2)
+    user = await create_user(db, email="mig138@test.com")
+    await create_card_type(db, key="Application", label="Application")
+    card = await create_card(db, card_type="Application", name="Mig", user_id=user.id)
+    payloads = [b"alpha", b"beta", b"alpha", b"gamma" * 1000, b""]
+    for i, payload in enumerate(payloads):
+        db.add(
+            FileAttachment(
+                card_id=card.id,
+                name=f"f{i}.bin",
+                mime_type="application/pdf",
+                size=len(payload),
+                content_hash=await get_blob_store().put(payload),
+            )
+        )
+    await db.flush()
+    conn = await db.connection()
+
+    await conn.run_sync(_run(mig.downgrade))
+    rows = (await conn.execute(sa.text("SELECT data FROM file_attachments"))).scalars().all()
+    assert sorted(bytes(r) for r in rows) == sorted(payloads)
+
+    await conn.run_sync(_run(mig.upgrade))
+    columns = {
+        c["name"]
+        for c in await conn.run_sync(
+            lambda sync_conn: sa.inspect(sync_conn).get_columns("file_attachments")
+        )
+    }
+    assert "data" not in columns
+    hashes = (
+        (await conn.execute(sa.text("SELECT content_hash FROM file_attachments"))).scalars().all()
+    )
+    assert sorted(hashes) == sorted(content_digest(p) for p in payloads)
@@ -0,0 +1,70 @@
+"""Round-trip test for migration 142 (delta-compressed process diagrams).
+
+Runs inside the ``db`` fixture's transaction, so the schema is restored when
+the test rolls back. Downgrade must expand every delta back into full XML
+before the delta columns go.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from app.models.process_diagram import ProcessDiagram
+from app.services.diagram_versions import encode_delta
+from tests.conftest import create_card, create_card_type
+
+_MIG_PATH = (
+    Path(__file__).resolve().parents[2] / "alembic" / "versions" / "142_process_diagram_deltas.py"
+)
+_spec = importlib.util.spec_from_file_location("mig142", _MIG_PATH)
+mig = importlib.util.module_from_spec(_spec)
+assert _spec and _spec.loader
+_spec.loader.exec_module(mig)
+
+
+def _run(step):
+    def runner(sync_conn):
+        with Operations.context(MigrationContext.configure(sync_conn)):
+            step()
+
+    return runner
+
+
+async def test_downgrade_expands_deltas(db):
+    await create_card_type(db, key="BusinessProcess", label="Business Process")
+    process = await create_card(db, card_type="BusinessProcess", name="Order to Cash")
+    base_xml = "<bpmn>\n  <task id='a'/>\n</bpmn>\n"
+    new_xml = "<bpmn>\n  <task id='a'/>\n  <task id='b'/>\n</bpmn>\n"
+    snapshot = ProcessDiagram(process_id=process.id, version=1, bpmn_xml=base_xml)
+    db.add(snapshot)
+    await db.flush()
+    delta = ProcessDiagram(
+        process_id=process.id,
+        version=2,
+        bpmn_delta=encode_delta(base_xml, new_xml),
+        delta_base_id=snapshot.id,
+    )
+    db.add(delta)
+    await db.flush()
+    delta_id = delta.id
+    conn = await db.connection()
+
+    await conn.run_sync(_run(mig.downgrade))
+    xml = await db.execute(
+        sa.text("SELECT bpmn_xml FROM process_diagrams WHERE id = :id"), {"id": delta_id}
+    )
+    assert xml.scalar_one() == new_xml
+
+    await conn.run_sync(_run(mig.upgrade))
+    columns = await db.execute(
+        sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = 'process_diagrams'"
+        )
+    )
+    assert {"bpmn_delta", "delta_base_id"} <= set(columns.scalars())
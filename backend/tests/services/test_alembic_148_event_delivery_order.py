@@ -0,0 +1,88 @@
+"""Round-trip test for migration 148 (commit-safe durable event order).
+
+Runs inside the ``db`` fixture's transaction, so the schema is restored when
+the test rolls back. Upgrade numbers the events still pending for some
+extension and moves each cursor onto them; downgrade maps the cursors back.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+_MIG_PATH = (
+    Path(__file__).resolve().parents[2] / "alembic" / "versions" / "148_event_delivery_order.py"
+)
+_spec = importlib.util.spec_from_file_location("mig148", _MIG_PATH)
+mig = importlib.util.module_from_spec(_spec)
+assert _spec and _spec.loader
+_spec.loader.exec_module(mig)
+
+
+def _run(step):
+    def runner(sync_conn):
+        with Operations.context(MigrationContext.configure(sync_conn)):
+            step()
+
+    return runner
+
+
+async def test_pending_events_survive_the_upgrade(db):
+    conn = await db.connection()
+    await conn.run_sync(_run(mig.downgrade))
+
+    start = datetime.now(timezone.utc) - timedelta(minutes=10)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for minute, event_id in enumerate(ids):
+        await db.execute(
+            sa.text(
+                "INSERT INTO events (id, event_type, data, created_at) "
+                "VALUES (:id, 'card.updated', '{}', :at)"
+            ),
+            {"id": event_id, "at": start + timedelta(minutes=minute)},
+        )
+    # "behind" has delivered the first event, "caught-up" all three.
+    for key, at in (("behind", 0), ("caught-up", 2)):
+        await db.execute(
+            sa.text(
+                "INSERT INTO extension_event_cursors (extension_key, event_created_at, event_id) "
+                "VALUES (:key, :at, :id)"
+            ),
+            {"key": key, "at": start + timedelta(minutes=at), "id": ids[at]},
+        )
+
+    await conn.run_sync(_run(mig.upgrade))
+    rows = await db.execute(sa.text("SELECT id, xact_id, seq FROM events"))
+    assert {row[0]: (row[1], row[2]) for row in rows} == {
+        ids[0]: (None, None),
+        ids[1]: (0, 1),
+        ids[2]: (0, 2),
+    }
+    cursors = await db.execute(
+        sa.text("SELECT extension_key, event_xact_id, event_seq FROM extension_event_cursors")
+    )
+    assert {row[0]: (row[1], row[2]) for row in cursors} == {
+        "behind": (0, 0),
+        "caught-up": (0, 2),
+    }
+    new = (
+        await db.execute(
+            sa.text(
+                "INSERT INTO events (id, event_type, data) "
+                "VALUES (gen_random_uuid(), 'card.created', '{}') RETURNING xact_id, seq"
+            )
+        )
+    ).one()
+    assert new.xact_id > 0 and new.seq == 3
+
+    await conn.run_sync(_run(mig.downgrade))
+    caught_up = await db.execute(
+        sa.text("SELECT event_id FROM extension_event_cursors WHERE extension_key = 'caught-up'")
+    )
+    assert caught_up.scalar_one() == ids[2]
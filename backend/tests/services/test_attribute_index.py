@@ -0,0 +1,128 @@
+"""Tests for the indexed-attribute helpers (app/services/attribute_index.py)."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from app.models.card import Card
+from app.models.card_type import CardType
+from app.services.attribute_index import (
+    attribute_index_name,
+    attribute_sort_expression,
+    build_attribute_indexes,
+    indexed_fields,
+    sync_attribute_indexes,
+)
+from tests.conftest import create_card, create_card_type
+
+
+def _schema(*fields: dict) -> list[dict]:
+    return [{"section": "General", "fields": list(fields)}]
+
+
+async def _attribute_indexes(db) -> dict[str, str]:
+    rows = await db.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND indexname LIKE 'ix\\_cards\\_attr\\_%'"
+        )
+    )
+    return dict(rows.all())
+
+
+def test_indexed_fields_only_lists_opted_in_scalar_fields():
+    schema = _schema(
+        {"key": "cost", "type": "cost", "indexed": True},
+        {"key": "tags", "type": "multiple_select", "indexed": True},
+        {"key": "notes", "type": "text"},
+    )
+    assert indexed_fields(schema) == [("cost", "cost")]
+
+
+async def test_sync_follows_the_metamodel(db):
+    card_type = await create_card_type(
+        db,
+        key="Application",
+        fields_schema=_schema(
+            {"key": "costTotalAnnual", "type": "cost", "indexed": True},
+            {"key": "riskLevel", "type": "single_select", "indexed": True},
+        ),
+    )
+    conn = await db.connection()
+    assert await conn.run_sync(sync_attribute_indexes) == (2, 0)
+    assert await conn.run_sync(sync_attribute_indexes) == (0, 0)
+
+    indexes = await _attribute_indexes(db)
+    cost_index = attribute_index_name("Application", "costTotalAnnual", "cost")
+    assert set(indexes) == {
+        cost_index,
+        attribute_index_name("Application", "riskLevel", "single_select"),
+    }
+    assert "WHERE ((type)::text = 'Application'::text)" in indexes[cost_index]
+
+    card_type.fields_schema = _schema({"key": "costTotalAnnual", "type": "cost"})
+    await db.flush()
+    assert await conn.run_sync(sync_attribute_indexes) == (0, 2)
+    assert await _attribute_indexes(db) == {}
+
+
+async def test_numeric_index_serves_the_sort_and_tolerates_bad_values(db):
+    await create_card_type(
+        db,
+        key="Application",
+        fields_schema=_schema({"key": "costTotalAnnual", "type": "cost", "indexed": True}),
+    )
+    conn = await db.connection()
+    await conn.run_sync(sync_attribute_indexes)
+    # A string where a number belongs indexes as NULL instead of failing the write.
+    await create_card(db, card_type="Application", attributes={"costTotalAnnual": "n/a"})
+
+    stmt = (
+        sa.select(Card.id)
+        .where(Card.type == "Application")
+        .order_by(attribute_sort_expression("costTotalAnnual", "cost"))
+        .limit(10)
+    )
+    await db.execute(sa.text("SET LOCAL enable_seqscan = off"))
+    compiled = stmt.compile(db.bind, compile_kwargs={"literal_binds": True})
+    plan = "\n".join((await db.execute(sa.text(f"EXPLAIN {compiled}"))).scalars())
+    assert attribute_index_name("Application", "costTotalAnnual", "cost") in plan
+
+
+async def test_concurrent_build_rebuilds_invalid_indexes(test_engine):
+    # CONCURRENTLY cannot run in the per-test transaction: commit and clean up.
+    name = attribute_index_name("Application", "costTotalAnnual", "cost")
+    async with test_engine.begin() as conn:
+        await conn.execute(
+            sa.insert(CardType).values(
+                key="Application",
+                label="Application",
+                fields_schema=_schema({"key": "costTotalAnnual", "type": "cost", "indexed": True}),
+            )
+        )
+    try:
+        assert await build_attribute_indexes(test_engine) == (1, 0)
+        assert await build_attribute_indexes(test_engine) == (0, 0)
+
+        # What a failed concurrent build leaves behind.
+        async with test_engine.begin() as conn:
+            await conn.execute(
+                sa.text(
+                    "UPDATE pg_index SET indisvalid = false "
+                    "WHERE indexrelid = CAST(:name AS regclass)"
+                ),
+                {"name": name},
+            )
+        assert await build_attribute_indexes(test_engine) == (1, 1)
+        async with test_engine.connect() as conn:
+            valid = await conn.scalar(
+                sa.text(
+                    "SELECT indisvalid FROM pg_index WHERE indexrelid = CAST(:name AS regclass)"
+                ),
+                {"name": name},
+            )
+        assert valid is True
+    finally:
+        async with test_engine.begin() as conn:
+            await conn.execute(sa.delete(CardType).where(CardType.key == "Application"))
+        assert await build_attribute_indexes(test_engine) == (0, 1)
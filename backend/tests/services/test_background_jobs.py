@@ -0,0 +1,342 @@
+"""The persistent background job queue and its worker.
+
+Sessions the queue opens itself are patched to the savepoint-rollback test
+session, and the worker runs with one slot so a handler never shares that
+session with the worker's own bookkeeping.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.models.background_job import BackgroundJob
+from app.services import background_jobs as jobs_mod
+from app.services import job_handlers as handlers_mod
+from app.services.background_jobs import (
+    JobCancelledError,
+    JobWorker,
+    claim_next_job,
+    enqueue_job,
+    purge_finished_jobs,
+    recover_stale_jobs,
+    register_job_kind,
+    request_cancel,
+)
+
+
+async def _echo(ctx):
+    await ctx.progress("working", 1, 2, "half way")
+    return {"echo": ctx.params, "attempt": ctx.attempt}
+
+
+async def _boom(ctx):
+    raise RuntimeError("handler exploded")
+
+
+async def _wait_forever(ctx):
+    await asyncio.Event().wait()
+
+
+@pytest.fixture(autouse=True)
+def _kinds():
+    saved = dict(jobs_mod._kinds)
+    jobs_mod._load_builtin_kinds()
+    register_job_kind("test.echo", _echo, concurrency=1)
+    register_job_kind("test.other", _echo, concurrency=1)
+    register_job_kind("test.boom", _boom, max_attempts=2)
+    register_job_kind("test.forever", _wait_forever)
+    register_job_kind("test.unique", _echo, unique=True)
+    register_job_kind("test.debounced", _echo, unique=True, debounce=True)
+    yield
+    jobs_mod._kinds.clear()
+    jobs_mod._kinds.update(saved)
+
+
+@pytest.fixture(autouse=True)
+def _patch_session(monkeypatch, db):
+    @asynccontextmanager
+    async def fake_session():
+        yield db
+
+    monkeypatch.setattr(jobs_mod, "async_session", fake_session)
+    monkeypatch.setattr(handlers_mod, "async_session", fake_session)
+
+
+async def _reload(db, job: BackgroundJob) -> BackgroundJob:
+    await db.refresh(job)
+    return job
+
+
+async def _run_once(worker: JobWorker) -> int:
+    claimed = await worker.tick()
+    await worker.join()
+    return claimed
+
+
+class TestRunning:
+    async def test_queued_job_runs_and_records_result_and_progress(self, db):
+        job = await enqueue_job(db, "test.echo", {"n": 1})
+        await db.commit()
+        assert job.status == "queued"
+        assert job.run_after is not None
+
+        assert await _run_once(JobWorker(slots=1)) == 1
+
+        job = await _reload(db, job)
+        assert job.status == "succeeded"
+        assert job.result == {"echo": {"n": 1}, "attempt": 1}
+        assert job.progress == {"phase": "working", "current": 1, "total": 2, "note": "half way"}
+        assert job.attempts == 1
+        assert job.locked_by is None
+        assert job.finished_at is not None
+
+    async def test_failed_attempt_is_retried_with_backoff_then_fails(self, db):
+        job = await enqueue_job(db, "test.boom")
+        await db.commit()
+        worker = JobWorker(slots=1)
+
+        await _run_once(worker)
+        job = await _reload(db, job)
+        assert job.status == "queued"
+        assert job.error == "handler exploded"
+        assert job.run_after > datetime.now(timezone.utc)
+        # Not due yet.
+        assert await _run_once(worker) == 0
+
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id)
+            .values(run_after=datetime.now(timezone.utc) - timedelta(hours=1))
+        )
+        await _run_once(worker)
+        job = await _reload(db, job)
+        assert job.status == "failed"
+        assert job.attempts == 2
+        assert job.error == "handler exploded"
+
+    async def test_unknown_kind_cannot_be_queued(self, db):
+        with pytest.raises(ValueError):
+            await enqueue_job(db, "test.missing")
+
+    async def test_unique_kind_returns_the_active_job(self, db):
+        first = await enqueue_job(db, "test.unique", {"type_key": "Application"})
+        again = await enqueue_job(db, "test.unique", {"type_key": "Application"})
+        other = await enqueue_job(db, "test.unique", {"type_key": "Provider"})
+        assert again.id == first.id
+        assert other.id != first.id
+
+    async def test_debounced_kind_coalesces_and_moves_the_start_back(self, db):
+        first = await enqueue_job(db, "test.debounced", {"type_key": "A"}, delay=30)
+        due = first.run_after
+        again = await enqueue_job(db, "test.debounced", {"type_key": "A"}, delay=60)
+        assert again.id == first.id
+        assert again.run_after > due
+        await db.commit()
+        assert await _run_once(JobWorker(slots=1)) == 0  # not due yet
+
+    async def test_debounced_kind_queues_behind_a_running_job(self, db):
+        first = await enqueue_job(db, "test.debounced", {"type_key": "A"})
+        await db.commit()
+        assert (await claim_next_job(db, "worker-a")).job_id == first.id
+        behind = await enqueue_job(db, "test.debounced", {"type_key": "A"})
+        assert behind.id != first.id
+        assert behind.status == "queued"
+
+
+class TestConcurrency:
+    async def test_kind_limit_holds_while_a_job_is_running(self, db):
+        first = await enqueue_job(db, "test.echo", {"n": 1})
+        await enqueue_job(db, "test.echo", {"n": 2})
+        other = await enqueue_job(db, "test.other")
+        await db.commit()
+
+        ctx = await claim_next_job(db, "worker-a")
+        assert ctx is not None and ctx.job_id == first.id
+        # test.echo is at its limit of one; only the other kind is claimable.
+        ctx = await claim_next_job(db, "worker-b")
+        assert ctx is not None and ctx.job_id == other.id
+        assert await claim_next_job(db, "worker-b") is None
+
+    async def test_env_override_raises_the_limit(self, db, monkeypatch):
+        monkeypatch.setattr(jobs_mod.settings, "JOB_CONCURRENCY", "test.echo=2, x=1")
+        await enqueue_job(db, "test.echo", {"n": 1})
+        await enqueue_job(db, "test.echo", {"n": 2})
+        await db.commit()
+
+        assert await claim_next_job(db, "worker-a") is not None
+        assert await claim_next_job(db, "worker-b") is not None
+
+
+class TestCancellation:
+    async def test_queued_job_is_cancelled_immediately(self, db):
+        job = await enqueue_job(db, "test.echo")
+        await request_cancel(db, job)
+        await db.commit()
+        assert job.status == "cancelled"
+        assert await _run_once(JobWorker(slots=1)) == 0
+
+    async def test_job_claimed_since_it_was_read_is_asked_to_stop(self, db):
+        job = await enqueue_job(db, "test.echo")
+        await db.commit()
+        # A worker claims it behind the back of the already loaded ``job``.
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id)
+            .values(status="running", locked_by="worker-a")
+            .execution_options(synchronize_session=False)
+        )
+        assert job.status == "queued"
+
+        await request_cancel(db, job)
+        await db.commit()
+        assert job.status == "running"
+        assert job.cancel_requested is True
+        assert job.finished_at is None
+
+    async def test_progress_raises_once_cancel_is_requested(self, db):
+        job = await enqueue_job(db, "test.echo")
+        await db.commit()
+        ctx = await claim_next_job(db, "worker-a")
+        await db.execute(
+            update(BackgroundJob).where(BackgroundJob.id == job.id).values(cancel_requested=True)
+        )
+        with pytest.raises(JobCancelledError):
+            await ctx.progress("working")
+        assert await ctx.cancel_requested()
+
+    async def test_worker_stops_a_running_job_on_request(self, db):
+        job = await enqueue_job(db, "test.forever")
+        await db.commit()
+        worker = JobWorker(slots=1)
+        assert await worker.tick() == 1
+        await asyncio.sleep(0)
+
+        await db.refresh(job)
+        await request_cancel(db, job)
+        await db.commit()
+        await worker.tick()  # heartbeat sees the request
+        await worker.join()
+
+        job = await _reload(db, job)
+        assert job.status == "cancelled"
+        assert job.finished_at is not None
+
+
+class TestRecovery:
+    async def test_stale_running_job_is_requeued_or_failed(self, db):
+        retry = await enqueue_job(db, "test.boom")
+        spent = await enqueue_job(db, "test.echo")
+        await db.commit()
+        long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+        for job, attempts in ((retry, 1), (spent, 1)):
+            await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job.id)
+                .values(
+                    status="running",
+                    attempts=attempts,
+                    locked_by="dead-worker",
+                    heartbeat_at=long_ago,
+                )
+            )
+
+        assert await recover_stale_jobs(db) == 2
+        retry = await _reload(db, retry)
+        spent = await _reload(db, spent)
+        assert retry.status == "queued" and retry.locked_by is None
+        assert spent.status == "failed"
+        assert "stopped responding" in spent.error
+
+    async def test_shutdown_hands_running_jobs_back(self, db, monkeypatch):
+        monkeypatch.setattr(jobs_mod.settings, "JOB_POLL_INTERVAL", 60)
+        job = await enqueue_job(db, "test.forever")
+        await db.commit()
+        worker = JobWorker(slots=1)
+        task = asyncio.create_task(worker.run())
+        # Generous: under a loaded parallel run the worker can take a while.
+        for _ in range(1000):
+            await asyncio.sleep(0.01)
+            if worker._running:
+                break
+        assert worker._running
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        job = await _reload(db, job)
+        assert job.status == "queued"
+        assert job.attempts == 0
+        assert job.locked_by is None
+
+
+async def test_purge_keeps_active_and_recent_jobs(db):
+    old = await enqueue_job(db, "test.echo", {"n": "old"})
+    recent = await enqueue_job(db, "test.echo", {"n": "recent"})
+    active = await enqueue_job(db, "test.echo", {"n": "active"})
+    await db.commit()
+    now = datetime.now(timezone.utc)
+    for job, finished in ((old, now - timedelta(days=40)), (recent, now - timedelta(days=1))):
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id)
+            .values(status="succeeded", finished_at=finished)
+        )
+
+    assert await purge_finished_jobs(db, retention_days=30) == 1
+    remaining = {j.id for j in (await db.execute(BackgroundJob.__table__.select())).all()}
+    assert old.id not in remaining
+    assert {recent.id, active.id} <= remaining
+
+
+class TestComplianceScanKind:
+    async def _run(self, db, monkeypatch, scan):
+        from app.models.turbolens import TurboLensAnalysisRun
+        from app.services import compliance_scanner
+
+        monkeypatch.setattr(compliance_scanner, "run_compliance_scan", scan)
+        run = TurboLensAnalysisRun(
+            analysis_type="compliance", status="running", started_at=datetime.now(timezone.utc)
+        )
+        db.add(run)
+        await db.flush()
+        job = await enqueue_job(db, "compliance.scan", {"run_id": str(run.id), "user_id": None})
+        await db.commit()
+        await _run_once(JobWorker(slots=1))
+        await db.refresh(run)
+        return run, await _reload(db, job)
+
+    async def test_completes_the_analysis_run(self, db, monkeypatch):
+        async def scan(db_, run_id, user_id, *, regulations=None, on_progress=None):
+            await on_progress("regulation", 1, 1, "gdpr")
+            return {"scan": "compliance", "compliance_findings": 0}
+
+        run, job = await self._run(db, monkeypatch, scan)
+        assert job.status == "succeeded"
+        assert job.progress["note"] == "gdpr"
+        assert run.status == "completed"
+        assert run.results["compliance_findings"] == 0
+
+    async def test_run_stays_open_while_a_retry_is_left(self, db, monkeypatch):
+        async def scan(*args, **kwargs):
+            raise RuntimeError("LLM unreachable")
+
+        run, job = await self._run(db, monkeypatch, scan)
+        assert job.status == "queued"
+        assert run.status == "running"
+
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id)
+            .values(run_after=datetime.now(timezone.utc) - timedelta(hours=1))
+        )
+        await db.commit()
+        await _run_once(JobWorker(slots=1))
+        await db.refresh(run)
+        assert run.status == "failed"
+        assert run.error_message == "LLM unreachable"
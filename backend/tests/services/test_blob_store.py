@@ -0,0 +1,136 @@
+"""Tests for the content-addressed attachment blob store (app/services/blob_store/)."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from app.models.file_attachment import FileAttachment
+from app.services.blob_store import (
+    BlobNotFoundError,
+    collect_unreferenced_blobs,
+    content_digest,
+    put_blob,
+)
+from app.services.blob_store.local import LocalBlobStore
+from tests.conftest import create_card, create_card_type, create_user
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalBlobStore(tmp_path / "blobs")
+
+
+def _age(store: LocalBlobStore, digest: str, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(store._path(digest), (past, past))
+
+
+class TestLocalBlobStore:
+    async def test_put_returns_sha256_and_reads_back(self, store):
+        digest = await store.put(b"hello")
+        assert digest == content_digest(b"hello")
+        assert await store.read(digest) == b"hello"
+        assert store._path(digest).relative_to(store.root).parts[:2] == (digest[:2], digest[2:4])
+
+    async def test_identical_content_is_stored_once(self, store):
+        first = await store.put(b"same")
+        _age(store, first, 7200)
+        assert await store.put(b"same") == first
+        files = [p for p in store.root.rglob("*") if p.is_file()]
+        assert len(files) == 1
+        # A dedup hit refreshes the timestamp the GC grace window keys on.
+        assert await store.list_older_than(time.time() - 3600) == []
+
+    async def test_iter_range_streams_requested_slice(self, store):
+        digest = await store.put(bytes(range(256)) * 4)
+        chunks = [c async for c in store.iter_range(digest, 10, 700, chunk_size=100)]
+        assert [len(c) for c in chunks] == [100] * 6 + [90]
+        assert b"".join(chunks) == (bytes(range(256)) * 4)[10:700]
+
+    async def test_missing_and_malformed_digests(self, store):
+        with pytest.raises(BlobNotFoundError):
+            await store.read("0" * 64)
+        with pytest.raises(BlobNotFoundError):
+            await store.read("../../etc/passwd")
+        assert not await store.exists("../" + "0" * 61)
+        with pytest.raises(BlobNotFoundError):
+            [c async for c in store.iter_range("0" * 64, 0, 1)]
+
+
+class TestGarbageCollection:
+    async def test_deletes_only_old_unreferenced_blobs(self, db, store):
+        user = await create_user(db, email="gc@test.com")
+        await create_card_type(db, key="Application", label="Application")
+        card = await create_card(db, card_type="Application", name="GC", user_id=user.id)
+
+        kept = await store.put(b"referenced")
+        orphan = await store.put(b"orphan")
+        fresh = await store.put(b"just uploaded")
+        for digest in (kept, orphan):
+            _age(store, digest, 7200)
+        db.add(
+            FileAttachment(
+                card_id=card.id, name="a.txt", mime_type="text/plain", size=10, content_hash=kept
+            )
+        )
+        await db.flush()
+
+        assert await collect_unreferenced_blobs(db, store, grace_seconds=3600) == 1
+        assert await store.exists(kept)
+        assert not await store.exists(orphan)
+        assert await store.exists(fresh)
+
+    async def test_rechecks_under_the_blob_lock_before_deleting(self, db, store, monkeypatch):
+        from app.services.blob_store import gc as gc_mod
+
+        user = await create_user(db, email="gc@test.com")
+        await create_card_type(db, key="Application", label="Application")
+        card = await create_card(db, card_type="Application", name="GC", user_id=user.id)
+        touched = await store.put(b"uploaded again")
+        linked = await store.put(b"linked meanwhile")
+        for digest in (touched, linked):
+            _age(store, digest, 7200)
+        real_lock = gc_mod.lock_blob
+
+        async def racing_lock(session, digest, *, exclusive=False):
+            # Both land between the batched reference check and the delete.
+            if digest == touched:
+                await store.put(b"uploaded again")
+            else:
+                session.add(
+                    FileAttachment(
+                        card_id=card.id,
+                        name="b.txt",
+                        mime_type="text/plain",
+                        size=16,
+                        content_hash=linked,
+                    )
+                )
+                await session.flush()
+            await real_lock(session, digest, exclusive=exclusive)
+
+        monkeypatch.setattr(gc_mod, "lock_blob", racing_lock)
+
+        assert await collect_unreferenced_blobs(db, store, grace_seconds=3600) == 0
+        assert await store.exists(touched)
+        assert await store.exists(linked)
+
+    async def test_writers_hold_the_blob_lock(self, db, store, monkeypatch):
+        from sqlalchemy import text
+
+        from app.services.blob_store import base as base_mod
+
+        monkeypatch.setattr(base_mod, "get_blob_store", lambda: store)
+        digest = await put_blob(db, b"locked")
+
+        held = await db.scalar(
+            text(
+                "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' "
+                "AND mode = 'ShareLock' AND pid = pg_backend_pid()"
+            )
+        )
+        assert held == 1
+        assert await store.exists(digest)
@@ -0,0 +1,67 @@
+"""Tests for the card count strategies and cache (app/services/card_counts.py)."""
+
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from app.core.query_profiler import profile_queries
+from app.models.card import Card
+from app.services.card_counts import CardCountCache, count_rows, estimate_rows
+from app.services.card_flags import orphaned_condition
+from tests.conftest import create_card, create_card_type
+
+
+def _count(*where):
+    return select(func.count(Card.id)).where(Card.status == "ACTIVE", *where)
+
+
+class TestCachedCounts:
+    async def test_same_filters_reuse_the_count(self, db):
+        await create_card_type(db, key="Application", label="Application")
+        await create_card(db, name="One")
+        await db.flush()
+
+        assert await count_rows(db, _count(orphaned_condition()), strategy="cached") == (1, True)
+        with profile_queries() as profile:
+            total = await count_rows(db, _count(orphaned_condition()), strategy="cached")
+        assert total == (1, True)
+        assert profile.total == 0
+
+    async def test_different_parameters_are_counted_separately(self, db):
+        await create_card_type(db, key="Application", label="Application")
+        await create_card(db, name="One")
+        await db.flush()
+
+        assert (await count_rows(db, _count(Card.name == "One"), strategy="cached"))[0] == 1
+        assert (await count_rows(db, _count(Card.name == "Two"), strategy="cached"))[0] == 0
+
+    async def test_a_card_write_drops_the_cached_counts(self, db):
+        await create_card_type(db, key="Application", label="Application")
+        await create_card(db, name="One")
+        await db.flush()
+        assert (await count_rows(db, _count(), strategy="cached"))[0] == 1
+
+        await create_card(db, name="Two")
+        assert not CardCountCache._entries
+        assert (await count_rows(db, _count(), strategy="cached"))[0] == 2
+
+    async def test_count_overlapping_a_write_is_not_stored(self, db):
+        generation = CardCountCache.generation()
+        CardCountCache.invalidate()
+        CardCountCache.put("key", 5, generation)
+        assert CardCountCache.get("key") is None
+
+
+class TestEstimatedCounts:
+    async def test_planner_estimate_is_a_row_count(self, db):
+        await create_card_type(db, key="Application", label="Application")
+        await create_card(db, name="One")
+        await db.flush()
+        assert await estimate_rows(db, select(Card.id)) >= 1
+
+    async def test_small_estimates_are_counted_exactly(self, db):
+        await create_card_type(db, key="Application", label="Application")
+        await create_card(db, name="One")
+        await create_card(db, name="Two")
+        await db.flush()
+        assert await count_rows(db, _count(), strategy="estimated") == (2, True)
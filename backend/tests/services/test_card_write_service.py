@@ -141,6 +141,32 @@ class TestUpdateCard:
             await svc.update_card(db, ext_actor(), card, {"attributes": {"criticality": "bad"}})
 
 
+class TestUpdateCards:
+    async def test_reports_changes_per_row_and_rescores(self, db, env):
+        a = await create_card(db, card_type="Application", name="A")
+        b = await create_card(db, card_type="Application", name="B")
+        before = a.data_quality
+        flags = await svc.update_cards(
+            db, ext_actor(), [(a, {"description": "now described"}), (b, {"name": "B"})]
+        )
+        assert flags == [True, False]
+        assert a.data_quality > before
+        events = (await db.execute(select(Event).where(Event.card_id == b.id))).scalars().all()
+        assert [e.event_type for e in events if e.event_type == "card.updated"] == []
+
+    async def test_one_bad_row_fails_the_call(self, db, env):
+        a = await create_card(db, card_type="Application", name="A")
+        b = await create_card(db, card_type="Application", name="B")
+        with pytest.raises(HTTPException):
+            await svc.update_cards(
+                db,
+                ext_actor(),
+                [(a, {"name": "A2"}), (b, {"attributes": {"criticality": "bad"}})],
+            )
+        events = (await db.execute(select(Event).where(Event.card_id == a.id))).scalars().all()
+        assert all(e.event_type != "card.updated" for e in events)
+
+
 class TestArchive:
     async def test_archive_set_flips_and_stamps(self, db, env):
         card = await create_card(db, card_type="Application", name="Retiring")
@@ -196,6 +222,32 @@ class TestUpsertRelation:
         assert rel2.description == "now described"
 
 
+class TestUpsertRelations:
+    async def test_creates_merges_and_emits_per_relation(self, db, env):
+        app = await create_card(db, card_type="Application", name="Src")
+        itc = await create_card(db, card_type="ITComponent", name="Tgt")
+        other = await create_card(db, card_type="ITComponent", name="Other")
+        first, _, _ = await svc.upsert_relation(
+            db, ext_actor(), type_key="app_to_itc", source_id=app.id, target_id=itc.id
+        )
+        results = await svc.upsert_relations(
+            db,
+            ext_actor(),
+            [
+                svc.RelationUpsert("app_to_itc", app.id, itc.id, description="described"),
+                svc.RelationUpsert("app_to_itc", app.id, other.id),
+            ],
+        )
+        (merged, reused, changed), (created, reused2, _) = results
+        assert merged.id == first.id and reused and changed == ["description"]
+        assert reused2 is False and created.target_id == other.id
+        types = [
+            e.event_type
+            for e in (await db.execute(select(Event).where(Event.card_id == other.id))).scalars()
+        ]
+        assert types.count("relation.created") == 1
+
+
 class TestNoCommit:
     def test_service_never_commits_or_rolls_back(self):
         """Source guard for the CLAUDE.md session rule: a helper must never
@@ -0,0 +1,241 @@
+"""Tests for multi-worker coordination (app/services/cluster.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.services import cluster
+from app.services.cluster import ClusterBus, LeaderElection, cluster_bus
+from app.services.event_bus import EventBus, _for_peers
+from app.services.permission_service import PermissionService
+from app.services.principal_cache import PrincipalCache
+
+
+def _peer_message(topic: str, payload: dict | None = None) -> str:
+    return json.dumps({"origin": "another-worker", "topic": topic, "payload": payload or {}})
+
+
+@pytest.fixture
+def multi_worker(monkeypatch, test_engine):
+    """Multi-worker mode against the test database, on lock keys of its own
+    (xdist workers share the database and so its advisory locks)."""
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    monkeypatch.setattr(cluster, "_coordination_engine", test_engine)
+    monkeypatch.setattr(cluster, "LEADER_LOCK_KEY", random.randint(1, 2**62))
+    monkeypatch.setattr(cluster, "STARTUP_LOCK_KEY", random.randint(1, 2**62))
+
+
+class TestClusterBus:
+    def test_publish_is_a_noop_until_started(self):
+        bus = ClusterBus()
+        bus.publish("anything", {"x": 1})
+        assert not bus.running
+
+    async def test_publish_queues_json_for_peers(self):
+        bus = ClusterBus()
+        bus._outbox = asyncio.Queue()
+        bus.publish("permissions.role", {"role_key": "admin"})
+        message = json.loads(bus._outbox.get_nowait())
+        assert message == {
+            "origin": cluster.WORKER_ID,
+            "topic": "permissions.role",
+            "payload": {"role_key": "admin"},
+        }
+
+    async def test_oversized_message_is_dropped(self):
+        bus = ClusterBus()
+        bus._outbox = asyncio.Queue()
+        bus.publish("big", {"blob": "x" * cluster.MAX_PAYLOAD_BYTES})
+        assert bus._outbox.empty()
+
+    def test_peer_message_runs_handler(self):
+        bus = ClusterBus()
+        seen: list[dict] = []
+        bus.on("topic", seen.append)
+        bus._on_notify(None, 0, cluster.CHANNEL, _peer_message("topic", {"a": 1}))
+        assert seen == [{"a": 1}]
+
+    def test_own_and_malformed_messages_are_ignored(self):
+        bus = ClusterBus()
+        seen: list[dict] = []
+        bus.on("topic", seen.append)
+        own = json.dumps({"origin": cluster.WORKER_ID, "topic": "topic", "payload": {}})
+        bus._on_notify(None, 0, cluster.CHANNEL, own)
+        bus._on_notify(None, 0, cluster.CHANNEL, "not json")
+        assert seen == []
+
+    async def test_applying_a_peer_message_does_not_echo_it(self):
+        bus = ClusterBus()
+        bus._outbox = asyncio.Queue()
+        bus.on("topic", lambda payload: bus.publish("topic", payload))
+        bus._on_notify(None, 0, cluster.CHANNEL, _peer_message("topic"))
+        assert bus._outbox.empty()
+
+    def test_resync_clears_registered_caches(self):
+        bus = ClusterBus()
+        seen: list[tuple[str, dict]] = []
+        bus.on("cache", lambda p: seen.append(("cache", p)), resync=True)
+        bus.on("event", lambda p: seen.append(("event", p)))
+        bus._resync()
+        assert seen == [("cache", {})]
+
+    async def test_publish_on_commit_waits_for_commit(self, db):
+        cluster_bus._outbox = asyncio.Queue()
+        try:
+            cluster_bus.publish_on_commit(db, "settings.runtime")
+            assert cluster_bus._outbox.empty()
+            await db.commit()
+            assert json.loads(cluster_bus._outbox.get_nowait())["topic"] == "settings.runtime"
+        finally:
+            cluster_bus._outbox = None
+
+    async def test_listener_receives_notify(self, multi_worker, test_engine):
+        bus = ClusterBus()
+        received = asyncio.Event()
+        bus.on("ping", lambda payload: received.set())
+        await bus.start()
+        try:
+            deadline = time.monotonic() + 10
+            notify = select(func.pg_notify(cluster.CHANNEL, _peer_message("ping")))
+            while not received.is_set() and time.monotonic() < deadline:
+                async with test_engine.begin() as conn:
+                    await conn.execute(notify)
+                try:
+                    await asyncio.wait_for(received.wait(), timeout=0.2)
+                except TimeoutError:
+                    pass
+            assert received.is_set()
+        finally:
+            await bus.stop()
+
+
+class TestPeerInvalidation:
+    def test_role_cache(self):
+        PermissionService._role_cache["admin"] = ({}, time.monotonic())
+        PermissionService._role_cache["member"] = ({}, time.monotonic())
+        cluster_bus._on_notify(
+            None, 0, cluster.CHANNEL, _peer_message("permissions.role", {"role_key": "admin"})
+        )
+        assert "admin" not in PermissionService._role_cache
+        assert "member" in PermissionService._role_cache
+
+    def test_srd_cache(self):
+        PermissionService._srd_cache[("Application", "responsible")] = (None, time.monotonic())
+        cluster_bus._on_notify(
+            None,
+            0,
+            cluster.CHANNEL,
+            _peer_message("permissions.srd", {"type_key": "Application", "role_key": None}),
+        )
+        assert PermissionService._srd_cache == {}
+
+    def test_principal_cache(self):
+        user_id = uuid.uuid4()
+        PrincipalCache._entries[user_id] = ({}, time.monotonic())
+        cluster_bus._on_notify(
+            None, 0, cluster.CHANNEL, _peer_message("principal", {"user_id": str(user_id)})
+        )
+        assert user_id not in PrincipalCache._entries
+
+
+class TestEventBusAcrossWorkers:
+    async def test_remote_events_skip_local_only_subscribers(self):
+        bus = EventBus()
+        everything = bus.subscribe()
+        local = bus.subscribe(include_remote=False)
+        first_all = asyncio.ensure_future(anext(everything))
+        first_local = asyncio.ensure_future(anext(local))
+        await asyncio.sleep(0)
+
+        bus.deliver_remote({"event": "card.updated", "data": {}})
+        assert (await first_all)["event"] == "card.updated"
+        assert not first_local.done()
+
+        await bus.publish("card.created", {"name": "X"})
+        assert (await first_local)["event"] == "card.created"
+        await everything.aclose()
+        await local.aclose()
+
+    def test_large_payloads_are_trimmed_for_peers(self):
+        message = {
+            "event": "notification.created",
+            "data": {"user_id": "u-1", "body": "x" * 10_000},
+            "card_id": None,
+        }
+        trimmed = _for_peers(message)
+        assert trimmed["data"] == {"user_id": "u-1"}
+        assert len(json.dumps(trimmed)) < cluster.MAX_PAYLOAD_BYTES
+        small = {"event": "card.updated", "data": {"name": "A"}}
+        assert _for_peers(small) is small
+
+
+class TestLeaderElection:
+    async def test_single_worker_runs_jobs_without_election(self):
+        started = asyncio.Event()
+
+        async def job():
+            started.set()
+            await asyncio.Event().wait()
+
+        election = LeaderElection([job])
+        task = asyncio.create_task(election.run())
+        await asyncio.wait_for(started.wait(), timeout=1)
+        assert election.is_leader
+        await cluster.cancel_tasks([task])
+        assert not election.is_leader
+
+    async def test_only_one_worker_leads_and_a_follower_takes_over(self, multi_worker):
+        runs: list[str] = []
+
+        def job_for(name: str):
+            async def job():
+                runs.append(name)
+                await asyncio.Event().wait()
+
+            return job
+
+        first = LeaderElection([job_for("first")], interval=0.05)
+        second = LeaderElection([job_for("second")], interval=0.05)
+        first_task = asyncio.create_task(first.run())
+        # ``is_leader`` flips before the job tasks get their first turn.
+        await _until(lambda: runs == ["first"])
+        second_task = asyncio.create_task(second.run())
+        await asyncio.sleep(0.3)
+        assert runs == ["first"]
+        assert not second.is_leader
+
+        # Stopping the leader closes its connection and releases the lock.
+        await cluster.cancel_tasks([first_task])
+        await _until(lambda: runs == ["first", "second"])
+        assert second.is_leader
+        await cluster.cancel_tasks([second_task])
+
+    async def test_startup_lock_serializes_workers(self, multi_worker):
+        order: list[str] = []
+
+        async def worker(name: str):
+            async with cluster.startup_lock():
+                order.append(f"{name}:in")
+                await asyncio.sleep(0.1)
+                order.append(f"{name}:out")
+
+        await asyncio.gather(worker("a"), worker("b"))
+        assert order in (
+            ["a:in", "a:out", "b:in", "b:out"],
+            ["b:in", "b:out", "a:in", "a:out"],
+        )
+
+
+async def _until(predicate, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.02)
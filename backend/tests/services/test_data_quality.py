@@ -408,3 +408,90 @@ async def test_zero_still_counts_as_filled(db):
     await _set_dq(db, description=0, lifecycle=0, relations=0, tags=0)
     card = await create_card(db, attributes={"seats": 0})
     assert await calc_data_quality(db, card) == 100.0
+
+
+async def test_bulk_rescore_matches_the_single_card_scorer(db):
+    """``rescore_cards`` applies compiled rules and batch-loaded facts; every
+    bucket has to come out exactly as ``calc_data_quality`` scores one card,
+    in a bounded number of queries however many cards there are."""
+    from app.models.stakeholder import Stakeholder
+    from app.models.tag import CardTag, Tag, TagGroup
+    from app.services.data_quality import rescore_cards
+    from tests.conftest import create_relation, create_relation_type, query_budget
+
+    await create_role(db, key="member", label="Member", permissions={})
+    user = await create_user(db, email="bulk@test.com", role="member")
+    await _type(db)
+    await create_card_type(db, key="ITComponent", label="IT Component")
+    await create_relation_type(db, source_mandatory=True)
+    await create_stakeholder_role_def(
+        db, card_type_key="Application", key="responsible", label="Responsible"
+    )
+    group = TagGroup(name="Tier", mandatory=True)
+    db.add(group)
+    await db.flush()
+    tag = Tag(tag_group_id=group.id, name="Gold")
+    db.add(tag)
+    itc = await create_card(db, card_type="ITComponent", name="DB")
+
+    cards = []
+    for i in range(12):
+        card = await create_card(db, name=f"App {i}", attributes={"a": "x"} if i % 2 else {})
+        if i % 3 == 0:
+            await create_relation(db, source_id=card.id, target_id=itc.id)
+        if i % 4 == 0:
+            db.add(CardTag(card_id=card.id, tag_id=tag.id))
+        if i % 5 == 0:
+            db.add(Stakeholder(card_id=card.id, user_id=user.id, role="responsible"))
+        card.data_quality = -1.0
+        cards.append(card)
+    itc.data_quality = -1.0
+    await db.flush()
+    ids = [c.id for c in cards] + [itc.id]
+
+    with query_budget(10):
+        assert await rescore_cards(db, ids) == 13
+    for card in cards + [itc]:
+        stored = card.data_quality
+        assert stored == await calc_data_quality(db, card), card.name
+
+
+async def test_score_and_approval_gate_agree_on_mandatory_items(db):
+    """The relations and tags buckets count exactly the items
+    ``missing_mandatory`` reports — applicable and missing alike."""
+    from app.models.tag import CardTag, Tag, TagGroup
+    from app.services.card_completeness import missing_mandatory
+    from tests.conftest import create_relation, create_relation_type
+
+    await create_card_type(db, key="Application", fields_schema=[])
+    await create_card_type(db, key="ITComponent", label="IT Component")
+    await _set_dq(db, description=0, lifecycle=0, stakeholders=0)
+    outgoing = await create_relation_type(db)
+    incoming = await create_relation_type(
+        db, key="itc_to_app", source_type_key="ITComponent", target_type_key="Application"
+    )
+    hidden = await create_relation_type(db, key="app_to_itc_hidden", is_hidden=True)
+    outgoing.source_mandatory = True
+    incoming.target_mandatory = True
+    hidden.source_mandatory = True
+    tier = TagGroup(name="Tier", mandatory=True)
+    elsewhere = TagGroup(name="Layer", mandatory=True, restrict_to_types=["ITComponent"])
+    empty = TagGroup(name="Empty", mandatory=True)
+    db.add_all([tier, elsewhere, empty])
+    await db.flush()
+    gold = Tag(tag_group_id=tier.id, name="Gold")
+    db.add_all([gold, Tag(tag_group_id=elsewhere.id, name="Core")])
+    itc = await create_card(db, card_type="ITComponent", name="DB")
+    tagged = await create_card(db, name="Tagged")
+    related = await create_card(db, name="Related")
+    await create_relation(db, source_id=related.id, target_id=itc.id)
+    db.add(CardTag(card_id=tagged.id, tag_id=gold.id))
+    await db.flush()
+
+    for card, score in ((tagged, 33.3), (related, 33.3)):
+        missing = await missing_mandatory(db, card)
+        assert (missing["relations_applicable"], missing["tag_groups_applicable"]) == (2, 1)
+        applicable = missing["relations_applicable"] + missing["tag_groups_applicable"]
+        satisfied = applicable - len(missing["relations"]) - len(missing["tag_groups"])
+        assert await calc_data_quality(db, card) == round(satisfied / applicable * 100, 1)
+        assert await calc_data_quality(db, card) == score
@@ -0,0 +1,92 @@
+"""Tests for delta-compressed process diagram versions
+(app/services/diagram_versions.py)."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from app.models.process_diagram import ProcessDiagram
+from app.services.diagram_versions import (
+    apply_delta,
+    compact_process_diagrams,
+    diagram_xml,
+    encode_delta,
+)
+from tests.conftest import create_card, create_card_type
+
+
+def _bpmn(tasks: int, renamed: int | None = None) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        "<bpmn:definitions>",
+        '  <bpmn:process id="P">',
+    ]
+    for i in range(tasks):
+        name = "Renamed" if i == renamed else f"Task {i}"
+        lines.append(f'    <bpmn:task id="Task_{i}" name="{name}" />')
+    lines += ["  </bpmn:process>", "</bpmn:definitions>", ""]
+    return "\n".join(lines)
+
+
+def test_delta_round_trips_edits_and_line_endings():
+    base = _bpmn(200)
+    for text in (_bpmn(200, renamed=7), _bpmn(150), _bpmn(260), "", base.replace("\n", "\r\n")):
+        assert apply_delta(base, encode_delta(base, text)) == text
+
+
+def test_delta_is_small_for_a_small_edit():
+    base = _bpmn(2000)
+    assert len(encode_delta(base, _bpmn(2000, renamed=1000))) < len(base) // 100
+
+
+async def _process_id(db):
+    await create_card_type(db, key="BusinessProcess", label="Business Process")
+    card = await create_card(db, card_type="BusinessProcess", name="Order to Cash")
+    return card.id
+
+
+async def test_compaction_converts_history_between_snapshots(db):
+    pid = await _process_id(db)
+    texts = [_bpmn(300, renamed=i) for i in range(7)]
+    db.add_all(
+        ProcessDiagram(process_id=pid, version=i + 1, bpmn_xml=text) for i, text in enumerate(texts)
+    )
+    await db.flush()
+
+    assert await compact_process_diagrams(db, interval=3) == 4
+    assert await compact_process_diagrams(db, interval=3) == 0
+
+    db.expire_all()
+    rows = (
+        (
+            await db.execute(
+                select(ProcessDiagram)
+                .where(ProcessDiagram.process_id == pid)
+                .order_by(ProcessDiagram.version)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert [r.bpmn_xml is not None for r in rows] == [True, False, False, True, False, False, True]
+    assert rows[1].delta_base_id == rows[0].id and rows[5].delta_base_id == rows[3].id
+    assert [await diagram_xml(db, r) for r in rows] == texts
+
+
+async def test_compaction_keeps_snapshots_that_deltas_use(db):
+    pid = await _process_id(db)
+    first = ProcessDiagram(process_id=pid, version=1, bpmn_xml=_bpmn(300))
+    second = ProcessDiagram(process_id=pid, version=2, bpmn_xml=_bpmn(300, renamed=1))
+    db.add_all([first, second])
+    await db.flush()
+    third = ProcessDiagram(
+        process_id=pid,
+        version=3,
+        bpmn_delta=encode_delta(second.bpmn_xml, _bpmn(300, renamed=2)),
+        delta_base_id=second.id,
+    )
+    db.add(third)
+    await db.flush()
+
+    assert await compact_process_diagrams(db, interval=10) == 0
+    assert await diagram_xml(db, third) == _bpmn(300, renamed=2)
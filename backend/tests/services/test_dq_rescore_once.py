@@ -2,8 +2,8 @@
 
 Existing installs may carry non-canonical scores (from the demo seed's old
 approximation or from workspace imports made by older importer versions).
-``run_dq_rescore_once`` heals the whole inventory exactly once, guarded by a
-marker in ``app_settings.general_settings``.
+``run_dq_rescore_once`` heals the whole inventory once, guarded by per-type
+fingerprints of the scoring rules in ``app_settings.general_settings``.
 """
 
 from __future__ import annotations
@@ -11,10 +11,10 @@ from __future__ import annotations
 import pytest
 from sqlalchemy import select
 
-from app.main import _DQ_RESCORE_FLAG, run_dq_rescore_once
+from app.main import run_dq_rescore_once
 from app.models.app_settings import AppSettings
 from app.models.card import Card
-from app.services.data_quality import calc_data_quality
+from app.services.data_quality import FINGERPRINT_SETTINGS_KEY, calc_data_quality
 from tests.conftest import create_card, create_card_type, create_user
 
 pytestmark = pytest.mark.asyncio
@@ -37,9 +37,10 @@ async def test_rescore_once_heals_scores_and_arms_marker(db):
     settings_row = (
         await db.execute(select(AppSettings).where(AppSettings.id == "default"))
     ).scalar_one()
-    assert settings_row.general_settings.get(_DQ_RESCORE_FLAG) is True
+    assert "Application" in settings_row.general_settings[FINGERPRINT_SETTINGS_KEY]
 
-    # Second run is a guarded no-op, even if a score drifts again.
+    # Second run is a guarded no-op while the rules are unchanged, even if a
+    # score drifts again.
     refreshed.data_quality = 12.3
     await db.flush()
     assert await run_dq_rescore_once(db) is None
@@ -77,7 +78,7 @@ async def test_rescore_reruns_when_only_the_old_v1_marker_is_set(db):
     settings_row = (
         await db.execute(select(AppSettings).where(AppSettings.id == "default"))
     ).scalar_one()
-    assert settings_row.general_settings.get(_DQ_RESCORE_FLAG) is True
+    assert "Application" in settings_row.general_settings[FINGERPRINT_SETTINGS_KEY]
     # The legacy marker is left in place untouched.
     assert settings_row.general_settings.get("dataQualityCanonicalRescoreDone") is True
 
@@ -125,5 +126,25 @@ async def test_rescore_reruns_when_only_the_v2_marker_is_set(db):
     settings_row = (
         await db.execute(select(AppSettings).where(AppSettings.id == "default"))
     ).scalar_one()
-    assert settings_row.general_settings.get(_DQ_RESCORE_FLAG) is True
+    assert "Application" in settings_row.general_settings[FINGERPRINT_SETTINGS_KEY]
     assert settings_row.general_settings.get("dataQualityCanonicalRescoreDoneV2") is True
+
+
+async def test_only_types_whose_rules_changed_are_rescored(db):
+    user = await create_user(db, email="rescore-fp@test.com", role="admin")
+    app_type = await create_card_type(db, key="Application", label="Application")
+    await create_card_type(db, key="Provider", label="Provider")
+    app = await create_card(db, card_type="Application", name="App", user_id=user.id)
+    provider = await create_card(db, card_type="Provider", name="Vendor", user_id=user.id)
+    assert await run_dq_rescore_once(db) is not None
+
+    app.data_quality = 42.0
+    provider.data_quality = 42.0
+    app_type.section_config = {"__dataQuality": {"lifecycle": 0}}
+    await db.flush()
+
+    assert await run_dq_rescore_once(db) == 1
+    assert app.data_quality == await calc_data_quality(db, app)
+    # Provider's rules did not change, so its (drifted) score is left alone.
+    assert provider.data_quality == 42.0
+    assert await run_dq_rescore_once(db) is None
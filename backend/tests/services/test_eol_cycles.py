@@ -0,0 +1,180 @@
+"""Stored endoflife.date cycles: conditional refreshes and the non-blocking read path."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.background_job import BackgroundJob
+from app.models.eol_product_cycles import EolProductCycles
+from app.services.eol_cycles import read_product_cycles, refresh_product_cycles, stale_products
+from tests.conftest import create_card, create_card_type
+
+PYTHON = [{"cycle": "3.12", "eol": "2028-10-02"}, {"cycle": "3.8", "eol": "2024-10-07"}]
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _age(db, product: str, days: int = 2) -> None:
+    row = await db.get(EolProductCycles, product)
+    row.checked_at = datetime.now(timezone.utc) - timedelta(days=days)
+    await db.commit()
+
+
+async def _queued_refreshes(db) -> int:
+    rows = await db.execute(select(BackgroundJob).where(BackgroundJob.kind == "eol.refresh_cycles"))
+    return len(rows.scalars().all())
+
+
+class TestRefresh:
+    async def test_revalidates_with_stored_validators(self, db):
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json=PYTHON,
+                headers={"ETag": '"v1"', "Last-Modified": "Mon, 02 Oct 2023 00:00:00 GMT"},
+            )
+
+        async with _client(handler) as client:
+            first = await refresh_product_cycles(db, ["python"], client=client)
+            row = await db.get(EolProductCycles, "python")
+            updated_at = row.updated_at
+            await _age(db, "python")
+            second = await refresh_product_cycles(db, ["python"], client=client)
+
+        assert first["updated"] == 1
+        assert second == {"updated": 0, "unchanged": 1, "not_found": 0, "failed": 0}
+        assert seen[1].headers["If-None-Match"] == '"v1"'
+        assert seen[1].headers["If-Modified-Since"] == "Mon, 02 Oct 2023 00:00:00 GMT"
+        await db.refresh(row)
+        assert row.cycles == PYTHON
+        assert row.updated_at == updated_at
+        assert row.checked_at > datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    async def test_unknown_product_is_stored_and_failures_keep_the_copy(self, db):
+        status = {"python": 200, "nope": 404}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            product = request.url.path.rsplit("/", 1)[-1].removesuffix(".json")
+            return httpx.Response(status[product], json=PYTHON)
+
+        async with _client(handler) as client:
+            await refresh_product_cycles(db, ["python", "nope"], client=client)
+            status["python"] = 503
+            await _age(db, "python")
+            counts = await refresh_product_cycles(db, ["python"], client=client)
+
+        assert counts["failed"] == 1
+        assert (await db.get(EolProductCycles, "python")).cycles == PYTHON
+        nope = await db.get(EolProductCycles, "nope")
+        assert nope is not None and nope.cycles is None
+
+    async def test_requests_in_flight_are_bounded(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "EOL_REFRESH_CONCURRENCY", 2)
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=PYTHON)
+
+        async with _client(handler) as client:
+            counts = await refresh_product_cycles(db, [f"p{i}" for i in range(7)], client=client)
+
+        assert counts["updated"] == 7
+        assert peak == 2
+
+    async def test_fixture_replaces_the_network(self, db, monkeypatch, tmp_path):
+        fixture = tmp_path / "eol.json"
+        fixture.write_text(json.dumps({"python": PYTHON}))
+        monkeypatch.setattr(settings, "EOL_FIXTURE_PATH", str(fixture))
+
+        counts = await refresh_product_cycles(db, ["python", "nope"])
+
+        assert counts == {"updated": 1, "unchanged": 0, "not_found": 1, "failed": 0}
+        assert (await db.get(EolProductCycles, "python")).cycles == PYTHON
+
+    async def test_stale_products_cover_linked_cards(self, db):
+        await create_card_type(db, key="ITComponent", label="IT Component")
+        await create_card(db, card_type="ITComponent", attributes={"eol_product": "nodejs"})
+        db.add(
+            EolProductCycles(product="python", cycles=PYTHON, checked_at=datetime.now(timezone.utc))
+        )
+        db.add(
+            EolProductCycles(
+                product="java",
+                cycles=[],
+                checked_at=datetime.now(timezone.utc) - timedelta(days=2),
+            )
+        )
+        await db.flush()
+
+        assert await stale_products(db) == ["java", "nodejs"]
+
+
+class TestRead:
+    async def test_serves_stored_cycles_and_queues_missing_or_stale(self, db):
+        db.add(
+            EolProductCycles(product="python", cycles=PYTHON, checked_at=datetime.now(timezone.utc))
+        )
+        await db.flush()
+
+        assert await read_product_cycles(db, ["python"]) == {"python": PYTHON}
+        assert await _queued_refreshes(db) == 0
+
+        assert await read_product_cycles(db, ["python", "nodejs"]) == {"python": PYTHON}
+        assert await _queued_refreshes(db) == 1
+
+        await _age(db, "python")
+        assert await read_product_cycles(db, ["python"]) == {"python": PYTHON}
+        # The queued job covers every stale product; no second one.
+        assert await _queued_refreshes(db) == 1
+
+    async def test_queued_job_fills_the_table(self, db, monkeypatch, tmp_path):
+        from contextlib import asynccontextmanager
+
+        from app.services import background_jobs as jobs_mod
+        from app.services import job_handlers as handlers_mod
+
+        fixture = tmp_path / "eol.json"
+        fixture.write_text(json.dumps({"python": PYTHON}))
+        monkeypatch.setattr(settings, "EOL_FIXTURE_PATH", str(fixture))
+
+        @asynccontextmanager
+        async def fake_session():
+            yield db
+
+        monkeypatch.setattr(jobs_mod, "async_session", fake_session)
+        monkeypatch.setattr(handlers_mod, "async_session", fake_session)
+        await create_card_type(db, key="ITComponent", label="IT Component")
+        await create_card(db, card_type="ITComponent", attributes={"eol_product": "python"})
+
+        assert await read_product_cycles(db, ["python"]) == {}
+        await db.commit()
+        worker = jobs_mod.JobWorker(slots=1)
+        while await worker.tick():
+            await worker.join()
+
+        job = (
+            await db.execute(
+                select(BackgroundJob).where(BackgroundJob.kind == "eol.refresh_cycles")
+            )
+        ).scalar_one()
+        assert job.status == "succeeded"
+        assert job.result["updated"] == 1
+        assert await read_product_cycles(db, ["python"]) == {"python": PYTHON}
@@ -0,0 +1,96 @@
+"""Tests for the monthly events partitions (app/services/event_partitions.py).
+
+The test schema is built by ``create_all``, which leaves ``events`` with only
+its default partition — the state every test here starts from.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+
+from app.models.event import Event
+from app.services.event_partitions import (
+    add_months,
+    apply_event_retention,
+    ensure_event_partitions,
+    list_event_partitions,
+)
+
+NOW = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+
+async def _add_event(db, when: datetime, event_type: str = "card.updated") -> Event:
+    event = Event(event_type=event_type, data={"at": when.isoformat()}, created_at=when)
+    db.add(event)
+    await db.flush()
+    return event
+
+
+async def _partition_of(db, event: Event) -> str:
+    return (
+        await db.execute(
+            sa.text("SELECT tableoid::regclass::text FROM events WHERE id = :id"),
+            {"id": event.id},
+        )
+    ).scalar_one()
+
+
+def test_add_months_crosses_years():
+    month = datetime(2026, 11, 1, tzinfo=timezone.utc)
+    assert add_months(month, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+async def test_ensure_creates_months_ahead_and_moves_stray_rows(db):
+    stray = await _add_event(db, datetime(2024, 3, 10, tzinfo=timezone.utc))
+    assert await _partition_of(db, stray) == "events_default"
+
+    created = await ensure_event_partitions(db, now=NOW, ahead=2)
+    assert created == ["events_y2024m03", "events_y2026m10", "events_y2026m11", "events_y2026m12"]
+    assert await _partition_of(db, stray) == "events_y2024m03"
+    assert await ensure_event_partitions(db, now=NOW, ahead=2) == []
+
+    current = await _add_event(db, NOW)
+    assert await _partition_of(db, current) == "events_y2026m10"
+
+
+async def test_retention_archives_whole_months_to_gzip(db, tmp_path):
+    old = await _add_event(db, datetime(2025, 1, 31, 23, tzinfo=timezone.utc), "card.created")
+    kept = await _add_event(db, datetime(2025, 11, 2, tzinfo=timezone.utc))
+    await ensure_event_partitions(db, now=NOW, ahead=0)
+
+    # Twelve months including October 2026 reach back to November 2025.
+    handled = await apply_event_retention(
+        db, months=12, mode="archive", archive_dir=tmp_path, now=NOW
+    )
+    assert handled == ["events_y2025m01"]
+
+    with gzip.open(tmp_path / "events_y2025m01.jsonl.gz", "rt", encoding="utf-8") as fh:
+        lines = [json.loads(line) for line in fh]
+    assert [(line["id"], line["event_type"]) for line in lines] == [(str(old.id), "card.created")]
+    assert not list(tmp_path.glob("*.partial"))
+
+    remaining = set((await db.execute(sa.select(Event.id))).scalars())
+    assert old.id not in remaining and kept.id in remaining
+    assert "events_y2025m01" not in await list_event_partitions(db)
+    assert (await db.execute(sa.text("SELECT to_regclass('events_y2025m01')"))).scalar() is None
+
+
+async def test_retention_detach_keeps_the_table(db, tmp_path):
+    old = await _add_event(db, datetime(2024, 6, 1, tzinfo=timezone.utc))
+    await ensure_event_partitions(db, now=NOW, ahead=0)
+
+    assert await apply_event_retention(db, months=0, archive_dir=tmp_path, now=NOW) == []
+    handled = await apply_event_retention(
+        db, months=3, mode="detach", archive_dir=tmp_path, now=NOW
+    )
+    assert handled == ["events_y2024m06"]
+    assert not list(tmp_path.iterdir())
+
+    assert (await db.execute(sa.select(Event).where(Event.id == old.id))).first() is None
+    detached = await db.execute(sa.text("SELECT count(*) FROM events_y2024m06_detached"))
+    assert detached.scalar_one() == 1
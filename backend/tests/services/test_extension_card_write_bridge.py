@@ -1,5 +1,6 @@
 """The SDK inventory data bridge, write half (SDK 1.5): guardrails, audit
-provenance, batching, dry-run, and the merge semantics.
+provenance, batching, dry-run, and the merge semantics; and the bulk
+writes added in SDK 1.8.
 
 Same harness as the read-half tests; writes additionally assert the
 ``ext:{key}`` mutation-batch trail and the ``data["ext"]`` event stamp the
@@ -15,6 +16,7 @@ import pytest
 from sqlalchemy import select
 
 from app.config import settings
+from app.core.query_profiler import profile_queries
 from app.models.card import Card
 from app.models.event import Event
 from app.models.mutation_batch import MutationBatch
@@ -313,3 +315,132 @@ class TestBatching:
         await bridge.create_card(type="Application", name="Rate 2")
         with pytest.raises(ExtensionDataError, match="rate cap"):
             await bridge.create_card(type="Application", name="Rate 3")
+
+
+class TestBulkWrites:
+    async def test_update_cards_merges_in_one_audited_batch(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        a = await create_card(db, card_type="Application", name="A", attributes={"keep": 1})
+        b = await create_card(db, card_type="Application", name="B")
+        bridge = ExtensionData(KEY)
+        updated = await bridge.update_cards(
+            [(str(b.id), {"description": "synced"}), (str(a.id), {"attributes": {"new": 2}})]
+        )
+        assert [c.name for c in updated] == ["B", "A"]
+        assert updated[0].description == "synced"
+        assert updated[1].attributes == {"keep": 1, "new": 2}
+        batches = await _batches(db)
+        assert len(batches) == 1 and batches[0].committed_at is not None
+        events = (
+            (await db.execute(select(Event).where(Event.event_type == "card.updated")))
+            .scalars()
+            .all()
+        )
+        assert {e.card_id for e in events} == {a.id, b.id}
+        assert all(e.batch_id == batches[0].id and e.data["ext"] == KEY for e in events)
+
+    async def test_validation_is_against_one_schema_snapshot(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        bridge = ExtensionData(KEY)
+
+        async def schema_reads(n: int) -> int:
+            cards = [
+                await create_card(db, card_type="Application", name=f"Snap {n}-{i}")
+                for i in range(n)
+            ]
+            with profile_queries() as profile:
+                await bridge.update_cards(
+                    [(str(c.id), {"attributes": {"criticality": "high"}}) for c in cards]
+                )
+            return sum("fields_schema" in s for s in profile.statements)
+
+        assert await schema_reads(2) == await schema_reads(8)
+
+    async def test_bad_row_fails_the_whole_call(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        a = await create_card(db, card_type="Application", name="A")
+        b = await create_card(db, card_type="Application", name="B")
+        bridge = ExtensionData(KEY)
+        with pytest.raises(ExtensionDataError, match="Invalid value"):
+            await bridge.update_cards(
+                [
+                    (str(a.id), {"name": "A2"}),
+                    (str(b.id), {"attributes": {"criticality": "nope"}}),
+                ]
+            )
+        events = (await db.execute(select(Event))).scalars().all()
+        assert all(e.event_type != "card.updated" for e in events)
+
+    async def test_duplicate_and_refused_rows_are_rejected_up_front(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        a = await create_card(db, card_type="Application", name="A")
+        bridge = ExtensionData(KEY)
+        with pytest.raises(ExtensionDataError, match="more than once"):
+            await bridge.update_cards([(str(a.id), {"name": "x"}), (str(a.id), {"name": "y"})])
+        with pytest.raises(ExtensionDataError, match="not writable"):
+            await bridge.update_cards([(str(a.id), {"status": "ARCHIVED"})])
+        assert await _batches(db) == []
+
+    async def test_every_row_counts_against_the_batch_cap(self, db, env, monkeypatch):
+        load_registry(grants=["core.cards.write"])
+        monkeypatch.setattr(settings, "EXTENSION_MAX_WRITES_PER_BATCH", 2)
+        cards = [await create_card(db, card_type="Application", name=f"C{i}") for i in range(3)]
+        bridge = ExtensionData(KEY)
+        with pytest.raises(ExtensionDataError, match="per-batch write cap"):
+            await bridge.update_cards([(str(c.id), {"description": "d"}) for c in cards])
+        with pytest.raises(ExtensionDataError, match="per-batch write cap"):
+            async with bridge.batch("sync"):
+                await bridge.update_card(str(cards[0].id), {"description": "d"})
+                await bridge.update_cards([(str(c.id), {"description": "e"}) for c in cards[1:]])
+
+    async def test_update_cards_dry_run_changes_nothing(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        a = await create_card(db, card_type="Application", name="Stays")
+        bridge = ExtensionData(KEY)
+        preview = await bridge.update_cards([(str(a.id), {"name": "Renamed"})], dry_run=True)
+        assert preview[0].name == "Renamed"
+        await db.refresh(a)
+        assert a.name == "Stays"
+        assert await _batches(db) == []
+
+    async def test_upsert_relations_creates_and_merges(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        app = await create_card(db, card_type="Application", name="Src")
+        itcs = [await create_card(db, card_type="ITComponent", name=f"T{i}") for i in range(3)]
+        bridge = ExtensionData(KEY)
+        first = await bridge.upsert_relation(
+            type="app_to_itc", source_id=str(app.id), target_id=str(itcs[0].id)
+        )
+        rels = await bridge.upsert_relations(
+            [
+                {
+                    "type": "app_to_itc",
+                    "source_id": str(app.id),
+                    "target_id": str(t.id),
+                    "description": "bulk",
+                }
+                for t in itcs
+            ]
+        )
+        assert rels[0].id == first.id
+        assert [r.target_id for r in rels] == [str(t.id) for t in itcs]
+        rows = list((await db.execute(select(Relation))).scalars().all())
+        assert len(rows) == 3 and {r.description for r in rows} == {"bulk"}
+
+    async def test_upsert_relations_checks_every_endpoint(self, db, env):
+        load_registry(grants=["core.cards.write"])
+        app = await create_card(db, card_type="Application", name="Src")
+        bridge = ExtensionData(KEY)
+        ghost = "00000000-0000-0000-0000-000000000000"
+        with pytest.raises(ExtensionDataError, match="not found"):
+            await bridge.upsert_relations(
+                [{"type": "app_to_itc", "source_id": str(app.id), "target_id": ghost}]
+            )
+        with pytest.raises(ExtensionDataError, match="take type"):
+            await bridge.upsert_relations([{"type": "app_to_itc", "source": str(app.id)}])
+        with pytest.raises(ExtensionDataError, match="need target_id"):
+            await bridge.upsert_relations([{"type": "app_to_itc", "source_id": str(app.id)}])
+        with pytest.raises(ExtensionDataError, match="need source_id"):
+            await bridge.upsert_relations(
+                [{"type": "app_to_itc", "source_id": app.id, "target_id": ghost}]
+            )
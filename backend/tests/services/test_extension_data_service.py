@@ -1,5 +1,6 @@
 """The SDK inventory data bridge, read half (SDK 1.5): grant gating,
-wire-shaped payloads, and GET /cards filter parity.
+wire-shaped payloads, and GET /cards filter parity; and the bulk and
+streaming reads added in SDK 1.7.
 
 Same harness as the todos/users bridge tests: the bridge opens its own
 sessions via ``async_session`` (patched to the savepoint-rollback test
@@ -15,11 +16,12 @@ from pathlib import Path
 
 import pytest
 
+from app.core.query_profiler import profile_queries
 from app.services.extensions import data_service as bridge_mod
 from app.services.extensions.data_service import ExtensionData
 from app.services.extensions.license import Entitlement, LicenseDocument
 from app.services.extensions.registry import ExtensionInfo, extension_registry
-from app.services.extensions.sdk import ExtCard, ExtensionPermissionError
+from app.services.extensions.sdk import ExtCard, ExtensionDataError, ExtensionPermissionError
 from tests.conftest import (
     create_card,
     create_card_type,
@@ -116,6 +118,13 @@ class TestGrantGating:
             await bridge.get_card_types()
         with pytest.raises(ExtensionPermissionError):
             await bridge.get_relation_types()
+        with pytest.raises(ExtensionPermissionError):
+            await bridge.get_cards([str(env["app"].id)])
+        with pytest.raises(ExtensionPermissionError):
+            await bridge.get_relations_for([str(env["app"].id)])
+        with pytest.raises(ExtensionPermissionError):
+            async for _ in bridge.iter_cards():
+                pass
 
     async def test_other_core_grants_do_not_imply_cards(self, db, env):
         load_registry(grants=["core.todos.read", "core.users.read"])
@@ -226,6 +235,63 @@ class TestGetRelations:
         assert await ExtensionData(KEY).get_relations("nope") == []
 
 
+class TestBulkReads:
+    async def test_get_cards_keeps_order_in_one_query(self, db, env):
+        load_registry(grants=["core.cards.read"])
+        asked = [str(env["itc"].id), "nope", str(env["app"].id), str(env["itc"].id)]
+        with profile_queries() as profile:
+            cards = await ExtensionData(KEY).get_cards(asked)
+        assert [c.name for c in cards] == ["PostgreSQL", "Billing Service"]
+        assert profile.total == 1
+
+    async def test_get_cards_caps_the_id_count(self, db, env, monkeypatch):
+        load_registry(grants=["core.cards.read"])
+        monkeypatch.setattr(bridge_mod, "MAX_BULK_IDS", 2)
+        with pytest.raises(ExtensionDataError):
+            await ExtensionData(KEY).get_cards([str(env["app"].id)] * 3)
+
+    async def test_iter_cards_filters_like_search(self, db, env):
+        load_registry(grants=["core.cards.read"])
+        bridge = ExtensionData(KEY)
+        names = {c.name async for c in bridge.iter_cards(type="Application")}
+        assert names == {"Billing Service", "Auth Service"}
+        names = {c.name async for c in bridge.iter_cards(include_archived=True)}
+        assert "Legacy Portal" in names
+        assert "Ghost" not in names
+
+    async def test_iter_cards_since_is_an_inclusive_keyset(self, db, env):
+        load_registry(grants=["core.cards.read"])
+        later = NOW + timedelta(days=1)
+        env["app"].updated_at = later
+        env["itc"].updated_at = later + timedelta(hours=1)
+        await db.flush()
+        synced = [c.name async for c in ExtensionData(KEY).iter_cards(since=later.isoformat())]
+        assert synced == ["Billing Service", "PostgreSQL"]
+
+    async def test_iter_cards_rejects_a_bad_since(self, db, env):
+        load_registry(grants=["core.cards.read"])
+        with pytest.raises(ExtensionDataError):
+            async for _ in ExtensionData(KEY).iter_cards(since="yesterday"):
+                pass
+
+    async def test_get_relations_for_groups_by_card(self, db, env):
+        load_registry(grants=["core.cards.read"])
+        asked = [str(env["app"].id), str(env["itc"].id), str(env["micro"].id)]
+        with profile_queries() as profile:
+            by_card = await ExtensionData(KEY).get_relations_for(asked)
+        assert profile.total == 1
+        assert [r.id for r in by_card[str(env["app"].id)]] == [str(env["rel"].id)]
+        assert [r.id for r in by_card[str(env["itc"].id)]] == [str(env["rel"].id)]
+        assert by_card[str(env["micro"].id)] == []
+
+    async def test_get_relations_for_hides_archived_endpoints(self, db, env):
+        load_registry(grants=["core.cards.read"])
+        env["itc"].status = "ARCHIVED"
+        await db.flush()
+        by_card = await ExtensionData(KEY).get_relations_for([str(env["app"].id)])
+        assert by_card == {str(env["app"].id): []}
+
+
 class TestMetamodelSnapshots:
     async def test_card_types_are_plain_dicts_excluding_hidden(self, db, env):
         load_registry(grants=["core.cards.read"])
@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
 
 import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.models.event import Event
+from app.models.extension import ExtensionEventCursor
 from app.services.event_bus import event_bus
 from app.services.extensions import events as ev_mod
 from app.services.extensions.events import (
@@ -215,3 +220,160 @@ class TestCardScope:
     def test_lapse_pauses_card_delivery(self):
         load_registry(grants=["core.events.card"], licensed=False)
         assert not _deliverable(KEY, sub("card."), msg("card.updated"))
+
+
+class TestDurableDelivery:
+    """SDK 1.6 — at-least-once delivery from the persisted events table."""
+
+    @pytest.fixture
+    async def durable(self, test_engine, monkeypatch):
+        # An event is read only once every transaction older than its own has
+        # ended, the test's own included: commit for real, clean up after.
+        session = async_sessionmaker(test_engine, expire_on_commit=False)
+        monkeypatch.setattr(ev_mod, "async_session", session)
+        load_registry(grants=["core.events.card"])
+        yield session
+        async with test_engine.begin() as conn:
+            await conn.execute(sa.delete(ExtensionEventCursor))
+            await conn.execute(sa.delete(Event))
+
+    @staticmethod
+    async def _publish(session, event_type: str, data: dict) -> None:
+        async with session() as db:
+            db.add(Event(event_type=event_type, data=data))
+            await db.commit()
+
+    async def _pump(self, handler, failures=None):
+        subs = [EventSubscription(prefix="card.", handler=handler, durable=True)]
+        ctx = ev_mod.build_context(KEY)
+        return await ev_mod.pump_durable_events(
+            KEY, subs, ctx, {} if failures is None else failures
+        )
+
+    async def _pump_until(self, handler, done, failures=None) -> int:
+        """Pump until ``done()``: transactions of other tests running in
+        parallel can hold the read horizon back for a moment."""
+        moved = 0
+        for _ in range(300):
+            moved += await self._pump(handler, failures)
+            if done():
+                return moved
+            await asyncio.sleep(0.05)
+        raise AssertionError("events were not delivered")
+
+    async def test_events_past_the_cursor_are_delivered_once(self, durable):
+        received: list[dict] = []
+
+        async def handler(ctx, message):
+            received.append(message)
+
+        assert await self._pump(handler) == 0  # first pass places the cursor
+        await self._publish(durable, "card.updated", {"id": "a"})
+        await self._publish(durable, "relation.created", {"id": "r"})
+        await self._publish(durable, "card.archived", {"id": "b", "ext": KEY})
+        await self._publish(durable, "card.created", {"id": "c"})
+
+        # The relation event is outside the prefix; the own-write event is
+        # passed over by include_self=False but still moves the cursor.
+        assert await self._pump_until(handler, lambda: len(received) == 2) == 3
+        assert [m["event"] for m in received] == ["card.updated", "card.created"]
+        assert received[0]["event_id"]
+        assert await self._pump(handler) == 0
+        assert len(received) == 2
+
+    async def test_a_failing_handler_is_retried_then_skipped(self, durable, monkeypatch):
+        monkeypatch.setattr(ev_mod.settings, "EXTENSION_EVENT_MAX_ATTEMPTS", 2)
+        calls: list[str] = []
+
+        async def flaky(ctx, message):
+            calls.append(message["event_id"])
+            raise RuntimeError("external system down")
+
+        failures: dict = {}
+        await self._pump(flaky, failures)
+        await self._publish(durable, "card.updated", {"id": "a"})
+
+        # Held at the event by the first failure, skipped on the second.
+        assert await self._pump_until(flaky, lambda: len(calls) == 1, failures) == 0
+        assert await self._pump(flaky, failures) == 1
+        assert len(calls) == 2 and calls[0] == calls[1]
+        assert failures == {}
+
+    async def test_the_cursor_survives_a_restart(self, durable):
+        received: list[str] = []
+
+        async def handler(ctx, message):
+            received.append(message["event"])
+
+        await self._pump(handler)
+        await self._publish(durable, "card.created", {"id": "a"})
+        # A fresh process: new contexts, new failure map, same stored cursor.
+        reset_contexts()
+        assert await self._pump_until(handler, lambda: len(received) == 1) == 1
+        reset_contexts()
+        assert await self._pump(handler) == 0
+        assert received == ["card.created"]
+
+    async def test_a_long_transaction_is_not_overtaken(self, durable):
+        received: list[str] = []
+
+        async def handler(ctx, message):
+            received.append(message["data"]["id"])
+
+        await self._pump(handler)
+        async with durable() as slow:
+            # Written first, committed last — well past any settle window a
+            # timestamp cursor would use.
+            slow.add(Event(event_type="card.updated", data={"id": "slow-event"}))
+            await slow.flush()
+            await self._publish(durable, "card.updated", {"id": "fast-event"})
+            assert await self._pump(handler) == 0
+            assert received == []
+            await slow.commit()
+
+        await self._pump_until(handler, lambda: len(received) == 2)
+        assert received == ["slow-event", "fast-event"]
+
+    async def test_a_held_back_consumer_names_the_open_transaction(
+        self, durable, monkeypatch, caplog
+    ):
+        monkeypatch.setattr(ev_mod.settings, "EXTENSION_EVENT_LAG_WARN_SECONDS", 0)
+
+        async def handler(ctx, message):
+            pass
+
+        await self._pump(handler)
+        async with durable() as idle:
+            idle.add(Event(event_type="card.updated", data={"id": "open"}))
+            await idle.flush()
+            await self._publish(durable, "card.updated", {"id": "waiting"})
+            with caplog.at_level(logging.WARNING, logger=ev_mod.logger.name):
+                for _ in range(100):
+                    assert await self._pump(handler) == 0
+                    if "held back" in caplog.text:
+                        break
+                    await asyncio.sleep(0.05)
+            await idle.rollback()
+
+        assert f"Durable events for extension {KEY} held back" in caplog.text
+
+    async def test_durable_subscriptions_stay_off_the_live_bus(self):
+        load_registry(grants=["core.events.card"])
+        live_and_durable = FakeInstance(
+            [
+                sub("card."),
+                EventSubscription(prefix="relation.", handler=sub().handler, durable=True),
+            ]
+        )
+        only_durable = FakeInstance(
+            [EventSubscription(prefix="card.", handler=sub().handler, durable=True)]
+        )
+
+        assert start_extension_event_dispatchers(report_for(only_durable)) == []
+        tasks = ev_mod.start_durable_event_consumers(report_for(live_and_durable))
+        try:
+            assert [t.get_name() for t in tasks] == [f"ext:{KEY}:durable-events"]
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
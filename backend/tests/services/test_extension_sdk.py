@@ -15,8 +15,8 @@ from app.database import get_db as core_get_db
 from app.services.extensions import sdk
 
 
-def test_sdk_version_is_1_5():
-    assert sdk.SDK_VERSION == "1.5"
+def test_sdk_version_is_1_8():
+    assert sdk.SDK_VERSION == "1.8"
 
 
 def test_sdk_reexports_route_dependencies_verbatim():
@@ -197,6 +197,9 @@ def test_sdk_compatibility_is_major_only():
     assert sdk.sdk_compatible("1.3")
     assert sdk.sdk_compatible("1.4")
     assert sdk.sdk_compatible("1.5")
+    assert sdk.sdk_compatible("1.6")
+    assert sdk.sdk_compatible("1.7")
+    assert sdk.sdk_compatible("1.8")
     assert not sdk.sdk_compatible("2.0")
 
 
@@ -204,6 +207,9 @@ def test_sdk_minor_newer_truth_table():
     # Newer minor on the same major → warn (still loads).
     assert sdk.sdk_minor_newer("1.9")
     # Same or older minor → no warning.
+    assert not sdk.sdk_minor_newer("1.8")
+    assert not sdk.sdk_minor_newer("1.7")
+    assert not sdk.sdk_minor_newer("1.6")
     assert not sdk.sdk_minor_newer("1.5")
     assert not sdk.sdk_minor_newer("1.4")
     assert not sdk.sdk_minor_newer("1.3")
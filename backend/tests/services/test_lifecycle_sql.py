@@ -0,0 +1,72 @@
+"""The SQL lifecycle expressions agree with the Python helpers."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.services.lifecycle import (
+    current_lifecycle_phase,
+    lifecycle_phase_sql,
+    lifecycle_rank,
+    lifecycle_rank_sql,
+    manual_eol_status_sql,
+)
+
+TODAY = datetime.now(timezone.utc).date()
+
+
+def _iso(days: int) -> str:
+    return date.fromordinal(TODAY.toordinal() + days).isoformat()
+
+
+LIFECYCLES = [
+    None,
+    {},
+    {"plan": _iso(10)},
+    {"plan": _iso(-30), "phaseIn": _iso(10)},
+    {"plan": _iso(-30), "active": _iso(-10), "endOfLife": _iso(400)},
+    {"active": _iso(-10), "phaseOut": _iso(-1), "endOfLife": _iso(100)},
+    {"active": _iso(-300), "endOfLife": _iso(0)},
+    {"active": f"{_iso(-5)}T08:30:00", "phaseOut": ""},
+    {"active": "someday", "phaseIn": _iso(-2)},
+    {"phaseOut": None, "endOfLife": _iso(30)},
+    # Impossible dates are skipped, not compared as text.
+    {"active": "2024-13-45", "plan": _iso(-5)},
+    {"endOfLife": "2023-02-29", "phaseOut": "2024-02-29T12:00:00", "active": _iso(-40)},
+    {"endOfLife": "0000-01-01", "active": "2024-04-31"},
+]
+
+
+@pytest.mark.parametrize("lifecycle", LIFECYCLES)
+async def test_phase_and_rank_match_python(db, lifecycle):
+    column = literal(lifecycle, JSONB)
+    phase, rank = (
+        await db.execute(select(lifecycle_phase_sql(column), lifecycle_rank_sql(column)))
+    ).one()
+    assert phase == current_lifecycle_phase(lifecycle)
+    assert rank == lifecycle_rank(lifecycle)
+
+
+@pytest.mark.parametrize(
+    ("lifecycle", "expected"),
+    [
+        (None, "unknown"),
+        ({}, "unknown"),
+        ({"endOfLife": _iso(-1)}, "eol"),
+        ({"endOfLife": _iso(0)}, "eol"),
+        ({"endOfLife": _iso(90)}, "approaching"),
+        ({"endOfLife": _iso(400)}, "supported"),
+        ({"endOfLife": _iso(400), "phaseOut": _iso(-1)}, "approaching"),
+        ({"endOfLife": "2030-01-01T00:00:00"}, "supported"),
+        ({"active": _iso(-10)}, "supported"),
+        ({"endOfLife": "2024-13-45"}, "supported"),
+        ({"endOfLife": "2023-02-29", "phaseOut": "2023-02-30"}, "supported"),
+    ],
+)
+async def test_manual_eol_status(db, lifecycle, expected):
+    status = await db.scalar(select(manual_eol_status_sql(literal(lifecycle, JSONB))))
+    assert status == expected
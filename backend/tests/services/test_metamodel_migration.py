@@ -0,0 +1,124 @@
+"""Compiled attribute migrations for metamodel edits."""
+
+from __future__ import annotations
+
+from app.core.query_profiler import profile_queries
+from app.services import metamodel_migration
+from app.services.card_counts import CardCountCache
+from app.services.metamodel_migration import (
+    AttributeMigration,
+    plan_attribute_migration,
+    preview_attribute_migration,
+    run_attribute_migration,
+)
+from app.services.relation_rollup import RelationSummaryCache
+from app.services.report_cache import LandscapeVersion
+from tests.conftest import create_card, create_card_type
+
+
+def _schema(*fields):
+    return [{"section": "General", "fields": list(fields)}]
+
+
+def _select(key, *options, kind="single_select"):
+    return {"key": key, "type": kind, "options": [{"key": o, "label": o} for o in options]}
+
+
+class TestPlan:
+    def test_diff_of_fields_and_options(self):
+        old = _schema(
+            {"key": "note", "type": "text"},
+            _select("tier", "gold", "bronze"),
+            _select("regions", "eu", "us", kind="multiple_select"),
+        )
+        new = _schema(_select("tier", "gold"), _select("regions", "eu", kind="multiple_select"))
+
+        plan = plan_attribute_migration(old, new)
+
+        assert plan.removed_fields == ("note",)
+        assert plan.single_select == {"tier": ("bronze",)}
+        assert plan.multiple_select == {"regions": ("us",)}
+        assert AttributeMigration.from_params(plan.to_params()) == plan
+
+    def test_extension_fields_keep_their_values(self):
+        old = _schema({"key": "rating", "type": "number", "ext": "acme"})
+        assert not plan_attribute_migration(old, _schema())
+
+    def test_still_removed_drops_what_was_added_back(self):
+        plan = AttributeMigration(("note",), {"tier": ("bronze", "silver")})
+        live = _schema({"key": "note", "type": "text"}, _select("tier", "gold", "silver"))
+
+        remaining = plan.still_removed(live)
+
+        assert remaining == AttributeMigration((), {"tier": ("bronze",)})
+
+
+class TestRun:
+    async def test_chunks_rewrite_each_card_once(self, db):
+        await create_card_type(db, key="Application", label="Application")
+        cards = [
+            await create_card(
+                db,
+                card_type="Application",
+                name=f"App {i}",
+                attributes={"note": "x", "tier": "bronze", "regions": ["eu", "us"], "keep": i},
+            )
+            for i in range(5)
+        ]
+        untouched = await create_card(
+            db, card_type="Application", name="Clean", attributes={"tier": "gold"}
+        )
+        plan = AttributeMigration(("note",), {"tier": ("bronze",)}, {"regions": ("us",)})
+        progress = []
+
+        async def on_progress(done, total):
+            progress.append((done, total))
+
+        with profile_queries() as profile:
+            changed = await run_attribute_migration(
+                db, "Application", plan, chunk_size=2, commit=False, on_progress=on_progress
+            )
+
+        assert changed == 5
+        assert progress == [(0, 5), (2, 5), (4, 5), (5, 5)]
+        updates = sum(n for s, n in profile.statements.items() if s.lstrip().startswith("UPDATE"))
+        assert updates == 3
+        for i, card in enumerate(cards):
+            await db.refresh(card)
+            assert card.attributes == {"regions": ["eu"], "keep": i}
+        await db.refresh(untouched)
+        assert untouched.attributes == {"tier": "gold"}
+        assert (await preview_attribute_migration(db, "Application", plan))["cards"] == 0
+
+    async def test_committed_chunks_move_the_caches_on(self, db, monkeypatch):
+        published: list[str] = []
+        monkeypatch.setattr(
+            metamodel_migration.cluster_bus,
+            "publish",
+            lambda topic, payload=None: published.append(topic),
+        )
+        await create_card_type(db, key="Application", label="Application")
+        for i in range(3):
+            await create_card(
+                db, card_type="Application", name=f"App {i}", attributes={"note": "x"}
+            )
+        await db.commit()
+        published.clear()
+        before = (
+            LandscapeVersion.current(),
+            CardCountCache.generation(),
+            RelationSummaryCache.generation(),
+        )
+
+        changed = await run_attribute_migration(
+            db, "Application", AttributeMigration(("note",)), chunk_size=2
+        )
+
+        assert changed == 3
+        # The raw UPDATE flushes nothing: both bumps come from the chunks.
+        assert (
+            LandscapeVersion.current(),
+            CardCountCache.generation(),
+            RelationSummaryCache.generation(),
+        ) == tuple(n + 2 for n in before)
+        assert published == ["reports.landscape", "cards.counts", "cards.relation_summary"] * 2
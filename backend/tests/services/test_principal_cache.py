@@ -0,0 +1,69 @@
+"""Tests for the short-TTL user principal cache (app/services/principal_cache.py)."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.query_profiler import profile_queries
+from app.services.principal_cache import PrincipalCache
+from tests.conftest import auth_headers, create_role, create_user
+
+
+@pytest.fixture
+async def member(db):
+    await create_role(db, key="member", label="Member", permissions={"inventory.view": True})
+    return await create_user(db, email="member@test.com", role="member")
+
+
+def _user_selects(profile) -> int:
+    return sum(n for shape, n in profile.shapes().items() if "FROM users" in shape)
+
+
+class TestPrincipalCache:
+    async def test_second_load_skips_select(self, db, member):
+        db.expunge(member)
+        with profile_queries() as first:
+            user = await PrincipalCache.load(db, member.id)
+        assert user.email == "member@test.com"
+        assert _user_selects(first) == 1
+
+        db.expunge(user)
+        with profile_queries() as second:
+            cached = await PrincipalCache.load(db, member.id)
+        assert _user_selects(second) == 0
+        assert cached.email == "member@test.com"
+        assert cached in db
+
+    async def test_update_evicts(self, db, member):
+        await PrincipalCache.load(db, member.id)
+        assert member.id in PrincipalCache._entries
+        member.display_name = "Renamed"
+        await db.flush()
+        assert member.id not in PrincipalCache._entries
+
+    async def test_cached_instance_writes_through(self, db, member):
+        await PrincipalCache.load(db, member.id)
+        db.expunge(member)
+        cached = await PrincipalCache.load(db, member.id)
+        cached.locale = "de"
+        await db.flush()
+        db.expunge(cached)
+        fresh = await PrincipalCache.load(db, member.id)
+        assert fresh.locale == "de"
+
+    async def test_ttl_zero_disables(self, db, member, monkeypatch):
+        from app.services import principal_cache
+
+        monkeypatch.setattr(principal_cache.settings, "USER_PRINCIPAL_CACHE_TTL", 0)
+        await PrincipalCache.load(db, member.id)
+        assert PrincipalCache._entries == {}
+
+
+class TestGetCurrentUser:
+    async def test_deactivation_takes_effect(self, client, db, member):
+        resp = await client.get("/api/v1/auth/me", headers=auth_headers(member))
+        assert resp.status_code == 200
+        member.is_active = False
+        await db.flush()
+        resp = await client.get("/api/v1/auth/me", headers=auth_headers(member))
+        assert resp.status_code == 401
@@ -0,0 +1,65 @@
+"""Tests for the changed-only element upsert (app/services/process_elements.py)."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from app.models.process_element import ProcessElement
+from app.services.bpmn_parser import ExtractedElement
+from app.services.process_elements import upsert_extracted_elements
+from tests.conftest import create_card, create_card_type
+
+
+def _task(bpmn_id: str, name: str, order: int) -> ExtractedElement:
+    return ExtractedElement(
+        bpmn_element_id=bpmn_id,
+        element_type="task",
+        name=name,
+        documentation=None,
+        lane_name=None,
+        is_automated=False,
+        sequence_order=order,
+    )
+
+
+async def test_only_changed_elements_are_written(db):
+    await create_card_type(db, key="BusinessProcess", label="Business Process")
+    process = await create_card(db, card_type="BusinessProcess", name="Order to Cash")
+    app = await create_card(db, name="ERP")
+
+    first = [_task("T1", "Pick", 0), _task("T2", "Pack", 1), _task("T3", "Ship", 2)]
+    changes = await upsert_extracted_elements(db, process.id, first)
+    assert (changes.added, changes.updated, changes.removed) == (3, 0, 0)
+    await db.flush()
+    linked = (
+        await db.execute(select(ProcessElement).where(ProcessElement.bpmn_element_id == "T1"))
+    ).scalar_one()
+    linked.application_id = app.id
+    await db.flush()
+
+    assert await upsert_extracted_elements(db, process.id, first) == type(changes)()
+
+    second = [_task("T1", "Pick items", 0), _task("T2", "Pack", 1), _task("T4", "Bill", 2)]
+    changes = await upsert_extracted_elements(db, process.id, second)
+    assert (changes.added, changes.updated, changes.removed) == (1, 1, 1)
+    await db.flush()
+
+    process_id, app_id = process.id, app.id
+    db.expire_all()
+    rows = (
+        (
+            await db.execute(
+                select(ProcessElement)
+                .where(ProcessElement.process_id == process_id)
+                .order_by(ProcessElement.sequence_order)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert [(r.bpmn_element_id, r.name) for r in rows] == [
+        ("T1", "Pick items"),
+        ("T2", "Pack"),
+        ("T4", "Bill"),
+    ]
+    assert rows[0].application_id == app_id
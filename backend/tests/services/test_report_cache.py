@@ -0,0 +1,84 @@
+"""Tests for the report response cache (app/services/report_cache.py)."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.query_profiler import profile_queries
+from app.services.report_cache import LandscapeVersion, ReportCache, report_key
+from tests.conftest import (
+    auth_headers,
+    create_card,
+    create_card_type,
+    create_role,
+    create_user,
+)
+
+
+@pytest.fixture
+async def env(db):
+    await create_role(db, key="admin", label="Admin", permissions={"*": True})
+    await create_role(db, key="viewer", label="Viewer", permissions={"reports.ea_dashboard": True})
+    await create_card_type(db, key="Application", label="Application")
+    admin = await create_user(db, email="admin@test.com", role="admin")
+    viewer = await create_user(db, email="viewer@test.com", role="viewer")
+    return {"admin": admin, "viewer": viewer}
+
+
+async def _roadmap(client, user):
+    resp = await client.get("/api/v1/reports/roadmap", headers=auth_headers(user))
+    assert resp.status_code == 200
+    return resp.json()
+
+
+class TestReportCache:
+    async def test_repeat_view_is_a_cache_hit(self, client, db, env):
+        await create_card(db, name="App", lifecycle={"active": "2024-01-01"})
+        first = await _roadmap(client, env["admin"])
+
+        with profile_queries() as profile:
+            again = await _roadmap(client, env["admin"])
+        assert again == first
+        assert not any("FROM cards" in shape for shape in profile.shapes())
+
+    async def test_a_card_write_moves_the_version(self, client, db, env):
+        await create_card(db, name="First", lifecycle={"active": "2024-01-01"})
+        assert len((await _roadmap(client, env["admin"]))["items"]) == 1
+        version = LandscapeVersion.current()
+
+        await create_card(db, name="Second", lifecycle={"active": "2024-01-01"})
+        assert LandscapeVersion.current() > version
+        assert len((await _roadmap(client, env["admin"]))["items"]) == 2
+
+    async def test_permission_shapes_do_not_share_entries(self, client, db, env):
+        await create_card(db, name="App", lifecycle={"active": "2024-01-01"})
+        await _roadmap(client, env["admin"])
+        await _roadmap(client, env["viewer"])
+        assert len(ReportCache._entries) == 2
+
+    async def test_a_refused_caller_never_finds_an_entry(self, client, db, env):
+        await create_role(db, key="nobody", label="Nobody", permissions={})
+        nobody = await create_user(db, email="nobody@test.com", role="nobody")
+        await _roadmap(client, env["admin"])
+        resp = await client.get("/api/v1/reports/roadmap", headers=auth_headers(nobody))
+        assert resp.status_code == 403
+
+
+def test_key_normalizes_repeatable_parameters():
+    a = report_key("matrix", {"attr": ["x:1", "y:2"], "row_type": "A"}, [True], 1)
+    b = report_key("matrix", {"row_type": "A", "attr": ["y:2", "x:1"]}, [True], 1)
+    assert a == b
+    assert a != report_key("matrix", {"attr": ["x:1", "y:2"], "row_type": "A"}, [True], 2)
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    from app.services import report_cache
+
+    monkeypatch.setattr(report_cache.settings, "REPORT_CACHE_SIZE", 2)
+    ReportCache.put("a", 1)
+    ReportCache.put("b", 2)
+    assert ReportCache.get("a") == 1
+    ReportCache.put("c", 3)
+    assert ReportCache.get("b") is None
+    assert ReportCache.get("a") == 1
+    assert ReportCache.get("c") == 3
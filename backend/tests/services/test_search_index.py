@@ -0,0 +1,69 @@
+"""Tests for the indexes behind free-text search (app/services/search_index.py).
+
+The tsvector side is core Postgres and always present; the trigram side
+depends on the server offering ``pg_trgm``, so those assertions adapt to
+whichever the test database has.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from app.models.card import Card
+from app.services.search_index import TRIGRAM_COLUMNS, ensure_trigram_indexes, trigram_index_name
+from app.services.search_rank import search_match
+from tests.conftest import create_card, create_card_type
+
+
+async def _plan(db, stmt) -> str:
+    await db.execute(sa.text("SET LOCAL enable_seqscan = off"))
+    compiled = stmt.compile(db.bind, compile_kwargs={"literal_binds": True})
+    rows = (await db.execute(sa.text(f"EXPLAIN {compiled}"))).scalars().all()
+    return "\n".join(rows)
+
+
+async def test_search_vector_is_maintained_on_write(db):
+    await create_card_type(db, key="Application", label="Application")
+    card = await create_card(db, card_type="Application", name="Ledger")
+    card.alias = "General Accounting"
+    await db.flush()
+
+    stmt = sa.select(Card.id).where(search_match("accounting general", vector=Card.search_vector))
+    assert (await db.execute(stmt)).scalars().all() == [card.id]
+
+
+async def test_multi_word_search_uses_the_vector_index(db):
+    stmt = sa.select(Card.id).where(search_match("payroll work", vector=Card.search_vector))
+    assert "ix_cards_search_vector" in await _plan(db, stmt)
+
+
+async def test_single_term_does_not_query_the_vector(db):
+    clause = search_match("payroll", Card.name, vector=Card.search_vector)
+    assert "to_tsquery" not in str(clause.compile())
+
+
+async def test_trigram_indexes_are_created_when_pg_trgm_is_available(db):
+    conn = await db.connection()
+    installed = await conn.run_sync(ensure_trigram_indexes)
+    existing = set(
+        (
+            await db.execute(
+                sa.text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+            )
+        )
+        .scalars()
+        .all()
+    )
+    expected = {
+        trigram_index_name(table, column)
+        for table, columns in TRIGRAM_COLUMNS.items()
+        for column in columns
+    }
+    if not installed:
+        assert not expected & existing
+        return
+    assert expected <= existing
+    # Idempotent: a second startup finds everything in place.
+    assert await conn.run_sync(ensure_trigram_indexes)
+    stmt = sa.select(Card.id).where(search_match("work", Card.name))
+    assert "ix_cards_name_trgm" in await _plan(db, stmt)
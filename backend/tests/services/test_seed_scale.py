@@ -0,0 +1,67 @@
+"""Tests for the scale-benchmark seeder (app/services/seed_scale.py)."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.card import Card
+from app.models.relation import Relation
+from app.models.relation_type import RelationType
+from app.services.seed import seed_metamodel
+from app.services.seed_scale import ScaleProfile, seed_scale_workspace
+from tests.conftest import create_user
+
+_TINY = ScaleProfile(
+    cards=300,
+    relations=600,
+    capability_depth=3,
+    capability_fanout=3,
+    diagrams=3,
+    cards_per_diagram=5,
+    process_diagrams=3,
+    tag_groups=2,
+    tags_per_group=2,
+    events_per_card=1,
+)
+
+
+@pytest.fixture
+async def seeded(db):
+    await seed_metamodel(db)
+    admin = await create_user(db, email="bench@test.com", role="admin")
+    counts = await seed_scale_workspace(db, _TINY, admin_id=admin.id)
+    return counts
+
+
+class TestSeedScaleWorkspace:
+    async def test_respects_profile_size(self, db, seeded):
+        assert seeded["cards"] <= _TINY.cards
+        assert seeded["cards"] > _TINY.cards * 0.9
+        assert seeded["relations"] == _TINY.relations
+        assert (await db.execute(select(func.count(Card.id)))).scalar() == seeded["cards"]
+
+    async def test_capability_tree_depth(self, seeded):
+        assert seeded["max_capability_level"] == _TINY.capability_depth
+
+    async def test_relations_match_their_type(self, db, seeded):
+        rows = await db.execute(
+            select(RelationType.source_type_key, RelationType.target_type_key, Card.type)
+            .select_from(Relation)
+            .join(RelationType, RelationType.key == Relation.type)
+            .join(Card, Card.id == Relation.source_id)
+        )
+        assert all(source == card_type for source, _, card_type in rows)
+
+    async def test_deterministic_ids(self, db, seeded):
+        first = sorted(str(i) for i in (await db.execute(select(Card.id))).scalars())
+        await db.rollback()
+        await seed_metamodel(db)
+        admin = await create_user(db, email="bench@test.com", role="admin")
+        await seed_scale_workspace(db, _TINY, admin_id=admin.id)
+        second = sorted(str(i) for i in (await db.execute(select(Card.id))).scalars())
+        assert first == second
+
+    async def test_refuses_non_empty_inventory(self, db, seeded):
+        with pytest.raises(RuntimeError, match="empty inventory"):
+            await seed_scale_workspace(db, _TINY)
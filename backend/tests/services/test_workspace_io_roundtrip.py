@@ -427,6 +427,81 @@ async def test_diagram_with_card_link_roundtrips(db):
     assert any(row.diagram_id == diag_id and row.card_id == card.id for row in links)
 
 
+async def test_file_attachment_bytes_roundtrip_through_blob_store(db):
+    """Attachment bytes live in the blob store, yet the bundle still carries
+    them as a ``data__asset`` file and re-import restores the hash."""
+    from app.models.file_attachment import FileAttachment
+    from app.services.blob_store import get_blob_store
+
+    user = await create_user(db, email="att@test.com", role="admin")
+    await create_card_type(db, key="Application", label="Application")
+    card = await create_card(db, card_type="Application", name="Attached App", user_id=user.id)
+    digest = await get_blob_store().put(b"%PDF-roundtrip")
+    attachment = FileAttachment(
+        card_id=card.id,
+        name="spec.pdf",
+        mime_type="application/pdf",
+        size=14,
+        content_hash=digest,
+        created_by=user.id,
+    )
+    db.add(attachment)
+    await db.flush()
+    att_id = attachment.id
+
+    raw = await build_bundle(db)
+    _, _, assets = bundle_io.unpack(raw)
+    assert assets[f"FileAttachments/{att_id}__spec.pdf"] == b"%PDF-roundtrip"
+
+    await db.execute(delete(FileAttachment).where(FileAttachment.id == att_id))
+    await db.flush()
+    result = await apply_bundle(db, parse_bundle(raw), user)
+    assert result.total_failed == 0, result.as_dict()
+    restored = (
+        await db.execute(select(FileAttachment).where(FileAttachment.id == att_id))
+    ).scalar_one()
+    assert restored.content_hash == digest
+    assert await get_blob_store().read(digest) == b"%PDF-roundtrip"
+
+
+async def test_process_diagram_delta_versions_roundtrip(db):
+    """A delta version travels as stored and is rebuilt against its snapshot
+    after re-import."""
+    from app.models.process_diagram import ProcessDiagram
+    from app.services.diagram_versions import diagram_xml, encode_delta
+
+    user = await create_user(db, email="bpm@test.com", role="admin")
+    await create_card_type(db, key="BusinessProcess", label="Business Process")
+    process = await create_card(db, card_type="BusinessProcess", name="Delta", user_id=user.id)
+    base_xml = "<bpmn>\n  <task id='a'/>\n</bpmn>\n"
+    new_xml = "<bpmn>\n  <task id='b'/>\n</bpmn>\n"
+    snapshot = ProcessDiagram(process_id=process.id, version=1, bpmn_xml=base_xml)
+    db.add(snapshot)
+    await db.flush()
+    delta = ProcessDiagram(
+        process_id=process.id,
+        version=2,
+        bpmn_delta=encode_delta(base_xml, new_xml),
+        delta_base_id=snapshot.id,
+    )
+    db.add(delta)
+    await db.flush()
+    delta_id = delta.id
+
+    raw = await build_bundle(db)
+    await db.execute(delete(ProcessDiagram))
+    await db.flush()
+    db.expunge_all()
+
+    result = await apply_bundle(db, parse_bundle(raw), user)
+    assert result.total_failed == 0, result.as_dict()
+    restored = (
+        await db.execute(select(ProcessDiagram).where(ProcessDiagram.id == delta_id))
+    ).scalar_one()
+    assert restored.bpmn_xml is None
+    assert await diagram_xml(db, restored) == new_xml
+
+
 async def test_diagram_groups_and_favorites_roundtrip(db):
     """Diagram groups, their membership, and per-user favorites survive
     export → delete → re-import."""
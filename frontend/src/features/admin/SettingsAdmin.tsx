@@ -178,6 +178,13 @@ interface FaviconInfo {
   mime_type: string;
 }
 
+type EventRetentionMode = "archive" | "detach";
+
+interface EventRetention {
+  months: number;
+  mode: EventRetentionMode;
+}
+
 function SectionHeader({ children }: { children: React.ReactNode }) {
   return (
     <Typography
@@ -283,6 +290,15 @@ function GeneralTab() {
   );
   const [savingArchiveRetention, setSavingArchiveRetention] = useState(false);
 
+  // Event history retention (whole months; 0 = keep everything)
+  const [eventRetention, setEventRetention] = useState<EventRetention>({
+    months: 0,
+    mode: "archive",
+  });
+  const [eventRetentionInput, setEventRetentionInput] = useState<string>("0");
+  const [eventRetentionMode, setEventRetentionMode] = useState<EventRetentionMode>("archive");
+  const [savingEventRetention, setSavingEventRetention] = useState(false);
+
   // Enabled locales state
   const { enabledLocales: cachedLocales, invalidateEnabledLocales } = useEnabledLocales();
   const [enabledLocales, setEnabledLocales] = useState<SupportedLocale[]>([...SUPPORTED_LOCALES]);
@@ -329,8 +345,9 @@ function GeneralTab() {
       api.get<EmailSettings>("/settings/email"),
       api.get<LogoInfo>("/settings/logo/info"),
       api.get<FaviconInfo>("/settings/favicon/info"),
+      api.get<EventRetention>("/settings/event-retention"),
     ])
-      .then(([general, emailData, logoData, faviconData]) => {
+      .then(([general, emailData, logoData, faviconData, eventRetention]) => {
         setEmailMethod(emailData.method ?? "smtp_basic");
         setSmtpHost(emailData.smtp_host);
         setSmtpPort(emailData.smtp_port);
@@ -363,6 +380,9 @@ function GeneralTab() {
         setFiscalYearStart(general.fiscal_year_start);
         setArchiveRetentionDays(general.archive_retention_days);
         setArchiveRetentionInput(String(general.archive_retention_days));
+        setEventRetention(eventRetention);
+        setEventRetentionInput(String(eventRetention.months));
+        setEventRetentionMode(eventRetention.mode);
         setAppTitle(general.app_title || DEFAULT_APP_TITLE);
         const fmt = (DATE_FORMAT_OPTIONS as string[]).includes(general.date_format)
           ? (general.date_format as DateFormatKey)
@@ -699,6 +719,31 @@ function GeneralTab() {
     }
   };
 
+  const MAX_EVENT_RETENTION_MONTHS = 1200;
+
+  const handleEventRetentionSave = async () => {
+    const parsed = Number(eventRetentionInput);
+    if (!Number.isInteger(parsed) || parsed < 0 || parsed > MAX_EVENT_RETENTION_MONTHS) {
+      setError(t("settings.eventRetention.invalid", { max: MAX_EVENT_RETENTION_MONTHS }));
+      return;
+    }
+    setSavingEventRetention(true);
+    setError("");
+    try {
+      const saved = await api.patch<EventRetention>("/settings/event-retention", {
+        months: parsed,
+        mode: eventRetentionMode,
+      });
+      setEventRetention(saved);
+      setEventRetentionInput(String(saved.months));
+      setSnack(t("settings.eventRetention.savedSuccess"));
+    } catch (e) {
+      setError(e instanceof Error ? e.message : t("common:errors.generic"));
+    } finally {
+      setSavingEventRetention(false);
+    }
+  };
+
   const handleCurrencySave = async () => {
     setSavingCurrency(true);
     setError("");
@@ -1392,6 +1437,76 @@ function GeneralTab() {
         </Box>
       </Paper>
 
+      {/* Event history retention */}
+      <Paper sx={{ p: 3, mb: 3 }}>
+        <Box sx={{ display: "flex", alignItems: "center", mb: 2, gap: 1 }}>
+          <MaterialSymbol icon="history" size={22} color="#555" />
+          <Typography variant="h6" fontWeight={600}>
+            {t("settings.eventRetention.title")}
+          </Typography>
+          <Chip
+            label={
+              eventRetention.months === 0
+                ? t("settings.eventRetention.keepAllChip")
+                : t("settings.eventRetention.monthsChip", { count: eventRetention.months })
+            }
+            size="small"
+            sx={{ ml: 1 }}
+          />
+        </Box>
+        <Typography variant="body2" color="text.secondary" sx={{ mb: 2 }}>
+          {t("settings.eventRetention.description")}
+        </Typography>
+        <FormControlLabel
+          control={
+            <Switch
+              checked={eventRetentionInput.trim() === "0"}
+              onChange={(e) => setEventRetentionInput(e.target.checked ? "0" : "24")}
+              disabled={savingEventRetention}
+            />
+          }
+          label={t("settings.eventRetention.keepAll")}
+        />
+        <Box sx={{ display: "flex", alignItems: "flex-start", gap: 2, mt: 1, flexWrap: "wrap" }}>
+          <TextField
+            type="number"
+            size="small"
+            label={t("settings.eventRetention.months")}
+            value={eventRetentionInput}
+            onChange={(e) => setEventRetentionInput(e.target.value)}
+            disabled={savingEventRetention || eventRetentionInput.trim() === "0"}
+            inputProps={{ min: 0, max: MAX_EVENT_RETENTION_MONTHS }}
+            helperText={t("settings.eventRetention.monthsHelp")}
+            sx={{ minWidth: 180 }}
+          />
+          <TextField
+            select
+            size="small"
+            label={t("settings.eventRetention.mode")}
+            value={eventRetentionMode}
+            onChange={(e) => setEventRetentionMode(e.target.value as EventRetentionMode)}
+            disabled={savingEventRetention || eventRetentionInput.trim() === "0"}
+            sx={{ minWidth: 320 }}
+          >
+            <MenuItem value="archive">{t("settings.eventRetention.modeArchive")}</MenuItem>
+            <MenuItem value="detach">{t("settings.eventRetention.modeDetach")}</MenuItem>
+          </TextField>
+          <Button
+            variant="contained"
+            startIcon={<MaterialSymbol icon="save" size={18} />}
+            sx={{ textTransform: "none", mt: 0.25 }}
+            onClick={handleEventRetentionSave}
+            disabled={
+              savingEventRetention ||
+              (eventRetentionInput === String(eventRetention.months) &&
+                eventRetentionMode === eventRetention.mode)
+            }
+          >
+            {savingEventRetention ? t("common:labels.loading") : t("common:actions.save")}
+          </Button>
+        </Box>
+      </Paper>
+
       {/* ── Modules ───────────────────────────────────────────────── */}
       <SectionHeader>{t("settings.section.modules")}</SectionHeader>
 
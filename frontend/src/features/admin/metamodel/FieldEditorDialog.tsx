@@ -14,6 +14,7 @@ import Select from "@mui/material/Select";
 import MenuItem from "@mui/material/MenuItem";
 import FormControlLabel from "@mui/material/FormControlLabel";
 import Switch from "@mui/material/Switch";
+import Tooltip from "@mui/material/Tooltip";
 import IconButton from "@mui/material/IconButton";
 import Alert from "@mui/material/Alert";
 import MaterialSymbol from "@/components/MaterialSymbol";
@@ -266,6 +267,21 @@ export default function FieldEditorDialog({ open, field: initial, typeKey, field
             }
             label={t("metamodel.fieldEditor.required")}
           />
+          {field.type !== "multiple_select" && (
+            <Tooltip title={t("metamodel.fieldEditor.indexedHint")}>
+              <FormControlLabel
+                control={
+                  <Switch
+                    checked={!!field.indexed}
+                    onChange={(e) =>
+                      setField({ ...field, indexed: e.target.checked })
+                    }
+                  />
+                }
+                label={t("metamodel.fieldEditor.indexed")}
+              />
+            </Tooltip>
+          )}
           <Typography variant="caption" color="text.secondary">
             {t("metamodel.fieldEditor.weightMovedHint")}
           </Typography>
@@ -12,7 +12,7 @@
  * source of truth for every edge; you unlink from the child, never from here.
  * The `via` chips name that owning descendant and navigate to it.
  */
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { useNavigate } from "react-router";
 import { useTranslation } from "react-i18next";
 import Alert from "@mui/material/Alert";
@@ -72,6 +72,9 @@ export default function DescendantRelationsDrawer({
   const [total, setTotal] = useState(0);
   const [viaTotal, setViaTotal] = useState(0);
   const [page, setPage] = useState(1);
+  // Last row id of each page already loaded: the page after one is fetched
+  // from there (keyset); a page jumped to directly falls back to its number.
+  const lastIds = useRef<Record<number, string>>({});
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
@@ -81,12 +84,15 @@ export default function DescendantRelationsDrawer({
   const load = useCallback(() => {
     setLoading(true);
     setError("");
+    const after = lastIds.current[page - 1];
     api
       .get<DescendantRelationsResponse>(
         `/cards/${cardId}/descendant-relations?relation_type=${encodeURIComponent(rt.key)}` +
-          `&page=${page}&page_size=${PAGE_SIZE}`,
+          (after ? `&after_id=${after}` : `&page=${page}`) +
+          `&page_size=${PAGE_SIZE}`,
       )
       .then((res) => {
+        if (res.rows.length) lastIds.current[page] = res.rows[res.rows.length - 1].id;
         setRows(res.rows);
         setTotal(res.total);
         setViaTotal(res.via_total ?? 0);
@@ -103,7 +109,10 @@ export default function DescendantRelationsDrawer({
 
   // Reset paging when the drawer is re-opened on another relation type.
   useEffect(() => {
-    if (!open) setPage(1);
+    if (!open) {
+      setPage(1);
+      lastIds.current = {};
+    }
   }, [open]);
 
   const goTo = (id: string) => {
@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react";
 import Box from "@mui/material/Box";
+import Button from "@mui/material/Button";
 import Chip from "@mui/material/Chip";
 import Link from "@mui/material/Link";
 import Typography from "@mui/material/Typography";
@@ -15,6 +16,8 @@ import { useDateFormat } from "@/hooks/useDateFormat";
 import type { EventEntry } from "@/types";
 
 // ── Tab: History ────────────────────────────────────────────────
+const HISTORY_PAGE_SIZE = 50;
+
 const EVENT_META_ICONS: Record<string, { icon: string; color: string }> = {
   "card.created": { icon: "add_circle", color: "#4caf50" },
   "card.updated": { icon: "edit", color: "#1976d2" },
@@ -353,10 +356,38 @@ function HistoryTab({ fsId, cardType }: { fsId: string; cardType?: string }) {
     return { icon: ct.icon || "category", color: ct.color || "#9e9e9e" };
   };
   const [events, setEvents] = useState<EventEntry[]>([]);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   useEffect(() => {
-    api.get<EventEntry[]>(`/cards/${fsId}/history`).then(setEvents).catch(() => {});
+    api
+      .get<EventEntry[]>(`/cards/${fsId}/history?page_size=${HISTORY_PAGE_SIZE}`)
+      .then((page) => {
+        setEvents(page);
+        setHasMore(page.length === HISTORY_PAGE_SIZE);
+      })
+      .catch(() => {});
   }, [fsId]);
 
+  // Keyset paging: ask for what comes after the oldest event shown.
+  const loadOlder = () => {
+    const last = events[events.length - 1];
+    if (!last?.created_at) return;
+    const params = new URLSearchParams({
+      page_size: String(HISTORY_PAGE_SIZE),
+      before: last.created_at,
+      before_id: last.id,
+    });
+    setLoadingMore(true);
+    api
+      .get<EventEntry[]>(`/cards/${fsId}/history?${params}`)
+      .then((page) => {
+        setEvents((prev) => [...prev, ...page]);
+        setHasMore(page.length === HISTORY_PAGE_SIZE);
+      })
+      .catch(() => {})
+      .finally(() => setLoadingMore(false));
+  };
+
   if (events.length === 0) {
     return <Typography color="text.secondary" variant="body2">{t("history.empty")}</Typography>;
   }
@@ -453,6 +484,13 @@ function HistoryTab({ fsId, cardType }: { fsId: string; cardType?: string }) {
           </Box>
         );
       })}
+      {hasMore && (
+        <Box sx={{ display: "flex", justifyContent: "center", mt: 1 }}>
+          <Button size="small" onClick={loadOlder} disabled={loadingMore}>
+            {t("history.loadOlder")}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 }
@@ -43,8 +43,9 @@ export function searchRank(name: string, query: string): number {
  * Callers that pre-filter never see the difference; the ones that can't are
  * why this is handled here rather than at each call site:
  *   - a tree keeps a match's ancestors for context, and those score -1;
- *   - a server-searched list matches name OR description, while this ranks on
- *     name alone, so a description-only hit scores -1 too.
+ *   - a server-searched list also matches alias, reference and description
+ *     (and, for multi-word queries, the words in any order), while this ranks
+ *     on name alone, so those hits score -1 too.
  */
 export function compareByRank(query: string, locale?: string) {
   // Any value above the "contains" tier (3) works; keep it finite so the
@@ -178,6 +178,10 @@ export interface FieldDef {
   required?: boolean;
   weight?: number;
   readonly?: boolean;
+  // Backed by a database index so inventory filters, sorts and reports over
+  // it stay fast (`app/services/attribute_index.py`). Ignored for
+  // multiple_select, whose filters the attributes GIN index already serves.
+  indexed?: boolean;
   group?: string;
   column?: 0 | 1;
   translations?: TranslationMap;
@@ -464,6 +468,8 @@ export interface HierarchyData {
 export interface CardListResponse {
   items: Card[];
   total: number;
+  /** False when `total` is a planner estimate (`?count=estimated`). */
+  total_exact?: boolean;
   page: number;
   page_size: number;
 }
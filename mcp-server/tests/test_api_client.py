@@ -123,3 +123,43 @@ class TestDelete:
         with pytest.raises(httpx.HTTPStatusError) as exc_info:
             await client.delete("/stakeholders/nope")
         assert "Stakeholder not found" in str(exc_info.value)
+
+
+class TestGetRevalidation:
+    @pytest.mark.asyncio
+    async def test_etag_response_is_revalidated(self, monkeypatch):
+        from turbo_ea_mcp import api_client
+
+        monkeypatch.setattr(api_client, "_etag_cache", api_client.OrderedDict())
+        sent: list[dict] = []
+
+        class FakeAsyncClient:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def get(self, url, headers=None, params=None):
+                sent.append(dict(headers))
+                request = httpx.Request("GET", url)
+                if headers.get("If-None-Match") == '"v1"':
+                    return httpx.Response(304, headers={"ETag": '"v1"'}, request=request)
+                return httpx.Response(
+                    200, json=[{"key": "Application"}], headers={"ETag": '"v1"'}, request=request
+                )
+
+        monkeypatch.setattr(httpx, "AsyncClient", FakeAsyncClient)
+        client = TurboEAClient("tok")
+        first = await client.get("/metamodel/types")
+        second = await client.get("/metamodel/types")
+
+        assert first == second == [{"key": "Application"}]
+        assert "If-None-Match" not in sent[0]
+        assert sent[1]["If-None-Match"] == '"v1"'
+        # Another user's token never revalidates against this copy.
+        await TurboEAClient("other").get("/metamodel/types")
+        assert "If-None-Match" not in sent[2]
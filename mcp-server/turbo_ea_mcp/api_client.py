@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json as _json
+from collections import OrderedDict
 
 import httpx
 
@@ -36,6 +37,13 @@ def _raise_for_status_with_detail(resp: httpx.Response) -> None:
         ) from None
 
 
+# Bodies of GET responses that carried an ETag (the metamodel listings), by
+# (token, URL), so a repeat call revalidates with ``If-None-Match`` and a 304
+# costs no transfer. Shared by every client instance; oldest entries go first.
+_ETAG_CACHE_SIZE = 64
+_etag_cache: OrderedDict[tuple[str, str], tuple[str, bytes]] = OrderedDict()
+
+
 class TurboEAClient:
     """Thin wrapper around httpx for authenticated Turbo EA API calls."""
 
@@ -65,15 +73,26 @@ class TurboEAClient:
         return h
 
     async def get(self, path: str, params: dict | None = None) -> dict | list:
+        url = f"{self._base}{path}"
+        key = (self._token, str(httpx.URL(url, params=params)))
+        cached = _etag_cache.get(key)
+        headers = self._headers()
+        if cached:
+            headers["If-None-Match"] = cached[0]
         async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(
-                f"{self._base}{path}",
-                headers=self._headers(),
-                params=params,
-            )
+            resp = await client.get(url, headers=headers, params=params)
+            if resp.status_code == 304 and cached:
+                _etag_cache.move_to_end(key)
+                return _json.loads(cached[1])
             _raise_for_status_with_detail(resp)
             if resp.status_code == 204:
                 return {}
+            etag = resp.headers.get("etag")
+            if etag:
+                _etag_cache[key] = (etag, resp.content)
+                _etag_cache.move_to_end(key)
+                while len(_etag_cache) > _ETAG_CACHE_SIZE:
+                    _etag_cache.popitem(last=False)
             return resp.json()
 
     async def post(self, path: str, json: dict | None = None) -> dict | list:
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Scale benchmark: seed a large synthetic workspace and time the hot paths.
+
+Seeds a deterministic workspace (``app/services/seed_scale.py``) into a
+dedicated benchmark database, then drives the real FastAPI app in-process
+(httpx ``ASGITransport`` — no server, no network) through the endpoints that
+get slow first as an inventory grows: card lists and counts, relation
+summaries, every report, metamodel reads, exports, bulk edits, the
+calculation engine and a workspace import dry-run. Each scenario runs a few
+warm-up iterations, then N timed ones; the JSON result records min / median /
+p95 / max latency and the SQL statement count from ``X-Query-Count``.
+
+Usage (from the repo root, against a running Postgres):
+
+    cd backend && python ../scripts/benchmark.py --profile medium --reset \\
+        --output bench-2.78.json
+    cd backend && python ../scripts/benchmark.py --skip-seed \\
+        --compare bench-2.78.json --output bench-next.json
+
+``--compare`` exits non-zero when any scenario's median regresses by more
+than ``--threshold`` (default 25 %) or issues more SQL statements than the
+baseline — wire it into CI to catch performance regressions before release.
+
+Requires: POSTGRES_* env vars (or defaults). The database defaults to
+``BENCH_POSTGRES_DB`` (``turboea_bench``) — never point it at a real
+workspace: ``--reset`` drops every table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# When running outside the container, add backend/ to sys.path
+backend_dir = Path(__file__).resolve().parent.parent / "backend"
+if backend_dir.is_dir():
+    sys.path.insert(0, str(backend_dir))
+
+# The app reads its settings at import time — point it at the benchmark
+# database before anything from ``app`` is imported.
+os.environ["POSTGRES_DB"] = os.getenv("BENCH_POSTGRES_DB", "turboea_bench")
+os.environ.setdefault("QUERY_PROFILER_ENABLED", "true")
+os.environ.setdefault("QUERY_PROFILER_SAMPLE_RATE", "0")
+
+import httpx  # noqa: E402
+from sqlalchemy import func, select, text  # noqa: E402
+
+from app.config import APP_VERSION  # noqa: E402
+from app.core.security import create_access_token, hash_password  # noqa: E402
+from app.database import async_session, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Base  # noqa: E402
+from app.models.card import Card  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.seed import seed_metamodel  # noqa: E402
+from app.services.seed_scale import PRESETS, ScaleProfile, seed_scale_workspace  # noqa: E402
+
+RESULT_FORMAT = 1
+BENCH_ADMIN_EMAIL = "bench-admin@turboea.local"
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+
+async def _reset_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _bench_admin() -> User:
+    async with async_session() as db:
+        user = (
+            await db.execute(select(User).where(User.email == BENCH_ADMIN_EMAIL))
+        ).scalar_one_or_none()
+        if user is None:
+            user = User(
+                email=BENCH_ADMIN_EMAIL,
+                display_name="Benchmark Admin",
+                password_hash=hash_password(uuid.uuid4().hex),
+                role="admin",
+            )
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+        return user
+
+
+async def _seed(profile: ScaleProfile) -> dict:
+    async with async_session() as db:
+        await seed_metamodel(db)
+    admin = await _bench_admin()
+    started = time.perf_counter()
+    async with async_session() as db:
+        counts = await seed_scale_workspace(db, profile, admin_id=admin.id)
+        await db.commit()
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    counts["seconds"] = round(time.perf_counter() - started, 1)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+
+async def _fixtures() -> dict:
+    """Ids the scenarios need, picked deterministically from the seeded data."""
+    async with async_session() as db:
+
+        async def first(type_key: str, *where) -> str:
+            row = await db.execute(
+                select(Card.id)
+                .where(Card.type == type_key, Card.status == "ACTIVE", *where)
+                .order_by(Card.name)
+                .limit(1)
+            )
+            return str(row.scalar_one())
+
+        app_ids = (
+            (
+                await db.execute(
+                    select(Card.id)
+                    .where(Card.type == "Application", Card.status == "ACTIVE")
+                    .order_by(Card.name)
+                    .limit(200)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        return {
+            "application": await first("Application"),
+            "capability_root": await first("BusinessCapability", Card.parent_id.is_(None)),
+            "bulk_ids": [str(i) for i in app_ids[:200]],
+            "archive_ids": [str(i) for i in app_ids[-20:]],
+            "total_cards": (await db.execute(select(func.count(Card.id)))).scalar(),
+        }
+
+
+def _scenarios(fx: dict) -> list[tuple[str, str, str, dict]]:
+    """``(name, method, path, request kwargs)`` in execution order."""
+    app_id = fx["application"]
+    cap_id = fx["capability_root"]
+    get = "GET"
+    return [
+        ("cards.list", get, "/cards", {"params": {"type": "Application", "page_size": 100}}),
+        ("cards.list_all", get, "/cards", {"params": {"page_size": 100}}),
+        ("cards.search", get, "/cards", {"params": {"search": "Application 01", "page_size": 50}}),
+        ("cards.counts", get, "/cards/counts", {}),
+        ("cards.get", get, f"/cards/{app_id}", {}),
+        ("cards.relation_summary", get, f"/cards/{app_id}/relation-summary", {}),
+        ("cards.hierarchy", get, f"/cards/{cap_id}/hierarchy", {}),
+        (
+            "cards.descendant_relations_summary",
+            get,
+            f"/cards/{cap_id}/descendant-relations/summary",
+            {},
+        ),
+        ("cards.history", get, f"/cards/{app_id}/history", {}),
+        ("relations.for_card", get, "/relations", {"params": {"card_id": app_id}}),
+        ("metamodel.types", get, "/metamodel/types", {}),
+        ("metamodel.relation_types", get, "/metamodel/relation-types", {}),
+        ("reports.dashboard", get, "/reports/dashboard", {}),
+        ("reports.admin_dashboard", get, "/reports/admin-dashboard", {}),
+        ("reports.landscape", get, "/reports/landscape", {"params": {"type": "Application"}}),
+        ("reports.app_portfolio", get, "/reports/app-portfolio", {}),
+        (
+            "reports.matrix",
+            get,
+            "/reports/matrix",
+            {"params": {"row_type": "Application", "col_type": "BusinessCapability"}},
+        ),
+        ("reports.roadmap", get, "/reports/roadmap", {}),
+        ("reports.cost", get, "/reports/cost", {"params": {"type": "Application"}}),
+        ("reports.cost_treemap", get, "/reports/cost-treemap", {"params": {"type": "Application"}}),
+        ("reports.capability_heatmap", get, "/reports/capability-heatmap", {}),
+        ("reports.dependencies", get, "/reports/dependencies", {}),
+        ("reports.data_quality", get, "/reports/data-quality", {}),
+        ("reports.eol", get, "/reports/eol", {}),
+        (
+            "export.cards_json",
+            get,
+            "/cards/export/json",
+            {"params": {"types": "Application", "include_relations": True}},
+        ),
+        ("export.cards_csv", get, "/cards/export/csv", {"params": {"type": "Application"}}),
+        ("export.workspace", get, "/admin/workspace/export", {}),
+        (
+            "write.bulk_update",
+            "PATCH",
+            "/cards/bulk",
+            {"json": {"ids": fx["bulk_ids"], "updates": {"approval_status": "DRAFT"}}},
+        ),
+        ("write.recalculate", "POST", "/calculations/recalculate/Application", {}),
+    ]
+
+
+async def _time_request(
+    client: httpx.AsyncClient, method: str, path: str, kwargs: dict, iterations: int, warmup: int
+) -> dict:
+    samples: list[float] = []
+    queries: list[int] = []
+    status = None
+    size = 0
+    for i in range(warmup + iterations):
+        started = time.perf_counter()
+        resp = await client.request(method, f"/api/v1{path}", **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        status = resp.status_code
+        size = len(resp.content)
+        if i >= warmup:
+            samples.append(elapsed)
+            queries.append(int(resp.headers.get("x-query-count", 0)))
+    return _summarise(samples, queries) | {"status": status, "bytes": size}
+
+
+def _summarise(samples: list[float], queries: list[int] | None = None) -> dict:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    out = {
+        "iterations": len(samples),
+        "min_ms": round(ordered[0], 1),
+        "median_ms": round(statistics.median(ordered), 1),
+        "p95_ms": round(p95, 1),
+        "max_ms": round(ordered[-1], 1),
+    }
+    if queries is not None:
+        out["queries"] = max(queries) if queries else 0
+    return out
+
+
+async def _time_archive_cycle(client: httpx.AsyncClient, card_ids: list[str], iterations: int):
+    """Archive then restore the same cards, so every iteration does real work."""
+    samples = []
+    queries = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        archived = await client.post(
+            "/api/v1/cards/bulk-archive",
+            json={"card_ids": card_ids, "child_strategy": "disconnect"},
+        )
+        restored = await client.post("/api/v1/cards/bulk-restore", json={"card_ids": card_ids})
+        samples.append((time.perf_counter() - started) * 1000)
+        queries.append(
+            int(archived.headers.get("x-query-count", 0))
+            + int(restored.headers.get("x-query-count", 0))
+        )
+    status = max(archived.status_code, restored.status_code)
+    return _summarise(samples, queries) | {"status": status}
+
+
+async def _time_import_dry_run(client: httpx.AsyncClient, admin: User, iterations: int) -> dict:
+    """Export once, then time parsing + diffing the bundle against the same DB."""
+    from app.services.workspace_io import diff_bundle, parse_bundle
+
+    raw = (await client.get("/api/v1/admin/workspace/export")).content
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        bundle = parse_bundle(raw)
+        async with async_session() as db:
+            await diff_bundle(db, bundle, admin)
+            await db.rollback()
+        samples.append((time.perf_counter() - started) * 1000)
+    return _summarise(samples) | {"bytes": len(raw)}
+
+
+def _selected(name: str, only: list[str] | None) -> bool:
+    return not only or any(name.startswith(prefix) for prefix in only)
+
+
+def _print_result(name: str, result: dict) -> None:
+    line = (
+        f"[bench] {name:<36} {result['median_ms']:>9.1f} ms median  {result['p95_ms']:>9.1f} ms p95"
+    )
+    if "queries" in result:
+        line += f"  {result['queries']:>5} queries"
+    if "status" in result:
+        line += f"  HTTP {result['status']}"
+    print(line)
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    profile = PRESETS[args.profile]
+    if args.seed is not None:
+        profile = ScaleProfile(**(profile.as_dict() | {"seed": args.seed}))
+
+    seed_counts: dict | None = None
+    if args.reset:
+        print(f"[bench] Resetting {os.environ['POSTGRES_DB']}...")
+        await _reset_schema()
+    if not args.skip_seed:
+        async with async_session() as db:
+            existing = (await db.execute(select(func.count(Card.id)))).scalar() or 0
+        if existing:
+            raise SystemExit(
+                f"[bench] {os.environ['POSTGRES_DB']} already holds {existing} cards — "
+                "pass --reset to rebuild it or --skip-seed to reuse it"
+            )
+        print(f"[bench] Seeding profile {args.profile!r}: {profile.as_dict()}")
+        seed_counts = await _seed(profile)
+        print(f"[bench] Seeded {seed_counts['cards']} cards in {seed_counts['seconds']}s")
+
+    admin = await _bench_admin()
+    token = create_access_token(admin.id, admin.role)
+    fx = await _fixtures()
+
+    results: dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=None,
+    ) as client:
+        for name, method, path, kwargs in _scenarios(fx):
+            if not _selected(name, args.only):
+                continue
+            result = await _time_request(client, method, path, kwargs, args.iterations, args.warmup)
+            results[name] = result
+            _print_result(name, result)
+        if _selected("write.archive_restore", args.only):
+            results["write.archive_restore"] = await _time_archive_cycle(
+                client, fx["archive_ids"], args.iterations
+            )
+            _print_result("write.archive_restore", results["write.archive_restore"])
+        if _selected("import.dry_run", args.only):
+            results["import.dry_run"] = await _time_import_dry_run(
+                client, admin, max(1, args.iterations // 2)
+            )
+            _print_result("import.dry_run", results["import.dry_run"])
+
+    async with engine.connect() as conn:
+        pg_version = (await conn.execute(text("SHOW server_version"))).scalar()
+
+    return {
+        "format": RESULT_FORMAT,
+        "app_version": APP_VERSION,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "profile": {"name": args.profile, **profile.as_dict()},
+        "dataset": {"total_cards": fx["total_cards"]},
+        "seed": seed_counts,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgres": pg_version,
+            "cpu_count": os.cpu_count(),
+        },
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "results": results,
+    }
+
+
+def _compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Scenarios that regressed against ``baseline``; empty when none did."""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        if before["median_ms"] > 0 and now["median_ms"] > before["median_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: median {before['median_ms']} → {now['median_ms']} ms "
+                f"(+{(now['median_ms'] / before['median_ms'] - 1) * 100:.0f}%)"
+            )
+        if "queries" in now and now["queries"] > before.get("queries", now["queries"]):
+            regressions.append(f"{name}: queries {before['queries']} → {now['queries']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profile", choices=sorted(PRESETS), default="large")
+    parser.add_argument("--seed", type=int, default=None, help="override the profile's RNG seed")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    parser.add_argument("--skip-seed", action="store_true", help="benchmark the existing data")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--only", nargs="*", default=None, help="scenario name prefixes, e.g. reports cards.list"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="write the JSON result here")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline result JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)"
+    )
+    args = parser.parse_args()
+    # One INFO line per request would drown the summary.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    result = asyncio.run(_run(args))
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"[bench] Wrote {args.output}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = _compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"[bench] {len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"[bench] No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
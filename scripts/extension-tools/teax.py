@@ -385,9 +385,9 @@ def cmd_pack(args) -> int:
     }
     manifest.setdefault("entitlement_key", manifest["key"])
     # Default to the SDK this teax ships with. The loader's compatibility
-    # check is major-only, so a 1.5 default still loads on a 1.1 core (with
+    # check is major-only, so a 1.8 default still loads on a 1.1 core (with
     # a newer-minor warning there).
-    manifest.setdefault("sdk_version", "1.5")
+    manifest.setdefault("sdk_version", "1.8")
     if args.key_id:
         manifest["key_id"] = args.key_id
     manifest["files"] = {